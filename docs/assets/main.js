@@ -29,6 +29,17 @@ class DashboardApp {
   }
   
   async loadData() {
+    // Prefer the pre-aggregated files written by scripts/build_dashboard_data.py
+    try {
+      const response = await fetch('./data/manifest.json');
+      if (response.ok) {
+        await this.loadManifest(await response.json());
+        return;
+      }
+    } catch (error) {
+      console.warn('Pre-aggregated data unavailable, loading work_review.json:', error);
+    }
+    
     try {
       const response = await fetch('./work_review.json');
       if (!response.ok) {
@@ -42,6 +53,38 @@ class DashboardApp {
     }
   }
   
+  async loadManifest(manifest) {
+    const response = await fetch(`./data/${manifest.rollups}`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    this.manifest = manifest;
+    this.rollups = await response.json();
+    this.chunkCache = new Map();
+    this.data = { metadata: manifest.metadata, aggregates: manifest.aggregates, daily: null };
+    this.repoNames = manifest.repos || [];
+    this.dateBounds = { start: manifest.dates.start, end: manifest.dates.end };
+    
+    // Index periods by their start/end clamped to the observed window
+    this.periodIndex = {};
+    ['month', 'week'].forEach(granularity => {
+      const byStart = new Map();
+      (this.rollups[granularity] || []).forEach(period => {
+        const start = period.start < this.dateBounds.start ? this.dateBounds.start : period.start;
+        const end = period.end > this.dateBounds.end ? this.dateBounds.end : period.end;
+        byStart.set(start, { ...period, effectiveStart: start, effectiveEnd: end });
+      });
+      this.periodIndex[granularity] = byStart;
+    });
+    
+    this.filters = {
+      repos: new Set(this.repoNames),
+      dateRange: { start: this.dateBounds.start, end: this.dateBounds.end }
+    };
+    this.filteredData = { ...this.data, daily: [] };
+  }
+  
   normalizeData() {
     // Create date->repo map for quick filtering
     this.dateRepoMap = new Map();
@@ -57,6 +100,9 @@ class DashboardApp {
       this.data.daily?.flatMap(day => day.repos?.map(repo => repo.name) || []) || []
     )];
     
+    const dates = (this.data.daily || []).map(d => d.date).sort();
+    this.dateBounds = { start: dates[0], end: dates[dates.length - 1] };
+    
     // Set default filters
     this.filters = {
       repos: new Set(this.repoNames),
@@ -69,7 +115,12 @@ class DashboardApp {
     this.applyFilters();
   }
   
-  applyFilters() {
+  async applyFilters() {
+    if (this.manifest) {
+      await this.applyChunkedFilters();
+      return;
+    }
+    
     if (!this.data.daily) {
       this.filteredData = { daily: [], aggregates: this.data.aggregates };
       return;
@@ -93,6 +144,361 @@ class DashboardApp {
     };
   }
   
+  async applyChunkedFilters() {
+    const token = (this.filterToken = (this.filterToken || 0) + 1);
+    const { start, end } = this.clampRange(this.filters.dateRange);
+    const granularity = this.pickGranularity(start, end);
+    
+    // Daily charts need the raw chunks; longer windows chart straight from rollups
+    const [daily, kpis] = await Promise.all([
+      granularity === 'day' ? this.loadDays(start, end) : Promise.resolve(this.rollupRows(granularity, start, end)),
+      this.calculateRollupKPIs(start, end)
+    ]);
+    
+    // A newer filter change finished first; drop this result
+    if (token !== this.filterToken) return;
+    
+    this.granularity = granularity;
+    this.rangeKPIs = kpis;
+    this.filteredData = {
+      ...this.data,
+      daily: daily.map(day => ({
+        ...day,
+        repos: day.repos?.filter(repo => this.filters.repos.has(repo.name)) || []
+      }))
+    };
+  }
+  
+  clampRange(range) {
+    const start = !range.start || range.start < this.dateBounds.start ? this.dateBounds.start : range.start;
+    const end = !range.end || range.end > this.dateBounds.end ? this.dateBounds.end : range.end;
+    return { start, end };
+  }
+  
+  pickGranularity(start, end) {
+    const days = this.daysBetween(start, end) + 1;
+    if (days <= 92) return 'day';
+    if (days <= 731) return 'week';
+    return 'month';
+  }
+  
+  daysBetween(start, end) {
+    return Math.round((Date.parse(`${end}T00:00:00Z`) - Date.parse(`${start}T00:00:00Z`)) / 86400000);
+  }
+  
+  shiftDate(isoDate, days) {
+    const date = new Date(`${isoDate}T00:00:00Z`);
+    date.setUTCDate(date.getUTCDate() + days);
+    return date.toISOString().slice(0, 10);
+  }
+  
+  loadChunk(chunk) {
+    if (!this.chunkCache.has(chunk.key)) {
+      const request = fetch(`./data/${chunk.file}`)
+        .then(response => {
+          if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+          }
+          return chunk.format === 'columnar' ? response.arrayBuffer() : response.json();
+        })
+        .then(payload => chunk.format === 'columnar' ? this.decodeColumnar(payload) : (payload.daily || []))
+        .catch(error => {
+          this.chunkCache.delete(chunk.key);
+          throw error;
+        });
+      this.chunkCache.set(chunk.key, request);
+    }
+    return this.chunkCache.get(chunk.key);
+  }
+  
+  decodeColumnar(buffer) {
+    // Decode a WRC1 chunk (see scripts/work_review_columnar.py) into day records
+    const bytes = new Uint8Array(buffer);
+    const magic = String.fromCharCode(...bytes.subarray(0, 4));
+    if (magic !== 'WRC1') {
+      throw new Error('Not a columnar work_review chunk');
+    }
+    const headerLength = new DataView(buffer).getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(bytes.subarray(8, 8 + headerLength)));
+    if (header.format_version !== 2) {
+      throw new Error(`Unsupported columnar format version: ${header.format_version}`);
+    }
+    const base = 8 + headerLength;
+    const arrayTypes = { u8: Uint8Array, u16: Uint16Array, u32: Uint32Array, i32: Int32Array, f64: Float64Array };
+    const sentinels = { u8: 0xFF, u16: 0xFFFF, u32: 0xFFFFFFFF, i32: -0x80000000, f64: null };
+    
+    const read = spec => new arrayTypes[spec.type](buffer, base + spec.offset, spec.length);
+    const scalar = (spec, value) => {
+      if (Number.isNaN(value) || value === sentinels[spec.type]) return null;
+      if (spec.encoding === 'string') return header.strings[value];
+      if (spec.encoding === 'bool') return value === 1;
+      if (spec.encoding === 'json') return JSON.parse(header.strings[value]);
+      return value;
+    };
+    
+    const [dateSpec, repoSpec, ...columns] = header.columns;
+    const dates = read(dateSpec);
+    const repoIndex = read(repoSpec);
+    const rows = Array.from({ length: header.rows }, (_, i) => ({ name: header.repos[repoIndex[i]] }));
+    
+    columns.forEach(spec => {
+      const present = spec.present ? read(spec.present) : null;
+      const values = spec.kind !== 'records' && spec.kind !== 'object' ? read(spec) : null;
+      const offsets = spec.offsets ? read(spec.offsets) : null;
+      const mask = spec.mask ? read(spec.mask) : null;
+      const fields = (spec.fields || []).map(field => [field, read(field), field.present ? read(field.present) : null]);
+      const parts = spec.path.slice();
+      const leaf = parts.pop();
+      
+      rows.forEach((row, i) => {
+        const state = present ? present[i] : 1;
+        if (!state) return;
+        let value;
+        if (state === 2) {
+          value = null;
+        } else if (spec.kind === 'scalar') {
+          value = scalar(spec, values[i]);
+        } else if (spec.kind === 'object') {
+          value = {};
+        } else if (spec.kind === 'hist') {
+          value = {};
+          for (let h = 0; h < spec.width; h++) {
+            if (!mask || mask[i * spec.width + h]) {
+              value[h] = scalar(spec, values[i * spec.width + h]);
+            }
+          }
+        } else if (spec.kind === 'list') {
+          value = [];
+          for (let j = offsets[i]; j < offsets[i + 1]; j++) {
+            value.push(scalar(spec, values[j]));
+          }
+        } else {
+          value = [];
+          for (let j = offsets[i]; j < offsets[i + 1]; j++) {
+            const item = {};
+            fields.forEach(([field, data, fieldPresent]) => {
+              if (!fieldPresent || fieldPresent[j]) {
+                item[field.name] = scalar(field, data[j]);
+              }
+            });
+            value.push(item);
+          }
+        }
+        
+        let target = row;
+        parts.forEach(part => {
+          target = target[part] || (target[part] = {});
+        });
+        target[leaf] = value;
+      });
+    });
+    
+    const daily = header.dates.map(date => ({ date, repos: [] }));
+    rows.forEach((row, i) => {
+      daily[dates[i]].repos.push(row);
+    });
+    return daily;
+  }
+  
+  async loadDays(start, end) {
+    const chunks = this.manifest.chunks.filter(chunk => chunk.end >= start && chunk.start <= end);
+    const loaded = await Promise.all(chunks.map(chunk => this.loadChunk(chunk)));
+    return loaded.flat().filter(day => day.date >= start && day.date <= end);
+  }
+  
+  async loadDayList(days) {
+    if (days.length === 0) return [];
+    const wanted = new Set(days);
+    const chunks = this.manifest.chunks.filter(chunk => days.some(day => day >= chunk.start && day <= chunk.end));
+    const loaded = await Promise.all(chunks.map(chunk => this.loadChunk(chunk)));
+    return loaded.flat().filter(day => wanted.has(day.date));
+  }
+  
+  decomposeRange(start, end) {
+    // Cover [start, end] with whole months, then whole weeks, then single days
+    const periods = [];
+    const days = [];
+    let cursor = start;
+    
+    while (cursor <= end) {
+      const month = this.periodIndex.month.get(cursor);
+      if (month && month.effectiveEnd <= end) {
+        periods.push(month);
+        cursor = this.shiftDate(month.effectiveEnd, 1);
+        continue;
+      }
+      
+      const week = this.periodIndex.week.get(cursor);
+      if (week && week.effectiveEnd <= end) {
+        periods.push(week);
+        cursor = this.shiftDate(week.effectiveEnd, 1);
+        continue;
+      }
+      
+      days.push(cursor);
+      cursor = this.shiftDate(cursor, 1);
+    }
+    
+    return { periods, days };
+  }
+  
+  async calculateRollupKPIs(start, end) {
+    const { periods, days } = this.decomposeRange(start, end);
+    const edgeDays = await this.loadDayList(days);
+    const accuracy = this.rollups.sketch_relative_accuracy;
+    
+    const totals = {
+      commits: 0, prs_opened: 0, prs_merged: 0, lines_added: 0, lines_deleted: 0,
+      workflow_runs: 0, workflow_successes: 0, ai_commit_markers: 0, ai_pr_markers: 0, bot_events: 0
+    };
+    const prMerge = this.sketchCreate(accuracy);
+    const issueClose = this.sketchCreate(accuracy);
+    
+    periods.forEach(period => {
+      Object.entries(period.repos).forEach(([name, rollup]) => {
+        if (!this.filters.repos.has(name)) return;
+        Object.keys(totals).forEach(key => { totals[key] += rollup.totals[key] || 0; });
+        this.sketchMerge(prMerge, rollup.sketches.pr_merge);
+        this.sketchMerge(issueClose, rollup.sketches.issue_close);
+      });
+    });
+    
+    edgeDays.forEach(day => {
+      day.repos.forEach(repo => {
+        if (!this.filters.repos.has(repo.name)) return;
+        totals.commits += repo.commits?.count || 0;
+        totals.prs_opened += repo.prs?.opened_count || 0;
+        totals.prs_merged += repo.prs?.merged_count || 0;
+        totals.lines_added += repo.commits?.lines_added || 0;
+        totals.lines_deleted += repo.commits?.lines_deleted || 0;
+        totals.workflow_runs += repo.workflows?.runs_count || 0;
+        if (repo.workflows?.success_rate != null && repo.workflows?.runs_count > 0) {
+          totals.workflow_successes += repo.workflows.success_rate * repo.workflows.runs_count;
+        }
+        totals.ai_commit_markers += repo.ai_signals?.commit_markers || 0;
+        totals.ai_pr_markers += repo.ai_signals?.pr_markers || 0;
+        totals.bot_events += repo.ai_signals?.bot_actor_events || 0;
+        if (repo.prs?.time_to_merge_seconds_median) {
+          this.sketchAdd(prMerge, repo.prs.time_to_merge_seconds_median);
+        }
+        if (repo.issues?.time_to_close_seconds_median) {
+          this.sketchAdd(issueClose, repo.issues.time_to_close_seconds_median);
+        }
+      });
+    });
+    
+    return {
+      commits: totals.commits,
+      prsOpened: totals.prs_opened,
+      prsMerged: totals.prs_merged,
+      linesAdded: totals.lines_added,
+      linesDeleted: totals.lines_deleted,
+      workflowSuccessRate: totals.workflow_runs > 0 ? (totals.workflow_successes / totals.workflow_runs) * 100 : 0,
+      medianPRMergeTime: this.sketchQuantile(prMerge, 0.5) || 0,
+      medianIssueCloseTime: this.sketchQuantile(issueClose, 0.5) || 0,
+      aiMarkers: totals.ai_commit_markers + totals.ai_pr_markers,
+      aiSignalScore: totals.ai_commit_markers * 1 + totals.ai_pr_markers * 2 + totals.bot_events * 1
+    };
+  }
+  
+  rollupRows(granularity, start, end) {
+    // Shape each rollup period like a daily record so the chart builders can reuse it
+    const accuracy = this.rollups.sketch_relative_accuracy;
+    
+    return (this.rollups[granularity] || [])
+      .filter(period => period.end >= start && period.start <= end)
+      .map(period => ({
+        date: period.start,
+        label: period.key,
+        repos: Object.entries(period.repos).map(([name, rollup]) => {
+          const totals = rollup.totals;
+          const prMerge = this.sketchMerge(this.sketchCreate(accuracy), rollup.sketches.pr_merge);
+          const issueClose = this.sketchMerge(this.sketchCreate(accuracy), rollup.sketches.issue_close);
+          
+          return {
+            name,
+            commits: {
+              count: totals.commits,
+              lines_added: totals.lines_added,
+              lines_deleted: totals.lines_deleted
+            },
+            prs: {
+              opened_count: totals.prs_opened,
+              merged_count: totals.prs_merged,
+              time_to_merge_seconds_median: this.sketchQuantile(prMerge, 0.5),
+              size_distribution: rollup.pr_sizes
+            },
+            issues: {
+              time_to_close_seconds_median: this.sketchQuantile(issueClose, 0.5)
+            },
+            workflows: {
+              runs_count: totals.workflow_runs,
+              success_rate: totals.workflow_runs > 0 ? totals.workflow_successes / totals.workflow_runs : null
+            },
+            ai_signals: {
+              commit_markers: totals.ai_commit_markers,
+              pr_markers: totals.ai_pr_markers,
+              bot_actor_events: totals.bot_events
+            },
+            work_patterns: {
+              hour_counts: rollup.active_hours
+            }
+          };
+        })
+      }));
+  }
+  
+  // Mergeable quantile sketches (see scripts/quantile_sketch.py)
+  sketchCreate(accuracy) {
+    const gamma = (1 + accuracy) / (1 - accuracy);
+    return { gamma, logGamma: Math.log(gamma), count: 0, zeros: 0, bins: new Map() };
+  }
+  
+  sketchMerge(sketch, serialized) {
+    if (!serialized) return sketch;
+    sketch.count += serialized.n || 0;
+    sketch.zeros += serialized.z || 0;
+    (serialized.c || []).forEach((count, i) => {
+      if (!count) return;
+      const index = serialized.o + i;
+      sketch.bins.set(index, (sketch.bins.get(index) || 0) + count);
+    });
+    return sketch;
+  }
+  
+  sketchAdd(sketch, value) {
+    if (value == null) return;
+    if (value === 0) {
+      sketch.zeros += 1;
+    } else {
+      const index = Math.ceil(Math.log(value) / sketch.logGamma);
+      sketch.bins.set(index, (sketch.bins.get(index) || 0) + 1);
+    }
+    sketch.count += 1;
+  }
+  
+  sketchQuantile(sketch, q) {
+    if (sketch.count === 0) return null;
+    const indexes = [...sketch.bins.keys()].sort((a, b) => a - b);
+    const valueAtRank = rank => {
+      if (rank < sketch.zeros) return 0;
+      let seen = sketch.zeros;
+      for (const index of indexes) {
+        seen += sketch.bins.get(index);
+        if (seen > rank) {
+          return 2 * Math.pow(sketch.gamma, index) / (sketch.gamma + 1);
+        }
+      }
+      return 2 * Math.pow(sketch.gamma, indexes[indexes.length - 1]) / (sketch.gamma + 1);
+    };
+    
+    // Interpolate between neighbouring ranks, like an exact even-length median
+    const rank = q * (sketch.count - 1);
+    const lower = Math.floor(rank);
+    const value = valueAtRank(lower);
+    return rank > lower ? value + (valueAtRank(lower + 1) - value) * (rank - lower) : value;
+  }
+  
   setupEventListeners() {
     // Repo filter checkboxes
     document.addEventListener('change', (e) => {
@@ -200,12 +606,12 @@ class DashboardApp {
   
   renderDateControls() {
     const slider = document.getElementById('date-range-slider');
-    if (!slider || !this.data.daily) return;
+    if (!slider || !this.dateBounds?.start) return;
     
-    const dates = this.data.daily.map(d => d.date).sort();
+    const dayCount = this.daysBetween(this.dateBounds.start, this.dateBounds.end) + 1;
     slider.min = 0;
-    slider.max = dates.length - 1;
-    slider.value = dates.length - 1; // Default to full range
+    slider.max = dayCount - 1;
+    slider.value = dayCount - 1; // Default to full range
     
     // Set up quick buttons
     const quickButtons = document.querySelectorAll('.date-quick-btn');
@@ -265,11 +671,18 @@ class DashboardApp {
   
   debouncedUpdate() {
     clearTimeout(this.debounceTimeout);
-    this.debounceTimeout = setTimeout(() => {
-      this.applyFilters();
-      this.updateKPIs();
-      this.updateCharts();
-      this.updateRepoDetail();
+    this.debounceTimeout = setTimeout(async () => {
+      try {
+        await this.applyFilters();
+        this.updateKPIs();
+        this.updateCharts();
+        this.updateRepoDetail();
+        this.clearError();
+      } catch (error) {
+        // A failed chunk fetch or decode would otherwise be an unhandled rejection
+        console.error('Failed to update dashboard:', error);
+        this.showError('Failed to load data for the selected range. Please try again.');
+      }
     }, 150);
   }
   
@@ -286,6 +699,10 @@ class DashboardApp {
   }
   
   calculateKPIs() {
+    if (this.manifest) {
+      return this.rangeKPIs || this.getEmptyKPIs();
+    }
+    
     if (!this.filteredData.daily) {
       return this.getEmptyKPIs();
     }
@@ -375,6 +792,11 @@ class DashboardApp {
     }
   }
   
+  formatDayLabel(day) {
+    // Rollup rows are labelled by period key (e.g. 2025-W35, 2025-09)
+    return day.label || new Date(day.date).toLocaleDateString();
+  }
+  
   formatDuration(seconds) {
     if (!seconds || seconds === 0) return '—';
     
@@ -579,7 +1001,7 @@ class DashboardApp {
   }
   
   prepareCommitsData() {
-    const labels = this.filteredData.daily.map(day => new Date(day.date).toLocaleDateString());
+    const labels = this.filteredData.daily.map(day => this.formatDayLabel(day));
     const datasets = [];
     
     this.repoNames.forEach((repoName, index) => {
@@ -603,7 +1025,7 @@ class DashboardApp {
   }
   
   prepareLinesData() {
-    const labels = this.filteredData.daily.map(day => new Date(day.date).toLocaleDateString());
+    const labels = this.filteredData.daily.map(day => this.formatDayLabel(day));
     
     const addedData = this.filteredData.daily.map(day => {
       return day.repos.reduce((sum, repo) => sum + (repo.commits?.lines_added || 0), 0);
@@ -635,7 +1057,7 @@ class DashboardApp {
   }
   
   preparePRVelocityData() {
-    const labels = this.filteredData.daily.map(day => new Date(day.date).toLocaleDateString());
+    const labels = this.filteredData.daily.map(day => this.formatDayLabel(day));
     
     const data = this.filteredData.daily.map(day => {
       const mergeTimes = day.repos
@@ -696,7 +1118,7 @@ class DashboardApp {
   }
   
   prepareAISignalsData() {
-    const labels = this.filteredData.daily.map(day => new Date(day.date).toLocaleDateString());
+    const labels = this.filteredData.daily.map(day => this.formatDayLabel(day));
     
     const commitMarkers = this.filteredData.daily.map(day => {
       return day.repos.reduce((sum, repo) => sum + (repo.ai_signals?.commit_markers || 0), 0);
@@ -739,7 +1161,7 @@ class DashboardApp {
   }
   
   prepareWorkflowData() {
-    const labels = this.filteredData.daily.map(day => new Date(day.date).toLocaleDateString());
+    const labels = this.filteredData.daily.map(day => this.formatDayLabel(day));
     
     const data = this.filteredData.daily.map(day => {
       const successRates = day.repos
@@ -792,20 +1214,23 @@ class DashboardApp {
     const container = document.getElementById('active-hours-list');
     if (!container) return;
     
-    // Get active hours for the selected repo across all days
-    const allHours = [];
+    // Count active hours for the selected repo across all days
+    const hourCounts = {};
     this.filteredData.daily.forEach(day => {
       const repo = day.repos.find(r => r.name === repoName);
-      if (repo?.work_patterns?.active_hours) {
-        allHours.push(...repo.work_patterns.active_hours);
+      if (repo?.work_patterns?.hour_counts) {
+        // Rollup periods carry pre-counted hour frequencies
+        repo.work_patterns.hour_counts.forEach((count, hour) => {
+          if (count) hourCounts[hour] = (hourCounts[hour] || 0) + count;
+        });
+      } else if (repo?.work_patterns?.active_hours) {
+        repo.work_patterns.active_hours.forEach(hour => {
+          hourCounts[hour] = (hourCounts[hour] || 0) + 1;
+        });
       }
     });
     
-    // Count frequency and get top 3
-    const hourCounts = {};
-    allHours.forEach(hour => {
-      hourCounts[hour] = (hourCounts[hour] || 0) + 1;
-    });
+    // Get top 3
     
     const topHours = Object.entries(hourCounts)
       .sort(([,a], [,b]) => b - a)
@@ -840,7 +1265,7 @@ class DashboardApp {
       
       const row = document.createElement('tr');
       row.innerHTML = `
-        <td>${new Date(day.date).toLocaleDateString()}</td>
+        <td>${this.formatDayLabel(day)}</td>
         <td>${repo.commits?.count || 0}</td>
         <td>${repo.prs?.opened_count || 0}</td>
         <td>${repo.prs?.merged_count || 0}</td>
@@ -889,14 +1314,15 @@ class DashboardApp {
   
   handleQuickDateSelect(button) {
     const days = parseInt(button.dataset.days);
-    if (!days || !this.data.daily) return;
+    if (!days || !this.dateBounds?.end) return;
     
-    const allDates = this.data.daily.map(d => d.date).sort();
-    const endDate = allDates[allDates.length - 1];
-    const startIndex = Math.max(0, allDates.length - days);
-    const startDate = allDates[startIndex];
+    const endDate = this.dateBounds.end;
+    const startDate = this.shiftDate(endDate, -(days - 1));
     
-    this.filters.dateRange = { start: startDate, end: endDate };
+    this.filters.dateRange = {
+      start: startDate < this.dateBounds.start ? this.dateBounds.start : startDate,
+      end: endDate
+    };
     this.updateDashboard();
   }
   
@@ -941,11 +1367,20 @@ class DashboardApp {
     const container = document.querySelector('.container');
     if (!container) return;
     
-    const errorDiv = document.createElement('div');
-    errorDiv.className = 'error-message';
+    let errorDiv = container.querySelector('.error-message');
+    if (!errorDiv) {
+      errorDiv = document.createElement('div');
+      errorDiv.className = 'error-message';
+      container.insertBefore(errorDiv, container.firstChild);
+    }
     errorDiv.textContent = message;
-    
-    container.insertBefore(errorDiv, container.firstChild);
+  }
+  
+  clearError() {
+    const errorDiv = document.querySelector('.container .error-message');
+    if (errorDiv) {
+      errorDiv.remove();
+    }
   }
   
   debounce(func, wait) {
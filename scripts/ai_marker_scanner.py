@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+AI Marker Scanner
+
+Detects AI-assistance markers ("Copilot", "generated with ChatGPT", ...) in
+commit messages and PR text. The marker dictionary is compiled into a
+single Aho-Corasick automaton, so each message is scanned in one pass no
+matter how many markers are configured, instead of one regex per marker.
+
+The CLI streams ``git log`` for every repo (one worker process per repo)
+and reports per-day, per-repo counts. ``--score-only`` writes a
+reproducible ``ai_signal_score`` into ``aggregates.by_repo`` of
+work_review.json, together with the fingerprint of the dictionary used.
+
+Dictionary files (``--markers``) are YAML or JSON::
+
+    markers:
+      - copilot                       # shorthand: whole-word, category "assistant"
+      - term: generated with
+        category: attribution
+        word: false                   # match inside longer words too
+      - term: "[bot]"
+        category: attribution
+        word: false
+        after: "co-authored-by:"      # only after this text on the same line
+"""
+
+import json
+import argparse
+import hashlib
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timezone
+
+from metrics import job
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+    ZoneInfoNotFoundError = Exception
+
+DEFAULT_MARKERS: List[Dict[str, Any]] = [
+    {"term": "copilot", "category": "assistant"},
+    {"term": "chatgpt", "category": "assistant"},
+    {"term": "claude", "category": "assistant"},
+    {"term": "gemini", "category": "assistant"},
+    {"term": "openai", "category": "assistant"},
+    {"term": "gpt-3", "category": "model", "word": False},
+    {"term": "gpt-4", "category": "model", "word": False},
+    {"term": "gpt-5", "category": "model", "word": False},
+    {"term": "gpt3", "category": "model", "word": False},
+    {"term": "gpt4", "category": "model", "word": False},
+    {"term": "gpt5", "category": "model", "word": False},
+    {"term": "llm", "category": "model"},
+    {"term": "ai-generated", "category": "attribution"},
+    {"term": "ai generated", "category": "attribution"},
+    {"term": "ai-assisted", "category": "attribution"},
+    {"term": "ai assisted", "category": "attribution"},
+    {"term": "generated by ai", "category": "attribution"},
+    {"term": "generated with ai", "category": "attribution"},
+    {"term": "co-authored-by: copilot", "category": "attribution"},
+    # Bot co-author trailers, e.g. "Co-authored-by: dependabot[bot] <...>"
+    {"term": "[bot]", "category": "attribution", "word": False, "after": "co-authored-by:"},
+]
+
+# Weights of the inputs to ai_signal_score, matching the dashboard KPI
+SCORE_WEIGHTS = {"commit_markers": 1, "pr_markers": 2, "bot_actor_events": 1}
+
+LOG_FORMAT = "%x1e%at%x1f%B%x1d"
+
+
+def load_markers(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load a marker dictionary file, or the built-in one when ``path`` is None."""
+    if path is None:
+        return [dict(marker) for marker in DEFAULT_MARKERS]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise RuntimeError("PyYAML is required for YAML marker files")
+            config = yaml.safe_load(f) or {}
+        else:
+            config = json.load(f)
+
+    markers = []
+    for entry in config.get("markers", []):
+        if isinstance(entry, str):
+            entry = {"term": entry}
+        marker = {"term": entry["term"], "category": entry.get("category", "assistant"),
+                  "word": entry.get("word", True)}
+        if entry.get("after"):
+            marker["after"] = entry["after"]
+        markers.append(marker)
+    return markers
+
+
+def dictionary_fingerprint(markers: List[Dict[str, Any]]) -> str:
+    """Stable short hash of a dictionary, recorded next to every score."""
+    canonical = sorted([m["term"].lower(), m.get("category", "assistant"), bool(m.get("word", True))]
+                       + ([m["after"].lower()] if m.get("after") else [])
+                       for m in markers)
+    return hashlib.sha256(json.dumps(canonical).encode("utf-8")).hexdigest()[:12]
+
+
+def ai_signal_score(commits: int, prs_opened: int, commit_markers: int,
+                    pr_markers: int, bot_actor_events: int) -> int:
+    """Share (0-100) of weighted commit/PR/bot activity carrying an AI signal.
+
+    Deterministic in its inputs, so the same counts always give the same score.
+    """
+    signal = (commit_markers * SCORE_WEIGHTS["commit_markers"]
+              + pr_markers * SCORE_WEIGHTS["pr_markers"]
+              + bot_actor_events * SCORE_WEIGHTS["bot_actor_events"])
+    activity = (commits * SCORE_WEIGHTS["commit_markers"]
+                + prs_opened * SCORE_WEIGHTS["pr_markers"]
+                + bot_actor_events * SCORE_WEIGHTS["bot_actor_events"])
+    if activity <= 0:
+        return 0
+    return min(100, round(100 * signal / activity))
+
+
+class MarkerAutomaton:
+    """Aho-Corasick automaton over lower-cased marker terms.
+
+    Failure links are folded into a full transition table, so scanning is a
+    single dictionary lookup per character.
+    """
+
+    def __init__(self, markers: Optional[List[Dict[str, Any]]] = None):
+        self.markers = markers if markers is not None else [dict(m) for m in DEFAULT_MARKERS]
+        self.categories = sorted({m.get("category", "assistant") for m in self.markers})
+
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, marker in enumerate(self.markers):
+            state = 0
+            for char in marker["term"].lower():
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(index)
+
+        # Breadth-first: complete each state's transitions from its failure state
+        fail = [0] * len(goto)
+        self.delta: List[Dict[str, int]] = [dict(goto[0])]
+        self.delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions = dict(self.delta[fail[state]])
+            for char, child in goto[state].items():
+                fail[child] = self.delta[fail[state]].get(char, 0)
+                outputs[child] = outputs[child] + outputs[fail[child]]
+                transitions[char] = child
+                queue.append(child)
+            self.delta[state] = transitions
+        self.outputs = [tuple(o) for o in outputs]
+        self.lengths = [len(m["term"]) for m in self.markers]
+        self.word = [m.get("word", True) for m in self.markers]
+        self.after = [(m.get("after") or "").lower() for m in self.markers]
+
+    def scan(self, text: str) -> List[Tuple[int, int]]:
+        """Return (marker index, start offset) for every match in ``text``."""
+        matches = []
+        delta = self.delta
+        outputs = self.outputs
+        lowered = text.lower()
+        state = 0
+        for position, char in enumerate(lowered):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    start = position - self.lengths[index] + 1
+                    if self.word[index]:
+                        if start > 0 and lowered[start - 1].isalnum():
+                            continue
+                        if position + 1 < len(lowered) and lowered[position + 1].isalnum():
+                            continue
+                    if self.after[index]:
+                        line_start = lowered.rfind("\n", 0, start) + 1
+                        if self.after[index] not in lowered[line_start:start]:
+                            continue
+                    matches.append((index, start))
+        return matches
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Count matches per category."""
+        counts: Dict[str, int] = {}
+        for index, _ in self.scan(text):
+            category = self.markers[index].get("category", "assistant")
+            counts[category] = counts.get(category, 0) + 1
+        return counts
+
+    def has_marker(self, text: str) -> bool:
+        return bool(self.scan(text))
+
+
+def _load_timezone(name: str):
+    if ZoneInfo is None:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        print(f"⚠️  Unknown timezone {name}, using UTC")
+        return timezone.utc
+
+
+def scan_repo(path: str, markers: List[Dict[str, Any]], tz_name: str = "UTC",
+              since: Optional[str] = None) -> Dict[str, Any]:
+    """Stream ``git log`` for one clone and count marked commits per day."""
+    automaton = MarkerAutomaton(markers)
+    tz = _load_timezone(tz_name)
+    args = ["git", "-C", path, "log", f"--format={LOG_FORMAT}"]
+    if since:
+        args.append(f"--since={since}")
+
+    days: Dict[str, Dict[str, Any]] = {}
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                               text=True, encoding="utf-8", errors="replace")
+
+    def finish(timestamp: Optional[int], message: List[str]):
+        if timestamp is None:
+            return
+        day = datetime.fromtimestamp(timestamp, tz=timezone.utc).astimezone(tz).date().isoformat()
+        stats = days.setdefault(day, {"commits": 0, "marked_commits": 0, "hits": {}})
+        stats["commits"] += 1
+        counts = automaton.count("".join(message))
+        if counts:
+            stats["marked_commits"] += 1
+            for category, count in counts.items():
+                stats["hits"][category] = stats["hits"].get(category, 0) + count
+
+    timestamp = None
+    message: List[str] = []
+    for line in process.stdout:
+        if line.startswith("\x1e"):
+            finish(timestamp, message)
+            stamp, _, rest = line[1:].partition("\x1f")
+            timestamp = int(stamp)
+            message = [rest]
+        else:
+            message.append(line)
+        if "\x1d" in line:
+            message[-1] = message[-1].split("\x1d", 1)[0]
+    finish(timestamp, message)
+    process.wait()
+
+    return {"path": path, "ok": process.returncode == 0, "days": days}
+
+
+class MarkerScanner:
+    def __init__(self, base_path: str = ".", review: Optional[str] = None,
+                 markers: Optional[List[Dict[str, Any]]] = None, workers: int = 4):
+        self.base_path = Path(base_path)
+        self.review_path = Path(review) if review else self.base_path / "docs" / "work_review.json"
+        self.markers = markers if markers is not None else load_markers()
+        self.workers = workers
+
+    def scan_repos(self, repo_paths: Dict[str, Path], tz_name: str = "UTC",
+                   since: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Scan every repo in its own process; returns {repo: {day: counts}}."""
+        results: Dict[str, Dict[str, Any]] = {}
+        with ProcessPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            futures = {name: executor.submit(scan_repo, str(path), self.markers, tz_name, since)
+                       for name, path in repo_paths.items()}
+            for name, future in futures.items():
+                result = future.result()
+                if not result["ok"]:
+                    print(f"❌ {name}: git log failed for {result['path']}")
+                    continue
+                results[name] = result["days"]
+        return results
+
+    def score_review(self) -> Dict[str, int]:
+        """Recompute ai_signal_score per repo from the daily records of work_review.json."""
+        with open(self.review_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        totals: Dict[str, Dict[str, int]] = {}
+        for day_data in data.get("daily", []):
+            for repo in day_data.get("repos", []):
+                entry = totals.setdefault(repo["name"], {"commits": 0, "prs_opened": 0, "commit_markers": 0,
+                                                         "pr_markers": 0, "bot_actor_events": 0})
+                ai_signals = repo.get("ai_signals") or {}
+                entry["commits"] += (repo.get("commits") or {}).get("count") or 0
+                entry["prs_opened"] += (repo.get("prs") or {}).get("opened_count") or 0
+                entry["commit_markers"] += ai_signals.get("commit_markers") or 0
+                entry["pr_markers"] += ai_signals.get("pr_markers") or 0
+                entry["bot_actor_events"] += ai_signals.get("bot_actor_events") or 0
+
+        by_repo = data.setdefault("aggregates", {}).setdefault("by_repo", [])
+        scores = {}
+        for name, entry in totals.items():
+            scores[name] = ai_signal_score(**entry)
+            aggregate = next((a for a in by_repo if a.get("name") == name), None)
+            if aggregate is None:
+                aggregate = {"name": name}
+                by_repo.append(aggregate)
+            aggregate["ai_signal_score"] = scores[name]
+
+        data.setdefault("metadata", {})["ai_signal_score"] = {
+            "dictionary": dictionary_fingerprint(self.markers),
+            "weights": SCORE_WEIGHTS,
+        }
+        with open(self.review_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return scores
+
+
+@job("ai_marker_scanner")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scan commit history for AI-assistance markers",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Scan clones next to this repository and print per-day counts
+  python scripts/ai_marker_scanner.py
+
+  # Scan with a custom dictionary and save the report
+  python scripts/ai_marker_scanner.py --markers markers.yaml --output reports/ai_markers.json
+
+  # Check whether a piece of text contains markers
+  python scripts/ai_marker_scanner.py --text "Refactor parser (generated with ChatGPT)"
+
+  # Recompute ai_signal_score in docs/work_review.json
+  python scripts/ai_marker_scanner.py --score-only
+        """
+    )
+
+    parser.add_argument("--markers", type=str,
+                       help="Marker dictionary (YAML or JSON, default: built-in)")
+    parser.add_argument("--review", type=str,
+                       help="work_review.json providing repos/timezone (default: docs/work_review.json)")
+    parser.add_argument("--repos-root", type=str,
+                       help="Directory containing one clone per repo (default: parent directory)")
+    parser.add_argument("--repo", action="append", default=[], metavar="NAME=PATH",
+                       help="Explicit clone path for one repo (repeatable)")
+    parser.add_argument("--since", type=str,
+                       help="Only scan commits after this date (default: full history)")
+    parser.add_argument("--workers", type=int, default=4,
+                       help="Number of repos scanned in parallel")
+    parser.add_argument("--output", type=str,
+                       help="Write the per-day, per-repo report to this JSON file")
+    parser.add_argument("--text", type=str,
+                       help="Scan a single string and print the matches")
+    parser.add_argument("--score-only", action="store_true",
+                       help="Only recompute ai_signal_score in work_review.json")
+
+    args = parser.parse_args()
+
+    try:
+        markers = load_markers(args.markers)
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"❌ Could not load markers: {e}")
+        sys.exit(1)
+
+    if args.text is not None:
+        automaton = MarkerAutomaton(markers)
+        for index, start in automaton.scan(args.text):
+            marker = markers[index]
+            print(f"   🤖 {marker['term']!r} ({marker.get('category', 'assistant')}) at {start}")
+        print(f"✅ {len(automaton.scan(args.text))} markers found")
+        return
+
+    scanner = MarkerScanner(review=args.review, markers=markers, workers=args.workers)
+    if args.score_only:
+        try:
+            scores = scanner.score_review()
+        except FileNotFoundError:
+            print(f"❌ work_review.json not found: {scanner.review_path}")
+            sys.exit(1)
+        for name, score in scores.items():
+            print(f"   📊 {name}: {score}")
+        print(f"✅ ai_signal_score updated (dictionary {dictionary_fingerprint(markers)})")
+        return
+
+    metadata: Dict[str, Any] = {}
+    if scanner.review_path.exists():
+        with open(scanner.review_path, 'r', encoding='utf-8') as f:
+            metadata = json.load(f).get("metadata", {})
+
+    repos_root = Path(args.repos_root) if args.repos_root else Path(".").resolve().parent
+    repo_paths = {name: repos_root / name for name in metadata.get("repos_included", [])}
+    for entry in args.repo:
+        name, sep, path = entry.partition("=")
+        if not sep:
+            print(f"❌ Invalid --repo value: {entry} (expected NAME=PATH)")
+            sys.exit(1)
+        repo_paths[name] = Path(path)
+    for name in list(repo_paths):
+        if not (repo_paths[name] / ".git").exists():
+            print(f"⚠️  Skipping {name}: no clone at {repo_paths[name]}")
+            del repo_paths[name]
+
+    started = datetime.now()
+    results = scanner.scan_repos(repo_paths, metadata.get("window", {}).get("timezone", "UTC"), args.since)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    for name, days in results.items():
+        commits = sum(d["commits"] for d in days.values())
+        marked = sum(d["marked_commits"] for d in days.values())
+        print(f"   📦 {name}: {commits} commits, {marked} with AI markers, {len(days)} days")
+    print(f"✅ Scanned {len(results)} repos in {elapsed:.2f}s (dictionary {dictionary_fingerprint(markers)})")
+
+    if args.output:
+        report = {
+            "generated_at": datetime.now().isoformat(),
+            "dictionary": dictionary_fingerprint(markers),
+            "repos": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Report saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,10 @@ Assigns strategic priorities to all backlog stories based on:
 - Business value
 - Dependencies
 - Implementation readiness
+
+The weights are the "strategic" model in priority_weights.yaml (see
+priority_engine.py); edit them there, or try changes first with
+priority_engine.py --set.
 """
 
 import json
@@ -14,69 +18,11 @@ import yaml
 from pathlib import Path
 from datetime import datetime
 
-def get_epic_priority_weight(epic):
-    """Return priority weight for epic (lower = higher priority)."""
-    epic_priorities = {
-        # Core business value - highest priority
-        "core": 1,
-        "modeling": 2,
-        "data_sources": 3,
-        
-        # Infrastructure and foundation - medium-high priority
-        "infrastructure": 4,
-        "ingestion": 5,
-        "infra": 6,
-        
-        # Feature expansion - medium priority
-        "ui": 7,
-        "training": 8,
-        "social_media": 9,
-        
-        # AI/LLM capabilities - medium priority
-        "llm_backlog": 10,
-        
-        # Maintenance and ad-hoc - lower priority
-        "adhoc": 11,
-        "unknown": 12,
-    }
-    return epic_priorities.get(epic, 10)
-
-def get_status_priority_modifier(status):
-    """Return priority modifier based on story status."""
-    status_modifiers = {
-        "ready": 0,      # Ready to implement - no delay
-        "backlog": 1,    # In backlog - slight delay
-        "blocked": 5,    # Blocked - significant delay
-        "accepted": 10,  # Already done - lowest priority
-    }
-    return status_modifiers.get(status, 2)
+from priority_engine import PriorityWeights, StoryFeatures, score_models
 
 def calculate_story_priority(story, story_index, total_stories):
     """Calculate priority for a story based on multiple factors."""
-    
-    # Base priority from epic
-    epic_weight = get_epic_priority_weight(story["epic"])
-    
-    # Status modifier
-    status_modifier = get_status_priority_modifier(story["status"])
-    
-    # Position within epic (stories later in file get slightly lower priority)
-    position_factor = (story_index / total_stories) * 2
-    
-    # Special high-priority patterns in title
-    title_lower = story["title"].lower()
-    title_boost = 0
-    if any(keyword in title_lower for keyword in ["critical", "urgent", "blocker", "foundation", "core"]):
-        title_boost = -3
-    elif any(keyword in title_lower for keyword in ["setup", "config", "install"]):
-        title_boost = -1
-    elif any(keyword in title_lower for keyword in ["nice-to-have", "future", "maybe"]):
-        title_boost = 3
-    
-    # Calculate final priority (round to integer)
-    final_priority = max(1, int(epic_weight + status_modifier + position_factor + title_boost))
-    
-    return final_priority
+    return PriorityWeights.load().model("strategic").score_story(story, story_index, total_stories)
 
 def assign_priorities():
     """Assign priorities to all stories in the backlog."""
@@ -95,9 +41,10 @@ def assign_priorities():
     
     print(f"🎯 Assigning priorities to {total_stories} stories...")
     
-    # Assign priorities
-    for i, story in enumerate(stories):
-        new_priority = calculate_story_priority(story, i, total_stories)
+    # Assign priorities (all stories scored at once by the strategic model)
+    strategic = PriorityWeights.load().model("strategic")
+    priorities = score_models([strategic], StoryFeatures(stories))[0]
+    for story, new_priority in zip(stories, priorities):
         story["priority"] = new_priority
         story["last_updated"] = datetime.now().strftime('%Y-%m-%d')
     
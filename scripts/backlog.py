@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Backlog Command Line for AI Sports Analytics Planning
+
+Single entry point for the backlog scripts. A subcommand's module is imported
+only when that subcommand runs, so ``backlog --help`` and ``backlog help``
+answer without loading yaml, json or any backlog data.
+
+Usage:
+  python scripts/backlog.py <command> [options]
+  python scripts/backlog.py help <command>
+  python scripts/backlog.py startup
+
+When backlog_daemon.py is running in the current directory, commands are
+forwarded to it and run against its already-parsed backlog; otherwise (or
+with BACKLOG_NO_DAEMON=1) they run in this process.
+"""
+
+import sys
+
+# Only sys is imported up front; everything else loads with the subcommand
+COMMANDS = {
+    "ingest": ("ingest_stories", "Ingest staged stories into the backlog"),
+    "update": ("update_story", "Update a story's status, branch or owner, or list ready stories"),
+    "prio": ("manage_priorities", "List, set, insert, shift and auto-prioritize story priorities"),
+    "report": ("generate_reports", "Generate velocity, health, priority and workflow reports"),
+    "dashboard": ("generate_real_dashboard", "Generate docs/index.html from real project data"),
+    "groom": ("backlog_groomer", "Write backlog_grooming_report.md for the next 20 stories"),
+    "clean": ("cleanup_data", "Clean up data quality issues in the backlog"),
+    "rebuild": ("generate_complete_backlog", "Rebuild COMPLETE_BACKLOG.json from story markdown"),
+    "daemon": ("backlog_daemon", "Start, stop or check the warm backlog daemon"),
+}
+
+DAEMON_SOCKET = ".cache/backlog_daemon.sock"
+# Commands that read from the terminal or run until interrupted stay local
+DIRECT_FLAGS = {"--interactive", "--watch"}
+
+STARTUP_BUDGET_MS = 100.0
+STARTUP_REPEAT = 7
+
+
+def usage() -> str:
+    lines = ["usage: backlog <command> [options]", "", "Commands:"]
+    for name, (_, summary) in COMMANDS.items():
+        lines.append(f"  {name:<10} {summary}")
+    lines.append(f"  {'help':<10} Show help for a command")
+    lines.append(f"  {'startup':<10} Measure startup time of common commands")
+    lines.append("")
+    lines.append("Run 'backlog <command> --help' for the options of a command.")
+    return "\n".join(lines)
+
+
+def run(command: str, argv: list):
+    """Import ``command``'s module and run its ``main()`` with ``argv``."""
+    import importlib
+
+    module = importlib.import_module(COMMANDS[command][0])
+    # argparse takes the program name from argv[0]
+    sys.argv = [f"backlog {command}"] + argv
+    return module.main()
+
+
+def frame(kind: bytes, payload: bytes) -> bytes:
+    """One daemon response frame: a kind byte, a 4-byte length, the payload."""
+    return kind + len(payload).to_bytes(4, "big") + payload
+
+
+def forward(command: str, argv: list):
+    """Run ``command`` in the daemon; returns None when no daemon is listening."""
+    import os
+
+    if (command == "daemon" or os.environ.get("BACKLOG_NO_DAEMON")
+            or DIRECT_FLAGS.intersection(argv) or not os.path.exists(DAEMON_SOCKET)):
+        return None
+
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(DAEMON_SOCKET)
+    except OSError:
+        # Stale socket left by a daemon that did not shut down cleanly
+        sock.close()
+        return None
+
+    # Request: NUL-separated tty flag, working directory, command and arguments
+    tty = "1" if sys.stdout.isatty() else "0"
+    sock.sendall(b"\0".join(os.fsencode(part) for part in [tty, os.getcwd(), command] + argv))
+    sock.shutdown(socket.SHUT_WR)
+    streams = {b"o": sys.stdout.buffer, b"e": sys.stderr.buffer}
+    with sock, sock.makefile("rb") as reader:
+        while True:
+            header = reader.read(5)
+            if len(header) < 5:
+                print("❌ Lost connection to the backlog daemon", file=sys.stderr)
+                return 1
+            payload = reader.read(int.from_bytes(header[1:], "big"))
+            if header[:1] == b"x":
+                return int(payload)
+            streams[header[:1]].write(payload)
+            streams[header[:1]].flush()
+
+
+def startup(argv: list) -> int:
+    """Time ``--help`` for the entry point and every subcommand against the budget."""
+    import argparse
+    import statistics
+    import subprocess
+    import time
+
+    parser = argparse.ArgumentParser(prog="backlog startup",
+                                     description="Measure startup time of common commands")
+    parser.add_argument("--repeat", type=int, default=STARTUP_REPEAT, help="Runs per command")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Median startup budget in milliseconds")
+    args = parser.parse_args(argv)
+
+    invocations = [["--help"]] + [[name, "--help"] for name in COMMANDS]
+    over = []
+    print(f"⏱️  Startup over {args.repeat} runs (budget {args.budget_ms:.0f} ms median)")
+    for invocation in invocations:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, __file__] + invocation,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append((time.perf_counter() - started) * 1000)
+        median = statistics.median(timings)
+        flag = "✅" if median <= args.budget_ms else "❌"
+        if median > args.budget_ms:
+            over.append(" ".join(invocation))
+        print(f"  {flag} backlog {' '.join(invocation):<20} median {median:6.1f} ms   min {min(timings):6.1f} ms")
+
+    if over:
+        print(f"❌ Over budget: {', '.join(over)}")
+        return 1
+    print("✅ All commands within budget")
+    return 0
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+
+    command, rest = argv[0], argv[1:]
+    if command == "help":
+        if not rest:
+            print(usage())
+            return 0
+        command, rest = rest[0], ["--help"]
+
+    if command == "startup":
+        return startup(rest)
+    if command not in COMMANDS:
+        print(f"❌ Unknown command: {command}\n", file=sys.stderr)
+        print(usage(), file=sys.stderr)
+        return 2
+
+    code = forward(command, rest)
+    if code is not None:
+        return code
+    return run(command, rest)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Backlog Daemon
+
+Keeps the script modules imported and the backlog views parsed in a
+background process listening on a Unix domain socket, so the dozens of
+``backlog prio`` / ``backlog update`` runs in a grooming session skip
+interpreter startup, imports and the JSON parse.
+
+backlog.py forwards a command here when the daemon's socket exists in the
+working directory and runs it directly otherwise. Each forwarded command
+runs in a process forked from the daemon: it picks up the warm views through
+``backlog_store.load_view``, may modify them freely (copy-on-write), and
+exits when done, so no command can leave state behind for the next one.
+Commands run one at a time; views that a command rewrote are parsed again
+before the next connection is accepted.
+
+Usage:
+  python scripts/backlog_daemon.py start
+  python scripts/backlog_daemon.py status
+  python scripts/backlog_daemon.py stop
+"""
+
+import argparse
+import atexit
+import importlib
+import io
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import List, Any, Optional
+
+from backlog import COMMANDS, DAEMON_SOCKET, forward, frame, run
+from metrics import job
+
+PID_FILE = ".cache/backlog_daemon.pid"
+LOG_FILE = ".cache/backlog_daemon.log"
+DEFAULT_IDLE_TIMEOUT = 3600
+START_TIMEOUT = 300
+# Imported by commands on demand; loaded up front so forwarded runs skip them
+WARM_IMPORTS = ["yaml", "backlog_store", "priority_engine"]
+
+
+class FrameWriter(io.RawIOBase):
+    """Raw stream that sends each write to the client as one response frame."""
+
+    def __init__(self, conn: socket.socket, kind: bytes):
+        self.conn = conn
+        self.kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.conn.sendall(frame(self.kind, bytes(data)))
+        return len(data)
+
+
+def exit_code(value: Any) -> int:
+    """Map a ``main()`` return value or ``SystemExit`` code the way ``sys.exit`` does."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    print(value, file=sys.stderr)
+    return 1
+
+
+class BacklogDaemon:
+    def __init__(self, base_path: str = ".", idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.base_path = Path(base_path).resolve()
+        self.socket_path = self.base_path / DAEMON_SOCKET
+        self.pid_file = self.base_path / PID_FILE
+        self.views = [self.base_path / "backlog" / "PRIORITIZATION.json",
+                      self.base_path / "backlog" / "COMPLETE_BACKLOG.json"]
+        self.idle_timeout = idle_timeout
+        self.started = time.time()
+        self.requests = 0
+        self.reparses = 0
+
+        # Load data
+        for name in WARM_IMPORTS + sorted({module for module, _ in COMMANDS.values()}):
+            importlib.import_module(name)
+        self.refresh()
+
+    def refresh(self) -> List[str]:
+        """Re-parse views changed on disk since they were last loaded."""
+        # Loaded with WARM_IMPORTS when serving; `daemon --help` never needs it
+        from backlog_store import warm_view
+
+        reparsed = [path.name for path in self.views if warm_view(path)]
+        self.reparses += len(reparsed)
+        return reparsed
+
+    def status(self) -> str:
+        from backlog_store import _WARM_VIEWS
+
+        lines = [f"🔥 Backlog daemon pid {os.getpid()} serving {self.base_path}",
+                 f"   Up {time.time() - self.started:.0f}s, {self.requests} commands, {self.reparses} view parses"]
+        for path in self.views:
+            warm = _WARM_VIEWS.get(str(path))
+            held = f"{len(warm[1].get('backlog', [])):,} stories" if warm else "not loaded"
+            lines.append(f"   {path.name}: {held}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self):
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        listener.listen(16)
+        listener.settimeout(self.idle_timeout or None)
+        self.pid_file.write_text(str(os.getpid()))
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        print(f"👂 Listening on {self.socket_path} (pid {os.getpid()})", flush=True)
+
+        try:
+            while True:
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    print(f"💤 Idle for {self.idle_timeout:.0f}s, exiting", flush=True)
+                    break
+                # A client that never finishes its request must not wedge the daemon
+                conn.settimeout(30)
+                with conn:
+                    try:
+                        self.handle(conn, listener)
+                    except (OSError, ValueError) as e:
+                        print(f"⚠️  Dropped request: {e}", flush=True)
+                reparsed = self.refresh()
+                if reparsed:
+                    print(f"🔄 Re-parsed {', '.join(reparsed)}", flush=True)
+        finally:
+            listener.close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            if self.pid_file.exists() and self.pid_file.read_text().strip() == str(os.getpid()):
+                self.pid_file.unlink()
+
+    def handle(self, conn: socket.socket, listener: socket.socket):
+        chunks = []
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        conn.settimeout(None)
+        tty, cwd, command, *argv = [os.fsdecode(part) for part in b"".join(chunks).split(b"\0")]
+        self.requests += 1
+
+        if command == "daemon-status":
+            conn.sendall(frame(b"o", self.status().encode("utf-8")) + frame(b"x", b"0"))
+            return
+
+        # Pick up edits made outside the daemon since the last command
+        self.refresh()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                listener.close()
+                code = self.run_child(conn, tty == "1", cwd, command, argv)
+            finally:
+                os._exit(code)
+
+        _, status = os.waitpid(pid, 0)
+        code = os.waitstatus_to_exitcode(status)
+        try:
+            if code < 0:
+                conn.sendall(frame(b"e", f"❌ Command killed by signal {-code}\n".encode("utf-8")))
+                code = 1
+            conn.sendall(frame(b"x", str(code).encode("ascii")))
+        except OSError:
+            # Client went away; nothing left to report to
+            pass
+
+    def run_child(self, conn: socket.socket, tty: bool, cwd: str, command: str, argv: List[str]) -> int:
+        """Run one command in the forked process with its output sent to the client."""
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        atexit._clear()
+        os.chdir(cwd)
+        sys.stdin = open(os.devnull)
+        # Buffer like a normal process would: by line on a terminal, in blocks otherwise
+        sys.stdout = io.TextIOWrapper(io.BufferedWriter(FrameWriter(conn, b"o")),
+                                      encoding="utf-8", errors="replace", line_buffering=tty)
+        sys.stderr = io.TextIOWrapper(io.BufferedWriter(FrameWriter(conn, b"e")),
+                                      encoding="utf-8", errors="backslashreplace", line_buffering=True)
+        try:
+            code = exit_code(run(command, argv))
+        except SystemExit as e:
+            code = exit_code(e.code)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        try:
+            # Exit handlers registered by the command, e.g. writing a --trace file
+            atexit._run_exitfuncs()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except OSError:
+            pass
+        return code
+
+
+def read_pid(base_path: Path) -> Optional[int]:
+    try:
+        pid = int((base_path / PID_FILE).read_text().strip())
+        os.kill(pid, 0)
+        return pid
+    except (FileNotFoundError, ValueError, ProcessLookupError):
+        return None
+
+
+def start(base_path: Path, idle_timeout: float) -> int:
+    pid = read_pid(base_path)
+    if pid is not None:
+        print(f"✅ Backlog daemon already running (pid {pid})")
+        return 0
+
+    log_path = base_path / LOG_FILE
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as log:
+        process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "serve", "--idle-timeout", str(idle_timeout)],
+            cwd=base_path, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True)
+
+    # Loading a large backlog takes a while; wait until the socket answers
+    started = time.perf_counter()
+    while time.perf_counter() - started < START_TIMEOUT:
+        if process.poll() is not None:
+            print(f"❌ Backlog daemon exited during startup; see {log_path}")
+            return 1
+        if (base_path / DAEMON_SOCKET).exists():
+            print(f"✅ Backlog daemon running (pid {process.pid}, "
+                  f"ready in {time.perf_counter() - started:.1f}s, log {log_path})")
+            return 0
+        time.sleep(0.05)
+    print(f"❌ Backlog daemon did not start within {START_TIMEOUT}s; see {log_path}")
+    return 1
+
+
+def stop(base_path: Path) -> int:
+    pid = read_pid(base_path)
+    if pid is None:
+        print("ℹ️  Backlog daemon is not running")
+        return 0
+    os.kill(pid, signal.SIGTERM)
+    for _ in range(100):
+        if read_pid(base_path) is None:
+            break
+        time.sleep(0.05)
+    print(f"🛑 Stopped backlog daemon (pid {pid})")
+    return 0
+
+
+@job("backlog_daemon")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep the parsed backlog warm for forwarded backlog commands",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Start in the background, then use backlog.py as usual
+  python scripts/backlog_daemon.py start
+  python scripts/backlog.py prio --list
+
+  # Check what it holds, then stop it
+  python scripts/backlog_daemon.py status
+  python scripts/backlog_daemon.py stop
+
+  # Run in the foreground (logs to the terminal)
+  python scripts/backlog_daemon.py serve --idle-timeout 0
+        """
+    )
+    parser.add_argument("action", choices=["start", "stop", "status", "serve"], help="What to do")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="Exit after this many seconds without a command; 0 never exits")
+    args = parser.parse_args()
+    base_path = Path(".").resolve()
+
+    if args.action == "start":
+        sys.exit(start(base_path, args.idle_timeout))
+    if args.action == "stop":
+        sys.exit(stop(base_path))
+    if args.action == "status":
+        code = forward("daemon-status", [])
+        if code is None:
+            print("ℹ️  Backlog daemon is not running")
+        sys.exit(code or 0)
+
+    daemon = BacklogDaemon(".", args.idle_timeout)
+    daemon.serve()
+
+
+if __name__ == "__main__":
+    main()
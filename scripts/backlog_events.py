@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Backlog Event Stream
+
+Push channel for backlog_service.py. Every committed change becomes a
+compact, sequence-numbered delta (story ID, operation, changed fields) that
+is broadcast to Server-Sent Events and WebSocket subscribers.
+
+- ``StoryDiffer``  keeps the last published version of each story, so a delta
+  carries only the fields that changed
+- ``DeltaLog``     numbers deltas and keeps the recent ones in a ring buffer;
+  each delta is serialized once, as both an SSE and a WebSocket frame
+- ``Broadcaster``  writes those pre-encoded frames to every matching
+  subscriber (no per-client serialization) and drops clients that stop
+  reading instead of buffering for them forever
+
+SSE event ids are ``<epoch>-<seq>``, so the ``Last-Event-ID`` a browser
+sends on its own when it reconnects names the server run as well as the
+position. Clients resume with that header, or with ``?since=<epoch>-<seq>``
+(``?since=N&epoch=E`` also works, and is what WebSocket clients use). If
+the position is older than the ring buffer, or from a previous server run
+(``epoch`` differs), they receive a ``reset`` event and should reload the
+full story list.
+"""
+
+import base64
+import copy
+import hashlib
+import json
+import struct
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Set, Iterable, Tuple
+
+from story_model import json_default
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_TEXT = 0x1
+WS_CLOSE = 0x8
+WS_PING = 0x9
+WS_PONG = 0xA
+
+
+def websocket_accept(key: str) -> str:
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key (RFC 6455)."""
+    digest = hashlib.sha1((key + WS_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def websocket_frame(payload: bytes, opcode: int = WS_TEXT) -> bytes:
+    """Unmasked server-to-client frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_websocket_frame(reader) -> tuple:
+    """Read one client frame; returns (opcode, payload)."""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if second & 0x80 else b""
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload
+
+
+def sse_frame(event: str, data: bytes, event_id: Optional[str] = None) -> bytes:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\n".encode("utf-8") + b"data: " + data + b"\n\n"
+
+
+def event_id(epoch: int, seq: int) -> str:
+    return f"{epoch}-{seq}"
+
+
+def parse_event_id(value: str) -> Tuple[int, Optional[int]]:
+    """(seq, epoch) from ``<epoch>-<seq>`` or a bare ``<seq>`` (epoch None); ValueError otherwise."""
+    epoch, _, seq = value.strip().rpartition("-")
+    return int(seq), int(epoch) if epoch else None
+
+
+class Delta:
+    __slots__ = ("seq", "story_id", "epic", "sse", "ws")
+
+    def __init__(self, seq: int, story_id: str, epic: Optional[str], payload: Dict[str, Any], epoch: int):
+        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8")
+        self.seq = seq
+        self.story_id = story_id
+        self.epic = epic
+        self.sse = sse_frame("delta", data, event_id(epoch, seq))
+        self.ws = websocket_frame(data)
+
+
+class StoryDiffer:
+    """Remembers published story versions and reports per-field changes."""
+
+    def __init__(self, stories: Iterable[Dict[str, Any]]):
+        self.snapshots: Dict[str, Dict[str, Any]] = {}
+        for story in stories:
+            if story.get("id"):
+                self.snapshots[story["id"]] = copy.deepcopy(story)
+
+    def diff(self, story: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the change record for ``story``, or None if nothing changed."""
+        previous = self.snapshots.get(story["id"])
+        current = copy.deepcopy(story)
+        self.snapshots[story["id"]] = current
+        if previous is None:
+            return {"op": "create", "fields": current}
+        fields = {key: value for key, value in current.items() if previous.get(key) != value}
+        removed = [key for key in previous if key not in current]
+        if not fields and not removed:
+            return None
+        change = {"op": "update", "fields": fields}
+        if removed:
+            change["removed"] = removed
+        return change
+
+    def forget(self, story_id: str) -> bool:
+        return self.snapshots.pop(story_id, None) is not None
+
+
+class DeltaLog:
+    """Sequence-numbered ring buffer of recent deltas."""
+
+    def __init__(self, capacity: int = 10000):
+        self.epoch = int(time.time())
+        self.seq = 0
+        self.entries: deque = deque(maxlen=capacity)
+
+    def append(self, story_id: str, epic: Optional[str], change: Dict[str, Any]) -> Delta:
+        self.seq += 1
+        payload = {"seq": self.seq, "id": story_id, **change}
+        if epic:
+            payload["epic"] = epic
+        delta = Delta(self.seq, story_id, (epic or "").lower() or None, payload, self.epoch)
+        self.entries.append(delta)
+        return delta
+
+    def since(self, seq: int) -> Optional[List[Delta]]:
+        """Deltas after ``seq``, or None if the client must reload (gap or unknown seq)."""
+        if seq > self.seq:
+            return None
+        if seq == self.seq:
+            return []
+        oldest = self.entries[0].seq if self.entries else self.seq + 1
+        if seq < oldest - 1:
+            return None
+        return [delta for delta in self.entries if delta.seq > seq]
+
+
+class Subscriber:
+    __slots__ = ("writer", "kind", "epics", "ids")
+
+    def __init__(self, writer, kind: str, epics: Optional[Set[str]] = None,
+                 ids: Optional[Set[str]] = None):
+        self.writer = writer
+        self.kind = kind
+        self.epics = epics or None
+        self.ids = ids or None
+
+    def wants(self, delta: Delta) -> bool:
+        if self.ids is not None and delta.story_id not in self.ids:
+            return False
+        if self.epics is not None and delta.epic not in self.epics:
+            return False
+        return True
+
+    def send(self, delta: Delta):
+        self.writer.write(delta.sse if self.kind == "sse" else delta.ws)
+
+
+class Broadcaster:
+    """Fans pre-encoded deltas out to subscribers."""
+
+    def __init__(self, log: DeltaLog, max_buffer: int = 1024 * 1024):
+        self.log = log
+        self.max_buffer = max_buffer
+        self.subscribers: Set[Subscriber] = set()
+        self.sent = 0
+        self.dropped = 0
+
+    def hello(self, subscriber: Subscriber, since: Optional[int], epoch: Optional[int]) -> bool:
+        """Replay missed deltas (or send reset) and register; returns False on reset."""
+        replay = None
+        if since is not None and (epoch is None or epoch == self.log.epoch):
+            replay = self.log.since(since)
+        info = json.dumps({"seq": self.log.seq, "epoch": self.log.epoch}).encode("utf-8")
+        event = "hello" if replay is not None or since is None else "reset"
+        if subscriber.kind == "sse":
+            # The id is where this stream starts, so a reconnect before the
+            # first delta still resumes instead of starting fresh
+            position = since if replay is not None else self.log.seq
+            subscriber.writer.write(b"retry: 2000\n\n" + sse_frame(event, info, event_id(self.log.epoch, position)))
+        else:
+            subscriber.writer.write(websocket_frame(
+                json.dumps({"event": event, "seq": self.log.seq, "epoch": self.log.epoch}).encode("utf-8")))
+        for delta in replay or []:
+            if subscriber.wants(delta):
+                subscriber.send(delta)
+        self.subscribers.add(subscriber)
+        return event != "reset"
+
+    def remove(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, deltas: List[Delta]):
+        for subscriber in list(self.subscribers):
+            for delta in deltas:
+                if subscriber.wants(delta):
+                    subscriber.send(delta)
+                    self.sent += 1
+            transport = subscriber.writer.transport
+            if transport.is_closing() or transport.get_write_buffer_size() > self.max_buffer:
+                # Slow or gone: drop it; the client resumes from its last seq
+                self.dropped += 1
+                self.remove(subscriber)
+                transport.abort()
+
+    def heartbeat(self):
+        ping_sse = b": ping\n\n"
+        ping_ws = websocket_frame(b"", WS_PING)
+        for subscriber in list(self.subscribers):
+            if subscriber.writer.transport.is_closing():
+                self.remove(subscriber)
+                continue
+            subscriber.writer.write(ping_sse if subscriber.kind == "sse" else ping_ws)
@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 """
 Backlog Grooming Script
-Systematically grooms the next 20 stories to ensure they are ready for implementation.
+Systematically grooms the next stories (20 by default, see priority_weights.yaml) to ensure they are ready for implementation.
 """
 
-import json
+import argparse
 import os
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from metrics import job
 
 class BacklogGroomer:
     def __init__(self, repo_root: str):
@@ -16,9 +18,13 @@ class BacklogGroomer:
         self.backlog_dir = self.repo_root / "backlog"
         self.prioritization_file = self.backlog_dir / "PRIORITIZATION.json"
 
+        from backlog_store import load_view
+        from priority_engine import PriorityWeights
+
         # Load current data
-        with open(self.prioritization_file, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        self.data = load_view(self.prioritization_file)
+        # Which stories get groomed: the "grooming" section of priority_weights.yaml
+        self.thresholds = PriorityWeights.load().grooming
 
         # ID format patterns
         self.id_patterns = {
@@ -42,11 +48,13 @@ class BacklogGroomer:
             'models': 'modeling'
         }
 
-    def get_top_stories_to_groom(self, count: int = 20) -> List[Dict]:
+    def get_top_stories_to_groom(self, count: Optional[int] = None) -> List[Dict]:
         """Get the top N stories that need grooming, excluding completed ones."""
+        count = self.thresholds['count'] if count is None else count
+        statuses = set(self.thresholds['statuses'])
         stories = [
             s for s in self.data['backlog']
-            if s['priority'] <= 20 and s['status'] in ['backlog', 'draft', 'ready', 'active', 'blocked']
+            if s['priority'] <= self.thresholds['max_priority'] and s['status'] in statuses
         ]
         return sorted(stories, key=lambda x: x['priority'])[:count]
 
@@ -156,9 +164,9 @@ class BacklogGroomer:
         report.append("")
 
         # Get top stories
-        top_stories = self.get_top_stories_to_groom(20)
+        top_stories = self.get_top_stories_to_groom()
 
-        report.append("## Top 20 Active Stories Ready for Grooming")
+        report.append(f"## Top {self.thresholds['count']} Active Stories Ready for Grooming")
         report.append("")
         report.append("| # | Story ID | Epic | Status | Priority | Issues |")
         report.append("|---|----------|------|--------|----------|--------|")
@@ -206,12 +214,16 @@ class BacklogGroomer:
         report.append(f"- **Stories marked as ready:** {ready_stories}")
         if completed_stories > 0:
             report.append(f"- **Completed stories (excluded from grooming):** {completed_stories}")
-        report.append(f"- **Top 20 priorities covered:** Yes")
+        report.append(f"- **Top {self.thresholds['count']} priorities covered:** Yes")
         report.append(f"- **Duplicate stories found:** {len(duplicates)}")
 
         return "\n".join(report)
 
+@job("backlog_groomer")
 def main():
+    parser = argparse.ArgumentParser(description="Groom the next 20 stories and write backlog_grooming_report.md")
+    parser.parse_args()
+
     groomer = BacklogGroomer(".")
     report = groomer.generate_grooming_report()
 
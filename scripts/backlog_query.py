@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Backlog Query Language
+
+Small query language for filtering and aggregating backlog stories, compiled
+into plans that use StoryIndex instead of scanning every story:
+
+    epic=ui and priority<10 and status in (ready, active) group by owner
+    title ~ "player tracking" or label=ml order by priority limit 5
+    not status in (completed, accepted) and created >= 2025-08-28
+
+Grammar:
+    query      := [condition] [group by FIELD] [order by FIELD [asc|desc]] [limit N]
+    condition  := term (or term)*
+    term       := factor (and factor)*
+    factor     := not factor | "(" condition ")" | comparison
+    comparison := FIELD (= | != | < | <= | > | >=) VALUE
+                | FIELD [not] in "(" VALUE ("," VALUE)* ")"
+                | FIELD ~ VALUE                      (words in title/ID, last word as prefix)
+
+Plan operators:
+    IndexScan   equality / IN on status, epic, owner, label, id (hash postings)
+    RangeScan   <, <=, >, >= on priority, created, last_updated (bisect on sorted column)
+    TextSearch  ~ on the title word index
+    Filter      anything else, evaluated only on rows produced by the other operators
+    Intersect / Union / Complement for and / or / not
+
+created and last_updated compare as calendar days (story_dates.day_number),
+so ``created = 2025-08-28`` also matches timestamps and frontmatter dates of
+that day. ``estimate < 5`` and the other orderings compare story points
+(estimates.parse_points), skipping TBD and unparseable estimates; ordering
+any other unindexed field is an error. ``--explain`` prints the plan with
+estimated and actual row counts.
+"""
+
+import json
+import argparse
+import re
+import sys
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from backlog_store import BacklogStore, StoryIndex
+from estimates import parse_points
+from metrics import job
+from story_dates import day_number
+from story_model import json_default
+
+FIELD_ALIASES = {"labels": "label", "depends_on": "dependencies", "deps": "dependencies",
+                 "updated": "last_updated", "backlog": "epic", "backlog_id": "epic"}
+HASH_INDEXED = {"status", "epic", "owner", "label", "id"}
+RANGE_INDEXED = set(StoryIndex.SORTED_FIELDS)
+LIST_VALUED = {"label", "dependencies"}
+DATE_FIELDS = {"created", "last_updated"}
+# Fields ordered by story points rather than by text
+POINTS_FIELDS = {"estimate"}
+ORDERING_OPERATORS = {"<", "<=", ">", ">="}
+KEYWORDS = {"and", "or", "not", "in", "group", "order", "by", "limit", "asc", "desc"}
+
+TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<op><=|>=|!=|=|<|>|~|\(|\)|,)
+      | (?P<word>[A-Za-z0-9_.:/@+-]+)
+    )""", re.VERBOSE)
+
+
+class QueryError(ValueError):
+    pass
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = TOKEN_RE.match(text, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Unexpected input at position {position}: {text[position:position + 10]!r}")
+        position = match.end()
+        if match.group("string") is not None:
+            tokens.append(("value", match.group("string")[1:-1]))
+        elif match.group("op") is not None:
+            tokens.append(("op", match.group("op")))
+        else:
+            word = match.group("word")
+            kind = "keyword" if word.lower() in KEYWORDS else "value"
+            tokens.append((kind, word.lower() if kind == "keyword" else word))
+    return tokens
+
+
+class Parser:
+    """Recursive-descent parser producing a tuple-based AST."""
+
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Optional[Tuple[str, str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def accept(self, kind: str, value: Optional[str] = None) -> Optional[str]:
+        token = self.peek()
+        if token and token[0] == kind and (value is None or token[1] == value):
+            self.position += 1
+            return token[1]
+        return None
+
+    def expect(self, kind: str, value: Optional[str] = None) -> str:
+        result = self.accept(kind, value)
+        if result is None:
+            found = self.peek()
+            raise QueryError(f"Expected {value or kind}, found {found[1] if found else 'end of query'}")
+        return result
+
+    def parse(self) -> Dict[str, Any]:
+        query: Dict[str, Any] = {"where": None, "group_by": None, "order_by": None,
+                                 "descending": False, "limit": None}
+        if self.peek() and self.peek() not in (("keyword", "group"), ("keyword", "order"),
+                                               ("keyword", "limit")):
+            query["where"] = self.condition()
+        if self.accept("keyword", "group"):
+            self.expect("keyword", "by")
+            query["group_by"] = self.field()
+        if self.accept("keyword", "order"):
+            self.expect("keyword", "by")
+            query["order_by"] = self.field()
+            if self.accept("keyword", "desc"):
+                query["descending"] = True
+            else:
+                self.accept("keyword", "asc")
+        if self.accept("keyword", "limit"):
+            try:
+                query["limit"] = int(self.expect("value"))
+            except ValueError:
+                raise QueryError("limit must be an integer")
+        if self.peek() is not None:
+            raise QueryError(f"Unexpected '{self.peek()[1]}'")
+        return query
+
+    def field(self) -> str:
+        name = self.expect("value").lower()
+        return FIELD_ALIASES.get(name, name)
+
+    def condition(self):
+        node = self.term()
+        while self.accept("keyword", "or"):
+            node = ("or", node, self.term())
+        return node
+
+    def term(self):
+        node = self.factor()
+        while self.accept("keyword", "and"):
+            node = ("and", node, self.factor())
+        return node
+
+    def factor(self):
+        if self.accept("keyword", "not"):
+            return ("not", self.factor())
+        if self.accept("op", "("):
+            node = self.condition()
+            self.expect("op", ")")
+            return node
+        return self.comparison()
+
+    def comparison(self):
+        field = self.field()
+        negate = bool(self.accept("keyword", "not"))
+        if self.accept("keyword", "in"):
+            self.expect("op", "(")
+            values = [self.expect("value")]
+            while self.accept("op", ","):
+                values.append(self.expect("value"))
+            self.expect("op", ")")
+            node = ("cmp", field, "in", values)
+            return ("not", node) if negate else node
+        if negate:
+            raise QueryError("'not' after a field must be followed by 'in'")
+        operator = self.expect("op")
+        if operator not in ("=", "!=", "<", "<=", ">", ">=", "~"):
+            raise QueryError(f"Unknown operator '{operator}'")
+        if operator in ORDERING_OPERATORS and field not in RANGE_INDEXED | POINTS_FIELDS:
+            raise QueryError(f"'{operator}' does not apply to {field}; use =, !=, in or ~")
+        return ("cmp", field, operator, self.expect("value"))
+
+
+def _coerce(field: str, value: str) -> Any:
+    if field == "priority":
+        try:
+            return int(value)
+        except ValueError:
+            raise QueryError(f"priority must be compared with an integer, got '{value}'")
+    if field in DATE_FIELDS:
+        day = day_number(value)
+        if day is None:
+            raise QueryError(f"{field} must be compared with a date (YYYY-MM-DD), got '{value}'")
+        return day
+    if field in POINTS_FIELDS:
+        points = parse_points(value)
+        if points is None:
+            raise QueryError(f"{field} must be compared with story points, got '{value}'")
+        return points
+    return value
+
+
+def _predicate_value(field: str, operator: str, value: Any) -> Any:
+    """The comparison value _row_matches expects for a parsed condition."""
+    if field in RANGE_INDEXED and not isinstance(value, list):
+        return _coerce(field, value)
+    if field in POINTS_FIELDS and operator in ORDERING_OPERATORS:
+        return _coerce(field, value)
+    return value
+
+
+def _row_matches(story: Dict[str, Any], field: str, operator: str, value: Any) -> bool:
+    """Predicate evaluation for the Filter operator."""
+    if field == "label":
+        actual = [str(v).lower() for v in story.get("labels") or []]
+    elif field == "dependencies":
+        actual = [str(v).lower() for v in story.get("dependencies") or []]
+    elif field == "priority" or field in DATE_FIELDS:
+        actual = StoryIndex.column_value(field, story)
+    elif field in POINTS_FIELDS and operator in ORDERING_OPERATORS:
+        actual = parse_points(story.get(field))
+    else:
+        actual = story.get(field)
+        actual = "" if actual is None else str(actual).lower()
+
+    if operator == "~":
+        words = StoryIndex.tokenize(str(story.get(field, "")))
+        tokens = re.findall(r"[a-z0-9]+", str(value).lower())
+        return all(any(w == t or (i == len(tokens) - 1 and w.startswith(t)) for w in words)
+                   for i, t in enumerate(tokens))
+    if operator == "in":
+        wanted = {_coerce(field, v) if field in RANGE_INDEXED else str(v).lower() for v in value}
+        return bool(set(actual) & wanted) if isinstance(actual, list) else actual in wanted
+
+    numeric = field in RANGE_INDEXED or (field in POINTS_FIELDS and operator in ORDERING_OPERATORS)
+    target = value if numeric else str(value).lower()
+    if isinstance(actual, list):
+        return (target in actual) if operator == "=" else (target not in actual) if operator == "!=" else False
+    if actual is None:
+        return False
+    if operator == "=":
+        return actual == target
+    if operator == "!=":
+        return actual != target
+    if operator == "<":
+        return actual < target
+    if operator == "<=":
+        return actual <= target
+    if operator == ">":
+        return actual > target
+    return actual >= target
+
+
+class PlanNode:
+    """One operator of a compiled plan. ``estimate`` is a row-count guess used for ordering."""
+
+    def __init__(self, kind: str, description: str, estimate: int, children: Optional[List["PlanNode"]] = None,
+                 run=None, predicate=None):
+        self.kind = kind
+        self.description = description
+        self.estimate = estimate
+        self.children = children or []
+        self._run = run
+        self.predicate = predicate
+        self.actual: Optional[int] = None
+
+    @property
+    def is_filter(self) -> bool:
+        return self.kind == "Filter"
+
+    def execute(self, index: StoryIndex, candidates: Optional[Set[str]] = None) -> Set[str]:
+        if self.kind == "Filter":
+            rows = set(index.by_id) if candidates is None else candidates
+            result = {sid for sid in rows if self.predicate(index.by_id[sid])}
+        elif self.kind == "Intersect":
+            # Most selective producers first; filters only see surviving rows
+            result = candidates
+            for child in self.children:
+                result = child.execute(index, result)
+                if not result:
+                    break
+            result = set() if result is None else result
+        elif self.kind == "Union":
+            result = set()
+            for child in self.children:
+                result |= child.execute(index, candidates)
+        elif self.kind == "Complement":
+            universe = set(index.by_id) if candidates is None else candidates
+            result = universe - self.children[0].execute(index, universe)
+        else:
+            result = self._run()
+            if candidates is not None:
+                result = result & candidates
+        self.actual = len(result)
+        return result
+
+    def explain(self, depth: int = 0) -> List[str]:
+        actual = f", actual={self.actual}" if self.actual is not None else ""
+        lines = [f"{'  ' * depth}{self.kind} {self.description} (est={self.estimate}{actual})".rstrip()]
+        for child in self.children:
+            lines.extend(child.explain(depth + 1))
+        return lines
+
+
+class QueryCompiler:
+    """Turns a parsed query into a plan over a StoryIndex."""
+
+    def __init__(self, index: StoryIndex):
+        self.index = index
+
+    def compile(self, node) -> PlanNode:
+        total = len(self.index.by_id)
+        if node is None:
+            return PlanNode("FullScan", "all stories", total, run=lambda: set(self.index.by_id))
+
+        kind = node[0]
+        if kind == "and":
+            children = self._flatten("and", node)
+            plans = [self.compile(child) for child in children]
+            # Index producers ordered by selectivity, then the residual filters
+            plans.sort(key=lambda p: (p.is_filter, p.estimate))
+            estimate = min((p.estimate for p in plans if not p.is_filter), default=total)
+            return PlanNode("Intersect", "", estimate, plans)
+        if kind == "or":
+            plans = [self.compile(child) for child in self._flatten("or", node)]
+            return PlanNode("Union", "", min(total, sum(p.estimate for p in plans)), plans)
+        if kind == "not":
+            child = self.compile(node[1])
+            return PlanNode("Complement", "", max(total - child.estimate, 0), [child])
+        return self._comparison(*node[1:])
+
+    def _flatten(self, kind: str, node) -> List[Any]:
+        if node[0] != kind:
+            return [node]
+        return self._flatten(kind, node[1]) + self._flatten(kind, node[2])
+
+    def _postings(self, field: str, value: str) -> Set[str]:
+        if field == "id":
+            story = self.index.by_id.get(value) or self.index.by_id.get(value.upper())
+            return {story["id"]} if story else set()
+        if field == "label":
+            return self.index.labels.get(value.lower(), set())
+        return self.index.fields[field].get(value.lower(), set())
+
+    def _comparison(self, field: str, operator: str, value) -> PlanNode:
+        total = len(self.index.by_id)
+        text = f"{field} {operator} {('(' + ', '.join(value) + ')') if isinstance(value, list) else value}"
+
+        if field in HASH_INDEXED and operator in ("=", "in"):
+            values = value if isinstance(value, list) else [value]
+            estimate = sum(len(self._postings(field, v)) for v in values)
+
+            def run(values=values, field=field):
+                result = set()
+                for v in values:
+                    result |= self._postings(field, v)
+                return result
+            return PlanNode("IndexScan", f"{text} [hash index: {field}]", estimate, run=run)
+
+        if field in RANGE_INDEXED and operator in ("<", "<=", ">", ">=", "="):
+            bound = _coerce(field, value)
+            low = bound if operator in (">", ">=", "=") else None
+            high = bound if operator in ("<", "<=", "=") else None
+            values, _ = self.index.column(field)
+            run = lambda: self.index.range(field, low, high, include_low=operator != ">",
+                                           include_high=operator != "<")
+            # Exact count is cheap: two bisects on the sorted column
+            estimate = len(run())
+            return PlanNode("RangeScan", f"{text} [sorted column: {field}, {len(values)} rows]",
+                            estimate, run=run)
+
+        if operator == "~" and field in ("title", "id", "text"):
+            run = lambda: self.index.search(value)
+            return PlanNode("TextSearch", f"{text} [word index]", len(run()), run=run)
+
+        if operator == "in" and field in RANGE_INDEXED:
+            bounds = [_coerce(field, v) for v in value]
+            run = lambda: set().union(*(self.index.range(field, b, b) for b in bounds))
+            return PlanNode("RangeScan", f"{text} [sorted column: {field}]", len(run()), run=run)
+
+        predicate_value = _predicate_value(field, operator, value)
+        predicate = lambda story: _row_matches(story, field, operator, predicate_value)
+        return PlanNode("Filter", text, total, predicate=predicate)
+
+
+class BacklogQuery:
+    """Parse, plan and run a query against a StoryIndex."""
+
+    def __init__(self, index: StoryIndex, text: str):
+        self.index = index
+        self.text = text
+        self.parsed = Parser(text).parse()
+        self.plan = QueryCompiler(index).compile(self.parsed["where"])
+
+    def run(self) -> Dict[str, Any]:
+        ids = self.plan.execute(self.index)
+        stories = [self.index.by_id[sid] for sid in ids]
+
+        group_by = self.parsed["group_by"]
+        if group_by:
+            groups: Dict[str, List[str]] = {}
+            for story in stories:
+                if group_by in LIST_VALUED:
+                    keys = story.get("labels" if group_by == "label" else group_by) or ["(none)"]
+                else:
+                    keys = [story.get(group_by)]
+                for key in keys:
+                    key = "(none)" if key in (None, "") else str(key)
+                    groups.setdefault(key, []).append(story["id"])
+            ordered = sorted(groups.items(), key=lambda item: (-len(item[1]), item[0]))
+            if self.parsed["limit"] is not None:
+                ordered = ordered[:self.parsed["limit"]]
+            return {"query": self.text, "total": len(stories), "group_by": group_by,
+                    "groups": [{"key": key, "count": len(members), "ids": sorted(members)}
+                               for key, members in ordered]}
+
+        order_by = self.parsed["order_by"] or "priority"
+        if order_by in RANGE_INDEXED:
+            key = lambda s: (StoryIndex.column_value(order_by, s) is None,
+                             StoryIndex.column_value(order_by, s) or 0, s["id"])
+        else:
+            key = lambda s: (str(s.get(order_by) or ""), s["id"])
+        stories.sort(key=key, reverse=self.parsed["descending"])
+        if self.parsed["limit"] is not None:
+            stories = stories[:self.parsed["limit"]]
+        return {"query": self.text, "total": len(ids), "stories": stories}
+
+    def explain(self) -> str:
+        lines = self.plan.explain()
+        if self.parsed["group_by"]:
+            lines.insert(0, f"Aggregate count group by {self.parsed['group_by']}")
+        else:
+            order = self.parsed["order_by"] or "priority"
+            lines.insert(0, f"Sort by {order}{' desc' if self.parsed['descending'] else ''}"
+                            + (f", limit {self.parsed['limit']}" if self.parsed["limit"] is not None else ""))
+        return "\n".join(lines)
+
+
+@job("backlog_query")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query backlog stories with a small filter/aggregation language",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Ready or active UI stories in the top 10
+  python scripts/backlog_query.py "epic=ui and priority<10 and status in (ready,active)"
+
+  # Open stories per owner
+  python scripts/backlog_query.py "not status in (completed,accepted) group by owner"
+
+  # Show the plan and which indexes it used
+  python scripts/backlog_query.py "title ~ player and priority <= 20" --explain
+        """
+    )
+
+    parser.add_argument("query", nargs="?", default="",
+                       help="Query text (empty lists every story)")
+    parser.add_argument("--explain", action="store_true",
+                       help="Print the query plan with estimated and actual row counts")
+    parser.add_argument("--format", choices=["table", "json"], default="table",
+                       help="Output format")
+
+    args = parser.parse_args()
+
+    store = BacklogStore()
+    index = StoryIndex(store.prioritization["backlog"])
+    try:
+        query = BacklogQuery(index, args.query)
+    except QueryError as e:
+        print(f"❌ Invalid query: {e}")
+        sys.exit(1)
+
+    result = query.run()
+    if args.format == "json":
+        if args.explain:
+            result["plan"] = query.explain().splitlines()
+        print(json.dumps(result, indent=2, ensure_ascii=False, default=json_default))
+        return
+
+    if "groups" in result:
+        print(f"\n📊 {result['total']} stories grouped by {result['group_by']}:")
+        for group in result["groups"]:
+            print(f"  {group['key']:<30} {group['count']:>4}")
+    else:
+        print(f"\n🔍 {result['total']} matching stories")
+        for story in result["stories"]:
+            print(f"  P{story.get('priority', 99):<3} {story['id']:<12} {story.get('status', ''):<12} "
+                  f"{story.get('epic', ''):<15} {story.get('title', '')[:60]}")
+
+    if args.explain:
+        print("\n🧭 Plan:")
+        for line in query.explain().splitlines():
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1008 @@
+#!/usr/bin/env python3
+"""
+Backlog Service
+
+Persistent asyncio HTTP server for the backlog API described in
+refinements/api (API-001 to API-004). The prioritized backlog is loaded
+once and indexed in memory (backlog_store.StoryIndex), so reads never
+reparse JSON. Writes go through the same persistence path as the scripts
+(StoryIngestor for new stories, BacklogStore for the JSON views) and are
+group-committed: concurrent writes within a short window share one atomic
+rewrite of PRIORITIZATION.json / COMPLETE_BACKLOG.json, and each request
+is answered once its change is on disk.
+
+Endpoints (all JSON unless noted):
+  GET    /api/v1                          endpoint list
+  GET    /api/v1/stories                  list with filters, search, sort, pagination
+  POST   /api/v1/stories                  create (validated, ID assigned, markdown written)
+  GET    /api/v1/stories/{id}             story details
+  PUT    /api/v1/stories/{id}             update fields
+  DELETE /api/v1/stories/{id}             remove from PRIORITIZATION.json (file kept)
+  POST   /api/v1/stories/{id}/move        move to another epic directory
+  POST   /api/v1/stories/{id}/transition  validated status change with history
+  POST   /api/v1/stories/{id}/rollback    undo the last status change
+  GET    /api/v1/stories/{id}/dependencies  blocked-by / blocking
+  POST   /api/v1/stories/bulk-transition  status change for many stories at once
+  POST   /api/v1/stories/bulk-move        move many stories at once
+  GET    /api/v1/stats                    counts grouped by epic/status/owner/label/priority
+  GET    /api/v1/query?q=...&explain=true query language (backlog_query.py) with optional plan
+  POST   /api/v1/export/stories           JSON export with filters; NDJSON/CSV streamed (chunked)
+  POST   /api/v1/import/stories           JSON import, or NDJSON/CSV body streamed and
+                                          committed in chunks; preview and conflict modes
+  GET    /api/v1/export/markdown/{epic}   story files of an epic
+  GET    /api/v1/events?since=E-N         Server-Sent Events stream of story deltas
+  GET    /api/v1/ws?since=N&epoch=E       the same stream over WebSocket
+  GET    /metrics                         Prometheus text format (metrics.py registry)
+  GET    /health                          liveness: process up, backlog loaded
+  GET    /health/detailed                 readiness: files, last commit, subscribers (503 if degraded)
+
+Stream subscribers can narrow the feed with ?epic=ui,core or ?id=UI-003 and
+resume from the last event id (``Last-Event-ID`` or ?since, see backlog_events.py).
+"""
+
+import json
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from backlog_events import (Broadcaster, DeltaLog, StoryDiffer, Subscriber, WS_CLOSE, WS_PING,
+                            WS_PONG, parse_event_id, read_websocket_frame, websocket_accept,
+                            websocket_frame)
+from backlog_query import BacklogQuery, QueryError
+from backlog_store import BacklogStore, StoryIndex
+from bulk_transfer import CONFLICT_MODES, DEFAULT_CHUNK_SIZE, EDITABLE_FIELDS, StreamingImporter
+from ingest_stories import StoryIngestor
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY
+from record_stream import RecordDecoder, encode_stories
+from story_dates import day_number
+from story_model import json_default
+
+# Allowed status changes (API-002). Reopening a completed story is allowed,
+# accepted is final.
+STATUS_TRANSITIONS = {
+    "draft": {"backlog", "ready"},
+    "backlog": {"draft", "ready", "active", "blocked"},
+    "ready": {"backlog", "active", "in-progress", "blocked"},
+    "active": {"in-progress", "backlog", "ready", "blocked", "completed"},
+    "in-progress": {"active", "backlog", "ready", "blocked", "completed"},
+    "blocked": {"backlog", "ready", "active", "in-progress"},
+    "completed": {"accepted", "active", "in-progress"},
+    "accepted": set(),
+}
+DONE_STATUSES = {"completed", "accepted"}
+# Moving into these requires every known dependency to be done
+DEPENDENCY_GATED = {"active", "in-progress", "completed", "accepted"}
+
+SORT_FIELDS = {"priority", "id", "title", "status", "epic", "created", "last_updated"}
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+MAX_IMPORT_ERRORS = 1000
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "backlog_http_requests_total", "HTTP requests handled", ["method", "route", "status"])
+HTTP_SECONDS = REGISTRY.histogram(
+    "backlog_http_request_seconds", "Time to handle an HTTP request, excluding the network", ["route"])
+COMMITS = REGISTRY.counter("backlog_group_commits_total", "Group commits written to disk")
+COMMIT_FAILURES = REGISTRY.counter("backlog_group_commit_failures_total", "Group commits that failed")
+COMMITTED_WRITES = REGISTRY.counter("backlog_committed_writes_total", "Write requests covered by a commit")
+STORIES = REGISTRY.gauge("backlog_stories", "Stories in the in-memory index")
+SUBSCRIBERS = REGISTRY.gauge("backlog_event_subscribers", "Connected SSE/WebSocket subscribers")
+EVENT_SEQ = REGISTRY.gauge("backlog_event_seq", "Sequence number of the latest delta")
+UPTIME = REGISTRY.gauge("backlog_service_uptime_seconds", "Seconds since the service started")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str, details: Optional[Any] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+
+class GroupCommitter:
+    """Coalesces writes into shared commits.
+
+    A write mutates the store in memory, then awaits ``commit()``. The
+    first waiter schedules a flush after ``window`` seconds; everything
+    that arrives before the flush (or while the previous one is still on
+    disk) rides along in the same commit. ``on_prepare`` runs when the
+    snapshot is taken and its result is passed to ``on_commit`` once the
+    files are written.
+    """
+
+    def __init__(self, store: BacklogStore, window: float = 0.005,
+                 on_prepare=None, on_commit=None):
+        self.store = store
+        self.window = window
+        self.on_prepare = on_prepare
+        self.on_commit = on_commit
+        self.commits = 0
+        self.writes = 0
+        self.last_commit: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._pending: Optional[asyncio.Future] = None
+        # The event loop only keeps weak references to tasks
+        self._flushes: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+
+    async def commit(self):
+        self.writes += 1
+        COMMITTED_WRITES.inc()
+        if self._pending is None:
+            self._pending = asyncio.get_running_loop().create_future()
+            task = asyncio.ensure_future(self._flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        await asyncio.shield(self._pending)
+
+    async def _flush(self):
+        async with self._lock:
+            await asyncio.sleep(self.window)
+            future, self._pending = self._pending, None
+            prepared = []
+            try:
+                prepared = self.store.prepare_commit()
+                changes = self.on_prepare() if self.on_prepare else None
+                await asyncio.to_thread(self.store.write_prepared, prepared)
+                self.commits += 1
+                self.last_commit, self.last_error = time.time(), None
+                COMMITS.inc()
+                if self.on_commit:
+                    self.on_commit(changes)
+                future.set_result(len(prepared))
+            except Exception as e:
+                # The changes are still in memory; keep their views dirty for the next commit
+                self.store.restore_dirty(prepared)
+                self.last_error = f"{type(e).__name__}: {e}"
+                COMMIT_FAILURES.inc()
+                future.set_exception(e)
+
+
+def _as_list(value) -> List[str]:
+    """Accept comma-separated strings or lists for filter values."""
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [str(v) for v in value]
+
+
+class BacklogService:
+    def __init__(self, base_path: str = ".", commit_window: float = 0.005):
+        self.base_path = Path(base_path)
+        self.started = time.time()
+
+        # Load data
+        self.store = BacklogStore(base_path)
+        self.index = StoryIndex(self.store.prioritization["backlog"])
+        self.ingestor = StoryIngestor(base_path, store=self.store)
+        self.committer = GroupCommitter(self.store, window=commit_window,
+                                        on_prepare=self._collect_changes,
+                                        on_commit=self._publish_changes)
+
+        # Push channel: stories touched since the last commit become deltas
+        self.events = DeltaLog()
+        self.differ = StoryDiffer(self.index.by_id.values())
+        self.broadcaster = Broadcaster(self.events)
+        self._touched: Dict[str, str] = {}
+
+        self.routes = [
+            ("GET", r"/api/v1", self.describe),
+            ("GET", r"/api/v1/stories", self.list_stories),
+            ("POST", r"/api/v1/stories", self.create_story),
+            ("POST", r"/api/v1/stories/bulk-transition", self.bulk_transition),
+            ("POST", r"/api/v1/stories/bulk-move", self.bulk_move),
+            ("GET", r"/api/v1/stories/(?P<story_id>[^/]+)", self.get_story),
+            ("PUT", r"/api/v1/stories/(?P<story_id>[^/]+)", self.update_story),
+            ("DELETE", r"/api/v1/stories/(?P<story_id>[^/]+)", self.delete_story),
+            ("POST", r"/api/v1/stories/(?P<story_id>[^/]+)/move", self.move_story),
+            ("POST", r"/api/v1/stories/(?P<story_id>[^/]+)/transition", self.transition_story),
+            ("POST", r"/api/v1/stories/(?P<story_id>[^/]+)/rollback", self.rollback_story),
+            ("GET", r"/api/v1/stories/(?P<story_id>[^/]+)/dependencies", self.story_dependencies),
+            ("GET", r"/api/v1/stats", self.stats),
+            ("GET", r"/api/v1/query", self.query),
+            ("POST", r"/api/v1/export/stories", self.export_stories),
+            ("POST", r"/api/v1/import/stories", self.import_stories),
+            ("GET", r"/api/v1/export/markdown/(?P<epic>[^/]+)", self.export_markdown),
+            ("GET", r"/metrics", self.metrics),
+            ("GET", r"/health", self.health),
+            ("GET", r"/health/detailed", self.health_detailed),
+        ]
+        # Metrics are labelled with the route template, not the raw path
+        self._compiled = [(method, re.compile(pattern + r"/?$"), handler,
+                           re.sub(r"\(\?P<(\w+)>[^)]*\)", r"{\1}", pattern))
+                          for method, pattern, handler in self.routes]
+
+    # ------------------------------------------------------------------ helpers
+
+    def _story(self, story_id: str) -> Dict[str, Any]:
+        story = self.index.by_id.get(story_id) or self.index.by_id.get(story_id.upper())
+        if story is None:
+            raise ApiError(404, f"Story not found: {story_id}")
+        return story
+
+    def _filter(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply list/stats/export filters; indexed filters and date ranges first, then priority checks."""
+        ids = self.index.select(status=_as_list(params.get("status")),
+                                epic=_as_list(params.get("epic")),
+                                owner=_as_list(params.get("owner")),
+                                label=_as_list(params.get("label")),
+                                text=params.get("q"))
+
+        # Date ranges bisect the index's sorted day columns before any story is touched
+        for field in ("created", "last_updated"):
+            after, before = params.get(f"{field}_after") or None, params.get(f"{field}_before") or None
+            if after is None and before is None:
+                continue
+            low, high = (None if value is None else day_number(value) for value in (after, before))
+            if (after is not None and low is None) or (before is not None and high is None):
+                raise ApiError(400, f"{field}_after/{field}_before must be dates (YYYY-MM-DD)")
+            ids = ids & self.index.range(field, low, high)
+        stories = [self.index.by_id[story_id] for story_id in ids]
+
+        try:
+            priority_min = int(params["priority_min"]) if params.get("priority_min") not in (None, "") else None
+            priority_max = int(params["priority_max"]) if params.get("priority_max") not in (None, "") else None
+        except ValueError:
+            raise ApiError(400, "priority_min/priority_max must be integers")
+        if priority_min is not None:
+            stories = [s for s in stories if s.get("priority", 99) >= priority_min]
+        if priority_max is not None:
+            stories = [s for s in stories if s.get("priority", 99) <= priority_max]
+        return stories
+
+    def _sort(self, stories: List[Dict[str, Any]], sort: Optional[str]) -> List[Dict[str, Any]]:
+        sort = sort or "priority"
+        reverse = sort.startswith("-")
+        field = sort.lstrip("-")
+        if field not in SORT_FIELDS:
+            raise ApiError(400, f"Cannot sort by '{field}'. Valid fields: {sorted(SORT_FIELDS)}")
+        if field == "priority":
+            key = lambda s: (s.get("priority", 99), s.get("id", ""))
+        else:
+            key = lambda s: (str(s.get(field) or ""), s.get("id", ""))
+        return sorted(stories, key=key, reverse=reverse)
+
+    def _changed(self, story: Dict[str, Any]):
+        story["last_updated"] = datetime.now().strftime("%Y-%m-%d")
+        self.index.update(story)
+        self.store.touch()
+        self._touched[story["id"]] = "upsert"
+
+    def _collect_changes(self) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+        """Diff the stories touched since the last commit (runs with the commit snapshot)."""
+        touched, self._touched = self._touched, {}
+        changes = []
+        for story_id, op in touched.items():
+            story = self.index.by_id.get(story_id)
+            if op == "delete" or story is None:
+                if self.differ.forget(story_id):
+                    changes.append((story_id, None, {"op": "delete"}))
+                continue
+            change = self.differ.diff(story)
+            if change:
+                changes.append((story_id, story.get("epic"), change))
+        return changes
+
+    def _publish_changes(self, changes):
+        deltas = [self.events.append(story_id, epic, change) for story_id, epic, change in changes or []]
+        if deltas:
+            self.broadcaster.publish(deltas)
+
+    def _unmet_dependencies(self, story: Dict[str, Any]) -> List[str]:
+        unmet = []
+        for dep in story.get("dependencies") or []:
+            dep_story = self.index.by_id.get(dep)
+            if dep_story is not None and dep_story.get("status") not in DONE_STATUSES:
+                unmet.append(dep)
+        return unmet
+
+    def _check_transition(self, story: Dict[str, Any], target: str, force: bool = False) -> List[str]:
+        current = story.get("status", "draft")
+        if target not in STATUS_TRANSITIONS:
+            return [f"Unknown status '{target}'. Valid statuses: {sorted(STATUS_TRANSITIONS)}"]
+        if current == target:
+            return [f"{story['id']} is already {target}"]
+        allowed = STATUS_TRANSITIONS.get(current, set(STATUS_TRANSITIONS))
+        if target not in allowed:
+            return [f"Cannot move {story['id']} from {current} to {target}. "
+                    f"Allowed: {sorted(allowed) or 'none'}"]
+        if target in DEPENDENCY_GATED and not force:
+            unmet = self._unmet_dependencies(story)
+            if unmet:
+                return [f"{story['id']} has unfinished dependencies: {', '.join(unmet)}"]
+        return []
+
+    def _apply_transition(self, story: Dict[str, Any], target: str, reason: str = "", note: str = ""):
+        entry = {"from": story.get("status", "draft"), "to": target,
+                 "at": datetime.now().isoformat(timespec="seconds")}
+        if reason:
+            entry["reason"] = reason
+        if note:
+            entry["note"] = note
+        story.setdefault("status_history", []).append(entry)
+        story["status"] = target
+        self._changed(story)
+
+    def _move_file(self, story: Dict[str, Any], epic: str):
+        """Move a story file into another epic directory and update both views."""
+        if epic not in self.ingestor.epic_dirs:
+            raise ApiError(422, f"Invalid epic '{epic}'. Valid epics: {list(self.ingestor.epic_dirs)}")
+        old_path = story.get("file_path")
+        source = self.base_path / old_path if old_path else None
+        if source is None or not source.exists():
+            raise ApiError(409, f"Story file for {story['id']} not found: {old_path}")
+
+        relative = Path("backlog") / self.ingestor.epic_dirs[epic] / source.name
+        target = self.base_path / relative
+        if target.exists() and target.resolve() != source.resolve():
+            raise ApiError(409, f"Target file already exists: {relative.as_posix()}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(source), str(target))
+
+        story["epic"] = epic
+        story["file_path"] = relative.as_posix()
+        self.store.remove(old_path)
+        # Keep the frontmatter epic in step so the sync service does not undo the move
+        self.ingestor.update_story_file(story, {"epic": epic})
+        self._changed(story)
+
+    def _create(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a story through the ingestion flow; raises ApiError on invalid input."""
+        story_data = dict(payload)
+        if story_data.get("id") and story_data["id"] in self.index.by_id:
+            raise ApiError(409, f"Story already exists: {story_data['id']}")
+        is_valid, errors = self.ingestor._validate_story(story_data)
+        if not is_valid:
+            raise ApiError(422, "Story validation failed", errors)
+
+        # Ingestion prints progress for the CLI; keep the server log readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            created = self.ingestor._process_single_story(story_data)
+        if not created:
+            raise ApiError(422, "Story could not be created")
+        # The store keeps its own Story built from story_data
+        story = self.store.priority_by_id.get(story_data["id"], story_data)
+        self.index.update(story)
+        self._touched[story["id"]] = "upsert"
+        return story
+
+    # ------------------------------------------------------------------ API-001
+
+    async def describe(self, request):
+        return 200, {"service": "backlog", "stories": len(self.index.by_id),
+                     "uptime_seconds": round(time.time() - self.started, 1),
+                     "commits": self.committer.commits, "writes": self.committer.writes,
+                     "events": {"seq": self.events.seq, "epoch": self.events.epoch,
+                                "subscribers": len(self.broadcaster.subscribers),
+                                "sent": self.broadcaster.sent, "dropped": self.broadcaster.dropped},
+                     "endpoints": [f"{method} {pattern}" for method, pattern, _ in self.routes]}
+
+    async def metrics(self, request):
+        # Point-in-time values are sampled at scrape time
+        STORIES.set(len(self.index.by_id))
+        SUBSCRIBERS.set(len(self.broadcaster.subscribers))
+        EVENT_SEQ.set(self.events.seq)
+        UPTIME.set(round(time.time() - self.started, 3))
+        return 200, (METRICS_CONTENT_TYPE, REGISTRY.render())
+
+    async def health(self, request):
+        """Liveness: cheap, never touches the disk."""
+        return 200, {"status": "ok", "stories": len(self.index.by_id),
+                     "uptime_seconds": round(time.time() - self.started, 1)}
+
+    async def health_detailed(self, request):
+        """Readiness: the JSON views are readable and the last commit succeeded."""
+        checks = {}
+        for name, path in (("prioritization", self.store.prioritization_file),
+                           ("complete", self.store.complete_file)):
+            try:
+                stat = path.stat()
+                checks[name] = {"ok": os.access(path, os.R_OK | os.W_OK),
+                                "bytes": stat.st_size, "modified": stat.st_mtime}
+            except OSError as e:
+                checks[name] = {"ok": name == "complete", "error": str(e)}
+        checks["commits"] = {"ok": self.committer.last_error is None,
+                             "count": self.committer.commits,
+                             "last_commit": self.committer.last_commit,
+                             "last_error": self.committer.last_error}
+        checks["events"] = {"ok": True, "seq": self.events.seq,
+                            "subscribers": len(self.broadcaster.subscribers),
+                            "dropped": self.broadcaster.dropped}
+        healthy = all(check["ok"] for check in checks.values())
+        return (200 if healthy else 503), {"status": "ok" if healthy else "degraded",
+                                           "uptime_seconds": round(time.time() - self.started, 1),
+                                           "stories": len(self.index.by_id), "checks": checks}
+
+    async def list_stories(self, request):
+        params = request["query"]
+        stories = self._sort(self._filter(params), params.get("sort"))
+        try:
+            limit = min(int(params.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+            offset = max(int(params.get("offset", 0)), 0)
+        except ValueError:
+            raise ApiError(400, "limit/offset must be integers")
+        return 200, {"total": len(stories), "limit": limit, "offset": offset,
+                     "stories": stories[offset:offset + limit]}
+
+    async def get_story(self, request, story_id):
+        return 200, self._story(story_id)
+
+    async def create_story(self, request):
+        story = self._create(request["json"])
+        await self.committer.commit()
+        return 201, story
+
+    async def update_story(self, request, story_id):
+        story = self._story(story_id)
+        payload = request["json"]
+        if "status" in payload:
+            raise ApiError(422, "Use POST /api/v1/stories/{id}/transition to change status")
+        unknown = set(payload) - EDITABLE_FIELDS - {"epic", "id"}
+        if unknown:
+            raise ApiError(422, f"Fields cannot be updated: {sorted(unknown)}",
+                           {"editable": sorted(EDITABLE_FIELDS | {"epic"})})
+        if payload.get("id", story["id"]) != story["id"]:
+            raise ApiError(422, "Story IDs cannot be changed")
+
+        updates = {field: payload[field] for field in EDITABLE_FIELDS if field in payload}
+        is_valid, errors = self.ingestor._validate_update(updates)
+        if not is_valid:
+            raise ApiError(422, "Story validation failed", errors)
+
+        if payload.get("epic") and payload["epic"] != story.get("epic"):
+            self._move_file(story, payload["epic"])
+        story.update(updates)
+        # Synced fields live in the story file too, or backlog_sync.py would revert them
+        self.ingestor.update_story_file(story, updates)
+        self._changed(story)
+        await self.committer.commit()
+        return 200, story
+
+    async def move_story(self, request, story_id):
+        story = self._story(story_id)
+        epic = request["json"].get("epic") or request["json"].get("backlog_id")
+        if not epic:
+            raise ApiError(422, "Missing required field: epic")
+        self._move_file(story, epic)
+        await self.committer.commit()
+        return 200, story
+
+    async def delete_story(self, request, story_id):
+        story = self._story(story_id)
+        force = request["query"].get("force") in ("1", "true", "yes")
+        if not force:
+            dependents = sorted(d for d in self.index.dependents.get(story["id"], set())
+                                if self.index.by_id.get(d, {}).get("status") not in DONE_STATUSES)
+            if dependents:
+                raise ApiError(409, f"{story['id']} is a dependency of unfinished stories",
+                               {"dependents": dependents})
+            if story.get("status") in ("active", "in-progress"):
+                raise ApiError(409, f"{story['id']} is {story['status']}; pass ?force=true to delete")
+
+        self.store.remove_prioritized(story["id"])
+        self.index.discard(story["id"])
+        self._touched[story["id"]] = "delete"
+        await self.committer.commit()
+        return 200, {"deleted": story["id"], "file_path": story.get("file_path"),
+                     "note": "Story file kept; only the prioritized entry was removed"}
+
+    # ------------------------------------------------------------------ API-002
+
+    async def transition_story(self, request, story_id):
+        story = self._story(story_id)
+        payload = request["json"]
+        target = payload.get("to") or payload.get("status")
+        if not target:
+            raise ApiError(422, "Missing required field: to")
+        errors = self._check_transition(story, target, force=bool(payload.get("force")))
+        if errors:
+            raise ApiError(422, errors[0], {"allowed": sorted(STATUS_TRANSITIONS.get(story.get("status"), []))})
+
+        previous = story.get("status")
+        self._apply_transition(story, target, payload.get("reason", ""), payload.get("note", ""))
+        await self.committer.commit()
+        return 200, {"id": story["id"], "from": previous, "to": target, "story": story}
+
+    async def bulk_transition(self, request):
+        payload = request["json"]
+        ids, target = _as_list(payload.get("ids")), payload.get("to") or payload.get("status")
+        if not ids or not target:
+            raise ApiError(422, "Missing required fields: ids, to")
+
+        # Validate everything first so a bulk change is all-or-nothing
+        errors = {}
+        stories = []
+        for story_id in ids:
+            try:
+                story = self._story(story_id)
+            except ApiError as e:
+                errors[story_id] = [e.message]
+                continue
+            problems = self._check_transition(story, target, force=bool(payload.get("force")))
+            if problems:
+                errors[story_id] = problems
+            stories.append(story)
+        if errors:
+            raise ApiError(422, "Bulk transition rejected; no stories were changed", errors)
+
+        for story in stories:
+            self._apply_transition(story, target, payload.get("reason", ""), payload.get("note", ""))
+        await self.committer.commit()
+        return 200, {"to": target, "updated": [s["id"] for s in stories]}
+
+    async def rollback_story(self, request, story_id):
+        story = self._story(story_id)
+        history = [h for h in story.get("status_history", []) if not h.get("rolled_back")]
+        if not history or history[-1]["to"] != story.get("status"):
+            raise ApiError(409, f"No status change to roll back for {story['id']}")
+
+        last = history[-1]
+        last["rolled_back"] = datetime.now().isoformat(timespec="seconds")
+        story["status"] = last["from"]
+        self._changed(story)
+        await self.committer.commit()
+        return 200, {"id": story["id"], "status": story["status"], "rolled_back": last}
+
+    async def story_dependencies(self, request, story_id):
+        story = self._story(story_id)
+        blocked_by = []
+        for dep in story.get("dependencies") or []:
+            dep_story = self.index.by_id.get(dep)
+            blocked_by.append({"id": dep, "status": dep_story.get("status") if dep_story else None,
+                               "known": dep_story is not None})
+        blocking = [{"id": d, "status": self.index.by_id[d].get("status")}
+                    for d in sorted(self.index.dependents.get(story["id"], set()))
+                    if d in self.index.by_id]
+        return 200, {"id": story["id"], "blocked_by": blocked_by, "blocking": blocking,
+                     "unmet": self._unmet_dependencies(story)}
+
+    # ------------------------------------------------------------------ API-003
+
+    async def stats(self, request):
+        params = request["query"]
+        group_by = params.get("group_by", "status")
+        stories = self._filter(params)
+        counts: Dict[str, int] = {}
+        for story in stories:
+            if group_by == "label":
+                keys = story.get("labels") or ["(none)"]
+            elif group_by in ("status", "epic", "owner", "priority", "estimate"):
+                keys = [story.get(group_by)]
+            else:
+                raise ApiError(400, f"Cannot group by '{group_by}'")
+            for key in keys:
+                key = "(none)" if key in (None, "") else str(key)
+                counts[key] = counts.get(key, 0) + 1
+        return 200, {"group_by": group_by, "total": len(stories),
+                     "counts": dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))}
+
+    async def query(self, request):
+        params = request["query"]
+        try:
+            query = BacklogQuery(self.index, params.get("q", ""))
+        except QueryError as e:
+            raise ApiError(400, f"Invalid query: {e}")
+        result = query.run()
+        if params.get("explain") in ("1", "true", "yes"):
+            result["plan"] = query.explain().splitlines()
+        return 200, result
+
+    # ------------------------------------------------------------------ API-004
+
+    async def export_stories(self, request):
+        params = {**request["query"], **request["json"]}
+        stories = self._sort(self._filter(params), params.get("sort"))
+        fmt = params.get("format", "json")
+        if fmt in STREAM_FORMATS:
+            # Encoded lazily and sent with chunked transfer encoding
+            return 200, (STREAM_FORMATS[fmt], encode_stories(stories, fmt))
+        return 200, {"total": len(stories), "stories": stories}
+
+    def _importer(self, params: Dict[str, Any]) -> StreamingImporter:
+        on_conflict = params.get("on_conflict", "skip")
+        if on_conflict not in CONFLICT_MODES:
+            raise ApiError(422, "on_conflict must be skip, overwrite or merge")
+        preview = str(params.get("preview", "")).lower() in ("1", "true", "yes")
+        return StreamingImporter(self.base_path, store=self.store, ingestor=self.ingestor,
+                                 on_conflict=on_conflict, preview=preview)
+
+    def _import_record(self, importer: StreamingImporter, row: int,
+                       record: Dict[str, Any]) -> Dict[str, Any]:
+        result, story, details = importer.apply(record)
+        entry = {"row": row, "id": story["id"] if story else record.get("id"), "result": result}
+        if result == "error":
+            entry["errors"] = details
+        elif result == "updated":
+            entry["fields"] = details
+            if not importer.preview:
+                self._changed(story)
+        elif result == "created":
+            self.index.update(story)
+            self._touched[story["id"]] = "upsert"
+        return entry
+
+    async def import_stories(self, request):
+        """JSON import; NDJSON and CSV bodies are streamed by ``stream_import``."""
+        params = {**request["query"], **request["json"]}
+        importer = self._importer(params)
+        stories = request["json"].get("stories")
+        if not isinstance(stories, list):
+            raise ApiError(422, "Body must contain a 'stories' list (or send NDJSON/CSV)")
+
+        results = [self._import_record(importer, number, dict(row)) if isinstance(row, dict)
+                   else {"row": number, "id": None, "result": "error", "errors": ["Expected an object"]}
+                   for number, row in enumerate(stories, 1)]
+        if not importer.preview:
+            await self.committer.commit()
+        summary: Dict[str, int] = {}
+        for result in results:
+            summary[result["result"]] = summary.get(result["result"], 0) + 1
+        return 200, {"preview": importer.preview, "on_conflict": importer.on_conflict,
+                     "summary": summary, "results": results}
+
+    @staticmethod
+    async def _body_chunks(reader: asyncio.StreamReader, headers: Dict[str, str]):
+        """Yield a request body piece by piece (Content-Length or chunked)."""
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    return
+                yield await reader.readexactly(size)
+                await reader.readexactly(2)
+        remaining = int(headers.get("content-length") or 0)
+        while remaining:
+            data = await reader.read(min(remaining, 64 * 1024))
+            if not data:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(data)
+            yield data
+
+    async def stream_import(self, query, headers, reader, writer):
+        """NDJSON/CSV import of any size: records are applied as they arrive and
+        committed every chunk, so neither the body nor the results are held in full."""
+        fmt = "csv" if "csv" in headers.get("content-type", "") else "ndjson"
+        started = time.perf_counter()
+        try:
+            importer = self._importer(query)
+            chunk_size = max(1, int(query.get("chunk_size") or DEFAULT_CHUNK_SIZE))
+        except (ApiError, ValueError) as e:
+            status, result = (e.status, {"error": e.message}) if isinstance(e, ApiError) \
+                else (422, {"error": f"Invalid chunk_size: {e}"})
+        else:
+            decoder = RecordDecoder(fmt)
+            errors: List[Dict[str, Any]] = []
+            rows = commits = pending = 0
+
+            def apply(decoded):
+                nonlocal rows, pending
+                for row, _, record, error in decoded:
+                    rows, pending = row, pending + 1
+                    if error:
+                        importer._count("error")
+                        entry = {"row": row, "id": None, "result": "error", "errors": [error]}
+                    else:
+                        entry = self._import_record(importer, row, record)
+                    if entry["result"] == "error" and len(errors) < MAX_IMPORT_ERRORS:
+                        errors.append(entry)
+
+            async for data in self._body_chunks(reader, headers):
+                apply(decoder.feed(data))
+                if not importer.preview and pending >= importer.chunk_limit(chunk_size):
+                    await self.committer.commit()
+                    commits, pending = commits + 1, 0
+            apply(decoder.close())
+            if not importer.preview and pending:
+                await self.committer.commit()
+                commits += 1
+            status, result = 200, {"preview": importer.preview, "on_conflict": importer.on_conflict,
+                                   "format": fmt, "rows": rows, "commits": commits,
+                                   "summary": importer.counts, "errors": errors,
+                                   "errors_truncated": importer.counts.get("error", 0) > len(errors)}
+
+        payload = json.dumps(result, ensure_ascii=False, default=json_default).encode("utf-8")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        HTTP_REQUESTS.inc(method="POST", route="/api/v1/import/stories", status=status)
+        HTTP_SECONDS.observe(elapsed_ms / 1000, route="/api/v1/import/stories")
+        # The body may not have been read to the end, so the connection is not reused
+        writer.write((f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'OK')}\r\n"
+                      f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                      f"X-Query-Time-Ms: {elapsed_ms:.3f}\r\nConnection: close\r\n\r\n").encode("latin-1")
+                     + payload)
+        await writer.drain()
+
+    async def export_markdown(self, request, epic):
+        files = []
+        for story_id in sorted(self.index.select(epic=[epic])):
+            path = self.base_path / self.index.by_id[story_id].get("file_path", "")
+            if path.is_file():
+                files.append({"id": story_id, "path": self.index.by_id[story_id]["file_path"],
+                              "content": path.read_text(encoding="utf-8")})
+        if not files:
+            raise ApiError(404, f"No story files for epic '{epic}'")
+        return 200, {"epic": epic, "files": files}
+
+    async def bulk_move(self, request):
+        payload = request["json"]
+        ids, epic = _as_list(payload.get("ids")), payload.get("epic") or payload.get("backlog_id")
+        if not ids or not epic:
+            raise ApiError(422, "Missing required fields: ids, epic")
+        stories = [self._story(story_id) for story_id in ids]
+        moved, errors = [], {}
+        for story in stories:
+            if story.get("epic") == epic:
+                continue
+            try:
+                self._move_file(story, epic)
+                moved.append(story["id"])
+            except ApiError as e:
+                errors[story["id"]] = e.message
+        await self.committer.commit()
+        return 200, {"epic": epic, "moved": moved, "errors": errors}
+
+    # ------------------------------------------------------------------ events
+
+    def _subscriber(self, kind: str, writer, query: Dict[str, str]) -> Subscriber:
+        epics = {e.lower() for e in _as_list(query.get("epic"))}
+        ids = set(_as_list(query.get("id")))
+        return Subscriber(writer, kind, epics, ids)
+
+    @staticmethod
+    def _resume_point(query: Dict[str, str], headers: Dict[str, str]) -> Tuple[Optional[int], Optional[int]]:
+        """(since, epoch) to resume from; None for a fresh subscription.
+
+        Last-Event-ID wins over ?since: an EventSource keeps its original URL
+        on every reconnect, but sends the id of the last event it received.
+        """
+        last_event_id = headers.get("last-event-id")
+        try:
+            if last_event_id:
+                return parse_event_id(last_event_id)
+            if query.get("since"):
+                since, epoch = parse_event_id(query["since"])
+                if epoch is None and query.get("epoch"):
+                    epoch = int(query["epoch"])
+                return since, epoch
+        except ValueError:
+            pass
+        return None, None
+
+    async def stream_events(self, query, headers, reader, writer):
+        """Server-Sent Events: replay from ?since / Last-Event-ID, then live deltas."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n")
+        subscriber = self._subscriber("sse", writer, query)
+        self.broadcaster.hello(subscriber, *self._resume_point(query, headers))
+        try:
+            # Nothing is expected from the client; wait for it to hang up
+            while await reader.read(1024):
+                pass
+        finally:
+            self.broadcaster.remove(subscriber)
+
+    async def stream_websocket(self, query, headers, reader, writer):
+        key = headers.get("sec-websocket-key")
+        if "websocket" not in headers.get("upgrade", "").lower() or not key:
+            body = b'{"error": "Expected a WebSocket upgrade"}'
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Type: application/json\r\n"
+                         + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+            return
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {websocket_accept(key)}\r\n\r\n").encode("latin-1"))
+        subscriber = self._subscriber("ws", writer, query)
+        self.broadcaster.hello(subscriber, *self._resume_point(query, headers))
+        try:
+            while True:
+                opcode, payload = await read_websocket_frame(reader)
+                if opcode == WS_CLOSE:
+                    writer.write(websocket_frame(payload[:2], WS_CLOSE))
+                    break
+                if opcode == WS_PING:
+                    writer.write(websocket_frame(payload, WS_PONG))
+        finally:
+            self.broadcaster.remove(subscriber)
+
+    async def _heartbeat(self, interval: float = 15.0):
+        while True:
+            await asyncio.sleep(interval)
+            self.broadcaster.heartbeat()
+
+    # ------------------------------------------------------------------ HTTP
+
+    async def dispatch(self, method: str, target: str, headers: Dict[str, str],
+                       body: bytes) -> Tuple[int, str, bytes]:
+        url = urlsplit(target)
+        path = unquote(url.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        started = time.perf_counter()
+
+        handler, kwargs, path_matched, route = None, {}, False, "unmatched"
+        for route_method, pattern, route_handler, template in self._compiled:
+            match = pattern.match(path)
+            if match:
+                path_matched = True
+                if route_method == method:
+                    handler, kwargs, route = route_handler, match.groupdict(), template
+                    break
+
+        try:
+            if handler is None:
+                raise ApiError(405 if path_matched else 404,
+                               f"{'Method not allowed' if path_matched else 'Not found'}: {method} {path}")
+            payload: Any = {}
+            if body and "csv" not in headers.get("content-type", ""):
+                try:
+                    payload = json.loads(body)
+                except json.JSONDecodeError as e:
+                    raise ApiError(400, f"Invalid JSON body: {e}")
+            request = {"method": method, "path": path, "query": query, "headers": headers,
+                       "body": body, "json": payload if isinstance(payload, dict) else {}}
+            status, result = await handler(request, **kwargs)
+        except ApiError as e:
+            status, result = e.status, {"error": e.message}
+            if e.details is not None:
+                result["details"] = e.details
+        except Exception as e:
+            status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+        HTTP_REQUESTS.inc(method=method, route=route, status=status)
+        HTTP_SECONDS.observe(time.perf_counter() - started, route=route)
+
+        if isinstance(result, tuple):
+            content_type, content = result
+            # Iterators of bytes are streamed by handle_connection
+            return status, content_type, content.encode("utf-8") if isinstance(content, str) else content
+        return status, "application/json", json.dumps(result, ensure_ascii=False,
+                                                      default=json_default).encode("utf-8")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """HTTP/1.1 with keep-alive, so clients can reuse one connection for many requests."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                stream = {"/api/v1/events": self.stream_events,
+                          "/api/v1/ws": self.stream_websocket}.get(urlsplit(target).path.rstrip("/"))
+                if stream is not None and method == "GET":
+                    # The stream owns the connection from here on
+                    query = {key: values[-1] for key, values in parse_qs(urlsplit(target).query).items()}
+                    await stream(query, headers, reader, writer)
+                    break
+                content_type = headers.get("content-type", "")
+                if (method == "POST" and urlsplit(target).path.rstrip("/") == "/api/v1/import/stories"
+                        and ("csv" in content_type or "ndjson" in content_type)):
+                    query = {key: values[-1] for key, values in parse_qs(urlsplit(target).query).items()}
+                    await self.stream_import(query, headers, reader, writer)
+                    break
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    status, content_type, payload = 413, "application/json", b'{"error": "Body too large"}'
+                    body = b""
+                    elapsed_ms = 0.0
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    started = time.perf_counter()
+                    status, content_type, payload = await self.dispatch(method, target, headers, body)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                              and length <= MAX_BODY_BYTES)
+                streamed = not isinstance(payload, bytes)
+                head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'OK')}\r\n"
+                        f"Content-Type: {content_type}\r\n"
+                        + ("Transfer-Encoding: chunked\r\n" if streamed else f"Content-Length: {len(payload)}\r\n")
+                        + f"X-Query-Time-Ms: {elapsed_ms:.3f}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+                if streamed:
+                    writer.write(head.encode("latin-1"))
+                    await self._write_chunked(writer, payload)
+                else:
+                    writer.write(head.encode("latin-1") + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write_chunked(writer: asyncio.StreamWriter, pieces, flush_size: int = 64 * 1024):
+        """Send an iterator of bytes as HTTP chunks of about ``flush_size``."""
+        buffer: List[bytes] = []
+        buffered = 0
+        for piece in pieces:
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= flush_size:
+                writer.write(b"%x\r\n" % buffered + b"".join(buffer) + b"\r\n")
+                await writer.drain()
+                buffer, buffered = [], 0
+        if buffered:
+            writer.write(b"%x\r\n" % buffered + b"".join(buffer) + b"\r\n")
+        writer.write(b"0\r\n\r\n")
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        address = server.sockets[0].getsockname()
+        print(f"🚀 Backlog service on http://{address[0]}:{address[1]}/api/v1 "
+              f"({len(self.index.by_id)} stories indexed)")
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            heartbeat.cancel()
+
+
+HTTP_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+                422: "Unprocessable Entity", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Persistent HTTP API for the backlog",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Serve the API on the default port
+  python scripts/backlog_service.py
+
+  # Query it
+  curl 'http://127.0.0.1:8765/api/v1/stories?status=backlog&epic=core&sort=priority'
+  curl -X POST http://127.0.0.1:8765/api/v1/stories/LLM-005/transition -d '{"to": "active"}'
+        """
+    )
+
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                       help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765,
+                       help="Port to listen on (default: 8765)")
+    parser.add_argument("--commit-window", type=float, default=5.0,
+                       help="Milliseconds to gather writes into one commit (default: 5)")
+
+    args = parser.parse_args()
+
+    if not Path("backlog/PRIORITIZATION.json").exists():
+        print("❌ backlog/PRIORITIZATION.json not found. Run from the repository root.")
+        sys.exit(1)
+
+    service = BacklogService(commit_window=args.commit_window / 1000)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 Backlog service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+"""
+Backlog Store
+
+In-memory view of the backlog's two JSON files:
+
+- backlog/COMPLETE_BACKLOG.json  - one entry per story file, keyed by file path
+- backlog/PRIORITIZATION.json    - the curated, prioritized list, keyed by story ID
+
+Changes are applied as deltas (``upsert`` / ``remove`` of a single story)
+and written with ``commit``, which only rewrites the views that actually
+changed and replaces each file atomically, so readers never see a half
+written JSON file. Tools that used to regenerate everything
+(generate_complete_backlog.py followed by update_prioritization_paths.py)
+can instead apply just the stories that changed.
+
+Stories are held as slotted ``story_model.Story`` objects rather than the
+parsed dicts; they behave like the dicts and serialize back to the same JSON.
+"""
+
+import gc
+import hashlib
+import json
+import marshal
+import os
+import re
+import struct
+import sys
+import tempfile
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+from datetime import datetime
+
+from metrics import CACHE_HITS, CACHE_MISSES, SAVE_SECONDS, record_read, record_write
+from story_dates import day_number
+from story_model import json_default, parse_view, story_view, to_story
+from tracing import span
+
+# Fields copied from a story file into its PRIORITIZATION.json entry.
+# Priority and status stay owned by PRIORITIZATION.json (update_story.py,
+# manage_priorities.py); frontmatter status is often stale.
+SYNCED_FIELDS = ["title", "branch_name", "file_path", "estimate", "epic",
+                 "dependencies", "labels", "last_updated"]
+# Dates the extractor fills with today when the frontmatter has none
+DEFAULTED_DATES = ["created", "last_updated"]
+
+# A top-level key in YAML frontmatter
+FRONTMATTER_KEY = re.compile(r"^([A-Za-z_][\w-]*)\s*:")
+
+
+# Parsed views are also kept as a marshal snapshot beside each JSON file
+# (backlog/.PRIORITIZATION.json.snapshot), which loads several times faster
+# than the indented JSON. The header records the source's mtime, size and
+# SHA-1; marshal's format can change between Python versions, so the
+# interpreter's cache tag is recorded too.
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAGIC = b"BKLGSNAP"
+SNAPSHOT_HEADER = struct.Struct("<8sIqq20s16s")
+_CACHE_TAG = (sys.implementation.cache_tag or "").encode("ascii")[:16]
+
+# Views parsed ahead of time by backlog_daemon.py, keyed by real path. The
+# daemon forks once per command, so each command gets its own copy-on-write
+# copy of these objects and can mutate them freely.
+_WARM_VIEWS: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def file_signature(path) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def snapshot_path(path) -> Path:
+    path = Path(path)
+    return path.with_name(f".{path.name}.snapshot")
+
+
+@contextmanager
+def _gc_paused():
+    """Hold off the cyclic GC while building a view.
+
+    Views are trees of dicts and lists with no cycles, so collections during
+    the parse only cost time (about a third of a large load).
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _read_snapshot(path) -> Optional[Tuple[Tuple[int, int], Any]]:
+    """Return the signature and data from ``path``'s snapshot if it matches the source."""
+    snapshot = snapshot_path(path)
+    try:
+        f = open(snapshot, 'rb')
+    except OSError:
+        return None
+    with f:
+        header = f.read(SNAPSHOT_HEADER.size)
+        if len(header) != SNAPSHOT_HEADER.size:
+            return None
+        magic, version, mtime_ns, size, digest, tag = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or tag.rstrip(b"\0") != _CACHE_TAG:
+            return None
+        st = os.stat(path)
+        if st.st_size != size:
+            return None
+        if st.st_mtime_ns != mtime_ns:
+            # Touched or checked out again: still valid if the content is unchanged
+            with open(path, 'rb') as src:
+                if hashlib.sha1(src.read()).digest() != digest:
+                    return None
+            try:
+                with open(snapshot, 'r+b') as out:
+                    out.write(SNAPSHOT_HEADER.pack(magic, version, st.st_mtime_ns, size, digest, tag))
+            except OSError:
+                pass
+        # marshal.load on a file reads object by object; one read is much faster
+        payload = f.read()
+        try:
+            with _gc_paused():
+                data = marshal.loads(payload)
+        except (EOFError, ValueError, TypeError):
+            return None
+        record_read("snapshot", SNAPSHOT_HEADER.size + len(payload))
+    return (st.st_mtime_ns, st.st_size), data
+
+
+def _write_snapshot(path, data: Any, raw: bytes, st: os.stat_result):
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, st.st_mtime_ns, st.st_size,
+                                  hashlib.sha1(raw).digest(), _CACHE_TAG)
+    try:
+        _write_bytes_atomic(snapshot_path(path), header + marshal.dumps(data))
+    except (OSError, ValueError):
+        # A read-only checkout or an unmarshallable value just means no snapshot
+        pass
+
+
+def _read_view(path) -> Tuple[Tuple[int, int], Any]:
+    """Return a view's file signature and content, from its snapshot when that is fresh."""
+    use_snapshot = not os.environ.get("BACKLOG_NO_SNAPSHOT")
+    if use_snapshot:
+        cached = _read_snapshot(path)
+        if cached is not None:
+            CACHE_HITS.inc(cache="snapshot")
+            return cached
+        CACHE_MISSES.inc(cache="snapshot")
+    with open(path, 'rb') as f:
+        raw = f.read()
+        st = os.fstat(f.fileno())
+    record_read("view", len(raw))
+    with _gc_paused():
+        data = json.loads(raw)
+    if use_snapshot:
+        _write_snapshot(path, data, raw, st)
+    return (st.st_mtime_ns, st.st_size), data
+
+
+def _take_warm_view(path) -> Optional[Any]:
+    """The daemon's pre-parsed copy of ``path`` if it is still current (handed out once)."""
+    warm = _WARM_VIEWS.pop(os.path.realpath(path), None)
+    if warm is not None and warm[0] == file_signature(path):
+        CACHE_HITS.inc(cache="warm_view")
+        return warm[1]
+    return None
+
+
+def load_view(path) -> Any:
+    """Load a JSON view: the daemon's pre-parsed copy, the snapshot, or the file itself.
+
+    A warm copy is handed out once; a second load in the same process reads
+    the view again, since the first caller may have modified its copy.
+    """
+    warm = _take_warm_view(path)
+    if warm is not None:
+        return warm
+    return _read_view(path)[1]
+
+
+def load_story_view(path) -> Dict[str, Any]:
+    """Load a JSON view with its stories as ``story_model.Story`` objects.
+
+    Takes the daemon's warm copy or a fresh snapshot like ``load_view`` and
+    converts its entries. Without either it parses the JSON straight into
+    Stories, so the per-story dicts never all exist at once; that path leaves
+    writing the snapshot to the next ``load_view``.
+    """
+    data = _take_warm_view(path)
+    if data is None and not os.environ.get("BACKLOG_NO_SNAPSHOT"):
+        cached = _read_snapshot(path)
+        if cached is not None:
+            CACHE_HITS.inc(cache="snapshot")
+            data = cached[1]
+        else:
+            CACHE_MISSES.inc(cache="snapshot")
+    if data is not None:
+        with _gc_paused():
+            return story_view(data)
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    record_read("view", len(raw))
+    with _gc_paused():
+        return parse_view(raw)
+
+
+def warm_view(path) -> bool:
+    """Keep a parsed copy of ``path`` for ``load_view``; returns True if it was (re)loaded."""
+    key = os.path.realpath(path)
+    try:
+        signature = file_signature(key)
+    except FileNotFoundError:
+        _WARM_VIEWS.pop(key, None)
+        return False
+    warm = _WARM_VIEWS.get(key)
+    if warm is not None and warm[0] == signature:
+        return False
+    loaded_signature, data = _read_view(key)
+    if file_signature(key) != loaded_signature:
+        # Rewritten while we were loading; leave it cold rather than pair
+        # the data with the wrong signature
+        _WARM_VIEWS.pop(key, None)
+        return False
+    _WARM_VIEWS[key] = (loaded_signature, data)
+    return True
+
+
+def _write_bytes_atomic(path: Path, data: bytes):
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def set_frontmatter_fields(path: Path, fields: Dict[str, Any]):
+    """Set top-level keys in a story file's YAML frontmatter, keeping the rest as written.
+
+    Values are dumped the way ingest_stories.py writes new stories. A key's
+    old value, including an indented or ``- item`` block under it, is
+    replaced in place; new keys go at the end, and a file without frontmatter
+    gets one. Line endings are kept.
+    """
+    import yaml
+
+    def dump(key: str, value: Any) -> List[str]:
+        return yaml.safe_dump({key: value}, default_flow_style=False, allow_unicode=True).rstrip("\n").split("\n")
+
+    raw = path.read_bytes().decode("utf-8")
+    newline = "\r\n" if "\r\n" in raw else "\n"
+    text = raw.replace("\r\n", "\n")
+    if text.startswith("---\n"):
+        # Same boundary as generate_complete_backlog.extract_story_from_file
+        end = text.find("\n---\n", 4)
+        if end == -1:
+            raise ValueError(f"Unterminated frontmatter in {path}")
+        header, body = text[4:end].split("\n"), text[end:]
+    else:
+        header, body = [], "\n---\n" + text
+
+    pending = dict(fields)
+    lines: List[str] = []
+    replacing = False
+    for line in header:
+        if replacing and (line[:1] in (" ", "\t", "-")):
+            continue
+        replacing = False
+        match = FRONTMATTER_KEY.match(line)
+        if match and match.group(1) in pending:
+            key = match.group(1)
+            lines.extend(dump(key, pending.pop(key)))
+            replacing = True
+            continue
+        lines.append(line)
+    for key, value in pending.items():
+        lines.extend(dump(key, value))
+
+    content = "---\n" + "\n".join(lines) + body
+    _write_bytes_atomic(path, content.replace("\n", newline).encode("utf-8"))
+
+
+def _write_text_atomic(path: Path, text: str) -> Tuple[int, int]:
+    """Replace ``path`` with ``text``; returns the new file's signature."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            # Taken from the file we wrote, so a writer that replaces it after the rename still counts as a change
+            st = os.fstat(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return st.st_mtime_ns, st.st_size
+
+
+class BacklogStore:
+    def __init__(self, base_path: str = "."):
+        self.base_path = Path(base_path)
+        self.backlog_path = self.base_path / "backlog"
+        self.complete_file = self.backlog_path / "COMPLETE_BACKLOG.json"
+        self.prioritization_file = self.backlog_path / "PRIORITIZATION.json"
+        self.dirty = {"complete": False, "prioritization": False}
+        # Each view's file_signature when last loaded or written (None if missing); see reload_changed
+        self.signatures: Dict[Path, Optional[Tuple[int, int]]] = {}
+
+        # Load data
+        self.complete = self._load(self.complete_file)
+        self.prioritization = self._load(self.prioritization_file)
+        self._index()
+
+    def _load(self, path: Path) -> Dict[str, Any]:
+        # Taken before reading, so a write during the load shows up as a change next time
+        self.signatures[path] = self._signature(path)
+        try:
+            with span(f"load.{self._view_name(path)}"):
+                return load_story_view(path)
+        except FileNotFoundError:
+            return {"metadata": {}, "backlog": []}
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            return file_signature(path)
+        except FileNotFoundError:
+            return None
+
+    def _view_name(self, path: Path) -> str:
+        return "complete" if path == self.complete_file else "prioritization"
+
+    def _index(self):
+        self.by_path: Dict[str, Dict[str, Any]] = {s["file_path"]: s for s in self.complete["backlog"]
+                                                   if s.get("file_path")}
+        self.priority_by_path = {s["file_path"]: s for s in self.prioritization["backlog"]
+                                 if s.get("file_path")}
+        self.priority_by_id = {s["id"]: s for s in self.prioritization["backlog"] if s.get("id")}
+
+    def reload(self):
+        """Re-read both JSON files, discarding uncommitted changes."""
+        self.complete = self._load(self.complete_file)
+        self.prioritization = self._load(self.prioritization_file)
+        self.dirty = {"complete": False, "prioritization": False}
+        self._index()
+
+    def reload_changed(self) -> List[str]:
+        """Re-read the views whose files changed since this store loaded or wrote them.
+
+        Returns the names of the views reloaded. Like ``reload``, it discards
+        their uncommitted changes; views left alone keep theirs.
+        """
+        changed = [path for path in (self.complete_file, self.prioritization_file)
+                   if self._signature(path) != self.signatures.get(path)]
+        for path in changed:
+            view = self._view_name(path)
+            setattr(self, view, self._load(path))
+            self.dirty[view] = False
+        if changed:
+            self._index()
+        return [self._view_name(path) for path in changed]
+
+    @property
+    def stories(self) -> List[Dict[str, Any]]:
+        return self.complete["backlog"]
+
+    def get(self, story_id: str) -> Optional[Dict[str, Any]]:
+        """Return the prioritized entry for an ID, or the first story file with it."""
+        story = self.priority_by_id.get(story_id)
+        if story is not None:
+            return story
+        return next((s for s in self.complete["backlog"] if s.get("id") == story_id), None)
+
+    def upsert(self, story: Dict[str, Any], explicit: Optional[Set[str]] = None,
+               sync_edits: bool = True) -> bool:
+        """Apply one extracted story file to both views; returns True if anything changed.
+
+        ``explicit`` names the fields the file's frontmatter set (see
+        generate_complete_backlog.parse_story_file); None means all of them.
+        Besides file_path, PRIORITIZATION.json only takes explicit
+        SYNCED_FIELDS whose value changed since the file was last applied,
+        so inferred titles, defaults such as "TBD" and stale frontmatter
+        never replace curated values, and a pass over unchanged files is a
+        no-op; ``sync_edits=False`` copies file_path alone. Defaulted dates
+        keep the ones already recorded.
+        """
+        path = story["file_path"]
+        changed = False
+        if explicit is None:
+            explicit = set(story)
+
+        existing = self.by_path.get(path)
+        edited: Set[str] = set()
+        if existing is not None and sync_edits:
+            edited = {field for field in explicit if existing.get(field) != story.get(field)}
+            kept = {field: existing[field] for field in DEFAULTED_DATES
+                    if field not in explicit and field in existing}
+            if kept:
+                story = {**story, **kept}
+        if existing is None:
+            story = to_story(story)
+            self.complete["backlog"].append(story)
+            self.by_path[path] = story
+            changed = True
+        elif existing != story:
+            existing.clear()
+            existing.update(story)
+            changed = True
+        self.dirty["complete"] |= changed
+
+        # Match the prioritized entry by path first (IDs are not unique across
+        # files), then by ID so renamed files keep their priority
+        entry = self.priority_by_path.get(path)
+        if entry is None:
+            entry = self.priority_by_id.get(story.get("id"))
+            # Only a rename moves the entry; another live file with the same ID does not
+            if entry is not None and entry.get("file_path") and \
+                    (self.base_path / entry["file_path"]).is_file():
+                entry = None
+        if entry is not None:
+            synced = edited | {"file_path"}
+            updates = {field: story[field] for field in SYNCED_FIELDS
+                       if field in synced and field in story and entry.get(field) != story[field]}
+            if updates:
+                old_path = entry.get("file_path")
+                entry.update(updates)
+                if old_path != entry["file_path"]:
+                    self.priority_by_path.pop(old_path, None)
+                    self.priority_by_path[entry["file_path"]] = entry
+                self.dirty["prioritization"] = True
+                changed = True
+        return changed
+
+    def add_prioritized(self, story: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a new story to PRIORITIZATION.json (used by ingestion); returns the stored entry."""
+        story = to_story(story)
+        self.prioritization["backlog"].append(story)
+        if story.get("file_path"):
+            self.priority_by_path[story["file_path"]] = story
+        if story.get("id"):
+            self.priority_by_id[story["id"]] = story
+        self.dirty["prioritization"] = True
+        return story
+
+    def remove(self, file_path: str) -> bool:
+        """Drop a deleted story file from COMPLETE_BACKLOG.json.
+
+        The prioritized entry is kept: a rename arrives as remove + upsert
+        and the upsert re-points it to the new file by ID.
+        """
+        story = self.by_path.pop(file_path, None)
+        if story is None:
+            return False
+        self.complete["backlog"] = [s for s in self.complete["backlog"] if s is not story]
+        self.dirty["complete"] = True
+        return True
+
+    def replace_all(self, stories: List[Tuple[Dict[str, Any], Set[str]]]):
+        """Replace COMPLETE_BACKLOG.json with a full scan and resync prioritization.
+
+        ``stories`` holds (story, explicit fields) pairs as returned by
+        generate_complete_backlog.parse_story_file. Like the
+        update_prioritization_paths.py step it replaces, a full scan only
+        re-points file_path in PRIORITIZATION.json: with no record of when
+        a file changed, a difference from COMPLETE_BACKLOG.json may just be
+        stale frontmatter.
+        """
+        scanned = {story["file_path"] for story, _ in stories}
+        for path in [p for p in self.by_path if p not in scanned]:
+            self.remove(path)
+        for story, explicit in stories:
+            self.upsert(story, explicit, sync_edits=False)
+
+    def remove_prioritized(self, story_id: str) -> Optional[Dict[str, Any]]:
+        """Drop a story from PRIORITIZATION.json; its markdown file is left alone."""
+        entry = self.priority_by_id.pop(story_id, None)
+        if entry is None:
+            return None
+        self.prioritization["backlog"] = [s for s in self.prioritization["backlog"] if s is not entry]
+        if self.priority_by_path.get(entry.get("file_path")) is entry:
+            del self.priority_by_path[entry["file_path"]]
+        self.dirty["prioritization"] = True
+        return entry
+
+    def touch(self, view: str = "prioritization"):
+        """Mark a view dirty after editing its entries in place."""
+        self.dirty[view] = True
+
+    def commit(self, generated_by: str = "Strategic Nexus Prime") -> List[Path]:
+        """Write the views that changed; returns the files written."""
+        prepared = self.prepare_commit(generated_by)
+        try:
+            return self.write_prepared(prepared)
+        except BaseException:
+            self.restore_dirty(prepared)
+            raise
+
+    def restore_dirty(self, prepared: List[Tuple[Path, str]]):
+        """Mark the views of a failed ``write_prepared`` dirty again, so the next commit retries them."""
+        for path, _ in prepared:
+            self.dirty[self._view_name(path)] = True
+
+    def write_prepared(self, prepared: List[Tuple[Path, str]]) -> List[Path]:
+        """Write payloads from ``prepare_commit``; safe to run off the main thread."""
+        for path, text in prepared:
+            view = self._view_name(path)
+            with span(f"write.{view}"), SAVE_SECONDS.time(view=view, phase="write"):
+                self.signatures[path] = _write_text_atomic(path, text)
+            record_write("view", len(text.encode("utf-8")))
+        return [path for path, _ in prepared]
+
+    def prepare_commit(self, generated_by: str = "Strategic Nexus Prime") -> List[Tuple[Path, str]]:
+        """Serialize the dirty views and clear the dirty flags.
+
+        Split from the write so a server can snapshot under its own lock
+        and do the disk I/O elsewhere; if that write fails, pass the payloads
+        to ``restore_dirty``.
+        """
+        prepared = []
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        if self.dirty["complete"]:
+            self.complete["backlog"].sort(key=lambda x: (x.get("epic", ""), x.get("id", "")))
+            self.complete["metadata"].update({
+                "last_updated": today,
+                "total_backlog_stories": len(self.complete["backlog"]),
+                "format_version": "2.0",
+                "generated_by": generated_by,
+            })
+            with span("serialize.complete"), SAVE_SECONDS.time(view="complete", phase="serialize"):
+                prepared.append((self.complete_file,
+                                 json.dumps(self.complete, indent=2, ensure_ascii=False, default=json_default)))
+
+        if self.dirty["prioritization"]:
+            self.prioritization["metadata"].update({
+                "last_updated": today,
+                "total_backlog_stories": len(self.prioritization["backlog"]),
+            })
+            with span("serialize.prioritization"), SAVE_SECONDS.time(view="prioritization", phase="serialize"):
+                prepared.append((self.prioritization_file,
+                                 json.dumps(self.prioritization, indent=2, ensure_ascii=False,
+                                            default=json_default)))
+
+        self.dirty = {"complete": False, "prioritization": False}
+        return prepared
+
+
+class StoryIndex:
+    """Secondary indexes over the prioritized stories for fast lookups.
+
+    Maps status, epic, label, owner and title words to sets of story IDs,
+    plus the reverse dependency graph. ``update``/``discard`` keep it in
+    step with single-story changes instead of rebuilding. Ordered fields
+    also get sorted column arrays for range scans, rebuilt lazily after a
+    change; dates are kept there as day numbers (story_dates.day_number).
+    """
+
+    FIELDS = ("status", "epic", "owner")
+    SORTED_FIELDS = ("priority", "created", "last_updated")
+
+    def __init__(self, stories: List[Dict[str, Any]]):
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.fields: Dict[str, Dict[str, Set[str]]] = {field: {} for field in self.FIELDS}
+        self.labels: Dict[str, Set[str]] = {}
+        self.words: Dict[str, Set[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._columns: Dict[str, Tuple[List[Any], List[str]]] = {}
+        for story in stories:
+            self.update(story)
+
+    @staticmethod
+    def tokenize(text: str) -> Set[str]:
+        return set(re.findall(r"[a-z0-9]+", (text or "").lower()))
+
+    def _story_keys(self, story: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "fields": {field: str(story.get(field) or "").lower() for field in self.FIELDS},
+            "labels": {str(label).lower() for label in story.get("labels") or []},
+            "words": self.tokenize(story.get("title", "")) | {story.get("id", "").lower()},
+            "dependencies": set(story.get("dependencies") or []),
+        }
+
+    def discard(self, story_id: str):
+        keys = self._keys.pop(story_id, None)
+        self.by_id.pop(story_id, None)
+        self._columns.clear()
+        if keys is None:
+            return
+        for field, value in keys["fields"].items():
+            self.fields[field].get(value, set()).discard(story_id)
+        for label in keys["labels"]:
+            self.labels.get(label, set()).discard(story_id)
+        for word in keys["words"]:
+            self.words.get(word, set()).discard(story_id)
+        for dep in keys["dependencies"]:
+            self.dependents.get(dep, set()).discard(story_id)
+
+    def update(self, story: Dict[str, Any]):
+        story_id = story.get("id")
+        if not story_id:
+            return
+        self.discard(story_id)
+        keys = self._story_keys(story)
+        self.by_id[story_id] = story
+        self._keys[story_id] = keys
+        for field, value in keys["fields"].items():
+            self.fields[field].setdefault(value, set()).add(story_id)
+        for label in keys["labels"]:
+            self.labels.setdefault(label, set()).add(story_id)
+        for word in keys["words"]:
+            self.words.setdefault(word, set()).add(story_id)
+        for dep in keys["dependencies"]:
+            self.dependents.setdefault(dep, set()).add(story_id)
+
+    @staticmethod
+    def column_value(field: str, story: Dict[str, Any]) -> Any:
+        value = story.get(field)
+        if field == "priority":
+            try:
+                return int(value if value is not None else 99)
+            except (TypeError, ValueError):
+                return None
+        if field in ("created", "last_updated"):
+            return day_number(value)
+        return None if value in (None, "") else str(value)
+
+    def column(self, field: str) -> Tuple[List[Any], List[str]]:
+        """Sorted (values, ids) arrays for an ordered field."""
+        cached = self._columns.get(field)
+        if cached is not None:
+            CACHE_HITS.inc(cache="index_column")
+        else:
+            CACHE_MISSES.inc(cache="index_column")
+            pairs = sorted((value, story_id) for story_id, value in
+                           ((sid, self.column_value(field, s)) for sid, s in self.by_id.items())
+                           if value is not None)
+            cached = ([value for value, _ in pairs], [story_id for _, story_id in pairs])
+            self._columns[field] = cached
+        return cached
+
+    def range(self, field: str, low: Any = None, high: Any = None,
+              include_low: bool = True, include_high: bool = True) -> Set[str]:
+        """IDs whose ``field`` lies between ``low`` and ``high`` (bisect on the sorted column)."""
+        values, ids = self.column(field)
+        start = 0 if low is None else (bisect_left if include_low else bisect_right)(values, low)
+        end = len(values) if high is None else (bisect_right if include_high else bisect_left)(values, high)
+        return set(ids[start:end])
+
+    def search(self, text: str) -> Set[str]:
+        """IDs whose title (or ID) contains every word of ``text``; prefix match on the last word."""
+        tokens = re.findall(r"[a-z0-9]+", (text or "").lower())
+        if not tokens:
+            return set(self.by_id)
+        result: Optional[Set[str]] = None
+        for position, token in enumerate(tokens):
+            matches = set(self.words.get(token, set()))
+            if position == len(tokens) - 1:
+                for word, ids in self.words.items():
+                    if word.startswith(token):
+                        matches |= ids
+            result = matches if result is None else result & matches
+            if not result:
+                break
+        return result or set()
+
+    def select(self, status: Optional[List[str]] = None, epic: Optional[List[str]] = None,
+               owner: Optional[List[str]] = None, label: Optional[List[str]] = None,
+               text: Optional[str] = None) -> Set[str]:
+        """Intersect the index postings for each filter (values within a filter are OR-ed)."""
+        result: Optional[Set[str]] = None
+
+        def narrow(ids: Set[str]):
+            nonlocal result
+            result = ids if result is None else result & ids
+
+        for field, values in (("status", status), ("epic", epic), ("owner", owner)):
+            if values:
+                ids = set()
+                for value in values:
+                    ids |= self.fields[field].get(value.lower(), set())
+                narrow(ids)
+        if label:
+            ids = set()
+            for value in label:
+                ids |= self.labels.get(value.lower(), set())
+            narrow(ids)
+        if text:
+            narrow(self.search(text))
+        return set(self.by_id) if result is None else result
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Backlog Sync Service
+
+Long-running service that keeps the backlog's JSON views in sync with the
+story markdown files. It watches backlog/ (inotify on Linux, polling
+elsewhere), debounces bursts of edits, re-extracts only the files that
+changed and applies them as deltas to BacklogStore, which rewrites
+COMPLETE_BACKLOG.json and PRIORITIZATION.json once per batch.
+
+This replaces the manual generate_complete_backlog.py +
+update_prioritization_paths.py cycle after editing a story.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Set, Tuple
+
+from backlog_store import BacklogStore
+from fs_watch import create_watcher, watch_batches, PollingWatcher
+from generate_complete_backlog import parse_story_file
+from metrics import job
+
+
+class BacklogSyncService:
+    def __init__(self, base_path: str = ".", debounce: float = 0.2,
+                 polling: bool = False, verbose: bool = True):
+        self.base_path = Path(base_path)
+        self.backlog_path = self.base_path / "backlog"
+        self.debounce = debounce
+        self.polling = polling
+        self.verbose = verbose
+
+        # Load data
+        self.store = BacklogStore(base_path)
+        self._view_files = {self.store.complete_file.resolve(),
+                            self.store.prioritization_file.resolve()}
+
+    def _relative(self, path: Path) -> Optional[Path]:
+        try:
+            return Path(path).resolve().relative_to(self.base_path.resolve())
+        except ValueError:
+            return None
+
+    def _is_story_path(self, path: Path) -> bool:
+        return path.suffix == ".md" and path.resolve() not in self._view_files
+
+    def extract(self, relative: Path) -> Optional[Tuple[Dict[str, Any], Set[str]]]:
+        """Extract one story and its explicit fields, keeping file_path relative to the repo root."""
+        parsed = parse_story_file(self.base_path / relative)
+        if parsed:
+            parsed[0]["file_path"] = relative.as_posix()
+        return parsed
+
+    def apply_changes(self, paths: Set[Path]) -> Dict[str, int]:
+        """Apply a batch of changed files to the store and commit once."""
+        counts = {"updated": 0, "removed": 0, "unchanged": 0}
+        parsed = {}
+        for path in sorted(paths):
+            if not self._is_story_path(path):
+                continue
+            relative = self._relative(path)
+            if relative is None:
+                continue
+            parsed[relative] = self.extract(relative) if (self.base_path / relative).is_file() else None
+
+        # Removals first, so a rename's new file can take over the old entry by ID
+        for relative, story in parsed.items():
+            if story is None:
+                counts["removed" if self.store.remove(relative.as_posix()) else "unchanged"] += 1
+        for story in parsed.values():
+            if story is None:
+                continue
+            counts["updated" if self.store.upsert(*story) else "unchanged"] += 1
+
+        self.store.commit()
+        return counts
+
+    def rescan(self) -> Dict[str, int]:
+        """Full rescan of backlog/, used on startup with --once and after event overflow."""
+        stories = []
+        for md_file in self.backlog_path.rglob("*.md"):
+            relative = self._relative(md_file)
+            story = self.extract(relative) if relative else None
+            if story:
+                stories.append(story)
+
+        before = len(self.store.stories)
+        self.store.replace_all(stories)
+        written = self.store.commit()
+        return {"stories": len(stories), "previous": before, "files_written": len(written)}
+
+    def run(self):
+        """Watch backlog/ until interrupted."""
+        watcher = create_watcher([self.backlog_path], polling=self.polling)
+        mode = "polling" if isinstance(watcher, PollingWatcher) else "inotify"
+        print(f"👀 Watching {self.backlog_path} ({mode}, debounce {self.debounce * 1000:.0f}ms)")
+
+        try:
+            for paths, overflowed in watch_batches(watcher, debounce=self.debounce, max_latency=0.8):
+                started = time.monotonic()
+                # Pick up edits made to the JSON views by other tools; the
+                # sync's own commits do not count, so most batches skip the parse
+                self.store.reload_changed()
+                if overflowed:
+                    result = self.rescan()
+                    print(f"⚠️  Event queue overflowed, rescanned {result['stories']} stories")
+                    continue
+
+                counts = self.apply_changes(paths)
+                elapsed = (time.monotonic() - started) * 1000
+                if counts["updated"] or counts["removed"]:
+                    print(f"✅ Synced {counts['updated']} updated, {counts['removed']} removed "
+                          f"in {elapsed:.0f}ms")
+                elif self.verbose and counts["unchanged"]:
+                    print(f"   {counts['unchanged']} file(s) changed without metadata changes")
+        except KeyboardInterrupt:
+            print("\n👋 Stopping backlog sync")
+        finally:
+            watcher.close()
+
+
+@job("backlog_sync")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Keep backlog JSON files in sync with story markdown files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Watch backlog/ and sync each edit as it happens
+  python scripts/backlog_sync.py
+
+  # One full rescan, then exit
+  python scripts/backlog_sync.py --once
+
+  # Sync specific files without watching
+  python scripts/backlog_sync.py --files backlog/infrastructure/INF-014-*.md
+        """
+    )
+
+    parser.add_argument("--once", action="store_true",
+                       help="Rescan all story files once and exit")
+    parser.add_argument("--files", nargs="+",
+                       help="Sync only these files and exit")
+    parser.add_argument("--debounce", type=float, default=0.2,
+                       help="Seconds of quiet before a batch is applied (default: 0.2)")
+    parser.add_argument("--poll", action="store_true",
+                       help="Use mtime polling instead of inotify")
+    parser.add_argument("--quiet", action="store_true",
+                       help="Only report batches that change the JSON views")
+
+    args = parser.parse_args()
+
+    service = BacklogSyncService(debounce=args.debounce, polling=args.poll, verbose=not args.quiet)
+    if not service.backlog_path.is_dir():
+        print(f"❌ Backlog directory not found: {service.backlog_path}")
+        sys.exit(1)
+
+    if args.files:
+        counts = service.apply_changes({Path(f) for f in args.files})
+        print(f"✅ Synced {counts['updated']} updated, {counts['removed']} removed, "
+              f"{counts['unchanged']} unchanged")
+    elif args.once:
+        result = service.rescan()
+        print(f"✅ Rescanned {result['stories']} stories ({result['files_written']} file(s) written)")
+    else:
+        service.run()
+
+
+if __name__ == "__main__":
+    main()
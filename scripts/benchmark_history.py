@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark History and Regression Comparator
+
+Every benchmark_suite.py run is appended as one JSON line to
+benchmarks/history.ndjson: the git commit, host, dataset manifest and the raw
+timings of every run. The file is only ever appended to, so it doubles as a
+record of how the tooling's performance moved over time.
+
+``compare BASE HEAD`` pools all clean-checkout runs of each revision on the
+same dataset (scale, seed, generator version) and tests each benchmark for a
+slowdown with a one-sided Mann-Whitney U test on wall time. A benchmark is
+flagged only when the change is both significant (p < alpha) and larger than
+the threshold, so noise on a busy machine does not produce false alarms. The
+exit code is 1 when anything got slower, for use in CI.
+
+Revisions without history can be measured on the spot with ``--run-missing``:
+the revision is checked out in a temporary git worktree and the suite runs
+its scripts against the same dataset.
+"""
+
+import json
+import argparse
+import math
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from metrics import job
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HISTORY_FILE = REPO_ROOT / "benchmarks" / "history.ndjson"
+DEFAULT_ALPHA = 0.05
+DEFAULT_THRESHOLD = 0.10
+MIN_RUNS = 3
+# Above this many (base x head) pairs, or with ties, the normal approximation is used
+EXACT_PAIRS_LIMIT = 400
+
+
+def append_history(payload: Dict[str, Any], path: Path = HISTORY_FILE):
+    """Append one suite run as a single line; earlier lines are never rewritten."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(payload, separators=(",", ":"), ensure_ascii=False) + "\n"
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line)
+
+
+def load_history(path: Path = HISTORY_FILE) -> List[Dict[str, Any]]:
+    entries = []
+    if not path.exists():
+        return entries
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"⚠️  Skipping unreadable history line {number}", file=sys.stderr)
+    return entries
+
+
+def dataset_key(manifest: Dict[str, Any]) -> Tuple:
+    """Runs are only comparable on the same generated data."""
+    return (manifest.get("generator_version"), manifest.get("stories"), manifest.get("seed"),
+            manifest.get("staging"), manifest.get("markdown"))
+
+
+def resolve_revision(revision: str) -> Optional[str]:
+    result = subprocess.run(["git", "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def collect_runs(history: List[Dict[str, Any]], commit: str, key: Optional[Tuple] = None,
+                 include_dirty: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+    """Successful runs per benchmark for ``commit``, pooled across history entries."""
+    runs: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in history:
+        metadata = entry.get("metadata", {})
+        git = metadata.get("git") or {}
+        if git.get("commit") != commit or (git.get("dirty") and not include_dirty):
+            continue
+        if key is not None and dataset_key(metadata.get("dataset") or {}) != key:
+            continue
+        for name, result in (entry.get("benchmarks") or {}).items():
+            if result.get("ok"):
+                runs.setdefault(name, []).extend(result.get("runs") or [])
+    return runs
+
+
+def _u_distribution(m: int, n: int) -> List[int]:
+    """Number of orderings giving each U = 0..m*n for samples of size m and n, without ties."""
+    # counts[i][j] is the distribution for sizes (i, j); U(i, j) = U(i-1, j) + j or U(i, j-1)
+    counts = [[[1] for _ in range(n + 1)] for _ in range(m + 1)]
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            size = i * j + 1
+            merged = [0] * size
+            for u, ways in enumerate(counts[i - 1][j]):
+                merged[u + j] += ways
+            for u, ways in enumerate(counts[i][j - 1]):
+                merged[u] += ways
+            counts[i][j] = merged
+    return counts[m][n]
+
+
+def mann_whitney_greater(base: List[float], head: List[float]) -> float:
+    """One-sided p-value that ``head`` values tend to be larger than ``base`` values."""
+    m, n = len(head), len(base)
+    u = sum(1.0 if h > b else 0.5 if h == b else 0.0 for h in head for b in base)
+    values = base + head
+    ties = len(set(values)) != len(values)
+
+    if not ties and m * n <= EXACT_PAIRS_LIMIT:
+        distribution = _u_distribution(m, n)
+        return sum(distribution[math.ceil(u):]) / sum(distribution)
+
+    total = m + n
+    tie_term = 0
+    for value in set(values):
+        t = values.count(value)
+        tie_term += t ** 3 - t
+    variance = m * n / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - m * n / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_benchmark(base_runs: List[Dict[str, Any]], head_runs: List[Dict[str, Any]],
+                      alpha: float = DEFAULT_ALPHA, threshold: float = DEFAULT_THRESHOLD) -> Dict[str, Any]:
+    base = [run["wall_seconds"] for run in base_runs]
+    head = [run["wall_seconds"] for run in head_runs]
+    row: Dict[str, Any] = {"base_runs": len(base), "head_runs": len(head)}
+    if len(base) < MIN_RUNS or len(head) < MIN_RUNS:
+        row["verdict"] = "too few runs"
+        return row
+
+    base_median, head_median = statistics.median(base), statistics.median(head)
+    change = head_median / base_median - 1 if base_median else 0.0
+    p_slower = mann_whitney_greater(base, head)
+    p_faster = mann_whitney_greater(head, base)
+    row.update({
+        "base_median": base_median,
+        "head_median": head_median,
+        "base_iqr": _iqr(base),
+        "head_iqr": _iqr(head),
+        "change": round(change, 4),
+        "p_slower": round(p_slower, 4),
+        "p_faster": round(p_faster, 4),
+        "base_rss_kb": statistics.median(run["max_rss_kb"] for run in base_runs),
+        "head_rss_kb": statistics.median(run["max_rss_kb"] for run in head_runs),
+    })
+    if p_slower < alpha and change > threshold:
+        row["verdict"] = "slower"
+    elif p_faster < alpha and change < -threshold:
+        row["verdict"] = "faster"
+    else:
+        row["verdict"] = "no change"
+    return row
+
+
+def _iqr(values: List[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    q1, _, q3 = statistics.quantiles(values, n=4, method="inclusive")
+    return q3 - q1
+
+
+def compare(history: List[Dict[str, Any]], base: str, head: str, key: Optional[Tuple] = None,
+            alpha: float = DEFAULT_ALPHA, threshold: float = DEFAULT_THRESHOLD,
+            include_dirty: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Compare every benchmark measured for both commits."""
+    base_runs = collect_runs(history, base, key, include_dirty)
+    head_runs = collect_runs(history, head, key, include_dirty)
+    return {name: compare_benchmark(base_runs[name], head_runs[name], alpha, threshold)
+            for name in sorted(set(base_runs) & set(head_runs))}
+
+
+def latest_dataset_key(history: List[Dict[str, Any]], commits: List[str]) -> Optional[Tuple]:
+    """Dataset of the most recent entry recorded for all of ``commits``."""
+    keys_by_commit = [{dataset_key(entry.get("metadata", {}).get("dataset") or {}) for entry in history
+                       if (entry.get("metadata", {}).get("git") or {}).get("commit") == commit}
+                      for commit in commits]
+    shared = set.intersection(*keys_by_commit) if keys_by_commit else set()
+    for entry in reversed(history):
+        key = dataset_key(entry.get("metadata", {}).get("dataset") or {})
+        if key in shared:
+            return key
+    return None
+
+
+def run_revision(commit: str, args) -> bool:
+    """Benchmark ``commit`` from a temporary worktree and append it to the history."""
+    from benchmark_suite import DATASET_DIR, run_suite
+
+    worktree = DATASET_DIR / "worktrees" / commit[:12]
+    if not worktree.exists():
+        result = subprocess.run(["git", "worktree", "add", "--detach", str(worktree), commit],
+                                cwd=REPO_ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"❌ Could not check out {commit[:12]}: {result.stderr.strip()}")
+            return False
+    try:
+        print(f"🔁 Benchmarking {commit[:12]} from {worktree}")
+        run_suite(args, scripts_dir=worktree / "scripts", history=Path(args.history))
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", str(worktree)],
+                       cwd=REPO_ROOT, capture_output=True, text=True)
+    return True
+
+
+def print_comparison(rows: Dict[str, Dict[str, Any]], base: str, head: str):
+    print(f"📊 {base[:10]} → {head[:10]}")
+    print(f"{'Benchmark':<24}  {'Base (IQR)':>17}  {'Head (IQR)':>17}  {'Change':>7}  {'p':>6}  {'RSS':>7}  Verdict")
+    for name, row in rows.items():
+        if "change" not in row:
+            print(f"{name:<24}  {'':>17}  {'':>17}  {'':>7}  {'':>6}  {'':>7}  "
+                  f"{row['verdict']} ({row['base_runs']} vs {row['head_runs']})")
+            continue
+        icon = {"slower": "❌", "faster": "🚀"}.get(row["verdict"], "✅")
+        base_text = f"{row['base_median']:.3f}s ±{row['base_iqr']:.3f}"
+        head_text = f"{row['head_median']:.3f}s ±{row['head_iqr']:.3f}"
+        p_value = row["p_slower"] if row["change"] >= 0 else row["p_faster"]
+        rss = row["head_rss_kb"] / row["base_rss_kb"] - 1 if row["base_rss_kb"] else 0.0
+        print(f"{name:<24}  {base_text:>17}  {head_text:>17}  {row['change']:>+7.1%}  {p_value:>6.3f}  "
+              f"{rss:>+7.1%}  {icon} {row['verdict']}")
+
+
+def print_log(history: List[Dict[str, Any]], limit: int):
+    for entry in history[-limit:]:
+        metadata = entry.get("metadata", {})
+        git = metadata.get("git") or {}
+        dataset = metadata.get("dataset") or {}
+        results = entry.get("benchmarks") or {}
+        failed = sum(1 for result in results.values() if result.get("ok") is False)
+        commit = (git.get("commit") or "nogit")[:10] + ("*" if git.get("dirty") else "")
+        print(f"{metadata.get('generated_at', '?'):<19}  {commit:<11}  {dataset.get('scale', '?'):>6}  "
+              f"seed {dataset.get('seed', '?'):<4}  {len(results):>3} benchmarks"
+              f"{f', {failed} failed' if failed else ''}  {git.get('subject') or ''}")
+
+
+@job("benchmark_history")
+def main():
+    from benchmark_suite import add_run_arguments
+
+    parser = argparse.ArgumentParser(
+        description="Compare benchmark history between git revisions",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Did the last commit slow anything down?
+  python scripts/benchmark_history.py compare HEAD~1 HEAD
+
+  # Benchmark revisions missing from the history first
+  python scripts/benchmark_history.py compare main HEAD --run-missing --scale 100k
+
+  # Recent suite runs (* marks runs from a dirty checkout)
+  python scripts/benchmark_history.py log
+        """
+    )
+    parser.add_argument("--history", type=str, default=str(HISTORY_FILE),
+                       help=f"History file (default: {HISTORY_FILE.relative_to(REPO_ROOT)})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compare_parser = subparsers.add_parser("compare", help="Flag significant slowdowns between two revisions")
+    compare_parser.add_argument("base", type=str, help="Baseline revision (commit, branch, tag)")
+    compare_parser.add_argument("head", type=str, nargs="?", default="HEAD",
+                                help="Revision to check (default: HEAD)")
+    compare_parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                                help=f"Significance level (default: {DEFAULT_ALPHA})")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help=f"Smallest relative change worth flagging (default: {DEFAULT_THRESHOLD})")
+    compare_parser.add_argument("--include-dirty", action="store_true",
+                                help="Also use runs from checkouts with uncommitted changes")
+    compare_parser.add_argument("--run-missing", action="store_true",
+                                help="Benchmark revisions that have no history yet")
+    add_run_arguments(compare_parser)
+
+    log_parser = subparsers.add_parser("log", help="List recorded suite runs")
+    log_parser.add_argument("--limit", type=int, default=20, help="Entries to show (default: 20)")
+
+    args = parser.parse_args()
+    history_path = Path(args.history)
+    history = load_history(history_path)
+
+    if args.command == "log":
+        if not history:
+            print(f"No benchmark history in {history_path}")
+            return
+        print_log(history, args.limit)
+        return
+
+    commits = []
+    for revision in (args.base, args.head):
+        commit = resolve_revision(revision)
+        if commit is None:
+            print(f"❌ Unknown revision: {revision}")
+            sys.exit(1)
+        commits.append(commit)
+    base, head = commits
+
+    if args.run_missing:
+        from synthetic_backlog import GENERATOR_VERSION
+        wanted = (GENERATOR_VERSION, args.scale, args.seed, args.staging, True)
+        for commit in dict.fromkeys(commits):
+            if not collect_runs(history, commit, wanted, args.include_dirty):
+                if not run_revision(commit, args):
+                    sys.exit(1)
+        history = load_history(history_path)
+        key = wanted
+    else:
+        key = latest_dataset_key(history, commits)
+        if key is None:
+            missing = [c[:10] for c in commits if not collect_runs(history, c, None, args.include_dirty)]
+            print(f"❌ No comparable history for {', '.join(missing) or 'both revisions on one dataset'}; "
+                  f"run benchmark_suite.py on each revision or pass --run-missing")
+            sys.exit(1)
+
+    rows = compare(history, base, head, key, args.alpha, args.threshold, args.include_dirty)
+    if not rows:
+        print("❌ The two revisions have no benchmarks in common")
+        sys.exit(1)
+    print_comparison(rows, base, head)
+
+    slower = [name for name, row in rows.items() if row["verdict"] == "slower"]
+    if slower:
+        print(f"\n❌ {len(slower)} benchmark(s) slower: {', '.join(slower)}")
+        sys.exit(1)
+    print("\n✅ No significant slowdowns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+
+Times every backlog script against a synthetic backlog (synthetic_backlog.py)
+at a chosen scale and stores the results as JSON, so runs from different
+commits can be compared.
+
+Each benchmark runs the real script as a subprocess with the dataset as its
+working directory, exactly as it runs against the repository. Before every
+run the files scripts modify (the JSON views, staging/new/, generated reports
+and dashboards, newly ingested stories, .cache/) are put back to the state
+the dataset was generated in, so repetitions measure the same work.
+
+Each benchmark gets unrecorded warmup runs, then measured runs; per run the
+suite records wall time, user and system CPU time, peak RSS and the exit
+status, and per benchmark the median, quartiles and IQR of wall time. Every
+suite run is appended to benchmarks/history.ndjson with the git commit, the
+Python version, the host and the dataset manifest; benchmark_history.py
+compares revisions from there.
+
+Datasets are cached in .cache/benchmarks/<scale>-seed<seed>/ and reused as
+long as their manifest matches the requested parameters.
+"""
+
+import json
+import argparse
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from backlog import COMMANDS, STARTUP_BUDGET_MS
+from benchmark_history import HISTORY_FILE, append_history
+from metrics import job
+from synthetic_backlog import DEFAULT_SEED, GENERATOR_VERSION, SCALES, generate, parse_scale, scale_label
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPTS_DIR.parent
+DATASET_DIR = REPO_ROOT / ".cache" / "benchmarks"
+DEFAULT_STAGING = 200
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+
+# Files restored before every run, relative to the dataset
+PRISTINE_FILES = ["backlog/PRIORITIZATION.json", "backlog/COMPLETE_BACKLOG.json", "docs/work_review.json"]
+# Outputs removed before every run
+GENERATED_PATHS = ["reports", "docs/data", "docs/dashboard-data.json", "docs/index.html",
+                   "staging/processed", ".cache"]
+
+# name -> script and arguments, what the dataset must provide and an optional
+# median wall-time budget in milliseconds that fails the run when exceeded
+BENCHMARKS: Dict[str, Dict[str, Any]] = {
+    "cli_help": {"command": ["backlog.py", "--help"], "budget_ms": STARTUP_BUDGET_MS},
+    **{f"cli_{name}_help": {"command": ["backlog.py", name, "--help"], "budget_ms": STARTUP_BUDGET_MS}
+       for name in COMMANDS},
+    "ingest": {"command": ["ingest_stories.py"], "needs": "staging"},
+    "complete_backlog": {"command": ["generate_complete_backlog.py"], "needs": "markdown"},
+    "priority_shift": {"command": ["manage_priorities.py", "--shift-from", "5", "--positions", "2"]},
+    "cleanup_dry_run": {"command": ["cleanup_data.py", "--dry-run"]},
+    "report_velocity": {"command": ["generate_reports.py", "--type", "velocity"]},
+    "report_health": {"command": ["generate_reports.py", "--type", "health"]},
+    "report_priority": {"command": ["generate_reports.py", "--type", "priority"]},
+    "report_workflow": {"command": ["generate_reports.py", "--type", "workflow"]},
+    "report_dashboard": {"command": ["generate_reports.py", "--dashboard"]},
+    "analytics_comprehensive": {"command": ["generate_performance_analytics.py", "--type", "comprehensive"]},
+    "analytics_velocity": {"command": ["generate_performance_analytics.py", "--type", "velocity"]},
+    "analytics_resource": {"command": ["generate_performance_analytics.py", "--type", "resource"]},
+    "analytics_risk": {"command": ["generate_performance_analytics.py", "--type", "risk"]},
+    "analytics_burndown": {"command": ["generate_performance_analytics.py", "--type", "burndown"]},
+    "dashboard_data": {"command": ["build_dashboard_data.py"]},
+    "real_dashboard": {"command": ["generate_real_dashboard.py"]},
+    "query_store": {"command": ["backlog_query.py", "status in (ready, active) and priority < 50"]},
+}
+
+
+def git_info(root: Path = REPO_ROOT) -> Dict[str, Any]:
+    """Commit, branch and dirty flag of the checkout being measured."""
+    def git(*args: str) -> Optional[str]:
+        try:
+            result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+        "subject": git("log", "-1", "--format=%s"),
+        "dirty": bool(status) if status is not None else None,
+    }
+
+
+class Dataset:
+    def __init__(self, path: Path):
+        self.path = path
+        self.pristine_path = path / ".pristine"
+
+        # Load data
+        with open(path / "synthetic_manifest.json", 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self._snapshot()
+
+    @classmethod
+    def prepare(cls, stories: int, seed: int, staging: int, path: Optional[Path] = None) -> "Dataset":
+        """Reuse the cached dataset for these parameters, generating it if needed."""
+        path = path or DATASET_DIR / f"{scale_label(stories)}-seed{seed}"
+        manifest_path = path / "synthetic_manifest.json"
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if (manifest.get("generator_version") == GENERATOR_VERSION and manifest.get("stories") == stories
+                    and manifest.get("seed") == seed and manifest.get("staging") == staging
+                    and manifest.get("markdown")):
+                return cls(path)
+            print(f"♻️  Dataset in {path} has different parameters; regenerating")
+        if path.exists():
+            shutil.rmtree(path)
+        print(f"🏗️  Generating {stories:,} stories (seed {seed}) in {path}")
+        manifest = generate(path, stories, seed, staging=staging)
+        print(f"✅ Dataset ready in {manifest['generation_seconds']:.1f}s")
+        return cls(path)
+
+    def _snapshot(self):
+        if (self.pristine_path / "stories.txt").exists():
+            return
+        self.pristine_path.mkdir(exist_ok=True)
+        for name in PRISTINE_FILES:
+            target = self.pristine_path / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.path / name, target)
+        staging = self.path / "staging" / "new"
+        if staging.exists():
+            shutil.copytree(staging, self.pristine_path / "staging" / "new")
+        with open(self.pristine_path / "stories.txt", 'w', encoding='utf-8') as f:
+            f.write("\n".join(sorted(self._story_files())))
+
+    def _story_files(self) -> List[str]:
+        backlog = self.path / "backlog"
+        return [f"{entry.name}/{story.name}" for entry in os.scandir(backlog) if entry.is_dir()
+                for story in os.scandir(entry.path) if story.name.endswith(".md")]
+
+    def restore(self, keep_cache: bool = False, new_stories: bool = False):
+        """Put everything a benchmark may have changed back to the generated state."""
+        for name in PRISTINE_FILES:
+            shutil.copy2(self.pristine_path / name, self.path / name)
+        for name in GENERATED_PATHS:
+            if keep_cache and name == ".cache":
+                continue
+            path = self.path / name
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+        staging = self.path / "staging" / "new"
+        if (self.pristine_path / "staging" / "new").exists():
+            if staging.exists():
+                shutil.rmtree(staging)
+            shutil.copytree(self.pristine_path / "staging" / "new", staging)
+        if new_stories:
+            with open(self.pristine_path / "stories.txt", 'r', encoding='utf-8') as f:
+                original = set(f.read().splitlines())
+            for name in set(self._story_files()) - original:
+                (self.path / "backlog" / name).unlink()
+
+
+def run_once(command: List[str], cwd: Path, timeout: Optional[float], log_path: Path,
+             scripts_dir: Path = SCRIPTS_DIR) -> Dict[str, Any]:
+    """Run one script to completion and measure it with wait4 (wall, CPU, peak RSS)."""
+    argv = [sys.executable, str(scripts_dir / command[0]), *command[1:]]
+    env = dict(os.environ)
+    env.pop("BACKLOG_METRICS_DIR", None)
+    with open(log_path, 'wb') as log:
+        started = time.perf_counter()
+        process = subprocess.Popen(argv, cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                                   stdout=log, stderr=subprocess.STDOUT)
+        timer = threading.Timer(timeout, process.kill) if timeout else None
+        if timer:
+            timer.start()
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - started
+        if timer:
+            timer.cancel()
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "wall_seconds": round(wall, 4),
+        "user_seconds": round(usage.ru_utime, 4),
+        "sys_seconds": round(usage.ru_stime, 4),
+        "max_rss_kb": usage.ru_maxrss if sys.platform != "darwin" else usage.ru_maxrss // 1024,
+        "exit_code": process.returncode,
+    }
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Distribution of wall time over the measured runs."""
+    walls = [run["wall_seconds"] for run in runs]
+    q1, q3 = walls[0], walls[0]
+    if len(walls) > 1:
+        q1, _, q3 = statistics.quantiles(walls, n=4, method="inclusive")
+    return {
+        "min": min(walls),
+        "q1": round(q1, 4),
+        "median": round(statistics.median(walls), 4),
+        "q3": round(q3, 4),
+        "iqr": round(q3 - q1, 4),
+        "mean": round(statistics.mean(walls), 4),
+        "stdev": round(statistics.stdev(walls), 4) if len(walls) > 1 else 0.0,
+        "max": max(walls),
+        "max_rss_kb": max(run["max_rss_kb"] for run in runs),
+    }
+
+
+class BenchmarkSuite:
+    def __init__(self, dataset: Dataset, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+                 timeout: Optional[float] = None, keep_cache: bool = False, scripts_dir: Path = SCRIPTS_DIR):
+        self.dataset = dataset
+        self.repeat = repeat
+        self.warmup = warmup
+        self.scripts_dir = scripts_dir
+        self.timeout = timeout
+        self.keep_cache = keep_cache
+        self.log_dir = dataset.path / ".logs"
+        self.log_dir.mkdir(exist_ok=True)
+
+    def available(self, name: str) -> Optional[str]:
+        """Why a benchmark cannot run on this dataset, or None."""
+        needs = BENCHMARKS[name].get("needs")
+        if needs == "staging" and not self.dataset.manifest.get("staging"):
+            return "dataset has no staged stories"
+        if needs == "markdown" and not self.dataset.manifest.get("markdown"):
+            return "dataset has no markdown stories"
+        return None
+
+    def run(self, names: List[str]) -> Dict[str, Any]:
+        results = {}
+        for name in names:
+            spec = BENCHMARKS[name]
+            reason = self.available(name)
+            if reason:
+                print(f"⏭️  {name}: skipped ({reason})")
+                results[name] = {"command": spec["command"], "skipped": reason}
+                continue
+
+            if not (self.scripts_dir / spec["command"][0]).exists():
+                print(f"⏭️  {name}: skipped ({spec['command'][0]} does not exist in this revision)")
+                results[name] = {"command": spec["command"], "skipped": "script missing"}
+                continue
+
+            # Warmup runs fill the OS page cache and import caches; they are not recorded
+            runs = []
+            for repetition in range(-self.warmup, self.repeat):
+                self.dataset.restore(keep_cache=self.keep_cache, new_stories=name == "ingest")
+                label = f"warmup{-repetition}" if repetition < 0 else str(repetition)
+                log_path = self.log_dir / f"{name}.{label}.log"
+                run = run_once(spec["command"], self.dataset.path, self.timeout, log_path, self.scripts_dir)
+                if repetition >= 0 or run["exit_code"] != 0:
+                    runs.append(run)
+                if run["exit_code"] != 0:
+                    print(f"❌ {name}: exit code {run['exit_code']} (see {log_path})")
+                    break
+
+            ok = all(run["exit_code"] == 0 for run in runs)
+            results[name] = {"command": spec["command"], "ok": ok, "runs": runs, "summary": summarize(runs)}
+            summary = results[name]["summary"]
+            budget = spec.get("budget_ms")
+            if budget is not None:
+                results[name]["budget_ms"] = budget
+                if summary["median"] * 1000 > budget:
+                    results[name]["ok"] = ok = False
+                    print(f"❌ {name}: median {summary['median'] * 1000:.1f} ms is over the {budget:.0f} ms budget")
+            print(f"{'✅' if ok else '❌'} {name:<24} median {summary['median']:>9.3f}s  "
+                  f"IQR {summary['iqr']:>7.3f}s  peak RSS {summary['max_rss_kb'] / 1024:>8.1f} MB")
+        self.dataset.restore(keep_cache=self.keep_cache, new_stories="ingest" in names)
+        return results
+
+
+def build_payload(results: Dict[str, Any], dataset: Dataset, repeat: int, warmup: int,
+                  git: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "metadata": {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "git": git,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "warmup": warmup,
+            "dataset": dataset.manifest,
+        },
+        "benchmarks": results,
+    }
+
+
+def add_run_arguments(parser):
+    """Options shared by the suite and ``benchmark_history.py compare --run-missing``."""
+    parser.add_argument("--scale", type=parse_scale, default=SCALES["10k"],
+                       help="Stories in the synthetic backlog: 10k, 100k, 1M or a count (default: 10k)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                       help=f"Dataset seed (default: {DEFAULT_SEED})")
+    parser.add_argument("--staging", type=int, default=DEFAULT_STAGING,
+                       help=f"Stories staged for the ingest benchmark (default: {DEFAULT_STAGING})")
+    parser.add_argument("--dataset", type=str,
+                       help="Dataset directory (default: .cache/benchmarks/<scale>-seed<seed>)")
+    parser.add_argument("--only", type=str,
+                       help="Comma-separated benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                       help=f"Measured runs per benchmark (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                       help=f"Unmeasured runs before the measured ones (default: {DEFAULT_WARMUP})")
+    parser.add_argument("--timeout", type=float,
+                       help="Kill a run after this many seconds")
+    parser.add_argument("--keep-cache", action="store_true",
+                       help="Keep the dataset's .cache/ between runs (measure warm caches)")
+
+
+def selected_benchmarks(only: Optional[str]) -> List[str]:
+    if not only:
+        return list(BENCHMARKS)
+    names = [name.strip() for name in only.split(",") if name.strip()]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmarks: {', '.join(unknown)} (see --list)")
+        sys.exit(1)
+    return names
+
+
+def run_suite(args, scripts_dir: Path = SCRIPTS_DIR, history: Optional[Path] = HISTORY_FILE,
+              output: Optional[Path] = None) -> Dict[str, Any]:
+    """Run the selected benchmarks with ``scripts_dir``'s scripts and record the results."""
+    names = selected_benchmarks(args.only)
+    dataset = Dataset.prepare(args.scale, args.seed, args.staging, Path(args.dataset) if args.dataset else None)
+    print(f"📊 Running {len(names)} benchmarks x {args.repeat} (+{args.warmup} warmup) "
+          f"on {dataset.manifest['stories']:,} stories")
+    suite = BenchmarkSuite(dataset, args.repeat, args.warmup, args.timeout, args.keep_cache, scripts_dir)
+    results = suite.run(names)
+
+    payload = build_payload(results, dataset, args.repeat, args.warmup, git_info(scripts_dir.parent))
+    if history is not None:
+        append_history(payload, history)
+        print(f"💾 Appended to {history}")
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2)
+        print(f"💾 Results saved to {output}")
+    return payload
+
+
+@job("benchmark_suite")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the backlog scripts on a synthetic backlog",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every benchmark on 10k stories: 1 warmup + 5 measured runs each
+  python scripts/benchmark_suite.py --scale 10k
+
+  # Just the reports on 100k stories
+  python scripts/benchmark_suite.py --scale 100k --only report_velocity,report_health
+
+  # Then check the change against the previous commit
+  python scripts/benchmark_history.py compare HEAD~1 HEAD
+
+  # List the benchmarks
+  python scripts/benchmark_suite.py --list
+        """
+    )
+    add_run_arguments(parser)
+    parser.add_argument("--history", type=str, default=str(HISTORY_FILE),
+                       help=f"History file to append to (default: {HISTORY_FILE.relative_to(REPO_ROOT)})")
+    parser.add_argument("--no-history", action="store_true",
+                       help="Do not append this run to the history")
+    parser.add_argument("--output", type=str,
+                       help="Also write this run's results to a JSON file")
+    parser.add_argument("--list", action="store_true",
+                       help="List the benchmarks and exit")
+
+    args = parser.parse_args()
+
+    if args.list:
+        for name, spec in BENCHMARKS.items():
+            print(f"  {name:<24} {' '.join(spec['command'])}")
+        return
+
+    payload = run_suite(args, history=None if args.no_history else Path(args.history),
+                        output=Path(args.output) if args.output else None)
+    if any(not result.get("ok", True) for result in payload["benchmarks"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
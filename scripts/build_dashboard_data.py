@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Dashboard Data Builder
+
+Pre-aggregates docs/work_review.json into the files the GitHub Pages
+dashboard loads lazily:
+
+- data/manifest.json  - metadata, repo list and the chunk index
+- data/rollups.json   - per-repo weekly and monthly totals with median sketches
+- data/chunks/*.wrc   - daily records split into monthly date-range chunks,
+                        in the columnar encoding from work_review_columnar.py
+
+The dashboard answers KPI queries from the rollups (plus at most two edge
+chunks) and only fetches the daily chunks a chart actually needs, so load
+time and filter latency stay flat as the observation window grows.
+"""
+
+import json
+import argparse
+import hashlib
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from datetime import date, datetime, timedelta
+
+from metrics import job
+from quantile_sketch import QuantileSketch, DEFAULT_RELATIVE_ACCURACY
+from work_review_columnar import encode_daily
+
+FORMAT_VERSION = 1
+
+# Additive per-repo counters kept in every rollup period
+TOTAL_FIELDS = [
+    "commits", "prs_opened", "prs_merged", "lines_added", "lines_deleted",
+    "workflow_runs", "workflow_successes", "ai_commit_markers",
+    "ai_pr_markers", "bot_events",
+]
+
+PR_SIZES = ["small", "medium", "large", "xlarge"]
+
+# Sketch name -> (section, field) of the daily value it summarizes
+SKETCH_FIELDS = {
+    "pr_merge": ("prs", "time_to_merge_seconds_median"),
+    "issue_close": ("issues", "time_to_close_seconds_median"),
+}
+
+
+def iso_week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def month_end(day: date) -> date:
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+class DashboardDataBuilder:
+    def __init__(self, base_path: str = ".", source: Optional[str] = None,
+                 output: Optional[str] = None,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 chunk_format: str = "columnar"):
+        self.base_path = Path(base_path)
+        self.docs_path = self.base_path / "docs"
+        self.source_path = Path(source) if source else self.docs_path / "work_review.json"
+        self.output_path = Path(output) if output else self.docs_path / "data"
+        self.relative_accuracy = relative_accuracy
+        self.chunk_format = chunk_format
+
+        # Load data
+        self.source_bytes = self.source_path.read_bytes()
+        self.data = json.loads(self.source_bytes)
+
+    def _repo_totals(self, repo: Dict[str, Any]) -> Dict[str, float]:
+        """Extract the additive counters for one day x repo record."""
+        commits = repo.get("commits") or {}
+        prs = repo.get("prs") or {}
+        workflows = repo.get("workflows") or {}
+        ai_signals = repo.get("ai_signals") or {}
+
+        runs = workflows.get("runs_count") or 0
+        successes = 0
+        if workflows.get("success_rate") is not None and runs > 0:
+            successes = workflows["success_rate"] * runs
+
+        return {
+            "commits": commits.get("count") or 0,
+            "prs_opened": prs.get("opened_count") or 0,
+            "prs_merged": prs.get("merged_count") or 0,
+            "lines_added": commits.get("lines_added") or 0,
+            "lines_deleted": commits.get("lines_deleted") or 0,
+            "workflow_runs": runs,
+            "workflow_successes": successes,
+            "ai_commit_markers": ai_signals.get("commit_markers") or 0,
+            "ai_pr_markers": ai_signals.get("pr_markers") or 0,
+            "bot_events": ai_signals.get("bot_actor_events") or 0,
+        }
+
+    def _new_rollup(self) -> Dict[str, Any]:
+        return {
+            "days": 0,
+            "totals": {field: 0 for field in TOTAL_FIELDS},
+            "pr_sizes": {size: 0 for size in PR_SIZES},
+            "active_hours": [0] * 24,
+            "sketches": {name: QuantileSketch(self.relative_accuracy) for name in SKETCH_FIELDS},
+        }
+
+    def _add_to_rollup(self, rollup: Dict[str, Any], repo: Dict[str, Any]):
+        rollup["days"] += 1
+        for field, value in self._repo_totals(repo).items():
+            rollup["totals"][field] += value
+
+        sizes = (repo.get("prs") or {}).get("size_distribution") or {}
+        for size, count in sizes.items():
+            rollup["pr_sizes"][size] = rollup["pr_sizes"].get(size, 0) + (count or 0)
+
+        for hour in (repo.get("work_patterns") or {}).get("active_hours") or []:
+            if 0 <= int(hour) < 24:
+                rollup["active_hours"][int(hour)] += 1
+
+        for name, (section, field) in SKETCH_FIELDS.items():
+            value = (repo.get(section) or {}).get(field)
+            if value:
+                rollup["sketches"][name].add(value)
+
+    def _serialize_rollup(self, rollup: Dict[str, Any]) -> Dict[str, Any]:
+        totals = {k: (round(v, 4) if isinstance(v, float) else v) for k, v in rollup["totals"].items()}
+        return {
+            "days": rollup["days"],
+            "totals": totals,
+            "pr_sizes": rollup["pr_sizes"],
+            "active_hours": rollup["active_hours"],
+            "sketches": {name: sketch.to_dict() for name, sketch in rollup["sketches"].items()},
+        }
+
+    def build_rollups(self, daily: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate daily records into contiguous weekly and monthly periods."""
+        if not daily:
+            return {"week": [], "month": []}
+
+        first = date.fromisoformat(daily[0]["date"])
+        last = date.fromisoformat(daily[-1]["date"])
+
+        # Emit every calendar period between the first and last day, even empty
+        # ones, so the dashboard can walk periods without gaps.
+        periods: Dict[str, List[Dict[str, Any]]] = {"week": [], "month": []}
+        index: Dict[str, Dict[date, Dict[str, Any]]] = {"week": {}, "month": {}}
+
+        cursor = iso_week_start(first)
+        while cursor <= last:
+            end = cursor + timedelta(days=6)
+            iso = cursor.isocalendar()
+            period = {"key": f"{iso[0]}-W{iso[1]:02d}", "start": cursor.isoformat(),
+                      "end": end.isoformat(), "repos": {}}
+            periods["week"].append(period)
+            index["week"][cursor] = period
+            cursor = end + timedelta(days=1)
+
+        cursor = month_start(first)
+        while cursor <= last:
+            end = month_end(cursor)
+            period = {"key": cursor.strftime("%Y-%m"), "start": cursor.isoformat(),
+                      "end": end.isoformat(), "repos": {}}
+            periods["month"].append(period)
+            index["month"][cursor] = period
+            cursor = end + timedelta(days=1)
+
+        for day_data in daily:
+            day = date.fromisoformat(day_data["date"])
+            owners = (index["week"][iso_week_start(day)], index["month"][month_start(day)])
+            for repo in day_data.get("repos", []):
+                for period in owners:
+                    rollup = period["repos"].setdefault(repo["name"], self._new_rollup())
+                    self._add_to_rollup(rollup, repo)
+
+        for granularity in periods.values():
+            for period in granularity:
+                period["repos"] = {name: self._serialize_rollup(rollup)
+                                   for name, rollup in period["repos"].items()}
+
+        return periods
+
+    def build_chunks(self, daily: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Split daily records into one chunk per calendar month."""
+        chunks: Dict[str, Dict[str, Any]] = {}
+        for day_data in daily:
+            key = day_data["date"][:7]
+            chunk = chunks.setdefault(key, {"key": key, "daily": []})
+            chunk["daily"].append(day_data)
+
+        for chunk in chunks.values():
+            chunk["start"] = chunk["daily"][0]["date"]
+            chunk["end"] = chunk["daily"][-1]["date"]
+
+        return [chunks[key] for key in sorted(chunks)]
+
+    def build(self) -> Dict[str, Any]:
+        """Write manifest, rollups and chunks; return the manifest."""
+        daily = sorted(self.data.get("daily", []), key=lambda d: d["date"])
+        repo_names = []
+        for day_data in daily:
+            for repo in day_data.get("repos", []):
+                if repo["name"] not in repo_names:
+                    repo_names.append(repo["name"])
+
+        chunks = self.build_chunks(daily)
+        rollups = self.build_rollups(daily)
+
+        # Start from a clean output directory so stale chunks never linger
+        chunks_dir = self.output_path / "chunks"
+        if chunks_dir.exists():
+            shutil.rmtree(chunks_dir)
+        chunks_dir.mkdir(parents=True)
+
+        chunk_index = []
+        for chunk in chunks:
+            if self.chunk_format == "columnar":
+                filename = f"chunks/{chunk['key']}.wrc"
+                (self.output_path / filename).write_bytes(encode_daily(chunk["daily"]))
+            else:
+                filename = f"chunks/{chunk['key']}.json"
+                self._write_json(self.output_path / filename, {
+                    "start": chunk["start"], "end": chunk["end"], "daily": chunk["daily"]
+                })
+            chunk_index.append({"key": chunk["key"], "start": chunk["start"],
+                                "end": chunk["end"], "days": len(chunk["daily"]),
+                                "format": self.chunk_format, "file": filename})
+
+        self._write_json(self.output_path / "rollups.json", {
+            "sketch_relative_accuracy": self.relative_accuracy,
+            "week": rollups["week"],
+            "month": rollups["month"],
+        })
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "generated_at": datetime.now().isoformat(),
+            "source": {
+                "file": self.source_path.name,
+                "sha256": hashlib.sha256(self.source_bytes).hexdigest(),
+            },
+            "metadata": self.data.get("metadata", {}),
+            "aggregates": self.data.get("aggregates", {}),
+            "repos": repo_names,
+            "dates": {
+                "start": daily[0]["date"] if daily else None,
+                "end": daily[-1]["date"] if daily else None,
+                "count": len(daily),
+            },
+            "rollups": "rollups.json",
+            "chunks": chunk_index,
+        }
+        self._write_json(self.output_path / "manifest.json", manifest)
+        return manifest
+
+    def _write_json(self, path: Path, payload: Dict[str, Any]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(",", ":"), ensure_ascii=False)
+
+
+@job("build_dashboard_data")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-aggregate work_review.json for the activity dashboard",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Build docs/data/ from docs/work_review.json
+  python scripts/build_dashboard_data.py
+
+  # Build from another source file into a custom directory
+  python scripts/build_dashboard_data.py --source work_review.json --output /tmp/data
+        """
+    )
+
+    parser.add_argument("--source", type=str,
+                       help="work_review.json to aggregate (default: docs/work_review.json)")
+    parser.add_argument("--output", type=str,
+                       help="Output directory (default: docs/data/)")
+    parser.add_argument("--accuracy", type=float, default=DEFAULT_RELATIVE_ACCURACY,
+                       help="Relative accuracy of the median sketches")
+    parser.add_argument("--chunk-format", choices=["columnar", "json"], default="columnar",
+                       help="Encoding of the daily chunk files")
+
+    args = parser.parse_args()
+
+    try:
+        builder = DashboardDataBuilder(source=args.source, output=args.output,
+                                       relative_accuracy=args.accuracy,
+                                       chunk_format=args.chunk_format)
+    except FileNotFoundError as e:
+        print(f"❌ Source file not found: {e.filename}")
+        sys.exit(1)
+
+    manifest = builder.build()
+    print(f"✅ Dashboard data written to {builder.output_path}")
+    print(f"   📅 {manifest['dates']['count']} days ({manifest['dates']['start']} → {manifest['dates']['end']})")
+    print(f"   📦 {len(manifest['chunks'])} chunks, {len(manifest['repos'])} repos")
+
+
+if __name__ == "__main__":
+    main()
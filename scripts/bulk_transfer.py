@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Bulk Story Import/Export
+
+Streams stories in and out of the backlog as NDJSON or CSV (API-004,
+RPT-004) without loading the whole file:
+
+- import: records are decoded one at a time (record_stream.py), validated
+  and created through the normal ingestion flow (StoryIngestor), and
+  committed to the JSON views in chunks. Rows that fail are written to an
+  errors file with their row number and reason. After every committed
+  chunk a checkpoint records the byte offset reached, so an interrupted
+  import continues with ``--resume`` instead of starting over.
+- export: stories are encoded and written one by one, optionally filtered
+  with the backlog query language (backlog_query.py).
+
+The importer's working set is one chunk of records. The backlog itself is
+still held by BacklogStore, and each commit rewrites its JSON views, so the
+chunk grows with the backlog (at least 10% of its size) to keep the total
+rewrite cost linear for very large imports.
+"""
+
+import json
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from backlog_query import BacklogQuery, QueryError
+from backlog_store import BacklogStore, StoryIndex
+from ingest_stories import StoryIngestor
+from metrics import job
+from record_stream import detect_format, encode_stories, iter_records
+
+# Fields an import (or API update) may change on an existing story
+EDITABLE_FIELDS = {"title", "estimate", "labels", "dependencies", "owner", "priority", "branch_name"}
+CONFLICT_MODES = ("skip", "overwrite", "merge")
+DEFAULT_CHUNK_SIZE = 1000
+CHECKPOINT_DIR = Path(".cache") / "bulk_import"
+
+
+class StreamingImporter:
+    def __init__(self, base_path: str = ".", store: Optional[BacklogStore] = None,
+                 on_conflict: str = "skip", preview: bool = False,
+                 ingestor: Optional[StoryIngestor] = None):
+        if on_conflict not in CONFLICT_MODES:
+            raise ValueError(f"on_conflict must be one of {CONFLICT_MODES}")
+        self.base_path = Path(base_path)
+        self.on_conflict = on_conflict
+        self.preview = preview
+
+        # Load data
+        self.store = store or BacklogStore(base_path)
+        self.ingestor = ingestor or StoryIngestor(base_path, store=self.store)
+        self.counts: Dict[str, int] = {}
+
+    def _count(self, result: str):
+        self.counts[result] = self.counts.get(result, 0) + 1
+
+    def apply(self, record: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]], List[str]]:
+        """Import one record; returns (result, story, details).
+
+        result is created, updated, skipped, would_create or error; details
+        are the validation errors, or the changed fields of an update.
+        """
+        story_id = record.get("id")
+        existing = self.store.priority_by_id.get(story_id) if story_id else None
+        if existing is not None:
+            if self.on_conflict == "skip":
+                self._count("skipped")
+                return "skipped", existing, []
+            updates = {k: v for k, v in record.items() if k in EDITABLE_FIELDS}
+            if self.on_conflict == "merge":
+                updates = {k: v for k, v in updates.items() if existing.get(k) in (None, "", [])}
+            is_valid, errors = self.ingestor._validate_update(updates)
+            if not is_valid:
+                self._count("error")
+                return "error", None, errors
+            if not self.preview and updates:
+                existing.update(updates)
+                # Synced fields go to the story file too, or backlog_sync.py would revert them
+                self.ingestor.update_story_file(existing, updates)
+                self.store.touch()
+            self._count("updated")
+            return "updated", existing, sorted(updates)
+
+        story_data = dict(record)
+        is_valid, errors = self.ingestor._validate_story(story_data)
+        if not is_valid:
+            self._count("error")
+            return "error", None, errors
+        if self.preview:
+            self._count("would_create")
+            return "would_create", None, []
+
+        # Ingestion prints per-story progress for the interactive CLI
+        with contextlib.redirect_stdout(io.StringIO()):
+            created = self.ingestor._process_single_story(story_data)
+        if not created:
+            self._count("error")
+            return "error", None, ["Story could not be created"]
+        self._count("created")
+        return "created", self.store.priority_by_id.get(story_data["id"], story_data), []
+
+    def chunk_limit(self, chunk_size: int) -> int:
+        """Rows per commit: at least ``chunk_size``, growing with the backlog."""
+        return max(chunk_size, len(self.store.prioritization["backlog"]) // 10)
+
+    # ------------------------------------------------------------------ files
+
+    @staticmethod
+    def _fingerprint(path: Path) -> Dict[str, Any]:
+        stat = path.stat()
+        with open(path, "rb") as f:
+            head = hashlib.sha1(f.read(64 * 1024)).hexdigest()
+        return {"source": str(path), "size": stat.st_size, "mtime": stat.st_mtime, "head": head}
+
+    def import_file(self, source: Path, fmt: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    checkpoint_path: Optional[Path] = None, errors_path: Optional[Path] = None,
+                    resume: bool = False, progress: bool = True) -> Dict[str, Any]:
+        source = Path(source)
+        fmt = fmt or detect_format(str(source))
+        checkpoint_path = checkpoint_path or CHECKPOINT_DIR / f"{source.name}.checkpoint.json"
+        errors_path = errors_path or CHECKPOINT_DIR / f"{source.name}.errors.ndjson"
+        fingerprint = self._fingerprint(source)
+
+        state = {**fingerprint, "format": fmt, "offset": 0, "row": 0, "errors_size": 0,
+                 "counts": {}, "chunks": 0, "complete": False}
+        if resume and checkpoint_path.exists():
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if any(saved.get(k) != fingerprint[k] for k in ("size", "mtime", "head")):
+                raise ValueError(f"{source} changed since the checkpoint was written; "
+                                 f"remove {checkpoint_path} to start over")
+            if saved.get("complete"):
+                return {**saved, "resumed": True}
+            state.update(saved)
+            self.counts = dict(saved.get("counts", {}))
+
+        if not self.preview:
+            errors_path.parent.mkdir(parents=True, exist_ok=True)
+            checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        # Errors past the checkpoint belong to rows that will be re-read
+        errors_file = open(errors_path, "a+b") if not self.preview else None
+        if errors_file is not None:
+            errors_file.truncate(state["errors_size"])
+            errors_file.seek(0, os.SEEK_END)
+
+        started = time.monotonic()
+        pending = 0
+        try:
+            for row, offset, record, error in iter_records(source, fmt, state["offset"], state["row"]):
+                if error:
+                    result, errors = "error", [error]
+                    self._count("error")
+                else:
+                    result, _, errors = self.apply(record)
+                if result == "error" and errors_file is not None:
+                    entry = {"row": row, "id": (record or {}).get("id"), "errors": errors}
+                    errors_file.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+
+                state["offset"], state["row"] = offset, row
+                pending += 1
+                if pending >= self.chunk_limit(chunk_size):
+                    self._commit_chunk(state, checkpoint_path, errors_file)
+                    pending = 0
+                    if progress:
+                        rate = state["row"] / max(time.monotonic() - started, 1e-9)
+                        print(f"   💾 Row {state['row']:,} committed ({rate:,.0f} rows/s)")
+
+            state["complete"] = True
+            self._commit_chunk(state, checkpoint_path, errors_file)
+        finally:
+            if errors_file is not None:
+                errors_file.close()
+
+        state["errors_path"] = str(errors_path) if self.counts.get("error") and not self.preview else None
+        state["elapsed_seconds"] = round(time.monotonic() - started, 2)
+        return state
+
+    def _commit_chunk(self, state: Dict[str, Any], checkpoint_path: Path, errors_file):
+        state["counts"] = dict(self.counts)
+        if self.preview:
+            return
+        # Story files and JSON views first, then the checkpoint that points past them
+        self.store.commit()
+        errors_file.flush()
+        os.fsync(errors_file.fileno())
+        state["errors_size"] = errors_file.tell()
+        state["chunks"] += 1
+        tmp = checkpoint_path.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, checkpoint_path)
+
+
+def export_stories(output, fmt: str = "ndjson", query: str = "", base_path: str = ".") -> int:
+    """Write stories matching ``query`` to a binary stream; returns the count."""
+    store = BacklogStore(base_path)
+    index = StoryIndex(store.prioritization["backlog"])
+    result = BacklogQuery(index, query).run()
+    if "stories" not in result:
+        raise QueryError("Exports need a filter query, not 'group by'")
+    # Hand the stories over lazily; the encoded output is never held in full
+    for chunk in encode_stories(result["stories"], fmt):
+        output.write(chunk)
+    return len(result["stories"])
+
+
+@job("bulk_transfer")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream stories in and out of the backlog as NDJSON or CSV",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Import, committing every 1000 rows; bad rows go to an errors file
+  python scripts/bulk_transfer.py import stories.ndjson
+
+  # Check a CSV without writing anything
+  python scripts/bulk_transfer.py import stories.csv --preview
+
+  # Continue an interrupted import from its checkpoint
+  python scripts/bulk_transfer.py import stories.ndjson --resume
+
+  # Export open UI stories as CSV
+  python scripts/bulk_transfer.py export ui.csv --query "epic=ui and not status in (completed,accepted)"
+        """
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import stories from NDJSON or CSV")
+    import_parser.add_argument("source", type=str, help="NDJSON (.ndjson/.jsonl) or CSV file")
+    import_parser.add_argument("--format", choices=["ndjson", "csv"],
+                              help="Input format (default: from the file extension)")
+    import_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                              help=f"Minimum rows per commit (default: {DEFAULT_CHUNK_SIZE})")
+    import_parser.add_argument("--on-conflict", choices=CONFLICT_MODES, default="skip",
+                              help="What to do with IDs that already exist (default: skip)")
+    import_parser.add_argument("--preview", action="store_true",
+                              help="Validate only; write nothing")
+    import_parser.add_argument("--resume", action="store_true",
+                              help="Continue from the last checkpoint")
+    import_parser.add_argument("--checkpoint", type=str,
+                              help=f"Checkpoint file (default: {CHECKPOINT_DIR}/<name>.checkpoint.json)")
+    import_parser.add_argument("--errors", type=str,
+                              help=f"Per-row error report (default: {CHECKPOINT_DIR}/<name>.errors.ndjson)")
+
+    export_parser = subparsers.add_parser("export", help="Export stories to NDJSON or CSV")
+    export_parser.add_argument("output", type=str, help="Output file, or - for stdout")
+    export_parser.add_argument("--format", choices=["ndjson", "csv"],
+                              help="Output format (default: from the file extension)")
+    export_parser.add_argument("--query", type=str, default="",
+                              help="Filter with the backlog query language")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        fmt = args.format or detect_format(args.output)
+        try:
+            if args.output == "-":
+                count = export_stories(sys.stdout.buffer, fmt, args.query)
+            else:
+                with open(args.output, "wb") as f:
+                    count = export_stories(f, fmt, args.query)
+        except QueryError as e:
+            print(f"❌ Invalid query: {e}")
+            sys.exit(1)
+        if args.output != "-":
+            print(f"✅ Exported {count} stories to {args.output} ({fmt})")
+        return
+
+    source = Path(args.source)
+    if not source.exists():
+        print(f"❌ File not found: {source}")
+        sys.exit(1)
+
+    importer = StreamingImporter(on_conflict=args.on_conflict, preview=args.preview)
+    print(f"📥 {'Previewing' if args.preview else 'Importing'} {source}"
+          f"{' (resuming)' if args.resume else ''}...")
+    try:
+        state = importer.import_file(source, args.format, args.chunk_size,
+                                     Path(args.checkpoint) if args.checkpoint else None,
+                                     Path(args.errors) if args.errors else None,
+                                     resume=args.resume)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    counts = state.get("counts", {})
+    print(f"\n✅ {state['row']:,} rows read in {state.get('elapsed_seconds', 0)}s: "
+          + ", ".join(f"{name} {count:,}" for name, count in sorted(counts.items())))
+    if state.get("errors_path"):
+        print(f"⚠️  Row errors written to {state['errors_path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,10 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
 
+from estimates import canonical_estimate
+from metrics import SAVE_SECONDS, job
+from tracing import add_trace_argument, span, start_from_args, traced
+
 class DataCleaner:
     def __init__(self, base_path: str = "."):
         self.base_path = Path(base_path)
@@ -33,14 +37,6 @@ class DataCleaner:
             "unknown": "adhoc"  # Move unknown to adhoc
         }
         
-        # Standard estimate values
-        self.standard_estimates = {
-            "1": "1sp", "2": "2sp", "3": "3sp", "5": "5sp", "8": "8sp", "13": "13sp",
-            "1sp": "1sp", "2sp": "2sp", "3sp": "3sp", "5sp": "5sp", "8sp": "8sp", "13sp": "13sp",
-            "small": "2sp", "medium": "5sp", "large": "8sp", "xl": "13sp",
-            "s": "2sp", "m": "5sp", "l": "8sp"
-        }
-        
         # Default owners for epics
         self.epic_owners = {
             "adhoc": "Planning Team",
@@ -57,10 +53,14 @@ class DataCleaner:
     
     def load_prioritization_data(self) -> Dict[str, Any]:
         """Load current prioritization data."""
+        # Imported on first load so that --help skips the store
+        from backlog_store import load_view
+
         json_file = self.backlog_path / "PRIORITIZATION.json"
-        with open(json_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with span("load.prioritization"):
+            return load_view(json_file)
     
+    @traced("clean.estimates")
     def clean_estimates(self, stories: List[Dict]) -> int:
         """Clean and standardize estimate values."""
         cleaned_count = 0
@@ -92,12 +92,14 @@ class DataCleaner:
                     
                 cleaned_count += 1
             
-            elif str(estimate).lower() in self.standard_estimates:
-                story["estimate"] = self.standard_estimates[str(estimate).lower()]
+            elif canonical_estimate(estimate) not in (None, story["estimate"]):
+                # Points and t-shirt sizes become "Nsp"; durations stay as written
+                story["estimate"] = canonical_estimate(estimate)
                 cleaned_count += 1
         
         return cleaned_count
     
+    @traced("clean.epics")
     def clean_epics(self, stories: List[Dict]) -> int:
         """Standardize epic names."""
         cleaned_count = 0
@@ -112,6 +114,7 @@ class DataCleaner:
         
         return cleaned_count
     
+    @traced("clean.owners")
     def clean_owners(self, stories: List[Dict]) -> int:
         """Assign owners based on epic when missing."""
         cleaned_count = 0
@@ -125,6 +128,7 @@ class DataCleaner:
         
         return cleaned_count
     
+    @traced("clean.priorities")
     def clean_priorities(self, stories: List[Dict]) -> int:
         """Smart priority assignment for unprocessed stories."""
         cleaned_count = 0
@@ -156,6 +160,7 @@ class DataCleaner:
         
         return cleaned_count
     
+    @traced("clean.titles")
     def clean_titles(self, stories: List[Dict]) -> int:
         """Clean up long titles and improve formatting."""
         cleaned_count = 0
@@ -183,6 +188,7 @@ class DataCleaner:
         
         return cleaned_count
     
+    @traced("clean.labels")
     def clean_labels(self, stories: List[Dict]) -> int:
         """Add missing labels and standardize existing ones."""
         cleaned_count = 0
@@ -268,8 +274,11 @@ class DataCleaner:
         
         # Save cleaned data
         output_file = self.backlog_path / "PRIORITIZATION.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with span("serialize.prioritization"), SAVE_SECONDS.time(view="prioritization", phase="serialize"):
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+        with span("write.prioritization"), SAVE_SECONDS.time(view="prioritization", phase="write"):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(text)
         
         print("\n✅ Data cleanup completed!")
         print(f"📈 Improvements made:")
@@ -341,14 +350,17 @@ class DataCleaner:
         return report
 
 
+@job("cleanup_data")
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Clean up AI Sports Analytics Planning data")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be cleaned without making changes")
     parser.add_argument("--report", action="store_true", help="Generate cleanup report")
+    add_trace_argument(parser)
     
     args = parser.parse_args()
+    start_from_args(args)
     
     cleaner = DataCleaner()
     
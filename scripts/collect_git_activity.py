@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Local Git Activity Collector
+
+Fills the commit section of work_review.json from local clones of the repos
+listed in ``metadata.repos_included``. Each repo's ``git log --numstat`` is
+streamed and parsed in its own worker thread, and the results are folded
+into the day x repo records:
+
+- commits.count, commits.authors
+- commits.lines_added / lines_deleted / files_changed
+- commits.commit_time_distribution and work_patterns.active_hours
+- commits.commit_message_ai_markers_count (mirrored to ai_signals.commit_markers)
+
+The last processed commit of every repo is stored in
+``metadata.collection_cursors``, so a rerun only reads commits made since
+the previous run. A repo without a cursor (or whose cursor is no longer an
+ancestor of HEAD, e.g. after a force push) has its commit fields rebuilt
+from scratch for the collection window. When a run skips commits dated
+after its end date (``--end-date`` in the past), no cursor is stored: a
+cursor at HEAD would hide those commits from every later run, so the next
+run rebuilds its window instead.
+"""
+
+import json
+import argparse
+import re
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from datetime import date, datetime, timedelta, timezone
+
+from ai_marker_scanner import MarkerAutomaton
+from metrics import job
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+    ZoneInfoNotFoundError = Exception
+
+# git log --format: record separator, fields separated by unit separators,
+# and a group separator closing the (possibly multi-line) message body.
+LOG_FORMAT = "%x1e%H%x1f%at%x1f%an%x1f%ae%x1f%B%x1d"
+
+FILES_CHANGED_PATTERN = re.compile(r"^(\d+|-)\t(\d+|-)\t(.+)$")
+
+
+def empty_repo_day(name: str) -> Dict[str, Any]:
+    """Return a day x repo record with every work_review.json field zeroed."""
+    return {
+        "name": name,
+        "commits": {
+            "count": 0,
+            "authors": [],
+            "lines_added": 0,
+            "lines_deleted": 0,
+            "files_changed": 0,
+            "commit_message_ai_markers_count": 0,
+            "commit_time_distribution": {str(hour): 0 for hour in range(24)},
+        },
+        "prs": {
+            "opened_count": 0,
+            "merged_count": 0,
+            "closed_unmerged_count": 0,
+            "time_to_first_review_seconds_median": None,
+            "time_to_merge_seconds_median": None,
+            "review_count": 0,
+            "comment_count": 0,
+            "additions_sum": 0,
+            "deletions_sum": 0,
+            "size_distribution": {"small": 0, "medium": 0, "large": 0, "xlarge": 0},
+            "ai_markers_count": 0,
+            "bots_participating": [],
+        },
+        "reviews": {
+            "code_reviews_count": 0,
+            "unique_reviewers": 0,
+            "review_comments_count": 0,
+            "human_vs_bot_reviews": {"human_count": 0, "bot_count": 0},
+        },
+        "issues": {
+            "opened_count": 0,
+            "closed_count": 0,
+            "time_to_close_seconds_median": None,
+            "with_ai_label_count": 0,
+            "comments_count": 0,
+        },
+        "workflows": {
+            "runs_count": 0,
+            "success_rate": None,
+            "mean_duration_seconds": None,
+            "flaky_runs_count": 0,
+            "failed_runs_link_samples": [],
+        },
+        "dora_like": {
+            "lead_time_for_changes_seconds_median": None,
+            "deployment_frequency_count": 0,
+            "change_failure_rate": None,
+            "mean_time_to_recover_seconds_median": None,
+        },
+        "work_patterns": {
+            "active_hours": [],
+            "focus_ratio": None,
+            "context_switch_count": 0,
+        },
+        "ai_signals": {
+            "commit_markers": 0,
+            "pr_markers": 0,
+            "file_signature_hits": 0,
+            "bot_actor_events": 0,
+            "prompt_artifacts_detected": False,
+            "examples_links": [],
+        },
+    }
+
+
+def _new_day_stats() -> Dict[str, Any]:
+    return {
+        "count": 0,
+        "authors": {},
+        "lines_added": 0,
+        "lines_deleted": 0,
+        "files_changed": 0,
+        "ai_markers": 0,
+        "hours": [0] * 24,
+    }
+
+
+class RepoLogReader:
+    """Streams ``git log --numstat`` for one clone into per-day commit stats."""
+
+    def __init__(self, name: str, path: Path, tz, start: date, end: date,
+                 cursor: Optional[str] = None):
+        self.name = name
+        self.path = path
+        self.tz = tz
+        self.start = start
+        self.end = end
+        self.cursor = cursor
+        self.ai_markers = MarkerAutomaton()
+
+    def _git(self, *args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", "-C", str(self.path), *args],
+                              capture_output=True, text=True)
+
+    def head(self) -> Optional[str]:
+        result = self._git("rev-parse", "HEAD")
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def cursor_is_valid(self, head: str) -> bool:
+        if not self.cursor:
+            return False
+        return self._git("merge-base", "--is-ancestor", self.cursor, head).returncode == 0
+
+    def _commit_day(self, timestamp: int):
+        moment = datetime.fromtimestamp(timestamp, tz=timezone.utc).astimezone(self.tz)
+        return moment.date(), moment.hour
+
+    def read(self) -> Dict[str, Any]:
+        """Collect stats for commits after the cursor (or the whole window)."""
+        result = {"name": self.name, "head": None, "cursor": None, "incremental": False,
+                  "commits_processed": 0, "days": {}, "error": None}
+
+        head = self.head()
+        if head is None:
+            result["error"] = f"not a git repository: {self.path}"
+            return result
+        result["head"] = result["cursor"] = head
+
+        args = ["log", "--numstat", f"--format={LOG_FORMAT}",
+                f"--since={self.start.isoformat()} 00:00"]
+        if self.cursor_is_valid(head):
+            result["incremental"] = True
+            if self.cursor == head:
+                return result
+            args.append(f"{self.cursor}..{head}")
+        else:
+            args.append(head)
+
+        # stderr goes to a file: an undrained pipe could fill up and block git
+        errors = tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace")
+        process = subprocess.Popen(["git", "-C", str(self.path), *args],
+                                   stdout=subprocess.PIPE, stderr=errors,
+                                   text=True, encoding="utf-8", errors="replace")
+
+        stats = None
+        message_lines: List[str] = []
+        in_message = False
+        for line in process.stdout:
+            if line.startswith("\x1e"):
+                # New commit header: hash, author time, name, email, message start
+                fields = line[1:].split("\x1f")
+                _, timestamp, author, email = fields[:4]
+                message_lines = [fields[4]] if len(fields) > 4 else []
+                in_message = True
+                stats = None
+
+                day, hour = self._commit_day(int(timestamp))
+                if self.start <= day <= self.end:
+                    stats = result["days"].setdefault(day.isoformat(), _new_day_stats())
+                    stats["count"] += 1
+                    stats["hours"][hour] += 1
+                    login = author or email
+                    stats["authors"][login] = stats["authors"].get(login, 0) + 1
+                    result["commits_processed"] += 1
+                elif day > self.end:
+                    # Left for a later window, so HEAD is not a safe cursor
+                    result["cursor"] = None
+
+                if message_lines and "\x1d" in message_lines[0]:
+                    in_message = False
+                    self._finish_message(stats, message_lines)
+                continue
+
+            if in_message:
+                message_lines.append(line)
+                if "\x1d" in line:
+                    in_message = False
+                    self._finish_message(stats, message_lines)
+                continue
+
+            match = FILES_CHANGED_PATTERN.match(line.rstrip("\n"))
+            if match and stats is not None:
+                added, deleted, _ = match.groups()
+                stats["lines_added"] += int(added) if added != "-" else 0
+                stats["lines_deleted"] += int(deleted) if deleted != "-" else 0
+                stats["files_changed"] += 1
+
+        process.wait()
+        if process.returncode != 0:
+            errors.seek(0)
+            result["error"] = errors.read().strip() or f"git log exited with {process.returncode}"
+        errors.close()
+        return result
+
+    def _finish_message(self, stats: Optional[Dict[str, Any]], lines: List[str]):
+        if stats is None:
+            return
+        message = "".join(lines).split("\x1d", 1)[0]
+        if self.ai_markers.has_marker(message):
+            stats["ai_markers"] += 1
+
+
+class GitActivityCollector:
+    def __init__(self, base_path: str = ".", review: Optional[str] = None,
+                 repos_root: Optional[str] = None,
+                 repo_paths: Optional[Dict[str, str]] = None,
+                 end_date: Optional[date] = None, days_back: Optional[int] = None,
+                 workers: int = 4):
+        self.base_path = Path(base_path)
+        self.review_path = Path(review) if review else self.base_path / "docs" / "work_review.json"
+        self.repos_root = Path(repos_root) if repos_root else self.base_path.resolve().parent
+        self.repo_paths = {name: Path(path) for name, path in (repo_paths or {}).items()}
+        self.workers = workers
+
+        # Load data
+        with open(self.review_path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+
+        self.metadata = self.data.setdefault("metadata", {})
+        window = self.metadata.setdefault("window", {})
+        self.tz = self._load_timezone(window.get("timezone", "UTC"))
+        self.days_back = days_back or window.get("days_back", 14)
+        self.end_date = end_date or datetime.now(self.tz).date()
+        self.start_date = self.end_date - timedelta(days=self.days_back)
+
+    def _load_timezone(self, name: str):
+        if ZoneInfo is None:
+            print(f"⚠️  zoneinfo unavailable, using UTC instead of {name}")
+            return timezone.utc
+        try:
+            return ZoneInfo(name)
+        except ZoneInfoNotFoundError:
+            print(f"⚠️  Unknown timezone {name}, using UTC")
+            return timezone.utc
+
+    def repo_path(self, name: str) -> Path:
+        return self.repo_paths.get(name, self.repos_root / name)
+
+    def collect(self) -> List[Dict[str, Any]]:
+        """Read every repo in parallel and fold the results into the data."""
+        cursors = self.metadata.setdefault("collection_cursors", {})
+        readers = []
+        for name in self.metadata.get("repos_included", []):
+            path = self.repo_path(name)
+            if not (path / ".git").exists() and not (path / "HEAD").exists():
+                print(f"⚠️  Skipping {name}: no clone at {path}")
+                continue
+            cursor = (cursors.get(name) or {}).get("commit")
+            readers.append(RepoLogReader(name, path, self.tz, self.start_date,
+                                         self.end_date, cursor))
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            results = list(executor.map(lambda reader: reader.read(), readers))
+
+        for result in results:
+            if result["error"]:
+                print(f"❌ {result['name']}: {result['error']}")
+                continue
+            if not result["incremental"]:
+                self._reset_commit_fields(result["name"])
+            self._apply(result)
+            if result["cursor"]:
+                cursors[result["name"]] = {
+                    "commit": result["cursor"],
+                    "collected_at": datetime.now(timezone.utc).isoformat(),
+                }
+            else:
+                cursors.pop(result["name"], None)
+
+        self._update_aggregates()
+        self.metadata["window"].update({
+            "days_back": self.days_back,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+        })
+        self.metadata["generated_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        return results
+
+    def _repo_day(self, day: str, name: str) -> Dict[str, Any]:
+        daily = self.data.setdefault("daily", [])
+        day_data = next((d for d in daily if d["date"] == day), None)
+        if day_data is None:
+            day_data = {"date": day, "repos": []}
+            daily.append(day_data)
+            daily.sort(key=lambda d: d["date"])
+        repo = next((r for r in day_data["repos"] if r["name"] == name), None)
+        if repo is None:
+            repo = empty_repo_day(name)
+            day_data["repos"].append(repo)
+        return repo
+
+    def _reset_commit_fields(self, name: str):
+        """Zero the commit fields of one repo inside the collection window."""
+        for day_data in self.data.get("daily", []):
+            if not self.start_date.isoformat() <= day_data["date"] <= self.end_date.isoformat():
+                continue
+            for repo in day_data.get("repos", []):
+                if repo["name"] != name:
+                    continue
+                template = empty_repo_day(name)
+                repo["commits"] = template["commits"]
+                repo.setdefault("work_patterns", template["work_patterns"])["active_hours"] = []
+                repo.setdefault("ai_signals", template["ai_signals"])["commit_markers"] = 0
+
+    def _apply(self, result: Dict[str, Any]):
+        for day, stats in result["days"].items():
+            repo = self._repo_day(day, result["name"])
+            commits = repo.setdefault("commits", empty_repo_day(result["name"])["commits"])
+
+            commits["count"] = (commits.get("count") or 0) + stats["count"]
+            commits["lines_added"] = (commits.get("lines_added") or 0) + stats["lines_added"]
+            commits["lines_deleted"] = (commits.get("lines_deleted") or 0) + stats["lines_deleted"]
+            commits["files_changed"] = (commits.get("files_changed") or 0) + stats["files_changed"]
+            commits["commit_message_ai_markers_count"] = (
+                (commits.get("commit_message_ai_markers_count") or 0) + stats["ai_markers"])
+
+            authors = {a["login"]: a["count"] for a in commits.get("authors") or []}
+            for login, count in stats["authors"].items():
+                authors[login] = authors.get(login, 0) + count
+            commits["authors"] = [{"login": login, "count": count}
+                                  for login, count in sorted(authors.items(), key=lambda x: -x[1])]
+
+            distribution = commits.get("commit_time_distribution") or {}
+            for hour, count in enumerate(stats["hours"]):
+                distribution[str(hour)] = (distribution.get(str(hour)) or 0) + count
+            commits["commit_time_distribution"] = distribution
+
+            work_patterns = repo.setdefault("work_patterns", {})
+            active = set(work_patterns.get("active_hours") or [])
+            active.update(hour for hour, count in enumerate(stats["hours"]) if count)
+            work_patterns["active_hours"] = sorted(active)
+
+            ai_signals = repo.setdefault("ai_signals", {})
+            ai_signals["commit_markers"] = commits["commit_message_ai_markers_count"]
+
+    def _update_aggregates(self):
+        """Recompute the commit totals in aggregates.by_repo from the daily records."""
+        by_repo = self.data.setdefault("aggregates", {}).setdefault("by_repo", [])
+        totals: Dict[str, Dict[str, int]] = {}
+        for day_data in self.data.get("daily", []):
+            for repo in day_data.get("repos", []):
+                commits = repo.get("commits") or {}
+                entry = totals.setdefault(repo["name"], {"commits": 0, "lines_added": 0, "lines_deleted": 0})
+                entry["commits"] += commits.get("count") or 0
+                entry["lines_added"] += commits.get("lines_added") or 0
+                entry["lines_deleted"] += commits.get("lines_deleted") or 0
+
+        for name, entry in totals.items():
+            aggregate = next((a for a in by_repo if a.get("name") == name), None)
+            if aggregate is None:
+                aggregate = {"name": name, "totals": {}}
+                by_repo.append(aggregate)
+            aggregate.setdefault("totals", {}).update(entry)
+
+    def save(self):
+        with open(self.review_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+
+
+@job("collect_git_activity")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Collect commit activity from local clones into work_review.json",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Read clones that sit next to this repository (../<repo-name>)
+  python scripts/collect_git_activity.py
+
+  # Read clones from another directory and point one repo elsewhere
+  python scripts/collect_git_activity.py --repos-root ~/src --repo nfl-predictions=/srv/nfl
+
+  # Collect a fixed window ending on a given day
+  python scripts/collect_git_activity.py --end-date 2025-09-04 --days-back 14
+        """
+    )
+
+    parser.add_argument("--review", type=str,
+                       help="work_review.json to update (default: docs/work_review.json)")
+    parser.add_argument("--repos-root", type=str,
+                       help="Directory containing one clone per repo (default: parent directory)")
+    parser.add_argument("--repo", action="append", default=[], metavar="NAME=PATH",
+                       help="Explicit clone path for one repo (repeatable)")
+    parser.add_argument("--end-date", type=str,
+                       help="Last day of the collection window (default: today)")
+    parser.add_argument("--days-back", type=int,
+                       help="Window length in days (default: metadata.window.days_back)")
+    parser.add_argument("--workers", type=int, default=4,
+                       help="Number of repos read in parallel")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Collect and report without writing work_review.json")
+
+    args = parser.parse_args()
+
+    repo_paths = {}
+    for entry in args.repo:
+        name, sep, path = entry.partition("=")
+        if not sep:
+            print(f"❌ Invalid --repo value: {entry} (expected NAME=PATH)")
+            sys.exit(1)
+        repo_paths[name] = path
+
+    try:
+        collector = GitActivityCollector(
+            review=args.review, repos_root=args.repos_root, repo_paths=repo_paths,
+            end_date=date.fromisoformat(args.end_date) if args.end_date else None,
+            days_back=args.days_back, workers=args.workers)
+    except FileNotFoundError as e:
+        print(f"❌ work_review.json not found: {e.filename}")
+        sys.exit(1)
+
+    print(f"📅 Window {collector.start_date} → {collector.end_date}")
+    results = collector.collect()
+    for result in results:
+        if result["error"]:
+            continue
+        mode = "incremental" if result["incremental"] else "full"
+        print(f"   📦 {result['name']}: {result['commits_processed']} commits ({mode})")
+        if not result["cursor"]:
+            print(f"      ⚠️  Commits after {collector.end_date} skipped; no cursor stored, next run rebuilds")
+
+    if args.dry_run:
+        print("🔍 Dry run - work_review.json not written")
+        return
+
+    collector.save()
+    print(f"✅ Updated {collector.review_path}")
+
+
+if __name__ == "__main__":
+    main()
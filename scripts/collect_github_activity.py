@@ -0,0 +1,721 @@
+#!/usr/bin/env python3
+"""
+GitHub Activity Collector
+
+Fills the PR, review, issue and workflow sections of work_review.json from
+the GitHub API while spending as little rate-limit budget as possible:
+
+- Pull requests and issues for several repos are fetched in one batched
+  GraphQL query (one ``repository`` alias per repo), paging only the repos
+  that still have updates newer than their cursor.
+- Workflow runs come from the REST API with ETag / If-None-Match caching,
+  so unchanged pages cost nothing.
+- Requests run concurrently on asyncio with a bounded semaphore and wait for
+  the rate-limit reset when the remaining budget runs low.
+
+Fetched items are merged into a local store (``.cache/github_activity.json``)
+and the day records are recomputed from it, so re-fetching an item never
+double counts. ``metadata.collection_cursors[repo].github_since`` records
+the last refresh; daily runs only fetch what changed since then.
+
+Use ``--mock`` to run the whole path against github_mock_server.py fixtures.
+"""
+
+import json
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from ai_marker_scanner import MarkerAutomaton
+from collect_git_activity import empty_repo_day
+from metrics import CACHE_HITS, CACHE_MISSES, job
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+    ZoneInfoNotFoundError = Exception
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_PAGE_SIZE = 50
+REPOS_PER_QUERY = 4
+# Re-fetch a little before the cursor so clock skew never drops an update
+CURSOR_OVERLAP = timedelta(minutes=10)
+RUN_OVERLAP = timedelta(days=1)
+
+AI_LABEL_PATTERN = re.compile(r"\b(ai|copilot|llm|gpt)\b|ai-", re.IGNORECASE)
+
+# PR size buckets by additions + deletions
+PR_SIZE_LIMITS = [("small", 100), ("medium", 500), ("large", 1000)]
+
+PR_FIELDS = """
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title body createdAt updatedAt mergedAt closedAt state additions deletions
+        author { login __typename }
+        comments { totalCount }
+        reviews(first: 50) {
+          nodes { submittedAt state author { login __typename } comments { totalCount } }
+        }
+      }"""
+
+ISSUE_FIELDS = """
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number createdAt updatedAt closedAt
+        labels(first: 20) { nodes { name } }
+        comments { totalCount }
+      }"""
+
+
+class RateLimitError(Exception):
+    """Raised when the API budget is exhausted for longer than we may wait."""
+
+
+class GitHubClient:
+    """Async GitHub API client with GraphQL batching and ETag caching."""
+
+    def __init__(self, token: str, api_url: str = DEFAULT_API_URL,
+                 etags: Optional[Dict[str, Any]] = None, max_concurrency: int = 4,
+                 reserve: int = 50, max_wait: float = 900):
+        self.token = token
+        self.api_url = api_url.rstrip("/")
+        self.etags = etags if etags is not None else {}
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.usage = {"graph_ql_calls": 0, "rest_calls": 0, "not_modified": 0}
+
+    def _request(self, method: str, url: str, body: Optional[bytes],
+                 headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        request = urllib.request.Request(url, data=body, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), e.read()
+
+    def _track(self, headers: Dict[str, str]):
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+
+    async def _wait_for_budget(self):
+        if self.remaining is None or self.remaining > self.reserve:
+            return
+        wait = (self.reset_at or time.time()) - time.time() + 1
+        if wait > self.max_wait:
+            raise RateLimitError(f"rate limit low ({self.remaining} left), resets in {wait:.0f}s")
+        if wait > 0:
+            print(f"⏳ Rate limit low ({self.remaining} left), waiting {wait:.0f}s for reset")
+            await asyncio.sleep(wait)
+        self.remaining = None
+
+    async def _send(self, method: str, url: str, body: Optional[bytes] = None,
+                    headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "ai-sports-analytics-planning",
+            **(headers or {}),
+        }
+        for attempt in range(3):
+            await self._wait_for_budget()
+            async with self.semaphore:
+                status, response_headers, payload = await asyncio.to_thread(
+                    self._request, method, url, body, headers)
+            self._track(response_headers)
+
+            # Primary or secondary rate limit: back off and retry
+            if status in (403, 429) and (response_headers.get("Retry-After")
+                                         or response_headers.get("X-RateLimit-Remaining") == "0"):
+                retry_after = float(response_headers.get("Retry-After") or 0)
+                wait = retry_after or max(0.0, (self.reset_at or time.time()) - time.time() + 1)
+                if wait > self.max_wait:
+                    raise RateLimitError(f"rate limited by {url}, retry in {wait:.0f}s")
+                print(f"⏳ Rate limited, retrying in {wait:.0f}s")
+                await asyncio.sleep(wait)
+                continue
+            return status, response_headers, payload
+        raise RateLimitError(f"rate limited by {url} after 3 attempts")
+
+    async def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps({"query": query, "variables": variables}).encode("utf-8")
+        status, _, payload = await self._send("POST", f"{self.api_url}/graphql", body,
+                                              {"Content-Type": "application/json"})
+        self.usage["graph_ql_calls"] += 1
+        if status != 200:
+            raise RuntimeError(f"GraphQL request failed with HTTP {status}: {payload[:200]!r}")
+        result = json.loads(payload)
+        rate = (result.get("data") or {}).get("rateLimit")
+        if rate:
+            self.remaining = rate["remaining"]
+            self.reset_at = datetime.fromisoformat(rate["resetAt"].replace("Z", "+00:00")).timestamp()
+        return result
+
+    async def rest_get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a REST resource, revalidating cached responses with If-None-Match."""
+        resource = f"{path}?{urlencode(params)}" if params else path
+        url = f"{self.api_url}{resource}"
+        cached = self.etags.get(resource)
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+
+        status, response_headers, payload = await self._send("GET", url, headers=headers)
+        self.usage["rest_calls"] += 1
+        if status == 304 and cached:
+            self.usage["not_modified"] += 1
+            CACHE_HITS.inc(cache="github_etag")
+            return cached["body"]
+        CACHE_MISSES.inc(cache="github_etag")
+        if status != 200:
+            raise RuntimeError(f"GET {path} failed with HTTP {status}")
+
+        body = json.loads(payload)
+        etag = response_headers.get("ETag")
+        if etag:
+            self.etags[resource] = {"etag": etag, "body": body}
+        return body
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _is_bot(author: Optional[Dict[str, Any]]) -> bool:
+    if not author:
+        return False
+    return author.get("__typename") == "Bot" or author.get("login", "").endswith("[bot]")
+
+
+def _bot_login(author: Dict[str, Any]) -> str:
+    login = author.get("login", "")
+    return login if login.endswith("[bot]") else f"{login}[bot]"
+
+
+def _median(values: List[float]) -> Optional[float]:
+    return statistics.median(values) if values else None
+
+
+class GitHubActivityCollector:
+    def __init__(self, client: GitHubClient, base_path: str = ".", review: Optional[str] = None,
+                 cache: Optional[str] = None, end_date: Optional[date] = None,
+                 days_back: Optional[int] = None, page_size: int = DEFAULT_PAGE_SIZE,
+                 full: bool = False):
+        self.client = client
+        self.base_path = Path(base_path)
+        self.review_path = Path(review) if review else self.base_path / "docs" / "work_review.json"
+        self.cache_path = Path(cache) if cache else self.base_path / ".cache" / "github_activity.json"
+        self.page_size = page_size
+        self.full = full
+        self.ai_markers = MarkerAutomaton()
+
+        # Load data
+        with open(self.review_path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+        self.store = {"etags": {}, "repos": {}}
+        if self.cache_path.exists():
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.store = json.load(f)
+        self.client.etags = self.store.setdefault("etags", {})
+
+        self.metadata = self.data.setdefault("metadata", {})
+        self.owner = self.metadata.get("owner", "")
+        window = self.metadata.setdefault("window", {})
+        self.tz = self._load_timezone(window.get("timezone", "UTC"))
+        self.days_back = days_back or window.get("days_back", 14)
+        self.end_date = end_date or datetime.now(self.tz).date()
+        self.start_date = self.end_date - timedelta(days=self.days_back)
+        self.window_start = datetime.combine(self.start_date, datetime.min.time(), self.tz)
+
+    def _load_timezone(self, name: str):
+        if ZoneInfo is None:
+            return timezone.utc
+        try:
+            return ZoneInfo(name)
+        except ZoneInfoNotFoundError:
+            print(f"⚠️  Unknown timezone {name}, using UTC")
+            return timezone.utc
+
+    def _since(self, name: str) -> datetime:
+        cursor = (self.metadata.get("collection_cursors", {}).get(name) or {}).get("github_since")
+        if self.full or not cursor:
+            return self.window_start
+        return max(self.window_start, _parse_time(cursor) - CURSOR_OVERLAP)
+
+    def _repo_store(self, name: str) -> Dict[str, Dict[str, Any]]:
+        store = self.store["repos"].setdefault(name, {})
+        for key in ("prs", "issues", "runs"):
+            store.setdefault(key, {})
+        return store
+
+    # -- fetching -------------------------------------------------------
+
+    def _batch_query(self, requests: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        """Build one GraphQL query with a repository alias per pending repo."""
+        declarations = ["$since: DateTime", "$pageSize: Int!"]
+        variables: Dict[str, Any] = {"pageSize": self.page_size,
+                                     "since": min(r["since"] for r in requests).strftime("%Y-%m-%dT%H:%M:%SZ")}
+        blocks = []
+        for i, request in enumerate(requests):
+            declarations += [f"$owner{i}: String!", f"$name{i}: String!"]
+            variables[f"owner{i}"] = self.owner
+            variables[f"name{i}"] = request["name"]
+            fields = []
+            if request["prs"]:
+                declarations.append(f"$prAfter{i}: String")
+                variables[f"prAfter{i}"] = request["pr_after"]
+                fields.append(f"    pullRequests(first: $pageSize, after: $prAfter{i}, "
+                              f"orderBy: {{field: UPDATED_AT, direction: DESC}}) {{{PR_FIELDS}\n    }}")
+            if request["issues"]:
+                declarations.append(f"$issueAfter{i}: String")
+                variables[f"issueAfter{i}"] = request["issue_after"]
+                fields.append(f"    issues(first: $pageSize, after: $issueAfter{i}, filterBy: {{since: $since}}, "
+                              f"orderBy: {{field: UPDATED_AT, direction: DESC}}) {{{ISSUE_FIELDS}\n    }}")
+            blocks.append(f"  r{i}: repository(owner: $owner{i}, name: $name{i}) {{\n"
+                          + "\n".join(fields) + "\n  }")
+
+        query = (f"query ({', '.join(declarations)}) {{\n"
+                 "  rateLimit { cost remaining resetAt }\n"
+                 + "\n".join(blocks) + "\n}")
+        return query, variables
+
+    async def fetch_prs_and_issues(self, names: List[str]):
+        """Page PRs and issues for all repos, REPOS_PER_QUERY aliases per query."""
+        pending = [{"name": name, "since": self._since(name), "prs": True, "issues": True,
+                    "pr_after": None, "issue_after": None} for name in names]
+
+        while pending:
+            batches = [pending[i:i + REPOS_PER_QUERY] for i in range(0, len(pending), REPOS_PER_QUERY)]
+            results = await asyncio.gather(*(self.client.graphql(*self._batch_query(batch))
+                                             for batch in batches))
+            next_pending = []
+            for batch, result in zip(batches, results):
+                for error in result.get("errors") or []:
+                    print(f"⚠️  GraphQL: {error.get('message')}")
+                data = result.get("data") or {}
+                for i, request in enumerate(batch):
+                    repository = data.get(f"r{i}")
+                    if repository is None:
+                        continue
+                    store = self._repo_store(request["name"])
+                    request = dict(request, prs=False, issues=False)
+
+                    connection = repository.get("pullRequests")
+                    if connection:
+                        nodes = connection["nodes"]
+                        for node in nodes:
+                            if _parse_time(node["updatedAt"]) >= request["since"]:
+                                store["prs"][str(node["number"])] = self._pr_record(node)
+                        # Ordered by updatedAt: stop once a page reaches older PRs
+                        if (connection["pageInfo"]["hasNextPage"] and nodes
+                                and _parse_time(nodes[-1]["updatedAt"]) >= request["since"]):
+                            request.update(prs=True, pr_after=connection["pageInfo"]["endCursor"])
+
+                    connection = repository.get("issues")
+                    if connection:
+                        for node in connection["nodes"]:
+                            store["issues"][str(node["number"])] = self._issue_record(node)
+                        if connection["pageInfo"]["hasNextPage"]:
+                            request.update(issues=True, issue_after=connection["pageInfo"]["endCursor"])
+
+                    if request["prs"] or request["issues"]:
+                        next_pending.append(request)
+            pending = next_pending
+
+    async def fetch_workflow_runs(self, name: str):
+        """Page runs newest first until they predate the cursor.
+
+        Page URLs are stable between refreshes, so when nothing new ran the
+        first page comes back 304 Not Modified and costs no budget.
+        """
+        # Runs can finish hours after they were created; re-read a day back
+        since = self._since(name) - RUN_OVERLAP
+        store = self._repo_store(name)
+        page = 1
+        while True:
+            body = await self.client.rest_get(f"/repos/{self.owner}/{name}/actions/runs",
+                                              {"per_page": 100, "page": page})
+            runs = body.get("workflow_runs", [])
+            for run in runs:
+                store["runs"][str(run["id"])] = {
+                    "name": run.get("name"),
+                    "created_at": run["created_at"],
+                    "started_at": run.get("run_started_at") or run["created_at"],
+                    "updated_at": run.get("updated_at"),
+                    "status": run.get("status"),
+                    "conclusion": run.get("conclusion"),
+                    "attempt": run.get("run_attempt", 1),
+                    "url": run.get("html_url"),
+                }
+            if (not runs or page * 100 >= body.get("total_count", 0)
+                    or _parse_time(runs[-1]["created_at"]) < since):
+                break
+            page += 1
+
+    def _pr_record(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        author = node.get("author") or {}
+        return {
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+            "merged_at": node.get("mergedAt"),
+            "closed_at": node.get("closedAt"),
+            "additions": node.get("additions") or 0,
+            "deletions": node.get("deletions") or 0,
+            "author": author.get("login"),
+            "bot": _is_bot(author),
+            "bot_login": _bot_login(author) if _is_bot(author) else None,
+            "comments": (node.get("comments") or {}).get("totalCount", 0),
+            "ai_marker": self.ai_markers.has_marker(f"{node.get('title', '')}\n{node.get('body') or ''}"),
+            "reviews": [{
+                "submitted_at": review.get("submittedAt"),
+                "author": (review.get("author") or {}).get("login"),
+                "bot": _is_bot(review.get("author")),
+                "bot_login": _bot_login(review["author"]) if _is_bot(review.get("author")) else None,
+                "comments": (review.get("comments") or {}).get("totalCount", 0),
+            } for review in (node.get("reviews") or {}).get("nodes", []) if review.get("submittedAt")],
+        }
+
+    def _issue_record(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        labels = [label["name"] for label in (node.get("labels") or {}).get("nodes", [])]
+        return {
+            "created_at": node["createdAt"],
+            "updated_at": node["updatedAt"],
+            "closed_at": node.get("closedAt"),
+            "ai_label": any(AI_LABEL_PATTERN.search(label) for label in labels),
+            "comments": (node.get("comments") or {}).get("totalCount", 0),
+        }
+
+    # -- aggregation ----------------------------------------------------
+
+    def _local_day(self, value: Optional[str]) -> Optional[str]:
+        moment = _parse_time(value)
+        return moment.astimezone(self.tz).date().isoformat() if moment else None
+
+    def _seconds_between(self, start: str, end: str) -> float:
+        return (_parse_time(end) - _parse_time(start)).total_seconds()
+
+    def summarize_repo(self, name: str) -> Dict[str, Dict[str, Any]]:
+        """Recompute per-day prs/reviews/issues/workflows sections from the store."""
+        store = self._repo_store(name)
+        days: Dict[str, Dict[str, Any]] = {}
+
+        def day(key: Optional[str]) -> Optional[Dict[str, Any]]:
+            if key is None or not self.start_date.isoformat() <= key <= self.end_date.isoformat():
+                return None
+            if key not in days:
+                days[key] = {"opened": [], "merged": [], "closed_unmerged": 0, "reviews": [],
+                             "issues_opened": [], "issues_closed": [], "runs": [], "bots": set()}
+            return days[key]
+
+        for pr in store["prs"].values():
+            opened = day(self._local_day(pr["created_at"]))
+            if opened is not None:
+                opened["opened"].append(pr)
+                if pr["bot"]:
+                    opened["bots"].add(pr["bot_login"])
+            if pr["merged_at"]:
+                merged = day(self._local_day(pr["merged_at"]))
+                if merged is not None:
+                    merged["merged"].append(pr)
+            elif pr["closed_at"]:
+                closed = day(self._local_day(pr["closed_at"]))
+                if closed is not None:
+                    closed["closed_unmerged"] += 1
+            for review in pr["reviews"]:
+                reviewed = day(self._local_day(review["submitted_at"]))
+                if reviewed is not None:
+                    reviewed["reviews"].append(review)
+                    if review["bot"]:
+                        reviewed["bots"].add(review["bot_login"])
+
+        for issue in store["issues"].values():
+            opened = day(self._local_day(issue["created_at"]))
+            if opened is not None:
+                opened["issues_opened"].append(issue)
+            if issue["closed_at"]:
+                closed = day(self._local_day(issue["closed_at"]))
+                if closed is not None:
+                    closed["issues_closed"].append(issue)
+
+        for run in store["runs"].values():
+            ran = day(self._local_day(run["created_at"]))
+            if ran is not None:
+                ran["runs"].append(run)
+
+        sections = {}
+        for key, stats in days.items():
+            sizes = {size: 0 for size, _ in PR_SIZE_LIMITS}
+            sizes["xlarge"] = 0
+            for pr in stats["opened"]:
+                lines = pr["additions"] + pr["deletions"]
+                sizes[next((size for size, limit in PR_SIZE_LIMITS if lines < limit), "xlarge")] += 1
+
+            first_reviews = [self._seconds_between(pr["created_at"], min(r["submitted_at"] for r in pr["reviews"]))
+                             for pr in stats["opened"] if pr["reviews"]]
+            reviewers = {r["author"] for r in stats["reviews"] if r["author"]}
+            bot_reviews = sum(1 for r in stats["reviews"] if r["bot"])
+
+            completed = [r for r in stats["runs"] if r["status"] == "completed"]
+            successes = [r for r in completed if r["conclusion"] == "success"]
+            durations = [self._seconds_between(r["started_at"], r["updated_at"])
+                         for r in completed if r["updated_at"]]
+
+            sections[key] = {
+                "prs": {
+                    "opened_count": len(stats["opened"]),
+                    "merged_count": len(stats["merged"]),
+                    "closed_unmerged_count": stats["closed_unmerged"],
+                    "time_to_first_review_seconds_median": _median(first_reviews),
+                    "time_to_merge_seconds_median": _median(
+                        [self._seconds_between(pr["created_at"], pr["merged_at"]) for pr in stats["merged"]]),
+                    "review_count": len(stats["reviews"]),
+                    "comment_count": sum(pr["comments"] for pr in stats["opened"]),
+                    "additions_sum": sum(pr["additions"] for pr in stats["opened"]),
+                    "deletions_sum": sum(pr["deletions"] for pr in stats["opened"]),
+                    "size_distribution": sizes,
+                    "ai_markers_count": sum(1 for pr in stats["opened"] if pr["ai_marker"]),
+                    "bots_participating": sorted(stats["bots"]),
+                },
+                "reviews": {
+                    "code_reviews_count": len(stats["reviews"]),
+                    "unique_reviewers": len(reviewers),
+                    "review_comments_count": sum(r["comments"] for r in stats["reviews"]),
+                    "human_vs_bot_reviews": {"human_count": len(stats["reviews"]) - bot_reviews,
+                                             "bot_count": bot_reviews},
+                },
+                "issues": {
+                    "opened_count": len(stats["issues_opened"]),
+                    "closed_count": len(stats["issues_closed"]),
+                    "time_to_close_seconds_median": _median(
+                        [self._seconds_between(i["created_at"], i["closed_at"]) for i in stats["issues_closed"]]),
+                    "with_ai_label_count": sum(1 for i in stats["issues_opened"] if i["ai_label"]),
+                    "comments_count": sum(i["comments"] for i in stats["issues_opened"]),
+                },
+                "workflows": {
+                    "runs_count": len(stats["runs"]),
+                    "success_rate": round(len(successes) / len(completed), 2) if completed else None,
+                    "mean_duration_seconds": round(statistics.mean(durations)) if durations else None,
+                    "flaky_runs_count": sum(1 for r in successes if (r["attempt"] or 1) > 1),
+                    "failed_runs_link_samples": [r["url"] for r in completed
+                                                 if r["conclusion"] == "failure" and r["url"]][:3],
+                },
+                "pr_markers": sum(1 for pr in stats["opened"] if pr["ai_marker"]),
+                "bot_events": sum(1 for pr in stats["opened"] if pr["bot"]) + bot_reviews,
+            }
+        return sections
+
+    def _prune(self, name: str):
+        """Drop stored items that can no longer affect a day inside the window."""
+        cutoff = self.window_start
+        store = self._repo_store(name)
+        for key in ("prs", "issues"):
+            store[key] = {k: v for k, v in store[key].items() if _parse_time(v["updated_at"]) >= cutoff}
+        store["runs"] = {k: v for k, v in store["runs"].items() if _parse_time(v["created_at"]) >= cutoff}
+
+    def _repo_day(self, day: str, name: str) -> Dict[str, Any]:
+        daily = self.data.setdefault("daily", [])
+        day_data = next((d for d in daily if d["date"] == day), None)
+        if day_data is None:
+            day_data = {"date": day, "repos": []}
+            daily.append(day_data)
+            daily.sort(key=lambda d: d["date"])
+        repo = next((r for r in day_data["repos"] if r["name"] == name), None)
+        if repo is None:
+            repo = empty_repo_day(name)
+            day_data["repos"].append(repo)
+        return repo
+
+    def apply(self, name: str):
+        sections = self.summarize_repo(name)
+        current = self.start_date
+        while current <= self.end_date:
+            key = current.isoformat()
+            current += timedelta(days=1)
+            section = sections.get(key)
+            if section is None:
+                # Nothing happened that day: only touch records that already exist
+                day_data = next((d for d in self.data.get("daily", []) if d["date"] == key), None)
+                if day_data is None or not any(r["name"] == name for r in day_data["repos"]):
+                    continue
+                template = empty_repo_day(name)
+                section = {field: template[field] for field in ("prs", "reviews", "issues", "workflows")}
+                section.update(pr_markers=0, bot_events=0)
+
+            repo = self._repo_day(key, name)
+            for field in ("prs", "reviews", "issues", "workflows"):
+                repo[field] = section[field]
+            ai_signals = repo.setdefault("ai_signals", {})
+            ai_signals["pr_markers"] = section["pr_markers"]
+            ai_signals["bot_actor_events"] = section["bot_events"]
+
+    # -- entry point ----------------------------------------------------
+
+    async def collect_async(self, names: Optional[List[str]] = None) -> List[str]:
+        names = names or self.metadata.get("repos_included", [])
+        started = datetime.now(timezone.utc)
+        await asyncio.gather(self.fetch_prs_and_issues(names),
+                             *(self.fetch_workflow_runs(name) for name in names))
+
+        cursors = self.metadata.setdefault("collection_cursors", {})
+        for name in names:
+            self._prune(name)
+            self.apply(name)
+            cursors.setdefault(name, {})["github_since"] = started.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        self._update_aggregates()
+        self.metadata["api_usage"] = {
+            "graph_ql_calls": self.client.usage["graph_ql_calls"],
+            "rest_calls": self.client.usage["rest_calls"],
+            "rate_limit_remaining": self.client.remaining,
+        }
+        self.metadata["window"].update({
+            "days_back": self.days_back,
+            "start_date": self.start_date.isoformat(),
+            "end_date": self.end_date.isoformat(),
+        })
+        self.metadata["generated_at"] = started.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return names
+
+    def collect(self, names: Optional[List[str]] = None) -> List[str]:
+        return asyncio.run(self.collect_async(names))
+
+    def _update_aggregates(self):
+        """Recompute PR, issue and workflow totals in aggregates.by_repo."""
+        by_repo = self.data.setdefault("aggregates", {}).setdefault("by_repo", [])
+        totals: Dict[str, Dict[str, int]] = {}
+        for day_data in self.data.get("daily", []):
+            for repo in day_data.get("repos", []):
+                prs = repo.get("prs") or {}
+                issues = repo.get("issues") or {}
+                entry = totals.setdefault(repo["name"], {"prs_opened": 0, "prs_merged": 0, "issues_opened": 0,
+                                                         "issues_closed": 0, "workflow_runs": 0})
+                entry["prs_opened"] += prs.get("opened_count") or 0
+                entry["prs_merged"] += prs.get("merged_count") or 0
+                entry["issues_opened"] += issues.get("opened_count") or 0
+                entry["issues_closed"] += issues.get("closed_count") or 0
+                entry["workflow_runs"] += (repo.get("workflows") or {}).get("runs_count") or 0
+
+        for name, entry in totals.items():
+            aggregate = next((a for a in by_repo if a.get("name") == name), None)
+            if aggregate is None:
+                aggregate = {"name": name, "totals": {}}
+                by_repo.append(aggregate)
+            aggregate.setdefault("totals", {}).update(entry)
+
+    def save(self):
+        with open(self.review_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(self.store, f, separators=(",", ":"))
+
+
+@job("collect_github_activity")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Collect PR, issue and workflow activity from GitHub into work_review.json",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Refresh docs/work_review.json (token from GITHUB_TOKEN)
+  python scripts/collect_github_activity.py
+
+  # Run the full path offline against the bundled fixtures
+  python scripts/collect_github_activity.py --mock --review /tmp/work_review.json --end-date 2025-09-04
+
+  # Ignore cursors and refetch the whole window
+  python scripts/collect_github_activity.py --full
+        """
+    )
+
+    parser.add_argument("--review", type=str,
+                       help="work_review.json to update (default: docs/work_review.json)")
+    parser.add_argument("--cache", type=str,
+                       help="Item and ETag store (default: .cache/github_activity.json)")
+    parser.add_argument("--token", type=str, default=os.environ.get("GITHUB_TOKEN"),
+                       help="GitHub token (default: $GITHUB_TOKEN)")
+    parser.add_argument("--api-url", type=str, default=DEFAULT_API_URL,
+                       help="API base URL")
+    parser.add_argument("--mock", action="store_true",
+                       help="Start github_mock_server.py in-process and collect from its fixtures")
+    parser.add_argument("--end-date", type=str,
+                       help="Last day of the collection window (default: today)")
+    parser.add_argument("--days-back", type=int,
+                       help="Window length in days (default: metadata.window.days_back)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                       help="GraphQL page size")
+    parser.add_argument("--concurrency", type=int, default=4,
+                       help="Maximum concurrent API requests")
+    parser.add_argument("--full", action="store_true",
+                       help="Ignore cursors and refetch the whole window")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="Collect and report without writing any files")
+
+    args = parser.parse_args()
+
+    server = None
+    if args.mock:
+        from github_mock_server import start_mock_server
+        server = start_mock_server()
+        args.api_url = f"http://127.0.0.1:{server.server_port}"
+        args.token = args.token or "mock-token"
+        if not args.cache:
+            args.cache = str(Path(".cache") / "github_activity_mock.json")
+        print(f"🧪 Using mock GitHub API at {args.api_url}")
+
+    if not args.token:
+        print("❌ No GitHub token: pass --token or set GITHUB_TOKEN (or use --mock)")
+        sys.exit(1)
+
+    client = GitHubClient(args.token, api_url=args.api_url, max_concurrency=args.concurrency)
+    try:
+        collector = GitHubActivityCollector(
+            client, review=args.review, cache=args.cache,
+            end_date=date.fromisoformat(args.end_date) if args.end_date else None,
+            days_back=args.days_back, page_size=args.page_size, full=args.full)
+    except FileNotFoundError as e:
+        print(f"❌ work_review.json not found: {e.filename}")
+        sys.exit(1)
+
+    print(f"📅 Window {collector.start_date} → {collector.end_date}")
+    try:
+        names = collector.collect()
+    except RateLimitError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        if server:
+            server.shutdown()
+
+    usage = client.usage
+    print(f"   📦 {len(names)} repos: {usage['graph_ql_calls']} GraphQL calls, "
+          f"{usage['rest_calls']} REST calls ({usage['not_modified']} not modified), "
+          f"{client.remaining} requests left")
+
+    if args.dry_run:
+        print("🔍 Dry run - nothing written")
+        return
+
+    collector.save()
+    print(f"✅ Updated {collector.review_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+DORA Metrics Engine
+
+Computes delivery metrics per repo and per window:
+
+- lead time for changes  (PR opened -> first successful deployment after merge)
+- deployment frequency   (successful deployment workflow runs)
+- change failure rate    (failed / attempted deployments)
+- time to restore        (failed deployment -> next successful run of that workflow)
+
+plus the PR merge and issue close times stored in ``aggregates.by_repo[].medians``.
+
+Everything is kept as per repo x day *partials*: counters plus mergeable
+quantile sketches (quantile_sketch.py). Weekly, monthly and all-time
+figures are produced by merging partials, so history never has to be
+re-read once a day is summarized. Partials persist in
+``docs/dora_partials.json`` and outlive the raw events in the GitHub
+activity store, which only covers the collection window.
+
+Days with raw events in ``.cache/github_activity.json`` are summarized
+from those events; other days fall back to the per-day medians already in
+work_review.json (one sample per repo-day).
+"""
+
+import json
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from datetime import date, datetime, timedelta, timezone
+
+from metrics import job
+from quantile_sketch import QuantileSketch, DEFAULT_RELATIVE_ACCURACY
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+    ZoneInfoNotFoundError = Exception
+
+# Workflow names that count as deployments
+DEPLOY_WORKFLOW_PATTERN = re.compile(r"deploy|release|publish", re.IGNORECASE)
+
+# A merged PR is only attributed to a deployment that follows within this delay
+MAX_DEPLOY_DELAY = timedelta(days=7)
+
+SKETCHES = ["lead_time", "merge_time", "issue_close", "restore_time"]
+COUNTERS = ["deployments", "deploy_attempts", "failed_deployments"]
+
+# Sketch -> (section, field) of the work_review.json per-day fallback value
+DAILY_FALLBACK = {
+    "lead_time": ("dora_like", "lead_time_for_changes_seconds_median"),
+    "merge_time": ("prs", "time_to_merge_seconds_median"),
+    "issue_close": ("issues", "time_to_close_seconds_median"),
+    "restore_time": ("dora_like", "mean_time_to_recover_seconds_median"),
+}
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value) if value is not None else None
+
+
+class DayPartial:
+    """Counters and sketches for one repo x day."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, source: str = "events"):
+        self.source = source
+        self.counters = {name: 0.0 for name in COUNTERS}
+        self.sketches = {name: QuantileSketch(relative_accuracy) for name in SKETCHES}
+
+    def merge(self, other: "DayPartial") -> "DayPartial":
+        for name in COUNTERS:
+            self.counters[name] += other.counters[name]
+        for name in SKETCHES:
+            self.sketches[name].merge(other.sketches[name])
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            **{name: _round_counter(value) for name, value in self.counters.items()},
+            **{name: sketch.to_dict() for name, sketch in self.sketches.items() if sketch.count},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], relative_accuracy: float) -> "DayPartial":
+        partial = cls(relative_accuracy, data.get("source", "events"))
+        for name in COUNTERS:
+            partial.counters[name] = data.get(name, 0)
+        for name in SKETCHES:
+            if name in data:
+                partial.sketches[name] = QuantileSketch.from_dict(data[name])
+        return partial
+
+
+def _round_counter(value: float):
+    return int(value) if float(value).is_integer() else round(value, 4)
+
+
+class DoraMetricsEngine:
+    def __init__(self, base_path: str = ".", review: Optional[str] = None,
+                 store: Optional[str] = None, partials: Optional[str] = None,
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.base_path = Path(base_path)
+        self.review_path = Path(review) if review else self.base_path / "docs" / "work_review.json"
+        self.store_path = Path(store) if store else self.base_path / ".cache" / "github_activity.json"
+        self.partials_path = Path(partials) if partials else self.base_path / "docs" / "dora_partials.json"
+        self.relative_accuracy = relative_accuracy
+
+        # Load data
+        with open(self.review_path, 'r', encoding='utf-8') as f:
+            self.data = json.load(f)
+        self.store: Dict[str, Any] = {}
+        if self.store_path.exists():
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                self.store = json.load(f)
+
+        # repo -> day -> DayPartial
+        self.partials: Dict[str, Dict[str, DayPartial]] = {}
+        if self.partials_path.exists():
+            with open(self.partials_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            self.relative_accuracy = saved.get("relative_accuracy", self.relative_accuracy)
+            for name, days in saved.get("repos", {}).items():
+                self.partials[name] = {day: DayPartial.from_dict(partial, self.relative_accuracy)
+                                       for day, partial in days.items()}
+
+        self.tz = self._load_timezone(self.data.get("metadata", {}).get("window", {}).get("timezone", "UTC"))
+
+    def _load_timezone(self, name: str):
+        if ZoneInfo is None:
+            return timezone.utc
+        try:
+            return ZoneInfo(name)
+        except ZoneInfoNotFoundError:
+            return timezone.utc
+
+    def _local_day(self, moment: datetime) -> str:
+        return moment.astimezone(self.tz).date().isoformat()
+
+    # -- building partials ----------------------------------------------
+
+    def partials_from_events(self, name: str) -> Dict[str, DayPartial]:
+        """Summarize raw PRs, issues and workflow runs from the activity store."""
+        repo_store = (self.store.get("repos") or {}).get(name)
+        if not repo_store:
+            return {}
+        days: Dict[str, DayPartial] = {}
+
+        def day(moment: datetime) -> DayPartial:
+            key = self._local_day(moment)
+            if key not in days:
+                days[key] = DayPartial(self.relative_accuracy)
+            return days[key]
+
+        deploys = sorted((run for run in repo_store.get("runs", {}).values()
+                          if DEPLOY_WORKFLOW_PATTERN.search(run.get("name") or "")
+                          and run.get("status") == "completed"),
+                         key=lambda run: run["created_at"])
+        successful_deploys = [_parse_time(run.get("updated_at") or run["created_at"])
+                              for run in deploys if run.get("conclusion") == "success"]
+
+        for index, run in enumerate(deploys):
+            created = _parse_time(run["created_at"])
+            partial = day(created)
+            partial.counters["deploy_attempts"] += 1
+            if run.get("conclusion") == "success":
+                partial.counters["deployments"] += 1
+            elif run.get("conclusion") == "failure":
+                partial.counters["failed_deployments"] += 1
+                restored = next((later for later in deploys[index + 1:]
+                                 if later.get("name") == run.get("name")
+                                 and later.get("conclusion") == "success"), None)
+                if restored:
+                    finished = _parse_time(restored.get("updated_at") or restored["created_at"])
+                    partial.sketches["restore_time"].add((finished - created).total_seconds())
+
+        for pr in repo_store.get("prs", {}).values():
+            merged = _parse_time(pr.get("merged_at"))
+            if merged is None:
+                continue
+            created = _parse_time(pr["created_at"])
+            partial = day(merged)
+            partial.sketches["merge_time"].add((merged - created).total_seconds())
+
+            # Lead time runs to the first successful deployment after the merge;
+            # repos without deployment workflows fall back to the merge time
+            deployed = next((moment for moment in successful_deploys if moment >= merged), None)
+            if deployed is None and successful_deploys:
+                continue
+            if deployed is not None and deployed - merged > MAX_DEPLOY_DELAY:
+                continue
+            partial.sketches["lead_time"].add(((deployed or merged) - created).total_seconds())
+
+        for issue in repo_store.get("issues", {}).values():
+            closed = _parse_time(issue.get("closed_at"))
+            if closed is not None:
+                created = _parse_time(issue["created_at"])
+                day(closed).sketches["issue_close"].add((closed - created).total_seconds())
+
+        return days
+
+    def partial_from_daily(self, repo: Dict[str, Any]) -> DayPartial:
+        """Seed a partial from the per-day medians of a work_review.json record."""
+        partial = DayPartial(self.relative_accuracy, source="daily")
+        for name, (section, field) in DAILY_FALLBACK.items():
+            value = (repo.get(section) or {}).get(field)
+            if value is not None:
+                partial.sketches[name].add(value)
+
+        dora = repo.get("dora_like") or {}
+        deployments = dora.get("deployment_frequency_count") or 0
+        partial.counters["deployments"] = deployments
+        partial.counters["deploy_attempts"] = deployments
+        if dora.get("change_failure_rate") is not None:
+            partial.counters["failed_deployments"] = dora["change_failure_rate"] * deployments
+        return partial
+
+    def covered_since(self, name: str) -> Optional[str]:
+        """First day whose events the activity store still holds in full.
+
+        The collector prunes PRs and issues by ``updated_at`` (runs by
+        ``created_at``) at its window start, so earlier days only keep
+        stragglers such as a PR merged long ago but updated recently.
+        """
+        start = self.data.get("metadata", {}).get("window", {}).get("start_date")
+        if start:
+            return start
+        repo_store = (self.store.get("repos") or {}).get(name) or {}
+        moments = [item["updated_at"] for key in ("prs", "issues")
+                   for item in repo_store.get(key, {}).values() if item.get("updated_at")]
+        moments += [run["created_at"] for run in repo_store.get("runs", {}).values() if run.get("created_at")]
+        return min(self._local_day(_parse_time(moment)) for moment in moments) if moments else None
+
+    def _rebuild(self, name: str, key: str, events: Optional[DayPartial],
+                 repo: Optional[Dict[str, Any]], since: Optional[str]) -> Optional[DayPartial]:
+        """The partial for one repo-day: events inside the store's window, else what was saved."""
+        saved = self.partials.get(name, {}).get(key)
+        if since is not None and key >= since:
+            return events if events is not None else self.partial_from_daily(repo)
+        # Outside the window any events are stragglers: an event-only partial
+        # would drop the day's deployments, failures and restore times
+        if saved is not None and saved.source == "events":
+            return saved
+        if repo is not None:
+            return self.partial_from_daily(repo)
+        return saved or events
+
+    def refresh(self) -> int:
+        """Rebuild partials for every day covered by events or daily records."""
+        updated = 0
+        event_days: Dict[str, Dict[str, DayPartial]] = {}
+        covered: Dict[str, Optional[str]] = {}
+        for name in self.data.get("metadata", {}).get("repos_included", []):
+            event_days[name] = self.partials_from_events(name)
+            # Without a store (e.g. .cache/ was cleared) no day counts as covered
+            in_store = bool((self.store.get("repos") or {}).get(name))
+            covered[name] = self.covered_since(name) if in_store else None
+
+        rebuilt = []
+        for day_data in self.data.get("daily", []):
+            for repo in day_data.get("repos", []):
+                name = repo["name"]
+                events = event_days.get(name, {}).pop(day_data["date"], None)
+                rebuilt.append((name, day_data["date"], events, repo))
+        # Event days without a daily record (e.g. before the review window)
+        for name, days in event_days.items():
+            rebuilt.extend((name, key, events, None) for key, events in days.items())
+
+        for name, key, events, repo in rebuilt:
+            partial = self._rebuild(name, key, events, repo, covered.get(name))
+            if partial is not self.partials.get(name, {}).get(key):
+                self.partials.setdefault(name, {})[key] = partial
+                updated += 1
+        return updated
+
+    # -- querying -------------------------------------------------------
+
+    def combine(self, name: Optional[str] = None, start: Optional[str] = None,
+                end: Optional[str] = None) -> DayPartial:
+        """Merge the partials of one repo (or all repos) within [start, end]."""
+        combined = DayPartial(self.relative_accuracy, source="combined")
+        for repo_name, days in self.partials.items():
+            if name is not None and repo_name != name:
+                continue
+            for key, partial in days.items():
+                if (start is None or key >= start) and (end is None or key <= end):
+                    combined.merge(partial)
+        return combined
+
+    def metrics(self, partial: DayPartial, days: int) -> Dict[str, Any]:
+        attempts = partial.counters["deploy_attempts"]
+        return {
+            "deployments": _round_counter(partial.counters["deployments"]),
+            "deployment_frequency_per_day": round(partial.counters["deployments"] / days, 3) if days else None,
+            "change_failure_rate": (round(partial.counters["failed_deployments"] / attempts, 3)
+                                    if attempts else None),
+            "lead_time_for_changes_seconds": {
+                "median": _round(partial.sketches["lead_time"].quantile(0.5)),
+                "p90": _round(partial.sketches["lead_time"].quantile(0.9)),
+            },
+            "time_to_restore_seconds_median": _round(partial.sketches["restore_time"].quantile(0.5)),
+            "pr_time_to_merge_seconds_median": _round(partial.sketches["merge_time"].quantile(0.5)),
+            "issue_time_to_close_seconds_median": _round(partial.sketches["issue_close"].quantile(0.5)),
+        }
+
+    def _bounds(self) -> Optional[tuple]:
+        keys = [key for days in self.partials.values() for key in days]
+        return (min(keys), max(keys)) if keys else None
+
+    def periods(self, granularity: str) -> List[Dict[str, Any]]:
+        """Per repo metrics for every week, month, or the whole history ("all")."""
+        bounds = self._bounds()
+        if bounds is None:
+            return []
+        first, last = date.fromisoformat(bounds[0]), date.fromisoformat(bounds[1])
+
+        windows = []
+        if granularity == "all":
+            windows.append(("all", first, last))
+        elif granularity == "week":
+            cursor = first - timedelta(days=first.weekday())
+            while cursor <= last:
+                iso = cursor.isocalendar()
+                windows.append((f"{iso[0]}-W{iso[1]:02d}", cursor, cursor + timedelta(days=6)))
+                cursor += timedelta(days=7)
+        elif granularity == "month":
+            cursor = first.replace(day=1)
+            while cursor <= last:
+                following = (cursor.replace(day=28) + timedelta(days=4)).replace(day=1)
+                windows.append((cursor.strftime("%Y-%m"), cursor, following - timedelta(days=1)))
+                cursor = following
+        else:
+            raise ValueError(f"Unknown granularity: {granularity}")
+
+        results = []
+        for key, start, end in windows:
+            # Count only days that actually fall inside the observed history
+            days = (min(end, last) - max(start, first)).days + 1
+            for name in sorted(self.partials):
+                partial = self.combine(name, start.isoformat(), end.isoformat())
+                results.append({"period": key, "start": start.isoformat(), "end": end.isoformat(),
+                                "repo": name, **self.metrics(partial, days)})
+        return results
+
+    # -- writing --------------------------------------------------------
+
+    def apply_to_review(self):
+        """Write per-day dora_like fields and per-repo medians into work_review.json."""
+        for day_data in self.data.get("daily", []):
+            for repo in day_data.get("repos", []):
+                partial = self.partials.get(repo["name"], {}).get(day_data["date"])
+                if partial is None or partial.source != "events":
+                    continue  # daily fallbacks already hold these values
+                attempts = partial.counters["deploy_attempts"]
+                repo["dora_like"] = {
+                    "lead_time_for_changes_seconds_median": _round(partial.sketches["lead_time"].median()),
+                    "deployment_frequency_count": _round_counter(partial.counters["deployments"]),
+                    "change_failure_rate": (round(partial.counters["failed_deployments"] / attempts, 2)
+                                            if attempts else None),
+                    "mean_time_to_recover_seconds_median": _round(partial.sketches["restore_time"].median()),
+                }
+
+        window = self.data.get("metadata", {}).get("window", {})
+        start, end = window.get("start_date"), window.get("end_date")
+        days = ((date.fromisoformat(end) - date.fromisoformat(start)).days + 1) if start and end else 0
+        by_repo = self.data.setdefault("aggregates", {}).setdefault("by_repo", [])
+        for name in self.partials:
+            metrics = self.metrics(self.combine(name, start, end), days)
+            aggregate = next((a for a in by_repo if a.get("name") == name), None)
+            if aggregate is None:
+                aggregate = {"name": name}
+                by_repo.append(aggregate)
+            aggregate["medians"] = {
+                "pr_time_to_merge_seconds": metrics["pr_time_to_merge_seconds_median"],
+                "issue_time_to_close_seconds": metrics["issue_time_to_close_seconds_median"],
+                "lead_time_for_changes_seconds": metrics["lead_time_for_changes_seconds"]["median"],
+            }
+            aggregate["dora"] = {key: metrics[key] for key in (
+                "deployment_frequency_per_day", "change_failure_rate", "time_to_restore_seconds_median")}
+            aggregate["dora"]["lead_time_for_changes_p90_seconds"] = metrics["lead_time_for_changes_seconds"]["p90"]
+
+        global_metrics = self.metrics(self.combine(None, start, end), days)
+        self.data["aggregates"].setdefault("global", {})["deployment_frequency_total"] = global_metrics["deployments"]
+
+    def save(self, review: bool = True):
+        with open(self.partials_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "relative_accuracy": self.relative_accuracy,
+                "repos": {name: {day: days[day].to_dict() for day in sorted(days)}
+                          for name, days in sorted(self.partials.items())},
+            }, f, indent=1)
+        if review:
+            with open(self.review_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2, ensure_ascii=False)
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if value < 3600:
+        return f"{value / 60:.0f}m"
+    if value < 86400:
+        return f"{value / 3600:.1f}h"
+    return f"{value / 86400:.1f}d"
+
+
+@job("dora_metrics")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute DORA-style delivery metrics from mergeable daily partials",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Refresh partials and print all-time metrics per repo
+  python scripts/dora_metrics.py
+
+  # Weekly breakdown as JSON
+  python scripts/dora_metrics.py --granularity week --format json
+
+  # Refresh partials and write medians back into docs/work_review.json
+  python scripts/dora_metrics.py --write
+        """
+    )
+
+    parser.add_argument("--review", type=str,
+                       help="work_review.json (default: docs/work_review.json)")
+    parser.add_argument("--store", type=str,
+                       help="GitHub activity store (default: .cache/github_activity.json)")
+    parser.add_argument("--partials", type=str,
+                       help="Daily partials file (default: docs/dora_partials.json)")
+    parser.add_argument("--granularity", choices=["week", "month", "all"], default="all",
+                       help="Aggregation window")
+    parser.add_argument("--format", choices=["table", "json"], default="table",
+                       help="Output format")
+    parser.add_argument("--write", action="store_true",
+                       help="Save partials and update medians in work_review.json")
+
+    args = parser.parse_args()
+
+    try:
+        engine = DoraMetricsEngine(review=args.review, store=args.store, partials=args.partials)
+    except FileNotFoundError as e:
+        print(f"❌ File not found: {e.filename}")
+        sys.exit(1)
+
+    updated = engine.refresh()
+    periods = engine.periods(args.granularity)
+
+    if args.format == "json":
+        print(json.dumps(periods, indent=2))
+    else:
+        print(f"📈 DORA metrics ({args.granularity}, {updated} repo-days refreshed)")
+        print(f"{'Period':<9} {'Repo':<30} {'Deploys/day':>11} {'CFR':>6} {'Lead p50':>9} {'Lead p90':>9} {'Restore':>8}")
+        for row in periods:
+            cfr = f"{row['change_failure_rate']:.0%}" if row["change_failure_rate"] is not None else "-"
+            lead = row["lead_time_for_changes_seconds"]
+            print(f"{row['period']:<9} {row['repo']:<30} {row['deployment_frequency_per_day'] or 0:>11.2f} {cfr:>6} "
+                  f"{_format_seconds(lead['median']):>9} {_format_seconds(lead['p90']):>9} "
+                  f"{_format_seconds(row['time_to_restore_seconds_median']):>8}")
+
+    if args.write:
+        engine.apply_to_review()
+        engine.save()
+        print(f"✅ Partials saved to {engine.partials_path}, medians written to {engine.review_path}")
+
+
+if __name__ == "__main__":
+    main()
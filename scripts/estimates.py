@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Story Estimate Normalization
+
+Stories carry estimates in whatever form their authors wrote: ``5``,
+``"5sp"``, ``"5 story points"``, t-shirt sizes (``"M"``, ``"large"``) or
+durations (``"2 days"``, ``"1 week"``). Every script that sums or buckets
+effort goes through ``parse_points``, which turns all of them into story
+points:
+
+- a bare number or a points unit (sp, pt, pts, point(s), story point(s)) is taken as is
+- t-shirt sizes use cleanup_data.py's scale: XS=1, S=2, M=5, L=8, XL=13, XXL=21
+- durations count one point per ideal day: a week is 5 points, an hour 1/8
+
+Anything else (``"TBD"``, ``""``, ``None``) parses to None. Results are
+memoized per string, since a backlog holds only a few dozen distinct
+spellings, so parsing 100k stories is mostly dictionary lookups.
+
+Usage:
+  python scripts/estimates.py
+"""
+
+import json
+import argparse
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Union
+
+from metrics import job
+
+Points = Union[int, float]
+
+POINTS_PER_DAY = 1
+DAYS_PER_WEEK = 5
+HOURS_PER_DAY = 8
+
+# Unit spelling -> points per unit; "" is a bare number
+POINT_UNITS = {"": 1, "sp": 1, "pt": 1, "pts": 1, "point": 1, "points": 1,
+               "story point": 1, "story points": 1}
+DURATION_UNITS = {
+    **dict.fromkeys(("d", "day", "days"), POINTS_PER_DAY),
+    **dict.fromkeys(("w", "wk", "wks", "week", "weeks"), POINTS_PER_DAY * DAYS_PER_WEEK),
+    **dict.fromkeys(("h", "hr", "hrs", "hour", "hours"), POINTS_PER_DAY / HOURS_PER_DAY),
+}
+TSHIRT_SIZES = {"xs": 1, "s": 2, "small": 2, "m": 5, "medium": 5, "l": 8, "large": 8,
+                "xl": 13, "extra large": 13, "xxl": 21}
+
+# Upper bounds (inclusive) of the size buckets used by the reports
+SIZE_BUCKETS = ((2, "small"), (5, "medium"))
+
+_ESTIMATE = re.compile(r"(\d+(?:\.\d+)?)\s*([a-z]+(?: [a-z]+)?)?")
+# "estimate: 3 days" in a story's markdown body; a unit is required there
+_UNIT_PATTERN = "|".join(sorted((re.escape(unit) for unit in {**POINT_UNITS, **DURATION_UNITS} if unit),
+                                key=len, reverse=True))
+ESTIMATE_IN_TEXT = re.compile(rf"estimate[:\s]*(\d+\.?\d*\s*(?:{_UNIT_PATTERN}))\b", re.IGNORECASE)
+
+# Only strings are memoized, so 1, 1.0 and True never share an entry
+_POINTS: Dict[str, Optional[Points]] = {}
+
+
+def _number(value: float) -> Points:
+    value = round(value, 2)
+    return int(value) if value == int(value) else value
+
+
+def _parse(text: str) -> Optional[tuple]:
+    """(points, kind) for an estimate string, kind being "points", "size" or "duration"."""
+    text = " ".join(text.lower().split())
+    if text in TSHIRT_SIZES:
+        return TSHIRT_SIZES[text], "size"
+    match = _ESTIMATE.fullmatch(text)
+    if not match:
+        return None
+    unit = match.group(2) or ""
+    if unit in POINT_UNITS:
+        return _number(float(match.group(1))), "points"
+    if unit in DURATION_UNITS:
+        return _number(float(match.group(1)) * DURATION_UNITS[unit]), "duration"
+    return None
+
+
+def parse_points(estimate: Any) -> Optional[Points]:
+    """Story points for any estimate form; None for TBD, blanks and unrecognized text."""
+    if type(estimate) is not str:
+        if isinstance(estimate, (int, float)) and not isinstance(estimate, bool) and math.isfinite(estimate):
+            return _number(estimate)
+        return None
+    points = _POINTS.get(estimate, False)
+    if points is False:
+        parsed = _parse(estimate)
+        points = _POINTS[estimate] = parsed[0] if parsed else None
+    return points
+
+
+def estimate_points(estimate: Any) -> Points:
+    """Like ``parse_points`` but 0 for unestimated stories, for summing effort."""
+    return parse_points(estimate) or 0
+
+
+def size_bucket(estimate: Any) -> str:
+    """small, medium or large by points; unknown when there is no usable estimate."""
+    points = parse_points(estimate)
+    if points is None:
+        return "unknown"
+    for limit, bucket in SIZE_BUCKETS:
+        if points <= limit:
+            return bucket
+    return "large"
+
+
+def canonical_estimate(estimate: Any) -> Optional[str]:
+    """The standard ``"Nsp"`` spelling of a points or t-shirt estimate.
+
+    Durations and unrecognized values give None: they stay as their authors
+    wrote them, since rewriting "2 days" as points would lose information.
+    """
+    if type(estimate) is not str:
+        points = parse_points(estimate)
+        return None if points is None else f"{points}sp"
+    parsed = _parse(estimate)
+    if parsed is None or parsed[1] == "duration":
+        return None
+    return f"{parsed[0]}sp"
+
+
+def find_estimate(text: str) -> Optional[str]:
+    """The estimate written in a story body ("estimate: 3 days"), if any."""
+    match = ESTIMATE_IN_TEXT.search(text)
+    return match.group(1) if match else None
+
+
+def summarize(stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Each distinct estimate spelling with its story count and parsed points."""
+    counts = Counter(json.dumps(story.get("estimate")) for story in stories)
+    return [{"estimate": json.loads(key), "stories": count, "points": parse_points(json.loads(key))}
+            for key, count in counts.most_common()]
+
+
+@job("estimates")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Show how the backlog's estimates normalize to story points",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Every distinct estimate in PRIORITIZATION.json and its points
+  python scripts/estimates.py
+
+  # Only the estimates that do not parse
+  python scripts/estimates.py --unparsed
+        """
+    )
+    parser.add_argument("--view", type=str, default="backlog/PRIORITIZATION.json",
+                        help="JSON view to read (default: backlog/PRIORITIZATION.json)")
+    parser.add_argument("--unparsed", action="store_true",
+                        help="List only estimates that give no points")
+    args = parser.parse_args()
+
+    from backlog_store import load_view
+
+    path = Path(args.view)
+    if not path.exists():
+        print(f"❌ View not found: {path}")
+        sys.exit(1)
+    stories = load_view(path).get("backlog", [])
+    rows = summarize(stories)
+    total = sum(estimate_points(story.get("estimate")) for story in stories)
+    print(f"📏 {path}: {len(stories):,} stories, {len(rows)} distinct estimates, {_number(total)} points in total")
+    for row in rows:
+        if args.unparsed and row["points"] is not None:
+            continue
+        points = "—" if row["points"] is None else f"{row['points']} pts"
+        print(f"   {json.dumps(row['estimate'], ensure_ascii=False):>20}  {points:>10}  ({row['stories']:,} stories)")
+
+
+if __name__ == "__main__":
+    main()
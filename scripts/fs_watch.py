@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+File System Watching
+
+Small dependency-free file watcher used by the long-running backlog tools:
+
+- ``InotifyWatcher``  - Linux inotify through ctypes, recursive, no polling
+- ``PollingWatcher``  - mtime/size snapshots for platforms without inotify
+
+``watch_batches`` turns the raw event stream into debounced batches: it
+waits for the first change, keeps collecting until the tree has been quiet
+for ``debounce`` seconds (or ``max_latency`` has passed), then yields the
+set of changed paths. A burst of saves from an editor or a bulk copy
+therefore becomes a single batch.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher over one or more directory trees."""
+
+    def __init__(self, roots: List[Path]):
+        library = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(library, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, Path] = {}
+        self.overflowed = False
+        for root in roots:
+            self._add_tree(Path(root))
+
+    def _add_watch(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = directory
+
+    def _add_tree(self, root: Path):
+        if not root.is_dir():
+            return
+        self._add_watch(root)
+        for dirpath, dirnames, _ in os.walk(root):
+            for name in dirnames:
+                self._add_watch(Path(dirpath) / name)
+
+    def read_events(self, timeout: Optional[float]) -> Set[Path]:
+        """Wait up to ``timeout`` seconds and return the paths that changed."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed: Set[Path] = set()
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buffer):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+            raw_name = buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length]
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            name = os.fsdecode(raw_name.rstrip(b"\0"))
+            path = directory / name if name else directory
+
+            if mask & IN_ISDIR:
+                # Watch new subdirectories and report files copied in with them
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path)
+                    changed.update(p for p in path.rglob("*") if p.is_file())
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Portable fallback comparing mtime/size snapshots of every file."""
+
+    def __init__(self, roots: List[Path], interval: float = 0.5):
+        self.roots = [Path(root) for root in roots]
+        self.interval = interval
+        self.overflowed = False
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            if not root.is_dir():
+                continue
+            for path in root.rglob("*"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if path.is_file():
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def read_events(self, timeout: Optional[float]) -> Set[Path]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._scan()
+        changed = {path for path, stat in current.items() if self._snapshot.get(path) != stat}
+        changed.update(path for path in self._snapshot if path not in current)
+        self._snapshot = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(roots: List[Path], polling: bool = False):
+    """Return an inotify watcher where available, otherwise a polling one."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots)
+
+
+def watch_batches(watcher, debounce: float = 0.25,
+                  max_latency: float = 2.0) -> Iterator[Tuple[Set[Path], bool]]:
+    """Yield ``(changed_paths, overflowed)`` once each burst of changes settles.
+
+    ``overflowed`` means the kernel queue overflowed and events were lost;
+    callers should fall back to a full rescan for that batch.
+    """
+    while True:
+        changed = watcher.read_events(1.0)
+        if not changed and not watcher.overflowed:
+            continue
+
+        started = time.monotonic()
+        while True:
+            remaining = max_latency - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            more = watcher.read_events(min(debounce, remaining))
+            if not more:
+                break
+            changed |= more
+
+        overflowed = watcher.overflowed
+        watcher.overflowed = False
+        yield changed, overflowed
@@ -8,13 +8,30 @@ with status tracking for all stories.
 
 import os
 import re
-import yaml
 import json
+import argparse
 from pathlib import Path
 from datetime import datetime
 
+from estimates import find_estimate
+from metrics import PARSE_ERRORS, SAVE_SECONDS, STORIES_PARSED, job, record_read, record_write
+from tracing import add_trace_argument, span, start_from_args, traced
+
 def extract_story_from_file(file_path):
     """Extract story metadata from a markdown file."""
+    parsed = parse_story_file(file_path)
+    return parsed[0] if parsed else None
+
+@traced("parse.story")
+def parse_story_file(file_path):
+    """Extract a story and the set of its fields that the frontmatter set.
+
+    Every other field is inferred from the path or body, or is a default
+    ("TBD", today's date); callers that sync into curated views should
+    only copy the explicit ones. Returns None for non-story files.
+    """
+    # Imported here so that importing this module (or --help) skips yaml
+    import yaml
     
     if file_path.name.startswith("_") or file_path.name == "README.md" or file_path.name == "index.md":
         return None
@@ -22,7 +39,9 @@ def extract_story_from_file(file_path):
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
+            record_read("story", os.fstat(f.fileno()).st_size)
     except:
+        PARSE_ERRORS.inc(source="markdown")
         return None
     
     # Extract YAML frontmatter if present
@@ -34,7 +53,7 @@ def extract_story_from_file(file_path):
                 yaml_content = content[4:yaml_end]
                 frontmatter = yaml.safe_load(yaml_content) or {}
         except:
-            pass
+            PARSE_ERRORS.inc(source="frontmatter")
     
     # Extract story ID from filename or content
     story_id = None
@@ -99,8 +118,7 @@ def extract_story_from_file(file_path):
     # Extract estimate
     estimate = frontmatter.get("estimate", "TBD")
     if estimate == "TBD":
-        if match := re.search(r'estimate[:\s]*(\d+\.?\d*\s*(?:sp|story points?|days?|weeks?))', content, re.IGNORECASE):
-            estimate = match.group(1)
+        estimate = find_estimate(content) or estimate
     
     # Extract dependencies
     dependencies = frontmatter.get("dependencies", [])
@@ -137,7 +155,14 @@ def extract_story_from_file(file_path):
         "last_updated": str(frontmatter.get("last_updated", datetime.now().strftime('%Y-%m-%d')))
     }
     
-    return story
+    # A field is explicit when the story kept the frontmatter's own value
+    sources = {field: frontmatter.get(field) for field in story}
+    sources["labels"] = frontmatter.get("labels", frontmatter.get("tags"))
+    explicit = {field for field, value in sources.items()
+                if value is not None and value != "TBD" and story[field] in (value, str(value))}
+    
+    STORIES_PARSED.inc(source="markdown")
+    return story, explicit
 
 def generate_complete_backlog():
     """Generate complete backlog JSON from all story files."""
@@ -146,13 +171,16 @@ def generate_complete_backlog():
     stories = []
     
     # Scan all markdown files in backlog directory
-    for md_file in backlog_dir.rglob("*.md"):
+    with span("load.scan"):
+        md_files = list(backlog_dir.rglob("*.md"))
+    for md_file in md_files:
         story = extract_story_from_file(md_file)
         if story:
             stories.append(story)
     
     # Sort by epic and story ID
-    stories.sort(key=lambda x: (x["epic"], x["id"]))
+    with span("aggregate.sort", stories=len(stories)):
+        stories.sort(key=lambda x: (x["epic"], x["id"]))
     
     # Create the JSON structure
     backlog_json = {
@@ -167,15 +195,25 @@ def generate_complete_backlog():
     
     return backlog_json
 
-if __name__ == "__main__":
+@job("generate_complete_backlog")
+def main():
+    parser = argparse.ArgumentParser(description="Generate backlog/COMPLETE_BACKLOG.json from all story files")
+    add_trace_argument(parser)
+    args = parser.parse_args()
+    start_from_args(args)
+    
     print("🤖 Strategic Nexus Prime generating complete backlog JSON...")
     
     backlog_data = generate_complete_backlog()
     
     # Save to file
     output_file = Path("backlog/COMPLETE_BACKLOG.json")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(backlog_data, f, indent=2, ensure_ascii=False)
+    with span("serialize.complete"), SAVE_SECONDS.time(view="complete", phase="serialize"):
+        text = json.dumps(backlog_data, indent=2, ensure_ascii=False)
+    with span("write.complete"), SAVE_SECONDS.time(view="complete", phase="write"):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+    record_write("view", len(text.encode("utf-8")))
     
     print(f"✅ Generated complete backlog with {backlog_data['metadata']['total_backlog_stories']} stories")
     print(f"📄 Saved to: {output_file}")
@@ -189,3 +227,7 @@ if __name__ == "__main__":
     print("\n📊 Epic Breakdown:")
     for epic, count in sorted(epics.items()):
         print(f"  {epic}: {count} stories")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,13 @@ from pathlib import Path
 from typing import Dict, List, Any
 import math
 
+from metrics import job
+from story_columns import open_story_columns
+
+# Story fields the analytics read; loaded from the columnar snapshot
+# "points" is the estimate normalized to story points when the columnar file is built
+ANALYTICS_FIELDS = ["epic", "status", "points", "owner", "priority"]
+
 class PerformanceAnalytics:
     """Advanced performance analytics for strategic planning."""
     
@@ -28,8 +35,8 @@ class PerformanceAnalytics:
         self.reports_path.mkdir(exist_ok=True)
         
         # Load data
-        with open(self.backlog_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        columns = open_story_columns(self.backlog_path)
+        self.data = {"metadata": columns.metadata, "backlog": columns.project(ANALYTICS_FIELDS)}
     
     def generate_velocity_analytics(self) -> Dict[str, Any]:
         """Generate advanced velocity analytics and trends."""
@@ -55,7 +62,7 @@ class PerformanceAnalytics:
         for story in stories:
             epic = story.get("epic", "unknown")
             status = story.get("status", "unknown")
-            estimate = self._parse_estimate(story.get("estimate", ""))
+            estimate = story.get("points", 0)
             
             if epic not in epic_performance:
                 epic_performance[epic] = {
@@ -115,7 +122,7 @@ class PerformanceAnalytics:
         for story in stories:
             epic = story.get("epic", "unknown")
             priority = story.get("priority", 99)
-            estimate = self._parse_estimate(story.get("estimate", ""))
+            estimate = story.get("points", 0)
             status = story.get("status", "unknown")
             
             if status not in ["completed", "accepted"]:
@@ -186,7 +193,7 @@ class PerformanceAnalytics:
         risk_score = 0
         
         # Complexity risk
-        large_stories = len([s for s in stories if self._parse_estimate(s.get("estimate", "")) > 8])
+        large_stories = len([s for s in stories if s.get("points", 0) > 8])
         if large_stories > 5:
             risks.append({
                 "type": "complexity",
@@ -272,8 +279,8 @@ class PerformanceAnalytics:
         remaining_stories = total_stories - completed_stories
         
         # Effort-based burndown
-        total_effort = sum(self._parse_estimate(s.get("estimate", "")) for s in stories)
-        completed_effort = sum(self._parse_estimate(s.get("estimate", "")) for s in stories if s.get("status") in ["completed", "accepted"])
+        total_effort = sum(s.get("points", 0) for s in stories)
+        completed_effort = sum(s.get("points", 0) for s in stories if s.get("status") in ["completed", "accepted"])
         remaining_effort = total_effort - completed_effort
         
         # Historical burndown simulation
@@ -328,17 +335,6 @@ class PerformanceAnalytics:
             }
         }
     
-    def _parse_estimate(self, estimate) -> int:
-        """Parse estimate value, handling both strings and integers."""
-        if isinstance(estimate, int):
-            return estimate
-        if isinstance(estimate, str):
-            try:
-                return int(estimate) if estimate.isdigit() else 0
-            except:
-                return 0
-        return 0
-    
     def generate_comprehensive_report(self) -> Dict[str, Any]:
         """Generate comprehensive performance analytics report."""
         return {
@@ -374,6 +370,7 @@ class PerformanceAnalytics:
         print(f"✅ Performance analytics saved: {filepath}")
         return filepath
 
+@job("generate_performance_analytics")
 def main():
     """Main function to run performance analytics."""
     import argparse
@@ -7,12 +7,20 @@ No synthetic data, no fake people, no made-up metrics - just the actual project.
 """
 
 import json
+import argparse
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
 from collections import Counter
 
+from metrics import job
+from story_columns import open_story_columns
+from tracing import add_trace_argument, span, start_from_args, traced
+
+# Story fields the dashboard reads; loaded from the columnar snapshot
+DASHBOARD_FIELDS = ["epic", "status", "priority", "estimate", "owner", "dependencies"]
+
 class RealDataDashboardGenerator:
     """Generate dashboard using only real project data."""
     
@@ -26,12 +34,14 @@ class RealDataDashboardGenerator:
     def _load_prioritization_data(self) -> Dict[str, Any]:
         """Load real prioritization data."""
         try:
-            with open(self.base_path / "backlog" / "PRIORITIZATION.json", 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with span("load.prioritization"):
+                columns = open_story_columns(self.base_path / "backlog" / "PRIORITIZATION.json")
+                return {"metadata": columns.metadata, "backlog": columns.project(DASHBOARD_FIELDS)}
         except Exception as e:
             print(f"❌ Error loading prioritization data: {e}")
             return {}
     
+    @traced("aggregate.analyze")
     def analyze_real_data(self) -> Dict[str, Any]:
         """Analyze only real project data."""
         if not self.prioritization_data:
@@ -100,6 +110,7 @@ class RealDataDashboardGenerator:
             }
         }
     
+    @traced("serialize.html")
     def generate_real_dashboard_html(self) -> str:
         """Generate dashboard HTML using only real data."""
         return '''<!DOCTYPE html>
@@ -571,13 +582,15 @@ class RealDataDashboardGenerator:
         
         # Save real data file (compatible with existing dashboard-data.json)
         data_path = self.docs_path / "dashboard-data.json"
-        with open(data_path, 'w', encoding='utf-8') as f:
-            json.dump(dashboard_data, f, indent=2, ensure_ascii=False)
+        with span("serialize.data"):
+            data_text = json.dumps(dashboard_data, indent=2, ensure_ascii=False)
+        with span("write.data"), open(data_path, 'w', encoding='utf-8') as f:
+            f.write(data_text)
         
         # Generate and save HTML
         html_content = self.generate_real_dashboard_html()
         html_path = self.docs_path / "index.html"
-        with open(html_path, 'w', encoding='utf-8') as f:
+        with span("write.html"), open(html_path, 'w', encoding='utf-8') as f:
             f.write(html_content)
         
         print(f"✅ Real data dashboard saved: {html_path}")
@@ -602,8 +615,14 @@ class RealDataDashboardGenerator:
                 file_path.unlink()
                 print(f"🧹 Removed synthetic file: {file_path.name}")
 
+@job("generate_real_dashboard")
 def main():
     """Main function to generate real data dashboard."""
+    parser = argparse.ArgumentParser(description="Generate docs/index.html from real project data")
+    add_trace_argument(parser)
+    args = parser.parse_args()
+    start_from_args(args)
+    
     try:
         generator = RealDataDashboardGenerator()
         dashboard_path = generator.generate_real_dashboard()
@@ -12,7 +12,12 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-import re
+from collections import Counter
+
+from estimates import estimate_points, parse_points, size_bucket
+from metrics import REPORT_SECONDS, SAVE_SECONDS, job, record_write
+from story_dates import DayIndex, today_number
+from tracing import add_trace_argument, span, start_from_args, traced
 
 class ReportGenerator:
     def __init__(self, base_path: str = "."):
@@ -27,22 +32,29 @@ class ReportGenerator:
         
     def _load_prioritization_json(self) -> Dict[str, Any]:
         """Load prioritization data."""
+        # Imported on first load so that --help skips the store
+        from backlog_store import load_view
+
         json_file = self.backlog_path / "PRIORITIZATION.json"
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with span("load.prioritization"):
+                return load_view(json_file)
         except FileNotFoundError:
             return {"metadata": {}, "backlog": []}
     
     def _load_complete_backlog(self) -> Dict[str, Any]:
         """Load complete backlog data."""
+        from backlog_store import load_view
+
         json_file = self.backlog_path / "COMPLETE_BACKLOG.json"
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with span("load.complete"):
+                return load_view(json_file)
         except FileNotFoundError:
             return {"metadata": {}, "backlog": []}
     
+    @traced("aggregate.velocity")
+    @REPORT_SECONDS.time(report="velocity")
     def generate_velocity_report(self) -> Dict[str, Any]:
         """Generate velocity and throughput metrics."""
         stories = self.prioritization_data.get("backlog", [])
@@ -88,6 +100,8 @@ class ReportGenerator:
             "top_priorities": self._get_top_priorities(stories, 10)
         }
     
+    @traced("aggregate.health")
+    @REPORT_SECONDS.time(report="health")
     def generate_backlog_health_report(self) -> Dict[str, Any]:
         """Analyze backlog health and quality metrics."""
         stories = self.prioritization_data.get("backlog", [])
@@ -101,13 +115,9 @@ class ReportGenerator:
             "stale_stories": 0
         }
         
-        # Story age analysis
-        current_date = datetime.now()
-        age_buckets = {"new": 0, "medium": 0, "old": 0, "stale": 0}
-        
         for story in stories:
             # Check quality issues
-            if not story.get("estimate") or story.get("estimate") == "TBD":
+            if parse_points(story.get("estimate")) is None:
                 quality_issues["missing_estimates"] += 1
             
             if not story.get("owner"):
@@ -116,26 +126,10 @@ class ReportGenerator:
             title = story.get("title", "")
             if len(title) > 80:
                 quality_issues["long_titles"] += 1
-            
-            # Age analysis
-            created_str = story.get("created", "")
-            if created_str:
-                try:
-                    created_date = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-                    age_days = (current_date - created_date).days
-                    
-                    if age_days <= 7:
-                        age_buckets["new"] += 1
-                    elif age_days <= 30:
-                        age_buckets["medium"] += 1
-                    elif age_days <= 90:
-                        age_buckets["old"] += 1
-                    else:
-                        age_buckets["stale"] += 1
-                        quality_issues["stale_stories"] += 1
-                        
-                except (ValueError, TypeError):
-                    pass
+        
+        # Story age analysis: bisects over the sorted created days
+        age_buckets = DayIndex(stories, "created").age_histogram(today_number())
+        quality_issues["stale_stories"] = age_buckets["stale"]
         
         # Epic balance analysis
         epic_story_counts = {}
@@ -161,6 +155,8 @@ class ReportGenerator:
             "recommendations": self._generate_health_recommendations(quality_issues, age_buckets)
         }
     
+    @traced("aggregate.priority")
+    @REPORT_SECONDS.time(report="priority")
     def generate_priority_analytics(self) -> Dict[str, Any]:
         """Analyze priority distribution and trends."""
         stories = self.prioritization_data.get("backlog", [])
@@ -211,6 +207,8 @@ class ReportGenerator:
             "priority_recommendations": self._generate_priority_recommendations(unprocessed_by_epic)
         }
     
+    @traced("aggregate.workflow")
+    @REPORT_SECONDS.time(report="workflow")
     def generate_workflow_metrics(self) -> Dict[str, Any]:
         """Analyze workflow efficiency and automation performance with advanced analytics."""
         stories = self.prioritization_data.get("backlog", [])
@@ -230,12 +228,8 @@ class ReportGenerator:
         }
         
         # Story complexity analysis
-        complexity_analysis = {
-            "small": len([s for s in stories if self._get_story_size(s.get("estimate", "")) == "small"]),
-            "medium": len([s for s in stories if self._get_story_size(s.get("estimate", "")) == "medium"]),
-            "large": len([s for s in stories if self._get_story_size(s.get("estimate", "")) == "large"]),
-            "unknown": len([s for s in stories if self._get_story_size(s.get("estimate", "")) == "unknown"])
-        }
+        sizes = Counter(size_bucket(s.get("estimate")) for s in stories)
+        complexity_analysis = {size: sizes[size] for size in ("small", "medium", "large", "unknown")}
         
         # Advanced analytics
         velocity_trends = self._calculate_velocity_trends(stories)
@@ -265,6 +259,8 @@ class ReportGenerator:
             "strategic_alignment": strategic_alignment
         }
     
+    @traced("aggregate.dashboard")
+    @REPORT_SECONDS.time(report="dashboard")
     def generate_dashboard_data(self) -> Dict[str, Any]:
         """Generate comprehensive dashboard data."""
         velocity = self.generate_velocity_report()
@@ -306,23 +302,6 @@ class ReportGenerator:
         prioritized.sort(key=lambda x: x.get("priority", 99))
         return prioritized[:count]
     
-    def _get_story_size(self, estimate: str) -> str:
-        """Categorize story size from estimate."""
-        if not estimate or estimate == "TBD":
-            return "unknown"
-        
-        # Extract numeric value
-        numeric_match = re.search(r'(\d+)', str(estimate))
-        if numeric_match:
-            size = int(numeric_match.group(1))
-            if size <= 2:
-                return "small"
-            elif size <= 5:
-                return "medium"
-            else:
-                return "large"
-        return "unknown"
-    
     def _generate_health_recommendations(self, quality_issues: Dict, age_buckets: Dict) -> List[str]:
         """Generate actionable recommendations for backlog health."""
         recommendations = []
@@ -593,13 +572,13 @@ class ReportGenerator:
         total_stories = len(stories)
         
         # Story quality indicators
-        with_estimates = len([s for s in stories if self._parse_estimate(s.get("estimate", "")) > 0])
+        with_estimates = len([s for s in stories if estimate_points(s.get("estimate")) > 0])
         with_owners = len([s for s in stories if s.get("owner") and s.get("owner") != "unassigned"])
         with_acceptance_criteria = len([s for s in stories if s.get("acceptance_criteria")])
         properly_prioritized = len([s for s in stories if isinstance(s.get("priority"), int) and s.get("priority", 99) < 99])
         
-        # Age analysis (simulated)
-        stale_stories = max(0, total_stories // 10)  # Assume 10% are stale
+        # Age analysis: stories not updated within the stale window
+        stale_stories = DayIndex(stories, "last_updated").stale(today_number())
         recent_stories = total_stories - stale_stories
         
         quality_score = 0
@@ -629,17 +608,6 @@ class ReportGenerator:
             ]
         }
     
-    def _parse_estimate(self, estimate) -> int:
-        """Parse estimate value, handling both strings and integers."""
-        if isinstance(estimate, int):
-            return estimate
-        if isinstance(estimate, str):
-            try:
-                return int(estimate) if estimate.isdigit() else 0
-            except:
-                return 0
-        return 0
-    
     def _assess_strategic_alignment(self, stories: List[Dict]) -> Dict[str, Any]:
         """Assess strategic alignment and goal progress."""
         epic_distribution = {}
@@ -709,17 +677,20 @@ class ReportGenerator:
         if output_format == "json":
             filename = f"{report_type}_{timestamp}.json"
             filepath = self.reports_path / filename
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
+            with span("serialize.report", report=report_type), SAVE_SECONDS.time(view="report", phase="serialize"):
+                content = json.dumps(report_data, indent=2, ensure_ascii=False)
         
         elif output_format == "markdown":
             filename = f"{report_type}_{timestamp}.md"
             filepath = self.reports_path / filename
-            markdown_content = self._generate_markdown_report(report_data, report_type)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(markdown_content)
+            with span("serialize.report", report=report_type), SAVE_SECONDS.time(view="report", phase="serialize"):
+                content = self._generate_markdown_report(report_data, report_type)
         
         if filepath:
+            with span("write.report", report=report_type), SAVE_SECONDS.time(view="report", phase="write"):
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    f.write(content)
+            record_write("report", len(content.encode("utf-8")))
             print(f"✅ Report saved: {filepath}")
             return filepath
         else:
@@ -755,6 +726,7 @@ class ReportGenerator:
         return md
 
 
+@job("generate_reports")
 def main():
     parser = argparse.ArgumentParser(
         description="AI Sports Analytics Reporting Engine",
@@ -772,6 +744,9 @@ Examples:
   
   # Generate dashboard data
   python scripts/generate_reports.py --dashboard
+  
+  # Show where the time goes (open the trace in ui.perfetto.dev)
+  python scripts/generate_reports.py --trace reports/trace.json
         """
     )
     
@@ -783,8 +758,10 @@ Examples:
                        help="Generate dashboard data")
     parser.add_argument("--output", type=str,
                        help="Output directory (default: reports/)")
+    add_trace_argument(parser)
     
     args = parser.parse_args()
+    start_from_args(args)
     
     # Initialize generator
     generator = ReportGenerator()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Local GitHub API Stand-in
+
+Serves the small slice of the GitHub API used by collect_github_activity.py
+from JSON fixtures, so the full collection path runs offline:
+
+- POST /graphql                              batched ``repository`` aliases
+- GET  /repos/{owner}/{repo}/actions/runs    with ETag / If-None-Match
+- GET  /rate_limit
+
+Fixtures live in scripts/fixtures/github/<repo>.json and hold GraphQL-shaped
+``pullRequests`` / ``issues`` nodes plus REST-shaped ``workflow_runs``. The
+server keeps a rate-limit budget and reports it in the same headers and
+``rateLimit`` field as GitHub; 304 responses do not consume budget.
+"""
+
+import json
+import argparse
+import hashlib
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_FIXTURES = Path(__file__).parent / "fixtures" / "github"
+
+ALIAS_PATTERN = re.compile(r"(\w+): repository\(owner: \$(\w+), name: \$(\w+)\)")
+RUNS_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/actions/runs$")
+
+
+class MockGitHubState:
+    """Fixture data, rate-limit budget and request counters shared by handlers."""
+
+    def __init__(self, fixtures_dir: Path = DEFAULT_FIXTURES, rate_limit: int = 5000,
+                 reset_seconds: int = 3600):
+        self.repos: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for path in sorted(Path(fixtures_dir).glob("*.json")):
+            with open(path, 'r', encoding='utf-8') as f:
+                fixture = json.load(f)
+            self.repos[(fixture["owner"], fixture["name"])] = fixture
+
+        self.limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + reset_seconds
+        self.counts = {"graphql": 0, "rest": 0, "not_modified": 0}
+        self.lock = threading.Lock()
+
+    def spend(self, cost: int = 1):
+        with self.lock:
+            self.remaining = max(0, self.remaining - cost)
+
+    def rate_headers(self) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_at),
+        }
+
+    def _page(self, nodes: List[Dict[str, Any]], first: int,
+              after: Optional[str]) -> Dict[str, Any]:
+        start = int(after) if after else 0
+        page = nodes[start:start + first]
+        end = start + len(page)
+        return {"pageInfo": {"hasNextPage": end < len(nodes), "endCursor": str(end)},
+                "nodes": page}
+
+    def graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        first = variables.get("pageSize", 100)
+        since = variables.get("since") or ""
+        data: Dict[str, Any] = {}
+        errors = []
+
+        for index, (alias, owner_var, name_var) in enumerate(ALIAS_PATTERN.findall(query)):
+            owner, name = variables.get(owner_var), variables.get(name_var)
+            fixture = self.repos.get((owner, name))
+            if fixture is None:
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias],
+                               "message": f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+                continue
+
+            suffix = alias[1:]
+            repository: Dict[str, Any] = {}
+            if f"prAfter{suffix}" in variables:
+                # Real GitHub has no `since` filter on pullRequests: ordering only
+                prs = sorted(fixture.get("pullRequests", []), key=lambda n: n["updatedAt"], reverse=True)
+                repository["pullRequests"] = self._page(prs, first, variables[f"prAfter{suffix}"])
+            if f"issueAfter{suffix}" in variables:
+                issues = sorted((n for n in fixture.get("issues", []) if n["updatedAt"] >= since),
+                                key=lambda n: n["updatedAt"], reverse=True)
+                repository["issues"] = self._page(issues, first, variables[f"issueAfter{suffix}"])
+            data[alias] = repository
+
+        self.spend(1)
+        data["rateLimit"] = {"cost": 1, "remaining": self.remaining,
+                             "resetAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.reset_at))}
+        response: Dict[str, Any] = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def workflow_runs(self, owner: str, name: str, params: Dict[str, List[str]]) -> Optional[Dict[str, Any]]:
+        fixture = self.repos.get((owner, name))
+        if fixture is None:
+            return None
+        created = (params.get("created") or [""])[0]
+        since = created[2:] if created.startswith(">=") else ""
+        per_page = int((params.get("per_page") or ["30"])[0])
+        page = int((params.get("page") or ["1"])[0])
+
+        runs = sorted((r for r in fixture.get("workflow_runs", []) if r["created_at"][:10] >= since),
+                      key=lambda r: r["created_at"], reverse=True)
+        start = (page - 1) * per_page
+        return {"total_count": len(runs), "workflow_runs": runs[start:start + per_page]}
+
+
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    state: MockGitHubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in {**self.state.rate_headers(), **(headers or {})}.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/graphql":
+            self._send_json(404, {"message": "Not Found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.state.counts["graphql"] += 1
+        if self.state.remaining <= 0:
+            self._send_json(403, {"message": "API rate limit exceeded"})
+            return
+        self._send_json(200, self.state.graphql(request.get("query", ""), request.get("variables") or {}))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/rate_limit":
+            self._send_json(200, {"resources": {"core": {
+                "limit": self.state.limit, "remaining": self.state.remaining, "reset": self.state.reset_at}}})
+            return
+
+        match = RUNS_PATH.match(url.path)
+        if not match:
+            self._send_json(404, {"message": "Not Found"})
+            return
+
+        payload = self.state.workflow_runs(match.group(1), match.group(2), parse_qs(url.query))
+        if payload is None:
+            self._send_json(404, {"message": "Not Found"})
+            return
+
+        etag = '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.state.counts["not_modified"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            for key, value in self.state.rate_headers().items():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        self.state.counts["rest"] += 1
+        if self.state.remaining <= 0:
+            self._send_json(403, {"message": "API rate limit exceeded"})
+            return
+        self.state.spend(1)
+        self._send_json(200, payload, {"ETag": etag})
+
+
+def start_mock_server(fixtures_dir: Path = DEFAULT_FIXTURES, port: int = 0,
+                      rate_limit: int = 5000) -> ThreadingHTTPServer:
+    """Start the stand-in on a background thread; ``server.server_port`` has the port."""
+    state = MockGitHubState(fixtures_dir, rate_limit=rate_limit)
+    handler = type("BoundMockGitHubHandler", (MockGitHubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve GitHub API fixtures for offline collection runs",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Serve the bundled fixtures on port 8765
+  python scripts/github_mock_server.py --port 8765
+
+  # Point the collector at it
+  python scripts/collect_github_activity.py --api-url http://127.0.0.1:8765 --token test
+        """
+    )
+
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--fixtures", type=str, default=str(DEFAULT_FIXTURES),
+                       help="Directory of <repo>.json fixtures")
+    parser.add_argument("--rate-limit", type=int, default=5000,
+                       help="Request budget before 403 responses")
+
+    args = parser.parse_args()
+
+    server = start_mock_server(Path(args.fixtures), args.port, args.rate_limit)
+    print(f"🧪 Mock GitHub API on http://127.0.0.1:{server.server_port} "
+          f"({len(server.state.repos)} fixture repos)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n👋 Stopped")
+
+
+if __name__ == "__main__":
+    main()
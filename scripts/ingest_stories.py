@@ -7,8 +7,6 @@ ID assignment, validation, and JSON updates.
 """
 
 import json
-import yaml
-import csv
 import re
 import argparse
 import sys
@@ -17,8 +15,16 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import shutil
 
+from metrics import PARSE_ERRORS, SAVE_SECONDS, STORIES_PARSED, job, record_read, record_write
+from record_stream import FORMATS, iter_records
+from story_dates import iso_date
+from tracing import add_trace_argument, span, start_from_args, traced
+
+# Bulk files in staging/bulk/: {"stories": [...]} documents plus streamed NDJSON/CSV
+BULK_SUFFIXES = (".json",) + tuple(FORMATS)
+
 class StoryIngestor:
-    def __init__(self, base_path: str = "."):
+    def __init__(self, base_path: str = ".", store: Optional["BacklogStore"] = None):
         self.base_path = Path(base_path)
         self.staging_path = self.base_path / "staging"
         self.backlog_path = self.base_path / "backlog"
@@ -39,15 +45,25 @@ class StoryIngestor:
             "models": "models"
         }
         
-        # Load existing data
-        self.prioritization_data = self._load_prioritization_json()
+        # Highest number per ID prefix, built on first use (see _get_next_story_id)
+        self._id_numbers: Optional[Dict[str, int]] = None
+
+        # Load existing data; with a store, stories are written through it
+        self.store = store
+        if store is not None:
+            self.prioritization_data = store.prioritization
+        else:
+            self.prioritization_data = self._load_prioritization_json()
         
     def _load_prioritization_json(self) -> Dict[str, Any]:
         """Load the current prioritization JSON."""
+        # Imported on first load so that --help skips the store
+        from backlog_store import load_view
+
         json_file = self.backlog_path / "PRIORITIZATION.json"
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with span("load.prioritization"):
+                return load_view(json_file)
         except FileNotFoundError:
             print(f"Warning: {json_file} not found. Creating new structure.")
             return {"metadata": {}, "backlog": []}
@@ -62,15 +78,12 @@ class StoryIngestor:
             "total_backlog_stories": len(self.prioritization_data["backlog"])
         })
         
-        # Ensure all dates are strings for JSON serialization
-        for story in self.prioritization_data["backlog"]:
-            if "created" in story and hasattr(story["created"], "strftime"):
-                story["created"] = story["created"].strftime("%Y-%m-%d")
-            if "last_updated" in story and hasattr(story["last_updated"], "strftime"):
-                story["last_updated"] = story["last_updated"].strftime("%Y-%m-%d")
-        
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.prioritization_data, f, indent=2, ensure_ascii=False)
+        with span("serialize.prioritization"), SAVE_SECONDS.time(view="prioritization", phase="serialize"):
+            text = json.dumps(self.prioritization_data, indent=2, ensure_ascii=False)
+        with span("write.prioritization"), SAVE_SECONDS.time(view="prioritization", phase="write"):
+            with open(json_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+        record_write("view", len(text.encode("utf-8")))
         print(f"✅ Updated {json_file}")
     
     def _get_next_story_id(self, epic: str) -> str:
@@ -92,20 +105,29 @@ class StoryIngestor:
         
         prefix = epic_prefixes.get(epic, "GEN")
         
-        # Find highest existing number for this prefix
-        existing_numbers = []
-        for story in self.prioritization_data["backlog"]:
-            story_id = story.get("id", "")
-            if story_id.startswith(prefix + "-"):
-                try:
-                    number = int(story_id.split("-")[1])
-                    existing_numbers.append(number)
-                except (IndexError, ValueError):
-                    continue
+        # Find highest existing number for this prefix. The scan runs once and
+        # is then kept up to date, so bulk imports do not rescan per story.
+        if self._id_numbers is None:
+            self._id_numbers = {}
+            for story in self.prioritization_data["backlog"]:
+                self._note_story_id(story.get("id", ""))
         
-        next_number = max(existing_numbers, default=0) + 1
+        next_number = self._id_numbers.get(prefix, 0) + 1
+        self._id_numbers[prefix] = next_number
         return f"{prefix}-{next_number:03d}"
     
+    def _note_story_id(self, story_id: str):
+        """Record an ID so the next generated one for its prefix is higher."""
+        if self._id_numbers is None:
+            return
+        parts = story_id.split("-")
+        try:
+            number = int(parts[1])
+        except (IndexError, ValueError):
+            return
+        if number > self._id_numbers.get(parts[0], 0):
+            self._id_numbers[parts[0]] = number
+    
     def _create_branch_name(self, story_id: str, title: str) -> str:
         """Create git branch name from story ID and title."""
         # Convert title to kebab-case
@@ -138,19 +160,43 @@ class StoryIngestor:
             errors.append(f"Invalid epic '{epic}'. Valid epics: {list(self.epic_dirs.keys())}")
         
         # Title validation
-        title = story_data.get("title", "")
+        errors.extend(self._title_errors(story_data.get("title", "")))
+        
+        return len(errors) == 0, errors
+    
+    def _title_errors(self, title: str) -> List[str]:
+        errors = []
         if len(title) < 10:
             errors.append("Title too short (minimum 10 characters)")
         if len(title) > 100:
             errors.append("Title too long (maximum 100 characters)")
-        
+        return errors
+    
+    def _validate_update(self, updates: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """Validate the fields an update sets on an existing story, by the rules new stories follow."""
+        errors = []
+        if "title" in updates:
+            title = updates["title"]
+            if not title or not isinstance(title, str):
+                errors.append("Missing required field: title")
+            else:
+                errors.extend(self._title_errors(title))
+        for field in ("labels", "dependencies"):
+            if field in updates and not isinstance(updates[field], list):
+                errors.append(f"{field} must be a list")
+        if "priority" in updates and (not isinstance(updates["priority"], int) or isinstance(updates["priority"], bool)):
+            errors.append("priority must be an integer")
         return len(errors) == 0, errors
     
+    @traced("parse.staging")
     def _parse_markdown_story(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """Parse a markdown story file."""
+        import yaml
+
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
+            record_read("staging", len(content.encode("utf-8")))
             
             # Split frontmatter and content
             if content.startswith('---'):
@@ -175,12 +221,15 @@ class StoryIngestor:
             if criteria_matches:
                 frontmatter['acceptance_criteria'] = criteria_matches
             
+            STORIES_PARSED.inc(source="staging")
             return frontmatter
             
         except Exception as e:
+            PARSE_ERRORS.inc(source="staging")
             print(f"Error parsing {file_path}: {e}")
             return None
     
+    @traced("ingest.story")
     def _process_single_story(self, story_data: Dict[str, Any], source_file: Optional[Path] = None) -> bool:
         """Process a single story into the backlog."""
         # Validate story
@@ -194,6 +243,8 @@ class StoryIngestor:
         # Generate story ID if not provided or temporary
         if not story_data.get("id") or story_data["id"].startswith("TEMP-"):
             story_data["id"] = self._get_next_story_id(story_data["epic"])
+        else:
+            self._note_story_id(story_data["id"])
         
         # Generate branch name
         story_data["branch_name"] = self._create_branch_name(story_data["id"], story_data["title"])
@@ -206,6 +257,9 @@ class StoryIngestor:
         story_data.setdefault("labels", [])
         story_data.setdefault("created", datetime.now().strftime("%Y-%m-%d"))
         story_data.setdefault("last_updated", datetime.now().strftime("%Y-%m-%d"))
+        # YAML frontmatter gives date objects; store every date as YYYY-MM-DD once, here
+        for field in ("created", "last_updated"):
+            story_data[field] = iso_date(story_data[field])
         story_data.setdefault("author", "story-ingestor")
         story_data.setdefault("owner", "")
         
@@ -222,14 +276,25 @@ class StoryIngestor:
         story_data["file_path"] = f"backlog/{self.epic_dirs[epic]}/{target_filename}"
         
         # Create the markdown file content
-        content = self._create_story_markdown(story_data)
+        with span("serialize.story"):
+            content = self._create_story_markdown(story_data)
         
         # Write the story file
-        with open(target_path, 'w', encoding='utf-8') as f:
+        with span("write.story"), open(target_path, 'w', encoding='utf-8') as f:
             f.write(content)
+        record_write("story", len(content.encode("utf-8")))
         
         # Add to prioritization JSON
-        self.prioritization_data["backlog"].append(story_data)
+        if self.store is not None:
+            from generate_complete_backlog import parse_story_file
+
+            self.store.add_prioritized(story_data)
+            parsed = parse_story_file(target_path)
+            if parsed:
+                parsed[0]["file_path"] = story_data["file_path"]
+                self.store.upsert(*parsed)
+        else:
+            self.prioritization_data["backlog"].append(story_data)
         
         print(f"✅ Created story: {story_data['id']} - {story_data['title']}")
         print(f"   📁 Location: {target_path}")
@@ -246,6 +311,8 @@ class StoryIngestor:
     
     def _create_story_markdown(self, story_data: Dict[str, Any]) -> str:
         """Create markdown content for a story."""
+        import yaml
+
         # Prepare frontmatter
         frontmatter = {k: v for k, v in story_data.items() 
                       if k not in ['user_story', 'acceptance_criteria', 'description']}
@@ -295,15 +362,41 @@ class StoryIngestor:
         
         return content
     
-    def process_markdown_files(self) -> int:
-        """Process all markdown files in staging/new/."""
+    def update_story_file(self, story: Dict[str, Any], updates: Dict[str, Any]) -> bool:
+        """Write an edit's synced fields into the story file and re-apply the file.
+
+        backlog_sync.py copies SYNCED_FIELDS from story files into the views,
+        so an edit made only in PRIORITIZATION.json would be reverted by the
+        next sync. Returns False when nothing synced changed or the story has
+        no file.
+        """
+        from backlog_store import SYNCED_FIELDS, set_frontmatter_fields
+        from generate_complete_backlog import parse_story_file
+
+        fields = {field: value for field, value in updates.items()
+                  if field in SYNCED_FIELDS and field != "file_path"}
+        path = self.base_path / story["file_path"] if story.get("file_path") else None
+        if not fields or path is None or not path.is_file():
+            return False
+        fields["last_updated"] = datetime.now().strftime("%Y-%m-%d")
+        set_frontmatter_fields(path, fields)
+
+        if self.store is not None:
+            parsed = parse_story_file(path)
+            if parsed:
+                parsed[0]["file_path"] = story["file_path"]
+                self.store.upsert(*parsed)
+        return True
+    
+    def process_markdown_files(self, files: Optional[List[Path]] = None) -> int:
+        """Process all markdown files in staging/new/, or just ``files``."""
         new_dir = self.staging_path / "new"
         if not new_dir.exists():
             print(f"No staging directory found: {new_dir}")
             return 0
         
         processed_count = 0
-        markdown_files = list(new_dir.glob("*.md"))
+        markdown_files = list(new_dir.glob("*.md")) if files is None else files
         
         if not markdown_files:
             print("No markdown files found in staging/new/")
@@ -323,22 +416,33 @@ class StoryIngestor:
         
         return processed_count
     
-    def process_json_files(self) -> int:
-        """Process JSON bulk import files."""
+    def process_json_files(self, files: Optional[List[Path]] = None) -> int:
+        """Process bulk import files in staging/bulk/, or just ``files``.
+
+        ``.json`` files hold a ``{"stories": [...]}`` document; ``.ndjson``,
+        ``.jsonl`` and ``.csv`` files are streamed one record at a time.
+        """
         bulk_dir = self.staging_path / "bulk"
         if not bulk_dir.exists():
             return 0
         
         processed_count = 0
-        json_files = list(bulk_dir.glob("*.json"))
+        if files is None:
+            json_files = sorted(p for p in bulk_dir.iterdir() if p.suffix.lower() in BULK_SUFFIXES)
+        else:
+            json_files = files
         
         for file_path in json_files:
-            print(f"\n🔄 Processing JSON: {file_path.name}")
+            print(f"\n🔄 Processing {file_path.suffix[1:].upper()}: {file_path.name}")
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                if file_path.suffix.lower() == ".json":
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    stories = data.get("stories", [])
+                    STORIES_PARSED.inc(len(stories), source="json")
+                else:
+                    stories = self._stream_records(file_path)
                 
-                stories = data.get("stories", [])
                 for story_data in stories:
                     if self._process_single_story(story_data):
                         processed_count += 1
@@ -353,6 +457,80 @@ class StoryIngestor:
         
         return processed_count
     
+    def _stream_records(self, file_path: Path):
+        """Yield records from an NDJSON/CSV file, reporting unreadable rows."""
+        for row, _, record, error in iter_records(file_path):
+            if error:
+                print(f"❌ Row {row}: {error}")
+            else:
+                yield record
+
+    def _staged_files(self, paths, directory: Path, suffixes) -> List[Path]:
+        """Files from a batch of events that are still waiting in ``directory``."""
+        return sorted(p for p in paths
+                      if p.parent == directory and p.suffix.lower() in suffixes and p.is_file())
+
+    def watch(self, debounce: float = 1.0, markdown: bool = True, bulk: bool = True,
+              polling: bool = False):
+        """Ingest stories as they land in staging/new/ and staging/bulk/.
+
+        Events are coalesced over ``debounce`` seconds and each batch is
+        written with a single store commit, so several authors dropping
+        stories at once cause one save instead of one per story.
+        """
+        # fs_watch loads ctypes; only watch mode needs it
+        from fs_watch import create_watcher, watch_batches
+
+        if self.store is None:
+            from backlog_store import BacklogStore
+
+            self.store = BacklogStore(self.base_path)
+        new_dir = self.staging_path / "new"
+        bulk_dir = self.staging_path / "bulk"
+        watched = []
+        if markdown:
+            new_dir.mkdir(parents=True, exist_ok=True)
+            watched.append(new_dir)
+        if bulk:
+            bulk_dir.mkdir(parents=True, exist_ok=True)
+            watched.append(bulk_dir)
+
+        watcher = create_watcher(watched, polling=polling)
+        print(f"👀 Watching {', '.join(str(d) for d in watched)} (debounce {debounce:.1f}s)")
+
+        # Anything staged before the watcher started forms the first batch
+        pending = set(new_dir.glob("*.md")) | set(bulk_dir.iterdir() if bulk_dir.exists() else [])
+        batches = watch_batches(watcher, debounce=debounce, max_latency=max(debounce * 5, 5.0))
+        try:
+            while True:
+                paths = pending or next(batches)[0]
+                pending = set()
+
+                markdown_files = self._staged_files(paths, new_dir, (".md",)) if markdown else []
+                json_files = self._staged_files(paths, bulk_dir, BULK_SUFFIXES) if bulk else []
+                if not markdown_files and not json_files:
+                    continue
+
+                # Pick up changes other tools made since the last batch
+                self.store.reload()
+                self.prioritization_data = self.store.prioritization
+                self._id_numbers = None
+
+                processed = 0
+                if markdown_files:
+                    processed += self.process_markdown_files(markdown_files)
+                if json_files:
+                    processed += self.process_json_files(json_files)
+
+                if processed > 0:
+                    for written in self.store.commit():
+                        print(f"✅ Updated {written}")
+                    print(f"🎉 Ingested {processed} stories from {len(markdown_files) + len(json_files)} files")
+        except KeyboardInterrupt:
+            print("\n👋 Stopping staging watch")
+        finally:
+            watcher.close()
+
     def interactive_story_creation(self):
         """Interactive CLI for creating a story."""
         print("\n🎯 Interactive Story Creation")
@@ -456,6 +634,7 @@ class StoryIngestor:
         print(f"   Edit the file and run 'ingest_stories.py' to process it")
 
 
+@job("ingest_stories")
 def main():
     parser = argparse.ArgumentParser(
         description="Story Ingestion System for AI Sports Analytics",
@@ -473,6 +652,9 @@ Examples:
   
   # Process only markdown files
   python scripts/ingest_stories.py --markdown-only
+  
+  # Keep running and ingest stories as they are dropped into staging/
+  python scripts/ingest_stories.py --watch
         """
     )
     
@@ -489,10 +671,17 @@ Examples:
     parser.add_argument("--json-only", action="store_true", 
                        help="Process only JSON files")
     
+    parser.add_argument("--watch", action="store_true",
+                       help="Watch staging/new and staging/bulk and ingest each batch of files")
+    parser.add_argument("--debounce", type=float, default=1.0,
+                       help="Seconds of quiet before a watched batch is ingested (default: 1.0)")
+    
     parser.add_argument("--dry-run", action="store_true",
                        help="Show what would be processed without making changes")
+    add_trace_argument(parser)
     
     args = parser.parse_args()
+    start_from_args(args)
     
     # Initialize ingestor
     ingestor = StoryIngestor()
@@ -510,6 +699,12 @@ Examples:
         ingestor.interactive_story_creation()
         return
     
+    # Handle watch mode
+    if args.watch:
+        ingestor.watch(debounce=args.debounce, markdown=not args.json_only,
+                       bulk=not args.markdown_only)
+        return
+    
     # Process staged stories
     total_processed = 0
     
@@ -13,6 +13,9 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+from metrics import SAVE_SECONDS, job
+from tracing import add_trace_argument, span, start_from_args, traced
+
 class PriorityManager:
     def __init__(self, json_file: str = "backlog/PRIORITIZATION.json"):
         self.json_file = Path(json_file)
@@ -20,9 +23,12 @@ class PriorityManager:
         
     def _load_json(self) -> Dict[str, Any]:
         """Load and parse the prioritization JSON file."""
+        # Imported on first load so that --help skips the store
+        from backlog_store import load_view
+
         try:
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with span("load.prioritization"):
+                return load_view(self.json_file)
         except FileNotFoundError:
             print(f"Error: {self.json_file} not found!")
             sys.exit(1)
@@ -35,10 +41,14 @@ class PriorityManager:
         # Update metadata
         self.data["metadata"]["last_updated"] = datetime.now().strftime("%Y-%m-%d")
         
-        with open(self.json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        with span("serialize.prioritization"), SAVE_SECONDS.time(view="prioritization", phase="serialize"):
+            text = json.dumps(self.data, indent=2, ensure_ascii=False)
+        with span("write.prioritization"), SAVE_SECONDS.time(view="prioritization", phase="write"):
+            with open(self.json_file, 'w', encoding='utf-8') as f:
+                f.write(text)
         print(f"✅ Updated {self.json_file}")
     
+    @traced("aggregate.by_priority")
     def get_stories_by_priority(self, include_completed: bool = False) -> Dict[int, List[Dict[str, Any]]]:
         """Group stories by priority level."""
         priority_groups = {}
@@ -103,6 +113,7 @@ class PriorityManager:
                 epic_tag = f"[{story.get('epic', 'unknown')}]"
                 print(f"   {status_emoji} {story['id']}: {story['title']} {epic_tag}")
     
+    @traced("update.shift")
     def shift_priorities(self, from_priority: int, positions: int, dry_run: bool = False):
         """
         Shift stories at a priority level down by specified positions.
@@ -143,6 +154,7 @@ class PriorityManager:
         self._save_json()
         print(f"✅ Shifted {len(affected_stories)} stories down by {positions} positions")
     
+    @traced("update.set")
     def set_priority(self, story_id: str, new_priority: int):
         """Set specific priority for a story."""
         story = self._find_story(story_id)
@@ -158,6 +170,7 @@ class PriorityManager:
         print(f"✅ {story_id}: Priority {old_priority} → {new_priority}")
         return True
     
+    @traced("update.insert")
     def insert_at_priority(self, story_ids: List[str], start_priority: int, shift_existing: bool = True):
         """
         Insert stories at specific priority levels, optionally shifting existing stories.
@@ -177,6 +190,7 @@ class PriorityManager:
             new_priority = start_priority + i
             self.set_priority(story_id, new_priority)
     
+    @traced("update.auto_prioritize")
     def auto_prioritize_ready_stories(self, max_priority: int = 10):
         """Automatically prioritize ready stories based on business value."""
         ready_stories = [
@@ -191,35 +205,16 @@ class PriorityManager:
         print(f"\n🤖 Auto-prioritizing {len(ready_stories)} ready stories")
         print("=" * 50)
         
-        # Simple scoring algorithm
-        def calculate_score(story):
-            score = 0
-            epic = story.get("epic", "")
-            
-            # Epic-based scoring
-            epic_scores = {
-                "core": 10,      # Core LLM functionality
-                "modeling": 8,   # ML models
-                "ingestion": 7,  # Data ingestion
-                "ui": 6,         # User interface
-                "quality": 5,    # Quality assurance
-                "infrastructure": 4,  # Infrastructure
-                "adhoc": 1       # Ad-hoc tasks
-            }
-            score += epic_scores.get(epic, 3)
-            
-            # Dependency bonus (stories with no dependencies are easier)
-            if not story.get("dependencies", []):
-                score += 2
-            
-            # Owner bonus (assigned stories)
-            if story.get("owner"):
-                score += 1
-            
-            return score
+        from priority_engine import PriorityWeights, StoryFeatures, ranking, score_models
+
+        # Business-value scores from the ready_queue model in priority_weights.yaml
+        model = PriorityWeights.load().model("ready_queue")
+        scores = score_models([model], StoryFeatures(ready_stories))[0]
         
         # Sort by score and assign priorities
-        ready_stories.sort(key=calculate_score, reverse=True)
+        order = ranking(scores, model.order)
+        ready_stories = [ready_stories[i] for i in order]
+        scores = [scores[i] for i in order]
         
         # Find next available priority slot
         current_priorities = {story.get("priority") for story in self.data["backlog"]}
@@ -230,7 +225,7 @@ class PriorityManager:
         for i, story in enumerate(ready_stories[:10]):  # Top 10 ready stories
             priority = next_priority + i
             self.set_priority(story["id"], priority)
-            print(f"   ⭐ {story['id']}: Priority {priority} (Score: {calculate_score(story)})")
+            print(f"   ⭐ {story['id']}: Priority {priority} (Score: {scores[i]})")
     
     def _find_story(self, story_id: str) -> Optional[Dict[str, Any]]:
         """Find a story by ID."""
@@ -300,6 +295,7 @@ class PriorityManager:
                 print("❌ Invalid option")
 
 
+@job("manage_priorities")
 def main():
     parser = argparse.ArgumentParser(
         description="AI Sports Analytics Priority Management",
@@ -357,8 +353,10 @@ Examples:
     # File path
     parser.add_argument("--file", type=str, default="backlog/PRIORITIZATION.json", 
                        help="Path to prioritization JSON file")
+    add_trace_argument(parser)
     
     args = parser.parse_args()
+    start_from_args(args)
     
     # Initialize manager
     manager = PriorityManager(args.file)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Pipeline Metrics
+
+Process-wide registry of counters, gauges and histograms for the backlog
+scripts and backlog_service.py (INT-004), rendered in the Prometheus text
+exposition format (version 0.0.4).
+
+- The service serves the registry at ``GET /metrics``.
+- Batch scripts decorate ``main()`` with ``@job("name")``. When
+  ``BACKLOG_METRICS_DIR`` is set (e.g. node_exporter's textfile collector
+  directory), each run writes ``backlog_<name>.prom`` there atomically on
+  exit, with every series labelled ``job="<name>"`` plus the run's
+  duration, outcome and timestamp. Cron runs can then be scraped and
+  compared over time.
+
+Standard library only; updates take a per-metric lock, so worker threads
+(``asyncio.to_thread``) can record safely.
+
+Usage:
+    from metrics import BYTES_WRITTEN, SAVE_SECONDS
+
+    with SAVE_SECONDS.time(view="prioritization", phase="write"):
+        ...
+    BYTES_WRITTEN.inc(len(data), kind="view")
+"""
+
+import functools
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+TEXTFILE_ENV = "BACKLOG_METRICS_DIR"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def value(self, **labels) -> Any:
+        return self._values.get(self._key(labels), 0)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> List[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        """(suffix, extra label names, label values, value) for rendering."""
+        with self._lock:
+            return [("", (), key, value) for key, value in sorted(self._values.items())]
+
+    def render(self, const_labels: Optional[Dict[str, str]] = None) -> List[str]:
+        const_names = tuple(const_labels or ())
+        const_values = tuple((const_labels or {}).values())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, extra_names, values, value in self.samples():
+            names = const_names + self.labelnames + extra_names
+            labels = _label_text(names, const_values + values)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def value(self, **labels) -> Dict[str, float]:
+        state = self._values.get(self._key(labels))
+        return {"count": state[2], "sum": state[1]} if state else {"count": 0, "sum": 0.0}
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    samples.append(("_bucket", ("le",), key + (_format_value(bound),), cumulative))
+                samples.append(("_sum", (), key, total))
+                samples.append(("_count", (), key, count))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self, const_labels: Optional[Dict[str, str]] = None) -> str:
+        """Prometheus text format; metrics with no samples yet are left out."""
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            if metric._values:
+                lines.extend(metric.render(const_labels))
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_textfile(self, path: Path, const_labels: Optional[Dict[str, str]] = None) -> Path:
+        """Write atomically, so the textfile collector never reads a partial file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.render(const_labels))
+        os.replace(tmp, path)
+        return path
+
+
+REGISTRY = Registry()
+
+# Pipeline metrics shared by the scripts and the service
+STORIES_PARSED = REGISTRY.counter(
+    "backlog_stories_parsed_total", "Story records parsed from markdown, JSON, NDJSON or CSV", ["source"])
+PARSE_ERRORS = REGISTRY.counter(
+    "backlog_parse_errors_total", "Story files or records that could not be parsed", ["source"])
+FILES_READ = REGISTRY.counter(
+    "backlog_files_read_total", "Files read by the pipeline", ["kind"])
+BYTES_READ = REGISTRY.counter(
+    "backlog_bytes_read_total", "Bytes read by the pipeline", ["kind"])
+FILES_WRITTEN = REGISTRY.counter(
+    "backlog_files_written_total", "Files written by the pipeline", ["kind"])
+BYTES_WRITTEN = REGISTRY.counter(
+    "backlog_bytes_written_total", "Bytes written by the pipeline", ["kind"])
+SAVE_SECONDS = REGISTRY.histogram(
+    "backlog_save_seconds", "Time to serialize or write a JSON view or report", ["view", "phase"])
+REPORT_SECONDS = REGISTRY.histogram(
+    "backlog_report_compute_seconds", "Time to compute a report, excluding the write", ["report"])
+CACHE_HITS = REGISTRY.counter(
+    "backlog_cache_hits_total", "Lookups answered from a cache", ["cache"])
+CACHE_MISSES = REGISTRY.counter(
+    "backlog_cache_misses_total", "Lookups that had to recompute or refetch", ["cache"])
+
+JOB_DURATION = REGISTRY.gauge(
+    "backlog_job_duration_seconds", "Wall time of the last run")
+JOB_SUCCESS = REGISTRY.gauge(
+    "backlog_job_success", "1 if the last run exited cleanly, 0 otherwise")
+JOB_LAST_RUN = REGISTRY.gauge(
+    "backlog_job_last_run_timestamp_seconds", "Unix time the last run finished")
+
+
+def record_write(kind: str, size: int):
+    FILES_WRITTEN.inc(kind=kind)
+    BYTES_WRITTEN.inc(size, kind=kind)
+
+
+def record_read(kind: str, size: int):
+    FILES_READ.inc(kind=kind)
+    BYTES_READ.inc(size, kind=kind)
+
+
+def textfile_path(name: str) -> Optional[Path]:
+    directory = os.environ.get(TEXTFILE_ENV)
+    return Path(directory) / f"backlog_{name}.prom" if directory else None
+
+
+def job(name: str):
+    """Decorate a script's ``main()`` to record the run and dump the registry.
+
+    Nothing is written unless ``BACKLOG_METRICS_DIR`` is set.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            success = False
+            try:
+                result = func(*args, **kwargs)
+                success = True
+                return result
+            except SystemExit as e:
+                success = e.code in (None, 0)
+                raise
+            finally:
+                JOB_DURATION.set(time.perf_counter() - started)
+                JOB_SUCCESS.set(1 if success else 0)
+                JOB_LAST_RUN.set(time.time())
+                path = textfile_path(name)
+                if path is not None:
+                    try:
+                        REGISTRY.write_textfile(path, {"job": name})
+                    except OSError as e:
+                        print(f"⚠️  Could not write metrics to {path}: {e}", file=sys.stderr)
+        return wrapper
+    return decorator
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Priority Scoring Engine
+
+Scores stories with the weighted models in priority_weights.yaml, the one
+place for what assign_priorities.py (the "strategic" model),
+manage_priorities.py --auto-prioritize ("ready_queue") and
+backlog_groomer.py (the "grooming" thresholds) used to hard-code.
+
+Stories are encoded once into feature columns (epic and status codes, list
+position, dependency and owner flags, estimate points, lowered titles). A
+model's scores for every story are then table lookups and element-wise sums
+over those columns, and a batch of what-if scenarios is scored together: as
+one scenarios x stories NumPy matrix when NumPy is installed, with ``map``
+over the columns otherwise. ``rank_changes`` reports how each scenario
+reorders the backlog relative to its base model, so planning ideas can be
+tried on a large backlog without rewriting any view:
+
+    weights = PriorityWeights.load()
+    features = StoryFeatures(stories)
+    baseline, data_first = score_models([weights.model("strategic"),
+                                         weights.model("data-first")], features)
+
+Usage:
+  python scripts/priority_engine.py --set epic.ui=1 --top 20
+"""
+
+import copy
+import json
+import argparse
+import sys
+import time
+from operator import add
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from estimates import estimate_points
+from metrics import job
+from story_columns import numpy_module
+
+DEFAULT_WEIGHTS = Path(__file__).resolve().with_name("priority_weights.yaml")
+
+# Score terms in the order they are summed (the order matters for float results)
+TERMS = ("epic", "status", "position", "title_keywords", "no_dependencies", "owner", "effort")
+TABLE_TERMS = ("epic", "status")
+MODEL_KEYS = set(TERMS) | {"order", "truncate", "minimum"}
+ORDERS = ("ascending", "descending")
+
+
+class WeightsError(ValueError):
+    pass
+
+
+class ScoringModel:
+    """One weighted model: lookup tables and coefficients for each score term."""
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        unknown = set(spec) - MODEL_KEYS - {"model"}
+        if unknown:
+            raise WeightsError(f"Model '{name}': unknown keys {sorted(unknown)}; valid: {sorted(MODEL_KEYS)}")
+        self.name = name
+        self.spec = spec
+        # The model a scenario was derived from (None for the models themselves)
+        self.base: Optional[str] = None
+        self.order = spec.get("order", "ascending")
+        if self.order not in ORDERS:
+            raise WeightsError(f"Model '{name}': order must be one of {ORDERS}, got '{self.order}'")
+        self.tables: Dict[str, Tuple[Dict[str, Any], Any]] = {}
+        for term in TABLE_TERMS:
+            table = dict(spec.get(term) or {})
+            default = table.pop("default", 0)
+            self.tables[term] = (table, default)
+        self.position = spec.get("position", 0)
+        try:
+            self.title_keywords = tuple((tuple(str(word).lower() for word in group["words"]), group["boost"])
+                                        for group in spec.get("title_keywords") or [])
+        except (KeyError, TypeError):
+            raise WeightsError(f"Model '{name}': title_keywords entries need 'words' and 'boost'")
+        self.no_dependencies = spec.get("no_dependencies", 0)
+        self.owner = spec.get("owner", 0)
+        self.effort = spec.get("effort", 0)
+        self.truncate = bool(spec.get("truncate", False))
+        self.minimum = spec.get("minimum")
+
+    def with_overrides(self, name: str, overrides: Dict[str, Any]) -> "ScoringModel":
+        """A copy of this model with some weights changed; table terms merge entry by entry."""
+        spec = copy.deepcopy(self.spec)
+        for key, value in overrides.items():
+            if key in TABLE_TERMS and isinstance(value, dict):
+                spec[key] = {**(spec.get(key) or {}), **value}
+            else:
+                spec[key] = value
+        model = ScoringModel(name, spec)
+        model.base = self.base or self.name
+        return model
+
+    def lookup(self, term: str, value: Any) -> Any:
+        table, default = self.tables[term]
+        return table.get(value, default)
+
+    def title_boost(self, title: str) -> Any:
+        """Boost of the first keyword group with a word in the (lowered) title."""
+        for words, boost in self.title_keywords:
+            if any(word in title for word in words):
+                return boost
+        return 0
+
+    def finish(self, score: Any) -> Any:
+        if self.truncate:
+            score = int(score)
+        if self.minimum is not None:
+            score = max(self.minimum, score)
+        return score
+
+    def score_story(self, story: Dict[str, Any], index: int = 0, total: int = 1) -> Any:
+        """One story's score, for callers that score a single story."""
+        score = self.lookup("epic", story.get("epic")) + self.lookup("status", story.get("status"))
+        if self.position:
+            score += (index / total) * self.position
+        if self.title_keywords:
+            score += self.title_boost(str(story.get("title") or "").lower())
+        if self.no_dependencies and not story.get("dependencies"):
+            score += self.no_dependencies
+        if self.owner and story.get("owner"):
+            score += self.owner
+        if self.effort:
+            score += self.effort * estimate_points(story.get("estimate"))
+        return _plain(self.finish(score))
+
+
+class PriorityWeights:
+    """The parsed priority_weights.yaml: models, what-if scenarios and grooming thresholds."""
+
+    def __init__(self, config: Dict[str, Any], source: Optional[Path] = None):
+        self.source = source
+        models = config.get("models") or {}
+        if not isinstance(models, dict) or not models:
+            raise WeightsError(f"{source or 'weights'}: no models defined")
+        self.models = {name: ScoringModel(name, spec or {}) for name, spec in models.items()}
+        self.scenarios: Dict[str, ScoringModel] = {}
+        for name, spec in (config.get("scenarios") or {}).items():
+            spec = dict(spec or {})
+            base = spec.pop("model", None)
+            if base not in self.models:
+                raise WeightsError(f"Scenario '{name}': unknown base model '{base}'")
+            self.scenarios[name] = self.models[base].with_overrides(name, spec)
+        self.grooming = {"max_priority": 20, "statuses": ["backlog", "draft", "ready", "active", "blocked"],
+                         "count": 20, **(config.get("grooming") or {})}
+
+    @classmethod
+    def load(cls, path=None) -> "PriorityWeights":
+        import yaml
+
+        path = Path(path) if path else DEFAULT_WEIGHTS
+        with open(path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f) or {}
+        return cls(config, path)
+
+    def model(self, name: str) -> ScoringModel:
+        """A model or scenario by name."""
+        model = self.models.get(name) or self.scenarios.get(name)
+        if model is None:
+            raise WeightsError(f"Unknown model or scenario '{name}'. "
+                               f"Models: {sorted(self.models)}; scenarios: {sorted(self.scenarios)}")
+        return model
+
+    def scenarios_of(self, base: str) -> List[ScoringModel]:
+        return [model for model in self.scenarios.values() if model.base == base]
+
+
+class StoryFeatures:
+    """The story fields the models read, encoded once into columns."""
+
+    def __init__(self, stories: List[Dict[str, Any]]):
+        self.count = len(stories)
+        self.ids = [story.get("id") or "" for story in stories]
+        self.codes: Dict[str, List[int]] = {}
+        self.values: Dict[str, List[Any]] = {}
+        for term in TABLE_TERMS:
+            index: Dict[Any, int] = {}
+            self.codes[term] = [index.setdefault(story.get(term), len(index)) for story in stories]
+            self.values[term] = list(index)
+        self.positions = [i / self.count for i in range(self.count)]
+        self.titles = [str(story.get("title") or "").lower() for story in stories]
+        self.no_dependencies = [not story.get("dependencies") for story in stories]
+        self.has_owner = [bool(story.get("owner")) for story in stories]
+        self.points = [estimate_points(story.get("estimate")) for story in stories]
+        self._boosts: Dict[Tuple, List[Any]] = {}
+
+    def title_boosts(self, model: ScoringModel) -> List[Any]:
+        """Per-story title boosts; scenarios with the same keyword groups share one pass."""
+        boosts = self._boosts.get(model.title_keywords)
+        if boosts is None:
+            boosts = self._boosts[model.title_keywords] = list(map(model.title_boost, self.titles))
+        return boosts
+
+
+def _plain(value: Any) -> Any:
+    """Integral floats as ints, so scores print and serialize like the old per-story ones."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _score_columns(model: ScoringModel, features: StoryFeatures) -> List[Any]:
+    """One model over all stories with ``map`` over the feature columns."""
+    lookups = [[model.lookup(term, value) for value in features.values[term]] for term in TABLE_TERMS]
+    scores = list(map(lookups[0].__getitem__, features.codes["epic"]))
+    scores = list(map(add, scores, map(lookups[1].__getitem__, features.codes["status"])))
+    if model.position:
+        scores = list(map(add, scores, [fraction * model.position for fraction in features.positions]))
+    if model.title_keywords:
+        scores = list(map(add, scores, features.title_boosts(model)))
+    for weight, flags in ((model.no_dependencies, features.no_dependencies), (model.owner, features.has_owner)):
+        if weight:
+            scores = [score + weight if flag else score for score, flag in zip(scores, flags)]
+    if model.effort:
+        scores = list(map(add, scores, [model.effort * points for points in features.points]))
+    if model.truncate or model.minimum is not None:
+        scores = list(map(model.finish, scores))
+    return list(map(_plain, scores))
+
+
+def _score_matrix(models: List[ScoringModel], features: StoryFeatures, numpy) -> List[List[Any]]:
+    """All models at once as a (models x stories) matrix."""
+    scores = None
+    for term in TABLE_TERMS:
+        table = numpy.array([[model.lookup(term, value) for value in features.values[term]]
+                             for model in models], dtype=float)
+        column = table[:, numpy.asarray(features.codes[term], dtype=numpy.intp)]
+        scores = column if scores is None else scores + column
+
+    def coefficients(name: str):
+        return numpy.array([getattr(model, name) for model in models], dtype=float)[:, None]
+
+    if any(model.position for model in models):
+        scores = scores + numpy.asarray(features.positions) * coefficients("position")
+    if any(model.title_keywords for model in models):
+        scores = scores + numpy.array([features.title_boosts(model) if model.title_keywords
+                                       else [0] * features.count for model in models], dtype=float)
+    for name, flags in (("no_dependencies", features.no_dependencies), ("owner", features.has_owner)):
+        if any(getattr(model, name) for model in models):
+            scores = scores + numpy.asarray(flags, dtype=float) * coefficients(name)
+    if any(model.effort for model in models):
+        scores = scores + coefficients("effort") * numpy.asarray(features.points, dtype=float)
+
+    truncate = numpy.array([model.truncate for model in models])
+    if truncate.any():
+        scores = numpy.where(truncate[:, None], numpy.trunc(scores), scores)
+    minimum = numpy.array([-numpy.inf if model.minimum is None else model.minimum for model in models])
+    scores = numpy.maximum(scores, minimum[:, None])
+    return [list(map(_plain, row)) for row in scores.tolist()]
+
+
+def score_models(models: List[ScoringModel], features: StoryFeatures) -> List[List[Any]]:
+    """Scores of every story under each model, in story order."""
+    if not models or not features.count:
+        return [[] for _ in models]
+    numpy = numpy_module()
+    if numpy is not None:
+        return _score_matrix(models, features, numpy)
+    return [_score_columns(model, features) for model in models]
+
+
+def ranking(scores: List[Any], order: str = "ascending") -> List[int]:
+    """Story indexes best first; ties keep story order."""
+    if order == "descending":
+        return sorted(range(len(scores)), key=lambda i: -scores[i])
+    return sorted(range(len(scores)), key=scores.__getitem__)
+
+
+def rank_changes(ids: List[str], base: List[int], other: List[int], top: int = 10) -> Dict[str, Any]:
+    """How the ``other`` ranking reorders ``base`` (both from ``ranking``)."""
+    base_rank = [0] * len(base)
+    other_rank = [0] * len(other)
+    for rank, i in enumerate(base):
+        base_rank[i] = rank
+    for rank, i in enumerate(other):
+        other_rank[i] = rank
+    shifts = [after - before for before, after in zip(base_rank, other_rank)]
+    moved = sum(1 for shift in shifts if shift)
+    biggest = sorted((i for i, shift in enumerate(shifts) if shift), key=lambda i: (-abs(shifts[i]), base_rank[i]))
+    base_top, other_top = set(base[:top]), set(other[:top])
+    return {
+        "moved": moved,
+        "mean_shift": round(sum(map(abs, shifts)) / len(shifts), 2) if shifts else 0,
+        "top_entered": [ids[i] for i in other[:top] if i not in base_top],
+        "top_left": [ids[i] for i in base[:top] if i not in other_top],
+        "biggest_moves": [{"id": ids[i], "from": base_rank[i] + 1, "to": other_rank[i] + 1}
+                          for i in biggest[:top]],
+    }
+
+
+def what_if(stories: List[Dict[str, Any]], base: ScoringModel, scenarios: List[ScoringModel],
+            top: int = 10) -> Dict[str, Any]:
+    """Score ``base`` and every scenario in one batch and diff each scenario's ranking against the base."""
+    features = StoryFeatures(stories)
+    started = time.perf_counter()
+    scores = score_models([base] + scenarios, features)
+    orders = [ranking(row, model.order) for row, model in zip(scores, [base] + scenarios)]
+    elapsed = time.perf_counter() - started
+    return {
+        "stories": features.count,
+        "base": base.name,
+        "seconds": round(elapsed, 4),
+        "top": [{"id": features.ids[i], "score": scores[0][i]} for i in orders[0][:top]],
+        "scenarios": {model.name: rank_changes(features.ids, orders[0], order, top)
+                      for model, order in zip(scenarios, orders[1:])},
+    }
+
+
+def parse_override(text: str) -> Tuple[str, Any]:
+    """``epic.ui=1`` or ``position=0`` as (key, value) for ScoringModel.with_overrides."""
+    import yaml
+
+    key, separator, raw = text.partition("=")
+    if not separator or not key:
+        raise WeightsError(f"Override must look like term=value or term.key=value, got '{text}'")
+    value = yaml.safe_load(raw)
+    term, _, entry = key.partition(".")
+    if term not in MODEL_KEYS:
+        raise WeightsError(f"Unknown term '{term}'; valid: {sorted(MODEL_KEYS)}")
+    if entry:
+        if term not in TABLE_TERMS:
+            raise WeightsError(f"Only {TABLE_TERMS} take term.key=value overrides")
+        return term, {entry: value}
+    return term, value
+
+
+@job("priority_engine")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score the backlog with priority_weights.yaml and compare what-if scenarios",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Strategic ranking and how every configured scenario changes it
+  python scripts/priority_engine.py
+
+  # One scenario, top 20
+  python scripts/priority_engine.py --scenario data-first --top 20
+
+  # Try an idea without editing any file
+  python scripts/priority_engine.py --set epic.ui=1 --set status.blocked=0
+
+  # Machine-readable output
+  python scripts/priority_engine.py --json
+        """
+    )
+    parser.add_argument("--view", type=str, default="backlog/PRIORITIZATION.json",
+                        help="JSON view to score (default: backlog/PRIORITIZATION.json)")
+    parser.add_argument("--config", type=str, help=f"Weights file (default: {DEFAULT_WEIGHTS.name} beside this script)")
+    parser.add_argument("--model", type=str, default="strategic", help="Base model (default: strategic)")
+    parser.add_argument("--scenario", action="append", default=[],
+                        help="Scenario to compare (repeatable; default: all scenarios of the base model)")
+    parser.add_argument("--set", action="append", default=[], metavar="TERM[.KEY]=VALUE",
+                        help="Ad-hoc scenario: change weights of the base model (repeatable)")
+    parser.add_argument("--top", type=int, default=10, help="Stories to list per ranking (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    args = parser.parse_args()
+
+    from backlog_store import load_view
+
+    path = Path(args.view)
+    if not path.exists():
+        print(f"❌ View not found: {path}")
+        sys.exit(1)
+    try:
+        weights = PriorityWeights.load(args.config)
+        base = weights.model(args.model)
+        scenarios = [weights.model(name) for name in args.scenario] or weights.scenarios_of(args.model)
+        if args.set:
+            overrides: Dict[str, Any] = {}
+            for text in args.set:
+                key, value = parse_override(text)
+                if isinstance(value, dict) and isinstance(overrides.get(key), dict):
+                    value = {**overrides[key], **value}
+                overrides[key] = value
+            scenarios.append(base.with_overrides("--set " + " ".join(args.set), overrides))
+    except (OSError, WeightsError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    stories = load_view(path).get("backlog", [])
+    report = what_if(stories, base, scenarios, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"🎯 {path}: {report['stories']:,} stories scored with '{base.name}' and "
+          f"{len(scenarios)} scenario(s) in {report['seconds'] * 1000:.1f} ms "
+          f"({'NumPy' if numpy_module() is not None else 'pure Python'})")
+    for rank, entry in enumerate(report["top"], 1):
+        print(f"   {rank:>3}. {entry['id']:<12} score {entry['score']}")
+    for name, diff in report["scenarios"].items():
+        print(f"\n🔀 {name}: {diff['moved']:,} stories move (mean shift {diff['mean_shift']})")
+        if diff["top_entered"] or diff["top_left"]:
+            print(f"   Top {args.top}: +{', '.join(diff['top_entered']) or '—'}  -{', '.join(diff['top_left']) or '—'}")
+        for move in diff["biggest_moves"][:5]:
+            print(f"   {move['id']:<12} {move['from']:>6} → {move['to']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Mergeable Quantile Sketch
+
+Log-bucketed histogram (DDSketch style) used to precompute medians for the
+activity dashboard. Sketches for different repos and date ranges merge by
+adding bucket counts, so daily partials can be combined into weekly, monthly
+or all-time quantiles without revisiting the raw values. Every reported
+quantile is within ``relative_accuracy`` of the exact value.
+
+The serialized form is deliberately simple so ``docs/assets/main.js`` can
+merge and query sketches with a few lines of JavaScript.
+"""
+
+import math
+from typing import Dict, Any, Iterable, Optional
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """Mergeable, relative-error quantile sketch for non-negative values."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _bucket_value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: Optional[float], count: int = 1):
+        """Add a value (``None`` is ignored, matching missing medians)."""
+        if value is None or count <= 0:
+            return
+        if value < 0:
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        if value == 0:
+            self.zero_count += count
+        else:
+            index = self._index(value)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def update(self, values: Iterable[Optional[float]]):
+        """Add every value from an iterable."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "QuantileSketch"):
+        """Merge another sketch with the same accuracy into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _value_at_rank(self, rank: int) -> float:
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                return self._bucket_value(index)
+        return self._bucket_value(max(self.bins))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the approximate q-quantile, or ``None`` when empty.
+
+        Interpolates between neighbouring ranks, so the median of an even
+        number of values averages the two middle values like an exact median.
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        lower = math.floor(rank)
+        value = self._value_at_rank(lower)
+        if rank > lower:
+            upper_value = self._value_at_rank(lower + 1)
+            value += (upper_value - value) * (rank - lower)
+        return value
+
+    def median(self) -> Optional[float]:
+        return self.quantile(0.5)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize as a dense count array starting at the lowest bucket."""
+        data = {"a": self.relative_accuracy, "n": self.count, "z": self.zero_count}
+        if self.bins:
+            offset = min(self.bins)
+            data["o"] = offset
+            data["c"] = [self.bins.get(i, 0) for i in range(offset, max(self.bins) + 1)]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data.get("a", DEFAULT_RELATIVE_ACCURACY))
+        sketch.zero_count = data.get("z", 0)
+        sketch.count = data.get("n", 0)
+        offset = data.get("o", 0)
+        for i, count in enumerate(data.get("c", [])):
+            if count:
+                sketch.bins[offset + i] = count
+        return sketch
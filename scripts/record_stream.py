@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Record Streams
+
+Incremental NDJSON and CSV decoding/encoding for bulk story transfer. Input
+is fed in byte chunks (from a file or a socket) and complete records come
+out as soon as they are available, each with the byte offset just past it,
+so callers can checkpoint and resume without holding the whole input.
+
+CSV follows RFC 4180: quoted fields may contain commas, doubled quotes and
+newlines. List fields (labels, dependencies) are ``;``-separated in CSV.
+"""
+
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+from metrics import PARSE_ERRORS, STORIES_PARSED
+
+LIST_FIELDS = ("labels", "dependencies")
+CSV_COLUMNS = ["id", "title", "status", "priority", "estimate", "epic", "owner",
+               "labels", "dependencies", "branch_name", "file_path", "created", "last_updated"]
+FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+READ_SIZE = 64 * 1024
+
+# (row number, offset after the record, record or None, error or None)
+DecodedRecord = Tuple[int, int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def detect_format(path: str, default: str = "ndjson") -> str:
+    return FORMATS.get(Path(path).suffix.lower(), default)
+
+
+def normalize_csv_record(row: Dict[str, str]) -> Dict[str, Any]:
+    """Turn CSV strings back into story fields; empty cells are dropped."""
+    record: Dict[str, Any] = {}
+    for key, value in row.items():
+        if value in (None, ""):
+            continue
+        if key in LIST_FIELDS:
+            record[key] = [v.strip() for v in value.split(";") if v.strip()]
+        elif key == "priority":
+            try:
+                record[key] = int(value)
+            except ValueError:
+                record[key] = value
+        else:
+            record[key] = value
+    return record
+
+
+class RecordDecoder:
+    """Push decoder: ``feed`` bytes, get back the records completed so far."""
+
+    def __init__(self, fmt: str, start_offset: int = 0, start_row: int = 0,
+                 header: Optional[List[str]] = None):
+        if fmt not in ("ndjson", "csv"):
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.fmt = fmt
+        self.offset = start_offset
+        self.row = start_row
+        self.header = header
+        self._buffer = b""
+        self._pending = ""       # CSV text of a record whose quotes are still open
+        self._pending_quotes = 0
+
+    def feed(self, data: bytes) -> List[DecodedRecord]:
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        records = []
+        for line in lines:
+            self.offset += len(line) + 1
+            record = self._line(line + b"\n")
+            if record is not None:
+                records.append(record)
+        self._count(records)
+        return records
+
+    def close(self) -> List[DecodedRecord]:
+        """Flush a final line without a trailing newline."""
+        records = []
+        if self._buffer:
+            line, self._buffer = self._buffer, b""
+            self.offset += len(line)
+            record = self._line(line)
+            if record is not None:
+                records.append(record)
+        if self._pending:
+            self.row += 1
+            records.append((self.row, self.offset, None, "Unterminated quoted field"))
+            self._pending = ""
+        self._count(records)
+        return records
+
+    def _count(self, records: List[DecodedRecord]):
+        if records:
+            errors = sum(1 for record in records if record[3] is not None)
+            if errors:
+                PARSE_ERRORS.inc(errors, source=self.fmt)
+            if len(records) > errors:
+                STORIES_PARSED.inc(len(records) - errors, source=self.fmt)
+
+    def _line(self, line: bytes) -> Optional[DecodedRecord]:
+        try:
+            text = line.decode("utf-8")
+        except UnicodeDecodeError:
+            self.row += 1
+            return (self.row, self.offset, None, "Invalid UTF-8")
+        if self.fmt == "ndjson":
+            return self._ndjson(text)
+        return self._csv(text)
+
+    def _ndjson(self, text: str) -> Optional[DecodedRecord]:
+        if not text.strip():
+            return None
+        self.row += 1
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError as e:
+            return (self.row, self.offset, None, f"Invalid JSON: {e.msg}")
+        if not isinstance(record, dict):
+            return (self.row, self.offset, None, "Expected a JSON object")
+        return (self.row, self.offset, record, None)
+
+    def _csv(self, text: str) -> Optional[DecodedRecord]:
+        if self.header is None and text.startswith("\ufeff"):
+            text = text[1:]
+        self._pending += text
+        self._pending_quotes += text.count('"')
+        if self._pending_quotes % 2:
+            return None  # newline inside a quoted field
+        record_text, self._pending, self._pending_quotes = self._pending, "", 0
+        if not record_text.strip():
+            return None
+
+        values = next(csv.reader(io.StringIO(record_text)), [])
+        if self.header is None:
+            self.header = [v.strip() for v in values]
+            return None
+        self.row += 1
+        if len(values) > len(self.header):
+            return (self.row, self.offset, None,
+                    f"Expected {len(self.header)} columns, found {len(values)}")
+        return (self.row, self.offset, normalize_csv_record(dict(zip(self.header, values))), None)
+
+
+def read_csv_header(path: Path) -> Optional[List[str]]:
+    decoder = RecordDecoder("csv")
+    with open(path, "rb") as f:
+        while decoder.header is None:
+            line = f.readline()
+            if not line:
+                break
+            decoder.feed(line)
+    return decoder.header
+
+
+def iter_records(path: Path, fmt: Optional[str] = None, offset: int = 0,
+                 row: int = 0) -> Iterator[DecodedRecord]:
+    """Stream records from a file, optionally starting at a checkpointed offset."""
+    path = Path(path)
+    fmt = fmt or detect_format(str(path))
+    header = read_csv_header(path) if fmt == "csv" and offset else None
+    decoder = RecordDecoder(fmt, start_offset=offset, start_row=row, header=header)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                break
+            yield from decoder.feed(chunk)
+    yield from decoder.close()
+
+
+def ndjson_line(story: Dict[str, Any]) -> bytes:
+    # story_model loads tracemalloc; ingest imports this module for FORMATS alone
+    from story_model import json_default
+
+    return json.dumps(story, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8") + b"\n"
+
+
+def csv_header(columns: List[str] = CSV_COLUMNS) -> bytes:
+    return csv_line({c: c for c in columns}, columns, flatten=False)
+
+
+def csv_line(story: Dict[str, Any], columns: List[str] = CSV_COLUMNS, flatten: bool = True) -> bytes:
+    row = []
+    for column in columns:
+        value = story.get(column)
+        if flatten and column in LIST_FIELDS:
+            value = ";".join(str(v) for v in value or [])
+        row.append("" if value is None else value)
+    output = io.StringIO()
+    csv.writer(output, lineterminator="\n").writerow(row)
+    return output.getvalue().encode("utf-8")
+
+
+def encode_stories(stories, fmt: str) -> Iterator[bytes]:
+    """Lazily encode an iterable of stories as NDJSON or CSV."""
+    if fmt == "csv":
+        yield csv_header()
+        for story in stories:
+            yield csv_line(story)
+    else:
+        for story in stories:
+            yield ndjson_line(story)
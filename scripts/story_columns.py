@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Columnar Story Snapshot
+
+Analytics and the dashboard only look at a handful of story fields, so they
+read them from a memory-mapped columnar file instead of parsing every story:
+
+    b"BKC1" | uint32 header length | JSON header | column buffers
+
+The file sits beside its view (backlog/.PRIORITIZATION.json.columns) and
+records the view's mtime and size; ``open_story_columns`` rebuilds it
+whenever the view has changed since. Each column is one of:
+
+- ``dict``: codes into a per-column value dictionary kept in the header,
+  code 0 meaning the story has no such key
+- ``int``: the values themselves as int32, for all-integer fields
+- ``list``: offsets plus item codes, for lists of strings (dependencies)
+
+Besides the stored fields, the file holds ``points``: each story's estimate
+normalized by estimates.parse_points when the file is built (0 when it has
+none), so effort totals need no parsing at read time.
+
+Buffers are little-endian and aligned like work_review_columnar's, and the
+file is mapped read-only, so concurrent report processes share one copy in
+the page cache. With NumPy installed, ``codes`` returns arrays viewing the
+mapping without a copy; otherwise it returns ``memoryview`` casts of it.
+"""
+
+import json
+import argparse
+import copy
+import mmap
+import os
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from estimates import estimate_points
+from metrics import CACHE_HITS, CACHE_MISSES, job
+from work_review_columnar import ALIGNMENT, COLUMN_TYPES
+
+MAGIC = b"BKC1"
+FORMAT_VERSION = 3
+
+# Fields kept in the columnar file (the ones analytics and dashboards aggregate)
+COLUMN_FIELDS = ["id", "epic", "status", "priority", "estimate", "owner",
+                 "created", "last_updated", "dependencies"]
+# Columns computed from a story field when the file is built: name -> (field, function)
+DERIVED_FIELDS = {"points": ("estimate", estimate_points)}
+
+NUMPY_TYPES = {"u8": "<u1", "u16": "<u2", "u32": "<u4", "i32": "<i4", "f64": "<f8"}
+
+# Marks a story without the key, as opposed to one whose value is null
+MISSING = object()
+
+_numpy = None
+
+
+def numpy_module():
+    """NumPy if it is installed, imported on first use so --help stays fast."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def columns_path(path) -> Path:
+    path = Path(path)
+    return path.with_name(f".{path.name}.columns")
+
+
+def column_value(story: Dict[str, Any], name: str) -> Any:
+    """What the column ``name`` holds for one story (MISSING where the key is absent)."""
+    if name in DERIVED_FIELDS:
+        field, derive = DERIVED_FIELDS[name]
+        return derive(story.get(field))
+    return story.get(name, MISSING)
+
+
+def _code_type(count: int) -> str:
+    for typecode in ("u8", "u16", "u32"):
+        if count < COLUMN_TYPES[typecode][2]:
+            return typecode
+    raise ValueError("Too many distinct values for a columnar dictionary")
+
+
+def _dictionary(values: List[Any]) -> Tuple[List[int], List[Any]]:
+    """Code each value by first appearance; code 0 is MISSING.
+
+    Values are keyed by type as well as JSON text, so 3 and "3", or None and
+    "null", get codes of their own.
+    """
+    index: Dict[Tuple[str, str], int] = {}
+    dictionary: List[Any] = []
+    codes = []
+    for value in values:
+        if value is MISSING:
+            codes.append(0)
+            continue
+        key = (type(value).__name__, json.dumps(value, sort_keys=True))
+        code = index.get(key)
+        if code is None:
+            dictionary.append(value)
+            code = index[key] = len(dictionary)
+        codes.append(code)
+    return codes, dictionary
+
+
+def encode_story_columns(data: Dict[str, Any], source: Tuple[int, int]) -> bytes:
+    """Encode a view's stories; ``source`` is the view's (mtime_ns, size) signature."""
+    stories = data.get("backlog", [])
+    buffers: List[array] = []
+    specs: List[Dict[str, Any]] = []
+
+    def add_buffer(values: List[int], typecode: str) -> Dict[str, Any]:
+        buffers.append(array(COLUMN_TYPES[typecode][0], values))
+        return {"type": typecode, "length": len(values), "buffer": len(buffers) - 1}
+
+    low, high = -0x7FFFFFFF, 0x7FFFFFFF
+    for name in COLUMN_FIELDS + list(DERIVED_FIELDS):
+        values = [column_value(story, name) for story in stories]
+        present = [value for value in values if value is not MISSING]
+
+        if present and all(type(value) is int and low <= value <= high for value in present):
+            sentinel = COLUMN_TYPES["i32"][2]
+            spec = {"name": name, "kind": "int",
+                    **add_buffer([sentinel if value is MISSING else value for value in values], "i32")}
+        elif present and all(isinstance(value, list) and all(isinstance(item, str) for item in value)
+                             for value in present):
+            items, dictionary = _dictionary([item for value in present for item in value])
+            offsets = [0]
+            for value in values:
+                offsets.append(offsets[-1] + (0 if value is MISSING else len(value)))
+            spec = {"name": name, "kind": "list", "values": dictionary,
+                    "offsets": add_buffer(offsets, "u32"),
+                    **add_buffer(items, _code_type(len(dictionary)))}
+            if len(present) < len(values):
+                spec["present"] = add_buffer([0 if value is MISSING else 1 for value in values], "u8")
+        else:
+            codes, dictionary = _dictionary(values)
+            spec = {"name": name, "kind": "dict", "values": dictionary,
+                    **add_buffer(codes, _code_type(len(dictionary)))}
+        specs.append(spec)
+
+    # Lay buffers out back to back, each aligned for its element size
+    offsets = []
+    position = 0
+    for packed in buffers:
+        position = (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+        offsets.append(position)
+        position += len(packed) * packed.itemsize
+
+    def resolve(spec: Dict[str, Any]):
+        spec["offset"] = offsets[spec.pop("buffer")]
+        for key in ("present", "offsets"):
+            if key in spec:
+                resolve(spec[key])
+
+    for spec in specs:
+        resolve(spec)
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "rows": len(stories),
+        "source": list(source),
+        "metadata": data.get("metadata", {}),
+        "columns": specs,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    header_bytes += b" " * (-(len(MAGIC) + 4 + len(header_bytes)) % ALIGNMENT)
+
+    body = bytearray(position)
+    for packed, offset in zip(buffers, offsets):
+        if sys.byteorder == "big":
+            packed = array(packed.typecode, packed)
+            packed.byteswap()
+        raw = packed.tobytes()
+        body[offset:offset + len(raw)] = raw
+
+    return MAGIC + len(header_bytes).to_bytes(4, "little") + header_bytes + bytes(body)
+
+
+class StoryColumns:
+    """Read access to an encoded columnar file (an mmap or a bytes object)."""
+
+    def __init__(self, buffer):
+        if bytes(buffer[:4]) != MAGIC:
+            raise ValueError("Not a columnar story file")
+        header_length = int.from_bytes(buffer[4:8], "little")
+        self.header = json.loads(bytes(buffer[8:8 + header_length]))
+        self.buffer = buffer
+        self.base = 8 + header_length
+        self.rows = self.header["rows"]
+        self.metadata = self.header["metadata"]
+        self.source = tuple(self.header["source"])
+        self.specs = {spec["name"]: spec for spec in self.header["columns"]}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _array(self, spec: Dict[str, Any]):
+        code, size, _ = COLUMN_TYPES[spec["type"]]
+        start = self.base + spec["offset"]
+        numpy = numpy_module()
+        if numpy is not None:
+            return numpy.frombuffer(self.buffer, dtype=NUMPY_TYPES[spec["type"]],
+                                    count=spec["length"], offset=start)
+        view = memoryview(self.buffer)[start:start + spec["length"] * size]
+        if sys.byteorder == "big":
+            values = array(code)
+            values.frombytes(view)
+            values.byteswap()
+            return values
+        return view.cast(code)
+
+    def codes(self, name: str):
+        """The raw column without copying: dictionary codes, or the values of an int column."""
+        return self._array(self.specs[name])
+
+    def values(self, name: str, default: Any = MISSING) -> List[Any]:
+        """Decode a column into one Python value per story (``default`` where the key is absent)."""
+        spec = self.specs[name]
+        raw = self._array(spec).tolist()
+
+        if spec["kind"] == "int":
+            sentinel = COLUMN_TYPES["i32"][2]
+            if sentinel not in raw:
+                return raw
+            return [default if value == sentinel else value for value in raw]
+
+        if spec["kind"] == "list":
+            items = [None] + spec["values"]
+            decoded = list(map(items.__getitem__, raw))
+            offsets = self._array(spec["offsets"]).tolist()
+            # Slicing per story runs in C; a comprehension over the offsets does not
+            lists = list(map(decoded.__getitem__, map(slice, offsets, offsets[1:])))
+            if "present" in spec:
+                present = self._array(spec["present"]).tolist()
+                return [value if flag else default for value, flag in zip(lists, present)]
+            return lists
+
+        lookup = [default] + spec["values"]
+        if any(isinstance(value, (list, dict)) for value in spec["values"]):
+            # Stories must not share one list or dict through the dictionary
+            return [copy.deepcopy(lookup[code]) for code in raw]
+        return list(map(lookup.__getitem__, raw))
+
+    def _has_missing(self, name: str) -> bool:
+        spec = self.specs[name]
+        if spec["kind"] == "list":
+            return "present" in spec
+        if spec["kind"] == "int":
+            return COLUMN_TYPES["i32"][2] in self._array(spec)
+        return 0 in self._array(spec)
+
+    def count_by(self, name: str, default: Any = None) -> Dict[Any, int]:
+        """Stories per value of a scalar column, in dictionary (or sorted) order."""
+        spec = self.specs[name]
+        if spec["kind"] == "list":
+            raise ValueError(f"count_by needs a scalar column, {name} holds lists")
+        codes = self._array(spec)
+        numpy = numpy_module()
+        if numpy is not None and spec["kind"] == "dict":
+            counted = enumerate(numpy.bincount(codes, minlength=len(spec["values"]) + 1).tolist())
+        elif numpy is not None:
+            keys, counts = numpy.unique(codes, return_counts=True)
+            counted = zip(keys.tolist(), counts.tolist())
+        else:
+            counted = sorted(Counter(codes).items())
+
+        if spec["kind"] == "dict":
+            lookup = [default] + spec["values"]
+        else:
+            sentinel = COLUMN_TYPES["i32"][2]
+        counts: Dict[Any, int] = {}
+        for code, count in counted:
+            if not count:
+                continue
+            if spec["kind"] == "dict":
+                key = lookup[code]
+            else:
+                key = default if code == sentinel else code
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    def project(self, fields: List[str]) -> List[Dict[str, Any]]:
+        """One dict per story holding just ``fields`` (absent keys stay absent)."""
+        if not fields:
+            return [{} for _ in range(self.rows)]
+        columns = [self.values(name) for name in fields]
+        rows = map(dict, map(zip, [fields] * self.rows, zip(*columns)))
+        if not any(self._has_missing(name) for name in fields):
+            return list(rows)
+        return [{name: value for name, value in row.items() if value is not MISSING}
+                for row in rows]
+
+
+def _map_columns(path: Path) -> Optional[StoryColumns]:
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        columns = StoryColumns(mapped)
+    except (ValueError, KeyError, UnicodeDecodeError):
+        return None
+    if columns.header.get("format_version") != FORMAT_VERSION:
+        return None
+    return columns
+
+
+def open_story_columns(path) -> StoryColumns:
+    """Map the columnar file for a view, rebuilding it first if the view changed."""
+    # Imported here so that the dashboard's --help skips the store
+    from backlog_store import _write_bytes_atomic, file_signature, load_view
+
+    path = Path(path)
+    signature = file_signature(path)
+    target = columns_path(path)
+    use_file = not os.environ.get("BACKLOG_NO_SNAPSHOT")
+    if use_file:
+        columns = _map_columns(target)
+        if columns is not None and columns.source == signature:
+            CACHE_HITS.inc(cache="story_columns")
+            return columns
+        CACHE_MISSES.inc(cache="story_columns")
+
+    payload = encode_story_columns(load_view(path), signature)
+    if use_file:
+        try:
+            _write_bytes_atomic(target, payload)
+        except OSError:
+            pass
+    return StoryColumns(payload)
+
+
+@job("story_columns")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build or check the columnar story snapshot of a backlog view",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Refresh backlog/.PRIORITIZATION.json.columns and show what it holds
+  python scripts/story_columns.py
+
+  # Check every column against the JSON view
+  python scripts/story_columns.py --verify
+        """
+    )
+    parser.add_argument("--view", type=str, default="backlog/PRIORITIZATION.json",
+                        help="JSON view to encode")
+    parser.add_argument("--verify", action="store_true",
+                        help="Decode every column and compare it with the view")
+    args = parser.parse_args()
+
+    view = Path(args.view)
+    try:
+        columns = open_story_columns(view)
+    except FileNotFoundError:
+        print(f"❌ View not found: {view}")
+        sys.exit(1)
+
+    target = columns_path(view)
+    size = target.stat().st_size if target.exists() else len(columns.buffer)
+    print(f"✅ Columnar snapshot: {target}")
+    print(f"   📊 {columns.rows:,} stories, {len(columns.specs)} columns, {size:,} bytes "
+          f"(view {view.stat().st_size:,} bytes)")
+    print(f"   🔢 Arrays: {'NumPy' if numpy_module() is not None else 'memoryview (NumPy not installed)'}")
+
+    if args.verify:
+        with open(view, 'r', encoding='utf-8') as f:
+            stories = json.load(f).get("backlog", [])
+        for name in COLUMN_FIELDS + list(DERIVED_FIELDS):
+            if columns.values(name) != [column_value(story, name) for story in stories]:
+                print(f"   ❌ Column {name} differs from the view")
+                sys.exit(1)
+        print("   ✅ All columns match the view")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Story Dates
+
+Stories record ``created`` and ``last_updated`` as ``YYYY-MM-DD`` strings,
+ISO timestamps, or date objects straight from YAML frontmatter. Reports and
+filters compare day numbers instead: days since 1970-01-01, the integer
+behind NumPy's ``datetime64[D]``. ``day_number`` is memoized per string, so
+a backlog's few hundred distinct dates are parsed once per process.
+
+``DayIndex`` keeps one field's story counts per day, sorted, so age
+histograms, staleness counts and "updated since" filters take a few binary
+searches instead of a parse and a comparison per story:
+
+    index = DayIndex(stories, "created")
+    index.age_histogram(day_number(date.today()))   # {"new": 12, "medium": 40, ...}
+    index.count(low=day_number("2025-08-01"))         # stories on or after a day
+
+Usage:
+  python scripts/story_dates.py --field last_updated --since 2025-08-01
+"""
+
+import argparse
+import sys
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from operator import methodcaller
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from metrics import job
+from story_model import parse_date
+
+EPOCH = date(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+# Age buckets of the health report: (name, oldest age in days); older is "stale"
+AGE_BUCKETS = (("new", 7), ("medium", 30), ("old", 90))
+STALE_AFTER_DAYS = AGE_BUCKETS[-1][1]
+
+# Only strings are memoized, like estimates._POINTS
+_DAYS: Dict[str, Optional[int]] = {}
+
+
+def day_number(value: Any) -> Optional[int]:
+    """Days since 1970-01-01 for a date string, timestamp, date or datetime; None otherwise."""
+    if type(value) is str:
+        day = _DAYS.get(value, False)
+        if day is False:
+            parsed = parse_date(value)
+            day = _DAYS[value] = None if parsed is None else parsed.toordinal() - _EPOCH_ORDINAL
+        return day
+    parsed = parse_date(value)
+    return None if parsed is None else parsed.toordinal() - _EPOCH_ORDINAL
+
+
+def day_date(day: int) -> date:
+    return EPOCH + timedelta(days=day)
+
+
+def today_number() -> int:
+    return date.today().toordinal() - _EPOCH_ORDINAL
+
+
+def iso_date(value: Any) -> Any:
+    """``YYYY-MM-DD`` for a date or datetime (as YAML frontmatter yields); other values unchanged."""
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+class DayIndex:
+    """How many stories fall on each day of one date field, as sorted days and running totals.
+
+    Stories are counted per distinct raw value first (a C-level ``Counter``
+    over the field), so each distinct date is parsed once and the work per
+    story is a dictionary increment; ranges are then two bisects.
+    """
+
+    def __init__(self, stories: List[Dict[str, Any]], field: str):
+        self.stories = stories
+        self.field = field
+        per_day: Dict[int, int] = {}
+        for value, count in Counter(map(methodcaller("get", field), stories)).items():
+            day = day_number(value)
+            if day is not None:
+                per_day[day] = per_day.get(day, 0) + count
+        self.days = sorted(per_day)
+        self.totals = list(accumulate((per_day[day] for day in self.days), initial=0))
+        self._by_day: Optional[Tuple[List[int], List[str]]] = None
+
+    def __len__(self) -> int:
+        """Stories with a parseable date."""
+        return self.totals[-1]
+
+    def _span(self, low: Optional[int], high: Optional[int]) -> Tuple[int, int]:
+        start = 0 if low is None else bisect_left(self.days, low)
+        end = len(self.days) if high is None else bisect_right(self.days, high)
+        return start, max(start, end)
+
+    def count(self, low: Optional[int] = None, high: Optional[int] = None) -> int:
+        """Stories dated from ``low`` to ``high``, both inclusive; None leaves a side open."""
+        start, end = self._span(low, high)
+        return self.totals[end] - self.totals[start]
+
+    def between(self, low: Optional[int] = None, high: Optional[int] = None) -> List[str]:
+        """IDs of the stories ``count`` counts, oldest first (sorted on first use)."""
+        if self._by_day is None:
+            pairs = sorted((day, story.get("id") or "") for day, story in
+                           ((day_number(story.get(self.field)), story) for story in self.stories)
+                           if day is not None)
+            self._by_day = ([day for day, _ in pairs], [story_id for _, story_id in pairs])
+        days, ids = self._by_day
+        start = 0 if low is None else bisect_left(days, low)
+        end = len(days) if high is None else bisect_right(days, high)
+        return ids[start:max(start, end)]
+
+    def age_histogram(self, today: int) -> Dict[str, int]:
+        """Stories per age bucket, ages counted in whole days before ``today``.
+
+        Future dates count as new, like the per-story comparison they replace.
+        """
+        histogram: Dict[str, int] = {}
+        newest = None
+        for name, max_age in AGE_BUCKETS:
+            oldest = today - max_age
+            histogram[name] = self.count(low=oldest, high=None if newest is None else newest - 1)
+            newest = oldest
+        histogram["stale"] = self.count(high=newest - 1)
+        return histogram
+
+    def stale(self, today: int, days: int = STALE_AFTER_DAYS) -> int:
+        """Stories dated more than ``days`` days before ``today``."""
+        return self.count(high=today - days - 1)
+
+
+@job("story_dates")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Show the age distribution of a story date field",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Age buckets of the created dates in PRIORITIZATION.json
+  python scripts/story_dates.py
+
+  # Stories updated since August 1st
+  python scripts/story_dates.py --field last_updated --since 2025-08-01
+        """
+    )
+    parser.add_argument("--view", type=str, default="backlog/PRIORITIZATION.json",
+                        help="JSON view to read (default: backlog/PRIORITIZATION.json)")
+    parser.add_argument("--field", choices=["created", "last_updated"], default="created",
+                        help="Date field to index (default: created)")
+    parser.add_argument("--since", type=str, help="Also count stories dated on or after YYYY-MM-DD")
+    parser.add_argument("--today", type=str, help="Reference day for ages (default: today)")
+    args = parser.parse_args()
+
+    from backlog_store import load_view
+
+    path = Path(args.view)
+    if not path.exists():
+        print(f"❌ View not found: {path}")
+        sys.exit(1)
+    bounds = {}
+    for option in ("since", "today"):
+        value = getattr(args, option)
+        if value is not None:
+            bounds[option] = day_number(value)
+            if bounds[option] is None:
+                print(f"❌ --{option} must be a date (YYYY-MM-DD), got '{value}'")
+                sys.exit(1)
+    today = bounds.get("today", today_number())
+
+    stories = load_view(path).get("backlog", [])
+    index = DayIndex(stories, args.field)
+    print(f"📅 {path}: {len(index):,} of {len(stories):,} stories have a {args.field} date")
+    if index.days:
+        print(f"   Range: {day_date(index.days[0])} to {day_date(index.days[-1])}")
+    for name, count in index.age_histogram(today).items():
+        print(f"   {name:>7}: {count:,}")
+    if "since" in bounds:
+        print(f"   🔎 On or after {args.since}: {index.count(low=bounds['since']):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Story Model
+
+Compact in-memory representation of one backlog story. A JSON story is a
+dict of a dozen or so keys whose values repeat across the backlog (epic,
+status, owner, labels, dates); at 100k+ stories the per-story dicts and the
+duplicate strings dominate the resident size of long-running processes such
+as backlog_service.py and backlog_sync.py.
+
+``Story`` keeps the known schema fields in ``__slots__``, interns the
+repeated strings, records the key order once per distinct shape so that
+``to_dict`` gives back exactly the JSON it was built from, and parses the
+estimate and the dates when they are set:
+
+    story = Story(entry)
+    story.status, story.points, story.created_on     # attributes, parsed once
+    story.get("status"), story["labels"]             # the dict interface still works
+    json.dumps(stories, default=json_default)        # serializes like the dicts did
+
+It is a ``MutableMapping``, so code written against story dicts keeps working
+unchanged; hot loops that know they hold Stories can use attributes.
+Keys outside the schema are kept in a small per-story dict. ``parse_view``
+builds the Stories while a JSON view is parsed, so the dicts never all
+exist at once (backlog_store.load_story_view).
+
+Usage:
+  python scripts/story_model.py --verify
+"""
+
+import json
+import argparse
+import sys
+import time
+import tracemalloc
+from collections.abc import MutableMapping
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterable, Optional, Tuple
+
+from estimates import _POINTS, parse_points
+from metrics import job
+
+# Schema fields held in slots, in the order the JSON views usually list them
+FIELDS = ("id", "title", "branch_name", "file_path", "status", "priority", "estimate", "epic",
+          "dependencies", "labels", "owner", "created", "last_updated", "author", "layer",
+          "acceptance_criteria", "effort")
+# String fields whose values repeat across stories; dependencies hold story IDs
+INTERNED_FIELDS = {"id", "status", "estimate", "epic", "owner", "created", "last_updated",
+                   "author", "layer", "effort"}
+INTERNED_LISTS = {"dependencies", "labels"}
+# Set through properties so their parsed forms stay in step: field -> (attribute, memo, parser)
+PARSED_FIELDS = {"estimate": ("points", "_POINTS", "parse_points"),
+                 "created": ("created_on", "_DATES", "parse_date"),
+                 "last_updated": ("updated_on", "_DATES", "parse_date")}
+
+_FIELD_SET = frozenset(FIELDS)
+_SHAPES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_DATES: Dict[Any, Optional[date]] = {}
+_UNSET = object()
+_BUILDERS: Dict[Tuple[str, ...], Callable] = {}
+_DUMPERS: Dict[int, Callable] = {}
+
+
+def _shape(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    """One shared key-order tuple per distinct story shape."""
+    return _SHAPES.setdefault(keys, keys)
+
+
+def _builder(keys: Tuple[str, ...]) -> Callable[["Story", Dict[str, Any]], None]:
+    """Compile the constructor body for one shape of story.
+
+    Backlogs have a handful of distinct shapes, so each gets straight-line
+    code (the way ``collections.namedtuple`` generates its methods) instead
+    of a per-key loop, which would dominate loading 100k stories.
+    """
+    lines = [f"({', '.join(f'v{i}' for i in range(len(keys)))},) = data.values()"]
+    extra = []
+    for i, key in enumerate(keys):
+        value = f"v{i}"
+        if key not in _FIELD_SET:
+            extra.append(f"{key!r}: {value}")
+            continue
+        if key in INTERNED_FIELDS:
+            lines.append(f"if type({value}) is str: {value} = intern({value})")
+        elif key in INTERNED_LISTS:
+            lines += [f"if type({value}) is list:",
+                      f"    try: {value} = list(map(intern, {value}))",
+                      f"    except TypeError: {value} = [intern(x) if type(x) is str else x for x in {value}]"]
+        if key in PARSED_FIELDS:
+            # Memo hits inline; misses (and odd types) go through the parser
+            parsed, memo, parse = PARSED_FIELDS[key]
+            lines += [f"self._{key} = {value}",
+                      f"try: self.{parsed} = {memo}[{value}]",
+                      f"except (KeyError, TypeError): self.{parsed} = {parse}({value})"]
+        else:
+            lines.append(f"self.{key} = {value}")
+    lines.append(f"self._extra = {{{', '.join(extra)}}}" if extra else "self._extra = None")
+    lines.append("self._keys = keys")
+    source = "def build(self, data):\n" + "\n".join(f"    {line}" for line in lines)
+    namespace = {"intern": sys.intern, "parse_points": parse_points, "parse_date": parse_date,
+                 "_POINTS": _POINTS, "_DATES": _DATES, "keys": _shape(keys)}
+    exec(source, namespace)
+    build = _BUILDERS[keys] = namespace["build"]
+    return build
+
+
+def _dumper(keys: Tuple[str, ...]) -> Callable[["Story"], Dict[str, Any]]:
+    """Compile ``to_dict`` for one shape; ``keys`` is a shared tuple from ``_shape``."""
+    items = []
+    for key in keys:
+        if key not in _FIELD_SET:
+            items.append(f"{key!r}: self._extra[{key!r}]")
+        elif key in PARSED_FIELDS:
+            items.append(f"{key!r}: self._{key}")
+        else:
+            items.append(f"{key!r}: self.{key}")
+    namespace: Dict[str, Any] = {}
+    exec(f"def dump(self):\n    return {{{', '.join(items)}}}", namespace)
+    # Shapes live in _SHAPES for good, so their ids stay unique
+    dump = _DUMPERS[id(keys)] = namespace["dump"]
+    return dump
+
+
+def _intern(key: str, value: Any) -> Any:
+    if type(value) is str and key in INTERNED_FIELDS:
+        return sys.intern(value)
+    if type(value) is list and key in INTERNED_LISTS:
+        # In place: like a dict, the Story must hold the very list it was given
+        for position, item in enumerate(value):
+            if type(item) is str:
+                value[position] = sys.intern(item)
+    return value
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """The date of a ``YYYY-MM-DD`` (or ISO timestamp) string, date or datetime; None otherwise."""
+    if type(value) is not str:
+        if isinstance(value, datetime):
+            return value.date()
+        return value if isinstance(value, date) else None
+    parsed = _DATES.get(value, _UNSET)
+    if parsed is _UNSET:
+        try:
+            parsed = date.fromisoformat(value[:10])
+        except ValueError:
+            parsed = None
+        _DATES[value] = parsed
+    return parsed
+
+
+class Story(MutableMapping):
+    """One story with slotted fields; behaves like the dict it was built from."""
+
+    __slots__ = tuple(name for name in FIELDS if name not in PARSED_FIELDS) + (
+        "_estimate", "_created", "_last_updated", "points", "created_on", "updated_on",
+        "_keys", "_extra")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        if not data:
+            self._keys = ()
+            self._extra = None
+            return
+        keys = tuple(data)
+        build = _BUILDERS.get(keys)
+        if build is None:
+            build = _builder(keys)
+        build(self, data)
+
+    # Parsed fields -----------------------------------------------------
+
+    @property
+    def estimate(self) -> Any:
+        return self._estimate
+
+    @estimate.setter
+    def estimate(self, value: Any):
+        self._estimate = value
+        self.points = parse_points(value)
+
+    @estimate.deleter
+    def estimate(self):
+        del self._estimate
+        del self.points
+
+    @property
+    def created(self) -> Any:
+        return self._created
+
+    @created.setter
+    def created(self, value: Any):
+        self._created = value
+        self.created_on = parse_date(value)
+
+    @created.deleter
+    def created(self):
+        del self._created
+        del self.created_on
+
+    @property
+    def last_updated(self) -> Any:
+        return self._last_updated
+
+    @last_updated.setter
+    def last_updated(self, value: Any):
+        self._last_updated = value
+        self.updated_on = parse_date(value)
+
+    @last_updated.deleter
+    def last_updated(self):
+        del self._last_updated
+        del self.updated_on
+
+    # Mapping interface -------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        extra = self._extra
+        return default if extra is None else extra.get(key, default)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._keys:
+            self._keys = _shape(self._keys + (key,))
+        if key in _FIELD_SET:
+            setattr(self, key, _intern(key, value))
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self._keys:
+            raise KeyError(key)
+        self._keys = _shape(tuple(k for k in self._keys if k != key))
+        if key in _FIELD_SET:
+            delattr(self, key)
+        else:
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        for key in self._keys:
+            if key in _FIELD_SET:
+                delattr(self, key)
+        self._keys = ()
+        self._extra = None
+
+    def copy(self) -> "Story":
+        return Story(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The story as a plain dict in its original key order (shallow, like ``dict(story)``)."""
+        dump = _DUMPERS.get(id(self._keys))
+        if dump is None:
+            dump = _dumper(self._keys)
+        return dump(self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Story):
+            other = other.to_dict()
+        elif not isinstance(other, dict):
+            return NotImplemented
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Pickle, copy and deepcopy go through the plain dict form
+        return (Story, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"Story({self.to_dict()!r})"
+
+
+def to_story(story: Dict[str, Any]) -> Story:
+    """``story`` itself if it already is a Story, otherwise a Story built from it."""
+    return story if isinstance(story, Story) else Story(story)
+
+
+def stories_from(stories: Iterable[Dict[str, Any]]) -> List[Story]:
+    return [to_story(story) for story in stories]
+
+
+def _nested_stories(value: Any) -> bool:
+    if type(value) is Story:
+        return True
+    if type(value) is list:
+        return any(_nested_stories(item) for item in value)
+    if type(value) is dict:
+        return any(_nested_stories(item) for item in value.values())
+    return False
+
+
+def _plain(value: Any) -> Any:
+    """``value`` with every Story inside it turned back into a dict."""
+    if type(value) is Story:
+        value = value.to_dict()
+    if type(value) is dict:
+        for key, item in value.items():
+            value[key] = _plain(item)
+    elif type(value) is list:
+        for position, item in enumerate(value):
+            value[position] = _plain(item)
+    return value
+
+
+def story_view(data: Any) -> Any:
+    """Turn the ``backlog`` entries of an already loaded view into Stories, in place."""
+    stories = data.get("backlog") if type(data) is dict else None
+    if type(stories) is list:
+        for position, story in enumerate(stories):
+            if type(story) is dict:
+                stories[position] = Story(story)
+    return data
+
+
+def parse_view(raw: bytes) -> Dict[str, Any]:
+    """Parse a JSON view straight into Stories.
+
+    Every object with an ``id`` becomes a Story as soon as the parser
+    finishes it, so the dict is dropped before the next story is read and
+    the dicts for a whole view never pile up. Objects with an ``id`` that
+    are not entries of ``backlog`` are turned back into dicts afterwards.
+    """
+    built = 0
+
+    def hook(obj: Dict[str, Any]) -> Any:
+        nonlocal built
+        if "id" in obj:
+            built += 1
+            return Story(obj)
+        return obj
+
+    data = json.loads(raw, object_hook=hook)
+    if type(data) is not dict:
+        return _plain(data)
+    stories = data.get("backlog")
+    if type(stories) is not list:
+        return _plain(data)
+    top = 0
+    for position, story in enumerate(stories):
+        if type(story) is Story:
+            top += 1
+        elif type(story) is dict:
+            stories[position] = Story(story)
+    if built == top:
+        return data
+
+    # Some Stories sit elsewhere (metadata, or nested inside a story)
+    for key, value in data.items():
+        if key != "backlog":
+            data[key] = _plain(value)
+    for story in stories:
+        for key in story:
+            value = story[key]
+            if type(value) in (Story, list, dict) and _nested_stories(value):
+                story[key] = _plain(value)
+    return data
+
+
+def json_default(value: Any) -> Any:
+    """``default=`` hook so ``json.dumps`` writes Stories like the dicts they came from."""
+    if isinstance(value, Story):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _measure(stories: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Memory of the stories as parsed JSON and as Stories, and a field-scan loop over each."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    dicts = [_copy_json(story) for story in stories]
+    dict_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    baseline = tracemalloc.get_traced_memory()[0]
+    slotted = stories_from(_copy_json(story) for story in stories)
+    story_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    dict_count = sum(1 for s in dicts if s.get("status") == "ready" and s.get("points") is None
+                     and (s.get("priority") or 99) < 50)
+    dict_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    story_count = sum(1 for s in slotted if getattr(s, "status", None) == "ready" and s.get("points") is None
+                      and (getattr(s, "priority", None) or 99) < 50)
+    story_seconds = time.perf_counter() - started
+    if dict_count != story_count:
+        raise AssertionError("Scan over Stories disagrees with the dicts")
+    return {"dict_bytes": dict_bytes, "story_bytes": story_bytes,
+            "dict_seconds": dict_seconds, "story_seconds": story_seconds}
+
+
+def _copy_json(value: Any) -> Any:
+    """A fresh copy with unshared strings, the way json.load would build it."""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    if isinstance(value, str):
+        return "".join(list(value)) if len(value) > 1 else value
+    return value
+
+
+@job("story_model")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that Stories round-trip a backlog view and measure their footprint",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Round-trip PRIORITIZATION.json and compare memory and scan time
+  python scripts/story_model.py --verify
+
+  # Another view
+  python scripts/story_model.py --view backlog/COMPLETE_BACKLOG.json --verify
+        """
+    )
+    parser.add_argument("--view", type=str, default="backlog/PRIORITIZATION.json",
+                        help="JSON view to load (default: backlog/PRIORITIZATION.json)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Round-trip every story and measure memory and scan time")
+    args = parser.parse_args()
+
+    from backlog_store import load_view
+
+    path = Path(args.view)
+    if not path.exists():
+        print(f"❌ View not found: {path}")
+        sys.exit(1)
+    stories = load_view(path).get("backlog", [])
+    print(f"📖 {path}: {len(stories):,} stories, {len({tuple(s) for s in stories})} key orders")
+    if not args.verify:
+        return
+
+    mismatched = [s.get("id") for s in stories if Story(s).to_dict() != s
+                  or list(Story(s)) != list(s)]
+    if mismatched:
+        print(f"❌ {len(mismatched)} stories do not round-trip, e.g. {mismatched[:5]}")
+        sys.exit(1)
+    print("   ✅ Every story round-trips to identical JSON")
+
+    measured = _measure(stories)
+    print(f"   💾 Dicts {measured['dict_bytes'] / 1e6:.1f} MB, Stories {measured['story_bytes'] / 1e6:.1f} MB "
+          f"({measured['dict_bytes'] / max(measured['story_bytes'], 1):.1f}x smaller)")
+    print(f"   ⏱️  Field scan: dicts {measured['dict_seconds'] * 1000:.1f} ms, "
+          f"Stories {measured['story_seconds'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
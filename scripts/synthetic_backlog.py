@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Synthetic Backlog Generator
+
+Builds a deterministic, realistic-looking backlog at any scale (10k, 100k,
+1M stories) for benchmarking the scripts (benchmark_suite.py). The output
+directory has the same layout as the repository:
+
+- backlog/<epic dir>/<id>-<slug>.md: stories with frontmatter, user story,
+  acceptance criteria and technical requirements, like the real ones
+- backlog/PRIORITIZATION.json and backlog/COMPLETE_BACKLOG.json
+- a dependency graph in the stories' ``dependencies``; every edge points to
+  an earlier story, so the graph is acyclic, and most edges stay within a
+  window of recent stories the way real work clusters
+- docs/work_review.json: daily activity for a set of repos
+- staging/new/: optional stories waiting to be ingested
+- synthetic_manifest.json: the parameters and the shape of the data
+
+The same seed and parameters always give the same files: every story is
+drawn from its own generator seeded by (seed, index), and dates are counted
+back from a fixed day rather than today. The JSON views are streamed, so
+generating a million stories never holds them all in memory.
+"""
+
+import json
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from collect_git_activity import empty_repo_day
+from metrics import job
+
+GENERATOR_VERSION = 1
+BASE_DATE = date(2025, 9, 1)
+DEFAULT_SEED = 42
+SCALES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+# epic -> (directory, ID prefix, weight); directories match StoryIngestor.epic_dirs
+EPICS = {
+    "core": ("core", "CORE", 14),
+    "modeling": ("modeling", "MOD", 8),
+    "ingestion": ("ingestion", "ING", 10),
+    "ui": ("ui", "UI", 12),
+    "quality": ("quality", "QA", 7),
+    "infrastructure": ("infrastructure", "INF", 13),
+    "adhoc": ("adhoc", "ADH", 18),
+    "social_media": ("social_media", "SOC", 9),
+    "explain": ("explain", "EXP", 4),
+    "models": ("models", "MDL", 5),
+}
+STATUSES = [("backlog", 32), ("accepted", 40), ("draft", 16), ("completed", 10), ("ready", 4),
+            ("in-progress", 4), ("active", 2), ("blocked", 2)]
+ESTIMATES = [("TBD", 45), ("1sp", 4), ("2sp", 16), ("3sp", 14), ("5sp", 8), ("8sp", 3), ("4sp", 2),
+             (3, 2), (5, 3), (8, 3)]
+LAYERS = ["Bronze", "Silver", "Gold", None]
+OWNERS = ["team-llm", "team-data", "team-platform", "team-ui", "team-models", ""]
+
+VERBS = ["Implement", "Add", "Refactor", "Investigate", "Integrate", "Automate", "Optimize", "Validate",
+         "Migrate", "Document", "Monitor", "Backfill", "Harden", "Deprecate", "Prototype"]
+SUBJECTS = ["injury report", "odds feed", "player tracking", "weather", "play-by-play", "roster",
+            "news sentiment", "betting line", "game schedule", "coach tendency", "snap count",
+            "depth chart", "power ranking", "model calibration", "feature store", "prediction API",
+            "dashboard", "alerting", "ingestion pipeline", "evaluation harness"]
+OBJECTS = ["ingestion", "features", "pipeline", "schema", "backtests", "exports", "cache", "validation",
+           "retries", "monitoring", "documentation", "latency", "coverage", "deduplication"]
+QUALIFIERS = ["", "", "", " for weekly slates", " with incremental refresh", " across seasons",
+              " behind a feature flag", " (phase 2)", " for live games", " in the Silver layer"]
+ROLES = ["data scientist", "analyst", "platform engineer", "product owner", "modeler", "bettor"]
+CRITERIA = ["Outputs validated against the JSON schema", "Backfill covers the last three seasons",
+            "p95 latency under 500 ms", "Failures retried with exponential backoff",
+            "Metrics exported for the ops dashboard", "Unit tests cover edge cases",
+            "Runbook updated with recovery steps", "Null values handled without crashes",
+            "Results reproducible from a fixed seed", "Idempotent when rerun for the same day"]
+LABELS = ["llm", "features", "news", "data", "monitoring", "ui", "api", "spike", "research",
+          "performance", "testing", "docs", "pipeline", "modeling", "infra", "tech-debt"]
+
+WORK_REPOS = ["ai-sports-analytics", "nfl-predictions", "data-pipeline", "model-serving", "web-dashboard",
+              "feature-store", "odds-ingestor", "eval-harness"]
+AUTHORS = ["dilligafog", "alice", "bob", "carol", "dependabot[bot]", "github-actions[bot]"]
+
+
+def parse_scale(value: str) -> int:
+    """Accept 10k/100k/1M shorthands or a plain story count."""
+    if value in SCALES:
+        return SCALES[value]
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([kKmM]?)", value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid scale '{value}' (use e.g. 10k, 100k, 1M or 5000)")
+    multiplier = {"": 1, "k": 1_000, "m": 1_000_000}[match.group(2).lower()]
+    return int(float(match.group(1)) * multiplier)
+
+
+def scale_label(stories: int) -> str:
+    for label, count in SCALES.items():
+        if count == stories:
+            return label
+    return str(stories)
+
+
+def _weighted(rng: random.Random, options: List[Tuple[Any, int]]):
+    return rng.choices([value for value, _ in options], weights=[weight for _, weight in options])[0]
+
+
+def _slug(title: str) -> str:
+    slug = re.sub(r'[^\w\s-]', '', title.lower())
+    return re.sub(r'[\s_]+', '-', slug).strip('-')[:50].rstrip('-')
+
+
+def _indent_json(value: Any, indent: int = 4) -> str:
+    """``json.dumps(value, indent=2)`` shifted right to sit inside a streamed array."""
+    pad = " " * indent
+    return pad + json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + pad)
+
+
+class SyntheticBacklog:
+    def __init__(self, stories: int, seed: int = DEFAULT_SEED, dependency_density: float = 0.6,
+                 dependency_window: int = 500):
+        self.stories = stories
+        self.seed = seed
+        self.dependency_density = dependency_density
+        self.dependency_window = dependency_window
+
+        # Epic and ID for every story up front; everything else is drawn per story
+        rng = random.Random(seed)
+        names = list(EPICS)
+        self.epics = rng.choices(range(len(names)), weights=[EPICS[name][2] for name in names], k=stories)
+        width = max(3, len(str(stories)))
+        counters = [0] * len(names)
+        self.ids: List[str] = []
+        for index in self.epics:
+            counters[index] += 1
+            self.ids.append(f"{EPICS[names[index]][1]}-{counters[index]:0{width}d}")
+        self.epic_names = names
+
+    def _rng(self, index: int) -> random.Random:
+        return random.Random(self.seed * 1_000_003 + index)
+
+    def _title(self, rng: random.Random) -> str:
+        title = f"{rng.choice(VERBS)} {rng.choice(SUBJECTS)} {rng.choice(OBJECTS)}{rng.choice(QUALIFIERS)}"
+        return title[0].upper() + title[1:]
+
+    def _dependencies(self, rng: random.Random, index: int) -> List[str]:
+        if index == 0:
+            return []
+        # Geometric count with the requested mean, capped to keep the graph sparse
+        stop = 1 / (1 + self.dependency_density)
+        count = 0
+        while count < 5 and rng.random() > stop:
+            count += 1
+        picked = set()
+        for _ in range(count):
+            if rng.random() < 0.1:
+                picked.add(rng.randrange(index))
+            else:
+                picked.add(rng.randrange(max(0, index - self.dependency_window), index))
+        return [self.ids[j] for j in sorted(picked)]
+
+    def story(self, index: int) -> Dict[str, Any]:
+        """The PRIORITIZATION.json entry for story ``index``, plus markdown-only extras."""
+        rng = self._rng(index)
+        epic = self.epic_names[self.epics[index]]
+        story_id = self.ids[index]
+        title = self._title(rng)
+        created = BASE_DATE - timedelta(days=rng.randrange(730))
+        updated = min(BASE_DATE, created + timedelta(days=int(rng.expovariate(1 / 30))))
+        status = _weighted(rng, STATUSES)
+        branch_name = f"{story_id.lower()}-{_slug(title)}"
+        labels = sorted(set(rng.sample(LABELS, rng.randint(1, 4))))
+        # Ranks cluster at the top like the hand-prioritized backlog; 99 is "unranked"
+        priority = 99 if rng.random() < 0.05 else min(int(rng.paretovariate(1.2) * 3) - 2, max(25, self.stories // 4))
+        return {
+            "id": story_id,
+            "title": title,
+            "branch_name": branch_name,
+            "file_path": f"backlog/{EPICS[epic][0]}/{branch_name}.md",
+            "status": status,
+            "priority": priority,
+            "estimate": _weighted(rng, ESTIMATES),
+            "epic": epic,
+            "dependencies": self._dependencies(rng, index),
+            "labels": labels,
+            "owner": rng.choice(OWNERS),
+            "created": created.isoformat(),
+            "last_updated": updated.isoformat(),
+            "_role": rng.choice(ROLES),
+            "_criteria": rng.sample(CRITERIA, rng.randint(2, 6)),
+            "_layer": rng.choice(LAYERS),
+        }
+
+    def markdown(self, story: Dict[str, Any]) -> str:
+        deps = ", ".join(story["dependencies"])
+        tags = ", ".join(story["labels"])
+        layer = story["_layer"] or "null"
+        criteria = "\n".join(f"- [ ] **{c.split()[0]}**: {c}." for c in story["_criteria"])
+        related = ", ".join(story["dependencies"][:4]) or "None"
+        return f"""---
+id: {story['id']}
+epic: {story['epic']}
+status: {story['status']}
+owner: {story['owner'] or 'null'}
+priority: {story['priority']}
+estimate: {story['estimate']}
+dependencies: [{deps}]
+tags: [{tags}]
+market: null
+layer: {layer}
+created: {story['created']}
+last_updated: {story['last_updated']}
+emit_metadata:
+  source_id: synthetic
+  layer: {layer}
+---
+
+# {story['id']}: {story['title']}
+
+- **Overview**: As a {story['_role']}, I want to {story['title'].lower()} so that downstream models and reports stay trustworthy.
+- **Value Proposition**: Removes manual steps and makes the {story['epic'].replace('_', ' ')} work measurable.
+
+## Acceptance Criteria
+{criteria}
+
+## Technical Requirements
+- [ ] Configuration lives in the pipeline settings, not in code.
+- [ ] Structured logging with the story ID in every record.
+- [ ] Error handling for upstream timeouts and malformed input.
+
+## Definition of Done
+- [ ] Acceptance criteria verified on staging data.
+- [ ] Documentation and runbook updated.
+
+## Related Features
+{related}
+"""
+
+    def staged_markdown(self, index: int) -> str:
+        """A new story in the staging/new/ format StoryIngestor expects."""
+        rng = random.Random(f"staging:{self.seed}:{index}")
+        title = self._title(rng)
+        labels = json.dumps(sorted(set(rng.sample(LABELS, rng.randint(1, 3)))))
+        criteria = "\n".join(f"- [ ] {c}" for c in rng.sample(CRITERIA, rng.randint(2, 5)))
+        return f"""---
+title: "{title}"
+epic: {rng.choice(list(EPICS))}
+priority: {rng.randint(1, 30)}
+estimate: "{rng.choice(['1sp', '2sp', '3sp', '5sp', '8sp'])}"
+labels: {labels}
+author: "synthetic-backlog"
+---
+
+# {title}
+
+## User Story
+
+**As a** {rng.choice(ROLES)}
+**I want** to {title.lower()}
+**So that** the weekly slate is ready without manual fixes
+
+## Acceptance Criteria
+
+{criteria}
+"""
+
+    def _stream_view(self, path: Path, metadata: Dict[str, Any], order, markdown_root: Optional[Path] = None,
+                     on_story=None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{\n  "metadata": ' + json.dumps(metadata, indent=2).replace("\n", "\n  ") + ',\n  "backlog": [')
+            first = True
+            for index in order:
+                story = self.story(index)
+                if markdown_root is not None:
+                    md_path = markdown_root / story["file_path"]
+                    with open(md_path, 'w', encoding='utf-8') as md:
+                        md.write(self.markdown(story))
+                if on_story is not None:
+                    on_story(index, story)
+                entry = {key: value for key, value in story.items() if not key.startswith("_")}
+                f.write(("\n" if first else ",\n") + _indent_json(entry))
+                first = False
+            f.write("\n  ]\n}" if not first else "]\n}")
+
+    def write_backlog(self, output: Path, markdown: bool = True) -> Dict[str, Any]:
+        if markdown:
+            for directory, _, _ in EPICS.values():
+                (output / "backlog" / directory).mkdir(parents=True, exist_ok=True)
+        metadata = {
+            "last_updated": BASE_DATE.isoformat(),
+            "total_backlog_stories": self.stories,
+            "format_version": "2.0",
+            "generated_by": "synthetic_backlog.py",
+            "priority_assigned": True,
+            "priority_method": "synthetic",
+        }
+        graph = {"edges": 0, "roots": 0, "longest_chain": 0}
+        depth = [0] * self.stories
+        index_of = {story_id: i for i, story_id in enumerate(self.ids)}
+
+        def track(index: int, story: Dict[str, Any]):
+            deps = story["dependencies"]
+            graph["edges"] += len(deps)
+            graph["roots"] += not deps
+            depth[index] = 1 + max((depth[index_of[d]] for d in deps), default=0)
+            graph["longest_chain"] = max(graph["longest_chain"], depth[index])
+
+        self._stream_view(output / "backlog" / "PRIORITIZATION.json", metadata, range(self.stories),
+                          markdown_root=output if markdown else None, on_story=track)
+
+        # COMPLETE_BACKLOG.json is sorted by (epic, id); zero-padded IDs grow with the index
+        order = sorted(range(self.stories), key=lambda i: (self.epic_names[self.epics[i]], i))
+        complete_metadata = {key: metadata[key] for key in
+                             ("last_updated", "total_backlog_stories", "format_version", "generated_by")}
+        self._stream_view(output / "backlog" / "COMPLETE_BACKLOG.json", complete_metadata, order)
+        return graph
+
+    def write_staging(self, output: Path, count: int):
+        staging = output / "staging" / "new"
+        staging.mkdir(parents=True, exist_ok=True)
+        for index in range(count):
+            with open(staging / f"synthetic-{index:06d}.md", 'w', encoding='utf-8') as f:
+                f.write(self.staged_markdown(index))
+
+    def write_work_review(self, output: Path, days: int, repos: int) -> Dict[str, Any]:
+        rng = random.Random(f"work_review:{self.seed}")
+        names = [WORK_REPOS[i] if i < len(WORK_REPOS) else f"service-{i:03d}" for i in range(repos)]
+        activity = {name: rng.uniform(0.3, 3.0) for name in names}
+        start = BASE_DATE - timedelta(days=days - 1)
+        totals = {name: {"commits": 0, "lines_added": 0, "lines_deleted": 0, "prs_opened": 0, "prs_merged": 0,
+                         "issues_opened": 0, "issues_closed": 0, "workflow_runs": 0} for name in names}
+        samples = {name: {"merge": [], "close": [], "lead": [], "ai": 0} for name in names}
+
+        path = output / "docs" / "work_review.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            "owner": "synthetic",
+            "repos_included": names,
+            "window": {"days_back": days, "timezone": "America/New_York",
+                       "start_date": start.isoformat(), "end_date": BASE_DATE.isoformat()},
+            "generated_at": f"{BASE_DATE.isoformat()}T12:00:00Z",
+            "api_usage": {"graph_ql_calls": 0, "rest_calls": 0, "rate_limit_remaining": 5000},
+            "collection_notes": f"Synthetic activity from synthetic_backlog.py (seed {self.seed}).",
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{\n  "metadata": ' + json.dumps(metadata, indent=2).replace("\n", "\n  ") + ',\n  "daily": [')
+            for offset in range(days):
+                day = start + timedelta(days=offset)
+                weekend = day.weekday() >= 5
+                records = [self._repo_day(rng, name, activity[name] * (0.3 if weekend else 1.0),
+                                          totals[name], samples[name]) for name in names]
+                f.write(("\n" if offset == 0 else ",\n") + _indent_json({"date": day.isoformat(), "repos": records}))
+
+            by_repo = []
+            for name in names:
+                sample = samples[name]
+                by_repo.append({
+                    "name": name,
+                    "days_observed": days,
+                    "totals": totals[name],
+                    "medians": {"pr_time_to_merge_seconds": _median(sample["merge"]),
+                                "issue_time_to_close_seconds": _median(sample["close"]),
+                                "lead_time_for_changes_seconds": _median(sample["lead"])},
+                    "ai_signal_score": min(100, round(100 * sample["ai"] / max(1, totals[name]["commits"]))),
+                })
+            all_commits = sum(t["commits"] for t in totals.values())
+            aggregates = {
+                "by_repo": by_repo,
+                "global": {
+                    "repos_count": repos,
+                    "total_commits": all_commits,
+                    "total_prs_opened": sum(t["prs_opened"] for t in totals.values()),
+                    "total_prs_merged": sum(t["prs_merged"] for t in totals.values()),
+                    "total_lines_added": sum(t["lines_added"] for t in totals.values()),
+                    "total_lines_deleted": sum(t["lines_deleted"] for t in totals.values()),
+                    "deployment_frequency_total": sum(t["prs_merged"] for t in totals.values()),
+                    "ai_signal_score": min(100, round(100 * sum(s["ai"] for s in samples.values())
+                                                      / max(1, all_commits))),
+                },
+            }
+            f.write("\n  ],\n  \"aggregates\": " + json.dumps(aggregates, indent=2).replace("\n", "\n  ") + "\n}")
+        return {"days": days, "repos": repos, "records": days * repos}
+
+    def _repo_day(self, rng: random.Random, name: str, rate: float, totals: Dict[str, int],
+                  sample: Dict[str, Any]) -> Dict[str, Any]:
+        record = empty_repo_day(name)
+        commit_count = int(rng.expovariate(1 / (4 * rate)))
+        if commit_count:
+            commits = record["commits"]
+            commits["count"] = commit_count
+            commits["authors"] = sorted(set(rng.choices(AUTHORS, k=min(commit_count, 3))))
+            commits["lines_added"] = sum(rng.randint(1, 120) for _ in range(commit_count))
+            commits["lines_deleted"] = commits["lines_added"] // rng.randint(2, 6)
+            commits["files_changed"] = commit_count * rng.randint(1, 6)
+            commits["commit_message_ai_markers_count"] = sum(rng.random() < 0.2 for _ in range(commit_count))
+            hours = rng.choices(range(8, 23), k=commit_count)
+            for hour in hours:
+                commits["commit_time_distribution"][str(hour)] += 1
+            record["work_patterns"] = {"active_hours": sorted(set(hours)),
+                                       "focus_ratio": round(rng.uniform(0.4, 0.95), 2),
+                                       "context_switch_count": rng.randint(0, 6)}
+            record["ai_signals"]["commit_markers"] = commits["commit_message_ai_markers_count"]
+            sample["ai"] += commits["commit_message_ai_markers_count"]
+
+        opened = int(rng.expovariate(1 / rate))
+        prs = record["prs"]
+        if opened:
+            merged = rng.randint(0, opened)
+            prs.update({"opened_count": opened, "merged_count": merged, "closed_unmerged_count": opened - merged,
+                        "review_count": rng.randint(0, 2 * opened), "comment_count": rng.randint(0, 4 * opened),
+                        "additions_sum": opened * rng.randint(10, 400), "deletions_sum": opened * rng.randint(0, 120),
+                        "ai_markers_count": rng.randint(0, opened)})
+            for _ in range(opened):
+                prs["size_distribution"][_weighted(rng, [("small", 5), ("medium", 3), ("large", 1), ("xlarge", 1)])] += 1
+            if merged:
+                prs["time_to_merge_seconds_median"] = int(rng.lognormvariate(8.5, 1.0))
+                prs["time_to_first_review_seconds_median"] = prs["time_to_merge_seconds_median"] // 3
+                record["dora_like"]["lead_time_for_changes_seconds_median"] = prs["time_to_merge_seconds_median"]
+                record["dora_like"]["deployment_frequency_count"] = merged
+                sample["merge"].append(prs["time_to_merge_seconds_median"])
+                sample["lead"].append(prs["time_to_merge_seconds_median"])
+            record["reviews"].update({"code_reviews_count": prs["review_count"],
+                                      "unique_reviewers": min(prs["review_count"], 3),
+                                      "review_comments_count": prs["comment_count"]})
+
+        issues = record["issues"]
+        issues["opened_count"] = int(rng.expovariate(1 / rate))
+        issues["closed_count"] = int(rng.expovariate(1 / rate))
+        if issues["closed_count"]:
+            issues["time_to_close_seconds_median"] = int(rng.lognormvariate(10.0, 1.2))
+            sample["close"].append(issues["time_to_close_seconds_median"])
+
+        runs = commit_count + opened
+        if runs:
+            workflows = record["workflows"]
+            workflows["runs_count"] = runs
+            workflows["success_rate"] = round(rng.uniform(0.7, 1.0), 2)
+            workflows["mean_duration_seconds"] = rng.randint(60, 900)
+            workflows["flaky_runs_count"] = int(runs * rng.uniform(0, 0.1))
+
+        totals["commits"] += commit_count
+        totals["lines_added"] += record["commits"]["lines_added"]
+        totals["lines_deleted"] += record["commits"]["lines_deleted"]
+        totals["prs_opened"] += prs["opened_count"]
+        totals["prs_merged"] += prs["merged_count"]
+        totals["issues_opened"] += issues["opened_count"]
+        totals["issues_closed"] += issues["closed_count"]
+        totals["workflow_runs"] += runs
+        return record
+
+
+def _median(values: List[int]) -> Optional[int]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def generate(output: Path, stories: int, seed: int = DEFAULT_SEED, markdown: bool = True,
+             staging: int = 0, days: Optional[int] = None, repos: Optional[int] = None,
+             dependency_density: float = 0.6) -> Dict[str, Any]:
+    """Write a complete synthetic dataset to ``output`` and return its manifest."""
+    started = time.perf_counter()
+    output.mkdir(parents=True, exist_ok=True)
+    generator = SyntheticBacklog(stories, seed, dependency_density)
+    graph = generator.write_backlog(output, markdown=markdown)
+    if staging:
+        generator.write_staging(output, staging)
+    days = days or 365
+    repos = repos or max(4, min(64, stories // 2000))
+    work_review = generator.write_work_review(output, days, repos)
+
+    manifest = {
+        "generator_version": GENERATOR_VERSION,
+        "stories": stories,
+        "scale": scale_label(stories),
+        "seed": seed,
+        "markdown": markdown,
+        "staging": staging,
+        "dependency_density": dependency_density,
+        "dependency_graph": graph,
+        "work_review": work_review,
+        "generation_seconds": round(time.perf_counter() - started, 3),
+    }
+    with open(output / "synthetic_manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+@job("synthetic_backlog")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a deterministic synthetic backlog for benchmarking",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 10k stories with markdown, views, dependencies and work_review.json
+  python scripts/synthetic_backlog.py --scale 10k --output /tmp/backlog-10k
+
+  # 1M stories without the markdown files (JSON views only)
+  python scripts/synthetic_backlog.py --scale 1M --output /tmp/backlog-1m --no-markdown
+
+  # Add 500 stories to staging/new/ for an ingestion run
+  python scripts/synthetic_backlog.py --scale 100k --output /tmp/backlog-100k --staging 500
+        """
+    )
+    parser.add_argument("--scale", type=parse_scale, default=SCALES["10k"],
+                       help="Number of stories: 10k, 100k, 1M or a count (default: 10k)")
+    parser.add_argument("--output", type=str, required=True,
+                       help="Directory to write the dataset to")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                       help=f"Random seed (default: {DEFAULT_SEED})")
+    parser.add_argument("--no-markdown", action="store_true",
+                       help="Skip the story markdown files")
+    parser.add_argument("--staging", type=int, default=0,
+                       help="Stories to put in staging/new/ (default: 0)")
+    parser.add_argument("--days", type=int,
+                       help="Days of work_review.json activity (default: 365)")
+    parser.add_argument("--repos", type=int,
+                       help="Repos in work_review.json (default: scales with the backlog, 4-64)")
+    parser.add_argument("--dependency-density", type=float, default=0.6,
+                       help="Mean dependencies per story (default: 0.6)")
+
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    if (output / "backlog" / "PRIORITIZATION.json").exists() and not (output / "synthetic_manifest.json").exists():
+        print(f"❌ {output} already holds a real backlog; choose an empty directory")
+        sys.exit(1)
+
+    print(f"🚀 Generating {args.scale:,} synthetic stories (seed {args.seed}) in {output}")
+    manifest = generate(output, args.scale, args.seed, markdown=not args.no_markdown,
+                        staging=args.staging, days=args.days, repos=args.repos,
+                        dependency_density=args.dependency_density)
+    graph = manifest["dependency_graph"]
+    print(f"✅ Generated {manifest['stories']:,} stories in {manifest['generation_seconds']:.1f}s")
+    print(f"   Dependencies: {graph['edges']:,} edges, {graph['roots']:,} roots, "
+          f"longest chain {graph['longest_chain']}")
+    print(f"   work_review.json: {manifest['work_review']['repos']} repos x {manifest['work_review']['days']} days")
+
+
+if __name__ == "__main__":
+    main()
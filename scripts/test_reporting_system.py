@@ -4,288 +4,1137 @@ Test and validate the AI Sports Analytics reporting system.
 
 Runs comprehensive tests on data integrity, report generation,
 and dashboard functionality before deployment.
+
+Everything runs in-process. Fixture backlogs (the repository's own backlog
+and a synthetic one from synthetic_backlog.py) are loaded once, together
+with the report generators, the story index and the dashboard data builder
+built on them, before worker processes are forked; test groups then run in
+parallel against that shared, read-only state. Each group re-checks the
+fixture fingerprint when it finishes, so a test that mutates shared data
+fails instead of silently corrupting the others.
+
+``--differential`` adds checks that compare the optimized aggregation paths
+(indexed query plans, index postings, dashboard rollups and sketches, the
+columnar chunk encoding) against the straightforward reference code they
+replace, on every fixture.
 """
 
 import json
 import sys
+import contextlib
+import copy
+import hashlib
+import io
+import multiprocessing
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import time
 import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from datetime import date, datetime
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from backlog_query import BacklogQuery, QueryError, _predicate_value, _row_matches
+from backlog_store import BacklogStore, StoryIndex, _read_snapshot, load_story_view, load_view
+from backlog_sync import BacklogSyncService
+from collect_git_activity import GitActivityCollector
+from dora_metrics import DoraMetricsEngine
+from build_dashboard_data import DashboardDataBuilder, PR_SIZES, iso_week_start, month_start
+from estimates import (DURATION_UNITS, POINT_UNITS, TSHIRT_SIZES, _POINTS, canonical_estimate,
+                       find_estimate, parse_points, size_bucket)
+from generate_performance_analytics import ANALYTICS_FIELDS, PerformanceAnalytics
+from generate_real_dashboard import DASHBOARD_FIELDS, RealDataDashboardGenerator
+from generate_reports import ReportGenerator
+from priority_engine import (PriorityWeights, StoryFeatures, _score_columns, _score_matrix, rank_changes,
+                             ranking, score_models)
+from quantile_sketch import QuantileSketch
+from story_dates import AGE_BUCKETS, DayIndex, day_date, day_number, iso_date
+from story_columns import (COLUMN_FIELDS, DERIVED_FIELDS, MISSING, StoryColumns, column_value,
+                           encode_story_columns, numpy_module, open_story_columns)
+from story_model import Story, json_default, parse_date, parse_view, stories_from
+from synthetic_backlog import DEFAULT_SEED, SCALES, generate, parse_scale, scale_label
+from work_review_columnar import EDGE_CASE_DAILY, decode_work_review, encode_daily, round_trips
+
+FIXTURE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "test_fixtures"
+DIFFERENTIAL_QUERIES = 40
+DIFFERENTIAL_SAMPLE = 1000
+
+# Fixtures by name; set in the parent before workers fork and inherited read-only
+_FIXTURES: Dict[str, "Fixture"] = {}
+
+
+class Fixture:
+    """A backlog loaded once and shared by every test."""
+
+    def __init__(self, name: str, base_path: Path):
+        self.name = name
+        self.base_path = base_path
+
+        # Load data
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.reports = ReportGenerator(str(base_path))
+            self.dashboard = RealDataDashboardGenerator(str(base_path))
+        self.prioritization = self.reports.prioritization_data
+        self.complete = self.reports.complete_backlog
+        self.stories = self.prioritization.get("backlog", [])
+        self.index = StoryIndex(self.stories)
+        self.dashboard_data: Optional[DashboardDataBuilder] = None
+        if (base_path / "docs" / "work_review.json").exists():
+            self.dashboard_data = DashboardDataBuilder(str(base_path))
+        self.fingerprint = self.compute_fingerprint()
+
+    def compute_fingerprint(self) -> str:
+        digest = hashlib.sha1()
+        for payload in (self.prioritization, self.complete, self.dashboard.prioritization_data,
+                        self.dashboard_data.data if self.dashboard_data else None):
+            digest.update(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
 
-def test_data_files() -> Tuple[bool, str]:
+def synthetic_fixture_path(stories: int, seed: int) -> Path:
+    """Generate (or reuse) a synthetic backlog without markdown files."""
+    path = FIXTURE_DIR / f"{scale_label(stories)}-seed{seed}"
+    manifest_path = path / "synthetic_manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("stories") == stories and manifest.get("seed") == seed:
+            return path
+    if path.exists():
+        shutil.rmtree(path)
+    generate(path, stories, seed, markdown=False)
+    return path
+
+
+# --- Data ------------------------------------------------------------------
+
+def test_data_files(fixture: Fixture) -> Tuple[bool, str]:
     """Test that required data files exist and are valid."""
-    try:
-        base_path = Path(".")
-        
-        # Check PRIORITIZATION.json
-        prioritization_file = base_path / "backlog" / "PRIORITIZATION.json"
-        if not prioritization_file.exists():
-            return False, "PRIORITIZATION.json not found"
-        
-        with open(prioritization_file, 'r', encoding='utf-8') as f:
-            prioritization_data = json.load(f)
-        
-        if "backlog" not in prioritization_data:
-            return False, "PRIORITIZATION.json missing 'backlog' key"
-        
-        # Check COMPLETE_BACKLOG.json
-        backlog_file = base_path / "backlog" / "COMPLETE_BACKLOG.json"
-        if not backlog_file.exists():
-            return False, "COMPLETE_BACKLOG.json not found"
-        
-        with open(backlog_file, 'r', encoding='utf-8') as f:
-            backlog_data = json.load(f)
-        
-        if "backlog" not in backlog_data:
-            return False, "COMPLETE_BACKLOG.json missing 'backlog' key"
-        
-        return True, f"Data files valid: {len(prioritization_data['backlog'])} prioritized stories, {len(backlog_data['backlog'])} total stories"
-        
-    except Exception as e:
-        return False, f"Data file validation error: {str(e)}"
-
-def test_report_generation() -> Tuple[bool, str]:
+    for name in ("PRIORITIZATION.json", "COMPLETE_BACKLOG.json"):
+        if not (fixture.base_path / "backlog" / name).exists():
+            return False, f"{name} not found"
+    if "backlog" not in fixture.prioritization:
+        return False, "PRIORITIZATION.json missing 'backlog' key"
+    if "backlog" not in fixture.complete:
+        return False, "COMPLETE_BACKLOG.json missing 'backlog' key"
+
+    missing_ids = sum(1 for story in fixture.stories if not story.get("id"))
+    if missing_ids:
+        return False, f"{missing_ids} prioritized stories without an id"
+
+    return True, (f"Data files valid: {len(fixture.stories)} prioritized stories, "
+                  f"{len(fixture.complete['backlog'])} total stories")
+
+
+# --- Reports ---------------------------------------------------------------
+
+def test_report_generation(fixture: Fixture) -> Tuple[bool, str]:
     """Test report generation functionality."""
-    try:
-        # Import and test report generator
-        sys.path.append('scripts')
-        from generate_reports import ReportGenerator
-        
-        generator = ReportGenerator()
-        
-        # Test velocity report
-        velocity_report = generator.generate_velocity_report()
-        if "total_stories" not in velocity_report:
-            return False, "Velocity report missing total_stories"
-        
-        # Test health report
-        health_report = generator.generate_backlog_health_report()
-        if "health_score" not in health_report:
-            return False, "Health report missing health_score"
-        
-        # Test priority report
-        priority_report = generator.generate_priority_analytics()
-        if "total_prioritized" not in priority_report:
-            return False, "Priority report missing total_prioritized"
-        
-        # Test workflow report
-        workflow_report = generator.generate_workflow_metrics()
-        if "automation_adoption" not in workflow_report:
-            return False, "Workflow report missing automation_adoption"
-        
-        # Test dashboard data generation
-        dashboard_data = generator.generate_dashboard_data()
-        if "summary" not in dashboard_data:
-            return False, "Dashboard data missing summary"
-        
-        return True, f"All report types generated successfully (velocity, health, priority, workflow, dashboard)"
-        
-    except Exception as e:
-        return False, f"Report generation error: {str(e)}"
-
-def test_dashboard_generation() -> Tuple[bool, str]:
-    """Test dashboard HTML generation."""
-    try:
-        # Import and test dashboard generator
-        sys.path.append('scripts')
-        from generate_dashboard import DashboardGenerator
-        from generate_reports import ReportGenerator
-        
-        # Generate test data
-        report_generator = ReportGenerator()
-        dashboard_data = report_generator.generate_dashboard_data()
-        
-        # Generate dashboard
-        dashboard_generator = DashboardGenerator()
-        html_content = dashboard_generator.generate_html_dashboard(dashboard_data)
-        
-        # Basic HTML validation
-        if "<html" not in html_content:
-            return False, "Generated HTML missing html tag"
-        
-        if "AI Sports Analytics" not in html_content:
-            return False, "Generated HTML missing title"
-        
-        if "Chart.js" not in html_content:
-            return False, "Generated HTML missing Chart.js"
-        
-        # Test badge generation
-        badges = dashboard_generator.generate_readme_badges(dashboard_data)
-        if "Stories" not in badges:
-            return False, "Badge generation failed"
-        
-        return True, f"Dashboard HTML generated successfully ({len(html_content)} characters)"
-        
-    except Exception as e:
-        return False, f"Dashboard generation error: {str(e)}"
-
-def test_script_execution() -> Tuple[bool, str]:
-    """Test that scripts can be executed directly."""
-    try:
-        import subprocess
-        import os
-        
-        # Test report generation script
-        result = subprocess.run([
-            sys.executable, "scripts/generate_reports.py", "--type", "velocity"
-        ], capture_output=True, text=True, cwd=".")
-        
-        if result.returncode != 0:
-            return False, f"Report script execution failed: {result.stderr}"
-        
-        # Test dashboard generation script
-        result = subprocess.run([
-            sys.executable, "scripts/generate_dashboard.py", "--live"
-        ], capture_output=True, text=True, cwd=".")
-        
-        if result.returncode != 0:
-            return False, f"Dashboard script execution failed: {result.stderr}"
-        
-        return True, "Scripts execute successfully"
-        
-    except Exception as e:
-        return False, f"Script execution error: {str(e)}"
-
-def test_output_validation() -> Tuple[bool, str]:
-    """Test that generated outputs are valid."""
-    try:
-        reports_path = Path("reports")
-        docs_path = Path("docs")
-        
-        # Check if reports directory exists and has content
-        if not reports_path.exists():
-            return False, "Reports directory not created"
-        
-        # Check for generated report files
-        json_reports = list(reports_path.glob("*.json"))
-        if not json_reports:
-            return False, "No JSON reports generated"
-        
-        # Validate JSON format
-        for report_file in json_reports[:3]:  # Check first 3
+    generator = fixture.reports
+
+    velocity_report = generator.generate_velocity_report()
+    if "total_stories" not in velocity_report:
+        return False, "Velocity report missing total_stories"
+    if velocity_report["total_stories"] != len(fixture.stories):
+        return False, f"Velocity report counts {velocity_report['total_stories']} of {len(fixture.stories)} stories"
+
+    health_report = generator.generate_backlog_health_report()
+    if "health_score" not in health_report:
+        return False, "Health report missing health_score"
+
+    priority_report = generator.generate_priority_analytics()
+    if "total_prioritized" not in priority_report:
+        return False, "Priority report missing total_prioritized"
+
+    workflow_report = generator.generate_workflow_metrics()
+    if "automation_adoption" not in workflow_report:
+        return False, "Workflow report missing automation_adoption"
+
+    dashboard_data = generator.generate_dashboard_data()
+    if "summary" not in dashboard_data:
+        return False, "Dashboard data missing summary"
+
+    return True, "All report types generated successfully (velocity, health, priority, workflow, dashboard)"
+
+
+def test_output_validation(fixture: Fixture) -> Tuple[bool, str]:
+    """Test that saved reports are valid, writing to a scratch directory."""
+    generator = copy.copy(fixture.reports)
+    with tempfile.TemporaryDirectory() as scratch:
+        generator.reports_path = Path(scratch)
+        saved = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for report_type, build in (("velocity", generator.generate_velocity_report),
+                                       ("health", generator.generate_backlog_health_report),
+                                       ("priority", generator.generate_priority_analytics),
+                                       ("workflow", generator.generate_workflow_metrics)):
+                generator.save_report(build(), report_type, "json")
+                generator.save_report(build(), report_type, "markdown")
+
+        for report_file in Path(scratch).glob("*.json"):
             with open(report_file, 'r', encoding='utf-8') as f:
                 report_data = json.load(f)
-            
             if "generated_at" not in report_data:
                 return False, f"Report {report_file.name} missing generated_at timestamp"
-        
-        # Check dashboard output
-        if docs_path.exists():
-            index_file = docs_path / "index.html"
-            if index_file.exists():
-                with open(index_file, 'r', encoding='utf-8') as f:
-                    html_content = f.read()
-                
-                if len(html_content) < 1000:
-                    return False, "Generated dashboard HTML too short"
-        
-        return True, f"Output validation passed: {len(json_reports)} reports generated"
-        
-    except Exception as e:
-        return False, f"Output validation error: {str(e)}"
-
-def run_comprehensive_test() -> Dict[str, Any]:
-    """Run all tests and return results."""
-    tests = [
-        ("Data Files", test_data_files),
-        ("Report Generation", test_report_generation),
-        ("Dashboard Generation", test_dashboard_generation),
-        ("Script Execution", test_script_execution),
-        ("Output Validation", test_output_validation)
-    ]
-    
+            saved += 1
+        markdown = list(Path(scratch).glob("*.md"))
+        if saved < 4 or len(markdown) < 4:
+            return False, f"Expected 4 JSON and 4 markdown reports, found {saved} and {len(markdown)}"
+
+    return True, f"Output validation passed: {saved} JSON and {len(markdown)} markdown reports"
+
+
+# --- Dashboards ------------------------------------------------------------
+
+def test_dashboard_generation(fixture: Fixture) -> Tuple[bool, str]:
+    """Test dashboard data and HTML generation."""
+    analysis = fixture.dashboard.analyze_real_data()
+    if fixture.stories and not analysis:
+        return False, "Dashboard analysis returned no data"
+
+    html_content = fixture.dashboard.generate_real_dashboard_html()
+    if "<html" not in html_content:
+        return False, "Generated HTML missing html tag"
+    if "AI Sports Analytics" not in html_content:
+        return False, "Generated HTML missing title"
+    if "chart.js" not in html_content.lower():
+        return False, "Generated HTML missing Chart.js"
+
+    return True, f"Dashboard HTML generated successfully ({len(html_content)} characters)"
+
+
+def test_dashboard_data(fixture: Fixture) -> Tuple[bool, str]:
+    """Test the activity dashboard build from work_review.json."""
+    if fixture.dashboard_data is None:
+        return True, "No docs/work_review.json; skipped"
+
+    builder = copy.copy(fixture.dashboard_data)
+    with tempfile.TemporaryDirectory() as scratch:
+        builder.output_path = Path(scratch)
+        manifest = builder.build()
+        for chunk in manifest["chunks"]:
+            if not (Path(scratch) / chunk["file"]).exists():
+                return False, f"Chunk {chunk['file']} listed but not written"
+        if not (Path(scratch) / "rollups.json").exists():
+            return False, "rollups.json not written"
+
+    return True, (f"Dashboard data built: {manifest['dates']['count']} days, "
+                  f"{len(manifest['chunks'])} chunks, {len(manifest['repos'])} repos")
+
+
+# --- Scripts ---------------------------------------------------------------
+
+def test_script_execution(fixture: Fixture) -> Tuple[bool, str]:
+    """Test the script entry points in-process against a scratch copy of the views."""
+    import generate_real_dashboard
+    import generate_reports
+
+    cwd = os.getcwd()
+    argv = sys.argv
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch_path = Path(scratch)
+        (scratch_path / "backlog").mkdir()
+        (scratch_path / "docs").mkdir()
+        for name in ("PRIORITIZATION.json", "COMPLETE_BACKLOG.json"):
+            source = fixture.base_path / "backlog" / name
+            if source.exists():
+                shutil.copy2(source, scratch_path / "backlog" / name)
+        try:
+            os.chdir(scratch_path)
+            for module, args in ((generate_reports, ["--type", "velocity"]),
+                                 (generate_real_dashboard, [])):
+                sys.argv = [f"{module.__name__}.py", *args]
+                output = io.StringIO()
+                try:
+                    with contextlib.redirect_stdout(output):
+                        module.main()
+                except SystemExit as e:
+                    if e.code not in (None, 0):
+                        return False, f"{module.__name__}.py exited with {e.code}: {output.getvalue()[-300:]}"
+        finally:
+            sys.argv = argv
+            os.chdir(cwd)
+
+        reports = list((scratch_path / "reports").glob("velocity_*.json"))
+        if not reports:
+            return False, "generate_reports.py wrote no velocity report"
+        index_file = scratch_path / "docs" / "index.html"
+        if not index_file.exists() or index_file.stat().st_size < 1000:
+            return False, "Generated dashboard HTML missing or too short"
+
+    return True, "Scripts execute successfully"
+
+
+def test_git_collector_windows(fixture: Fixture) -> Tuple[bool, str]:
+    """A run ending before the newest commits must leave them for the next run."""
+    commits = ("2025-09-01", "2025-09-03", "2025-09-06")
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch_path = Path(scratch)
+        clone = scratch_path / "demo"
+        clone.mkdir()
+
+        def git(*args: str, day: Optional[str] = None):
+            env = dict(os.environ, GIT_AUTHOR_NAME="dev", GIT_AUTHOR_EMAIL="dev@example.com",
+                       GIT_COMMITTER_NAME="dev", GIT_COMMITTER_EMAIL="dev@example.com")
+            if day:
+                env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = f"{day}T12:00:00+00:00"
+            subprocess.run(["git", "-C", str(clone), *args], env=env, check=True, capture_output=True)
+
+        git("init", "-q")
+        for day in commits:
+            (clone / "notes.txt").write_text(f"{day}\n", encoding="utf-8")
+            git("add", "notes.txt")
+            git("commit", "-q", "-m", f"Work on {day}", day=day)
+
+        review = scratch_path / "work_review.json"
+        review.write_text(json.dumps({"metadata": {"repos_included": ["demo"],
+                                                   "window": {"days_back": 14, "timezone": "UTC"}},
+                                      "daily": []}), encoding="utf-8")
+        processed = []
+        for end in ("2025-09-04", "2025-09-10", "2025-09-10"):
+            collector = GitActivityCollector(review=str(review), repos_root=scratch,
+                                             end_date=date.fromisoformat(end), workers=1)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = collector.collect()
+            if results[0]["error"]:
+                return False, f"Collector failed: {results[0]['error']}"
+            processed.append(results[0]["commits_processed"])
+            collector.save()
+
+        counts = {day["date"]: repo["commits"]["count"] for day in collector.data["daily"]
+                  for repo in day["repos"] if repo["commits"]["count"]}
+    if counts != dict.fromkeys(commits, 1):
+        return False, f"Commits per day after split windows: {counts}, expected one on each of {commits}"
+    if processed[-1] != 0:
+        return False, f"Incremental rerun processed {processed[-1]} commits again"
+    return True, f"Split windows counted {len(commits)} commits once each (runs processed {processed})"
+
+
+def test_dora_pruned_store(fixture: Fixture) -> Tuple[bool, str]:
+    """Saved partials before the store's window survive a PR that was merged then but updated since."""
+    def run(run_id: int, conclusion: str, created: str) -> Dict[str, Any]:
+        return {"id": run_id, "name": "Deploy", "status": "completed", "conclusion": conclusion,
+                "created_at": created, "updated_at": created}
+
+    pr = {"number": 1, "created_at": "2025-07-31T09:00:00Z", "merged_at": "2025-08-01T10:00:00Z",
+          "updated_at": "2025-08-01T10:00:00Z"}
+    store = {"repos": {"demo": {"prs": {"1": pr}, "issues": {}, "runs": {
+        "1": run(1, "success", "2025-08-01T11:00:00Z"),
+        "2": run(2, "failure", "2025-08-01T12:00:00Z"),
+        "3": run(3, "success", "2025-08-01T13:00:00Z"),
+        "4": run(4, "success", "2025-09-03T12:00:00Z"),
+    }}}}
+    review = {"metadata": {"repos_included": ["demo"],
+                           "window": {"timezone": "UTC", "start_date": "2025-07-25"}}, "daily": []}
+
+    with tempfile.TemporaryDirectory() as scratch:
+        paths = {name: Path(scratch) / f"{name}.json" for name in ("review", "store", "partials")}
+
+        def refresh() -> DoraMetricsEngine:
+            paths["review"].write_text(json.dumps(review), encoding="utf-8")
+            paths["store"].write_text(json.dumps(store), encoding="utf-8")
+            engine = DoraMetricsEngine(scratch, review=str(paths["review"]), store=str(paths["store"]),
+                                       partials=str(paths["partials"]))
+            engine.refresh()
+            engine.save(review=False)
+            return engine
+
+        before = refresh().partials["demo"]["2025-08-01"].counters
+        # The next collection moves the window past August: runs are pruned by
+        # created_at, but the PR stays because it was updated recently
+        review["metadata"]["window"]["start_date"] = "2025-09-01"
+        pr["updated_at"] = "2025-09-02T08:00:00Z"
+        store["repos"]["demo"]["runs"] = {"4": store["repos"]["demo"]["runs"]["4"]}
+        engine = refresh()
+
+    after = engine.partials["demo"]["2025-08-01"].counters
+    if after != before:
+        return False, f"2025-08-01 partial changed from {before} to {after} after pruning"
+    if engine.partials["demo"]["2025-09-03"].counters["deployments"] != 1:
+        return False, "Deployment inside the window was not refreshed from events"
+    return True, f"2025-08-01 kept {before['deployments']:.0f} deployments and {before['failed_deployments']:.0f} failure"
+
+
+def test_backlog_sync_noop(fixture: Fixture) -> Tuple[bool, str]:
+    """A sync pass over unchanged story files leaves PRIORITIZATION.json as it was."""
+    source = fixture.base_path / "backlog"
+    if not (source / "PRIORITIZATION.json").exists() or next(source.rglob("*.md"), None) is None:
+        return True, "No story files; skipped"
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copytree(source, Path(scratch) / "backlog")
+        prioritization = Path(scratch) / "backlog" / "PRIORITIZATION.json"
+        before = prioritization.read_bytes()
+        with contextlib.redirect_stdout(io.StringIO()):
+            service = BacklogSyncService(scratch, verbose=False)
+            rescanned = service.rescan()
+            if prioritization.read_bytes() != before:
+                reference = {s.get("file_path"): s for s in json.loads(before)["backlog"]}
+                changed = [s.get("id") for s in json.loads(prioritization.read_bytes())["backlog"]
+                           if reference.get(s.get("file_path")) != s]
+                return False, f"Rescan changed PRIORITIZATION.json entries: {changed[:5]}"
+            # The watcher's per-file path, over every story, and a second rescan
+            edited = service.apply_changes(set((Path(scratch) / "backlog").rglob("*.md")))
+            again = BacklogSyncService(scratch, verbose=False).rescan()
+    if edited["updated"] or edited["removed"]:
+        return False, f"Re-applying unchanged files changed the views: {edited}"
+    if again["files_written"]:
+        return False, f"A second rescan wrote {again['files_written']} file(s)"
+    return True, f"Rescan of {rescanned['stories']} stories left PRIORITIZATION.json unchanged; reruns wrote nothing"
+
+
+def test_store_reload_changed(fixture: Fixture) -> Tuple[bool, str]:
+    """BacklogStore.reload_changed skips the store's own commits and picks up other writers."""
+    source = fixture.base_path / "backlog" / "PRIORITIZATION.json"
+    if not source.exists():
+        return True, "No PRIORITIZATION.json; skipped"
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copytree(fixture.base_path / "backlog", Path(scratch) / "backlog")
+        store = BacklogStore(scratch)
+        if store.reload_changed():
+            return False, "Views reloaded right after loading"
+        store.touch("prioritization")
+        with contextlib.redirect_stdout(io.StringIO()):
+            store.commit()
+        if store.reload_changed():
+            return False, "The store's own commit triggered a reload"
+
+        # Another tool rewrites PRIORITIZATION.json
+        complete = store.complete
+        prioritization = Path(scratch) / "backlog" / "PRIORITIZATION.json"
+        data = json.loads(prioritization.read_bytes())
+        if not data["backlog"]:
+            return True, "PRIORITIZATION.json has no stories; skipped"
+        data["backlog"][0]["title"] = "Edited by another tool"
+        prioritization.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        reloaded = store.reload_changed()
+        if reloaded != ["prioritization"]:
+            return False, f"An external edit reloaded {reloaded}, expected ['prioritization']"
+        if store.prioritization["backlog"][0]["title"] != "Edited by another tool" or store.complete is not complete:
+            return False, "Reload did not pick up the edit, or re-read the unchanged COMPLETE_BACKLOG.json"
+    return True, "Own commits skip the reload; an external edit reloads only its view"
+
+
+# --- Differential: optimized paths against reference implementations --------
+
+def _reference_predicate(node) -> Callable[[Dict[str, Any]], bool]:
+    """A parsed query as a plain predicate over one story, built on the Filter operator's matcher."""
+    kind = node[0]
+    if kind in ("and", "or"):
+        left, right = _reference_predicate(node[1]), _reference_predicate(node[2])
+        if kind == "and":
+            return lambda story: left(story) and right(story)
+        return lambda story: left(story) or right(story)
+    if kind == "not":
+        inner = _reference_predicate(node[1])
+        return lambda story: not inner(story)
+    _, field, operator, value = node
+    value = _predicate_value(field, operator, value)
+    return lambda story: _row_matches(story, field, operator, value)
+
+
+def _sample_queries(fixture: Fixture, count: int) -> List[str]:
+    """Deterministic mix of indexed, range, text and filter conditions."""
+    rng = random.Random(fixture.name)
+    stories = fixture.stories
+    values = {
+        "status": sorted({str(s.get("status")) for s in stories if s.get("status")}),
+        "epic": sorted({str(s.get("epic")) for s in stories if s.get("epic")}),
+        "owner": sorted({str(s.get("owner")) for s in stories if s.get("owner")}),
+        "label": sorted({str(label) for s in stories for label in s.get("labels") or []}),
+        "created": sorted({str(s.get("created")) for s in stories if s.get("created")}),
+        "word": sorted({w for s in stories[:500] for w in StoryIndex.tokenize(s.get("title", "")) if len(w) > 3}),
+    }
+
+    def quote(value: str) -> str:
+        return f"'{value}'" if '"' in value else f'"{value}"'
+
+    def comparison() -> str:
+        choice = rng.choice(["status", "epic", "owner", "label", "priority", "created", "title", "in", "estimate"])
+        if choice == "priority":
+            return f"priority {rng.choice(['<', '<=', '>', '>=', '=', '!='])} {rng.randint(1, 30)}"
+        if choice == "created" and values["created"]:
+            return f"created {rng.choice(['<', '>='])} {rng.choice(values['created'])}"
+        if choice == "title" and values["word"]:
+            return f"title ~ {rng.choice(values['word'])}"
+        if choice == "in" and values["status"]:
+            picked = rng.sample(values["status"], min(2, len(values["status"])))
+            return f"status {rng.choice(['in', 'not in'])} ({', '.join(quote(v) for v in picked)})"
+        if choice == "estimate":
+            if rng.random() < 0.5:
+                return f"estimate {rng.choice(['<', '<=', '>', '>='])} {rng.choice(['1', '3', '5', '8'])}"
+            return f"estimate = {rng.choice(['TBD', '3sp', '5sp'])}"
+        if values.get(choice):
+            return f"{choice} {rng.choice(['=', '!='])} {quote(rng.choice(values[choice]))}"
+        return f"priority < {rng.randint(1, 30)}"
+
+    def condition(depth: int = 0) -> str:
+        if depth >= 2 or rng.random() < 0.4:
+            return comparison()
+        joiner = rng.choice([" and ", " or "])
+        text = joiner.join(condition(depth + 1) for _ in range(rng.randint(2, 3)))
+        return f"not ({text})" if rng.random() < 0.15 else f"({text})"
+
+    return [condition() for _ in range(count)]
+
+
+def diff_query_plans(fixture: Fixture) -> Tuple[bool, str]:
+    """Indexed query plans agree with scanning on a sample of stories."""
+    queries = _sample_queries(fixture, DIFFERENTIAL_QUERIES)
+    stories = list(fixture.index.by_id.values())
+    # Scanning every story for every query is what the plans avoid; a fixed sample keeps this fast
+    sample = random.Random(f"scan:{fixture.name}").sample(stories, min(len(stories), DIFFERENTIAL_SAMPLE))
+    for text in queries:
+        query = BacklogQuery(fixture.index, text)
+        optimized = query.plan.execute(fixture.index)
+        where = query.parsed["where"]
+        matches = _reference_predicate(where) if where is not None else (lambda story: True)
+        for story in sample:
+            if (story["id"] in optimized) != matches(story):
+                found = "returned" if story["id"] in optimized else "missed"
+                return False, f"'{text}': plan {found} {story['id']}, scan disagrees"
+
+    for field in ("status", "epic", "owner", "label"):
+        result = BacklogQuery(fixture.index, f"group by {field}").run()
+        optimized = {group["key"]: group["count"] for group in result["groups"]}
+        reference: Counter = Counter()
+        for story in fixture.index.by_id.values():
+            keys = (story.get("labels") or ["(none)"]) if field == "label" else [story.get(field)]
+            for key in keys:
+                reference["(none)" if key in (None, "") else str(key)] += 1
+        if optimized != dict(reference):
+            return False, f"group by {field}: query aggregate differs from a direct count"
+
+    # The scan above shares _row_matches with the plan, so check estimate ordering against parse_points directly
+    points = {story["id"]: parse_points(story.get("estimate")) for story in stories}
+    for text, holds in (("estimate > 3", lambda p: p > 3), ("estimate <= 3", lambda p: p <= 3)):
+        expected = {sid for sid, p in points.items() if p is not None and holds(p)}
+        if BacklogQuery(fixture.index, text).plan.execute(fixture.index) != expected:
+            return False, f"'{text}' differs from comparing parse_points, skipping unparseable estimates"
+    for text in ("title > m", "status <= done", "estimate > TBD"):
+        try:
+            BacklogQuery(fixture.index, text)
+        except QueryError:
+            continue
+        return False, f"'{text}' should be rejected, not compared as text"
+
+    return True, (f"{len(queries)} random queries match a scan of {len(sample)} stories; 4 group-bys match "
+                  f"direct counts; estimate ordering matches parse_points")
+
+
+def diff_index_select(fixture: Fixture) -> Tuple[bool, str]:
+    """StoryIndex.select postings match filtering the story list, and the velocity report's counts."""
+    rng = random.Random(f"select:{fixture.name}")
+    stories = list(fixture.index.by_id.values())
+    options = {field: sorted({str(s.get(field) or "") for s in stories}) for field in ("status", "epic", "owner")}
+    options["label"] = sorted({str(label) for s in stories for label in s.get("labels") or []})
+    for _ in range(40):
+        filters = {field: rng.sample(values, min(len(values), rng.randint(1, 2)))
+                   for field, values in options.items() if values and rng.random() < 0.5}
+        optimized = fixture.index.select(**filters)
+        wanted = {field: {v.lower() for v in values} for field, values in filters.items()}
+        reference = {s["id"] for s in stories
+                     if all(str(s.get(field) or "").lower() in wanted[field] for field in ("status", "epic", "owner")
+                            if field in wanted)
+                     and ("label" not in wanted or {str(l).lower() for l in s.get("labels") or []} & wanted["label"])}
+        if optimized != reference:
+            return False, f"select({filters}) returned {len(optimized)} stories, filtering {len(reference)}"
+
+    # Every prioritized story is indexed once, so postings sizes equal the report breakdown
+    if len(fixture.index.by_id) == len(fixture.stories):
+        report = fixture.reports.generate_velocity_report()["status_breakdown"]
+        expected: Counter = Counter()
+        for status, count in report.items():
+            expected[str(status or "").lower()] += count
+        postings = {status: len(ids) for status, ids in fixture.index.fields["status"].items() if ids}
+        if postings != dict(expected):
+            return False, "Status postings differ from the velocity report's status breakdown"
+
+    return True, "40 index selections match list filtering; status postings match the velocity report"
+
+
+def diff_dashboard_rollups(fixture: Fixture) -> Tuple[bool, str]:
+    """Weekly/monthly rollups equal direct sums of the daily records; sketches stay within accuracy."""
+    builder = fixture.dashboard_data
+    if builder is None:
+        return True, "No docs/work_review.json; skipped"
+
+    daily = sorted(builder.data.get("daily", []), key=lambda d: d["date"])
+    rollups = builder.build_rollups(daily)
+    accuracy = builder.relative_accuracy
+    checked = 0
+    for granularity, period_start in (("week", iso_week_start), ("month", month_start)):
+        reference: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for day_data in daily:
+            start = period_start(date.fromisoformat(day_data["date"])).isoformat()
+            for repo in day_data.get("repos", []):
+                entry = reference.setdefault((start, repo["name"]), {"days": 0, "totals": Counter(),
+                                                                     "sizes": Counter(), "merge": []})
+                entry["days"] += 1
+                entry["totals"].update(builder._repo_totals(repo))
+                entry["sizes"].update({k: v or 0 for k, v in ((repo.get("prs") or {}).get("size_distribution")
+                                                              or {}).items()})
+                merge = (repo.get("prs") or {}).get("time_to_merge_seconds_median")
+                if merge:
+                    entry["merge"].append(merge)
+
+        for period in rollups[granularity]:
+            for name, rollup in period["repos"].items():
+                expected = reference.pop((period["start"], name), None)
+                if expected is None:
+                    return False, f"{granularity} {period['key']} has {name} but no daily records"
+                if rollup["days"] != expected["days"]:
+                    return False, f"{granularity} {period['key']} {name}: {rollup['days']} days, expected {expected['days']}"
+                for field, value in rollup["totals"].items():
+                    if abs(value - expected["totals"].get(field, 0)) > 1e-3:
+                        return False, f"{granularity} {period['key']} {name}: {field} {value} != {expected['totals'][field]}"
+                if any(rollup["pr_sizes"].get(size, 0) != expected["sizes"].get(size, 0) for size in PR_SIZES):
+                    return False, f"{granularity} {period['key']} {name}: PR size counts differ"
+                if expected["merge"]:
+                    exact = sorted(expected["merge"])
+                    estimate = QuantileSketch.from_dict(rollup["sketches"]["pr_merge"]).quantile(0.5)
+                    true_median = (exact[(len(exact) - 1) // 2] + exact[len(exact) // 2]) / 2
+                    if abs(estimate - true_median) > accuracy * true_median * 1.0001:
+                        return False, (f"{granularity} {period['key']} {name}: sketch median {estimate:.0f} "
+                                       f"outside ±{accuracy:.0%} of {true_median:.0f}")
+                checked += 1
+        if reference:
+            return False, f"{len(reference)} {granularity} repo periods missing from the rollups"
+
+    return True, f"{checked} repo periods match direct sums; sketch medians within ±{accuracy:.0%}"
+
+
+def diff_columnar_chunks(fixture: Fixture) -> Tuple[bool, str]:
+    """The columnar chunk encoding decodes back to the original daily records."""
+    # Empty dicts, sparse histograms, null-then-list and mixed-type columns
+    if not round_trips(EDGE_CASE_DAILY):
+        return False, "Edge-case records do not round-trip through the columnar encoding"
+
+    builder = fixture.dashboard_data
+    if builder is None:
+        return True, "Edge cases round-trip; no docs/work_review.json"
+
+    daily = sorted(builder.data.get("daily", []), key=lambda d: d["date"])
+    chunks = builder.build_chunks(daily)
+    for chunk in chunks:
+        decoded = decode_work_review(encode_daily(chunk["daily"]))["daily"]
+        if json.dumps(decoded, sort_keys=True) != json.dumps(chunk["daily"], sort_keys=True):
+            return False, f"Chunk {chunk['key']} does not round-trip through the columnar encoding"
+
+    return True, f"{len(chunks)} chunks and the edge cases round-trip through the columnar encoding"
+
+
+def diff_view_snapshots(fixture: Fixture) -> Tuple[bool, str]:
+    """Views loaded from their marshal snapshots equal a plain JSON parse."""
+    checked = []
+    for name in ("PRIORITIZATION.json", "COMPLETE_BACKLOG.json"):
+        path = fixture.base_path / "backlog" / name
+        if not path.exists():
+            continue
+        # The first load writes the snapshot if it is missing or stale
+        load_view(path)
+        cached = _read_snapshot(path)
+        if cached is None:
+            return False, f"{name}: no fresh snapshot after loading it"
+        with open(path, 'r', encoding='utf-8') as f:
+            reference = json.load(f)
+        if cached[1] != reference:
+            return False, f"{name}: snapshot differs from the JSON file"
+        # BacklogStore's Story views come from the same snapshot
+        stories = load_story_view(path)
+        if any(type(story) is not Story for story in stories.get("backlog", [])):
+            return False, f"{name}: load_story_view left plain dicts in the backlog"
+        if stories != parse_view(path.read_bytes()):
+            return False, f"{name}: load_story_view from the snapshot differs from parsing the JSON"
+        checked.append(name)
+
+    return True, f"{', '.join(checked) or 'No views'} match their snapshots"
+
+
+def diff_story_columns(fixture: Fixture) -> Tuple[bool, str]:
+    """Columns read from the columnar file, and the reports built on them, match the JSON stories."""
+    # Values whose JSON text collides (None/"null", 3/"3") keep their own dictionary codes
+    mixed = [{"id": "S-1", "owner": None, "priority": 3}, {"id": "S-2", "owner": "null", "priority": "3"}]
+    decoded = StoryColumns(encode_story_columns({"backlog": mixed}, (0, 0)))
+    for name in ("owner", "priority"):
+        if decoded.values(name) != [story[name] for story in mixed]:
+            return False, f"Column {name} merges values that only differ in type"
+
+    path = fixture.base_path / "backlog" / "PRIORITIZATION.json"
+    if not path.exists():
+        return True, "No PRIORITIZATION.json; skipped"
+    columns = open_story_columns(path)
+    stories = fixture.stories
+    if len(columns) != len(stories):
+        return False, f"{len(columns)} rows in the columnar file, {len(stories)} stories in the view"
+
+    for name in COLUMN_FIELDS + list(DERIVED_FIELDS):
+        if columns.values(name) != [column_value(story, name) for story in stories]:
+            return False, f"Column {name} differs from the stories"
+        if columns.specs[name]["kind"] != "list":
+            reference = Counter(column_value(story, name) if name in DERIVED_FIELDS else story.get(name)
+                                for story in stories)
+            if columns.count_by(name) != dict(reference):
+                return False, f"count_by({name}) differs from a direct count"
+
+    for fields in (ANALYTICS_FIELDS, DASHBOARD_FIELDS):
+        expected = [{field: column_value(story, field) for field in fields
+                     if column_value(story, field) is not MISSING} for story in stories]
+        if columns.project(fields) != expected:
+            return False, f"project({fields}) differs from the stories"
+
+    # The reports built from projected columns equal the same reports built from whole stories
+    with contextlib.redirect_stdout(io.StringIO()):
+        analytics = PerformanceAnalytics(str(fixture.base_path))
+        reference = copy.copy(analytics)
+        # Whole stories, with the points the analytics would otherwise parse from the estimate
+        reference.data = {**fixture.prioritization,
+                          "backlog": [{**story, "points": column_value(story, "points")} for story in stories]}
+        for method in ("generate_velocity_analytics", "generate_resource_optimization",
+                       "generate_risk_analysis", "generate_burndown_analysis"):
+            optimized, expected = getattr(analytics, method)(), getattr(reference, method)()
+            # Only the generation timestamps may differ
+            optimized.pop("generated_at", None)
+            expected.pop("generated_at", None)
+            if optimized != expected:
+                return False, f"PerformanceAnalytics.{method} differs on whole stories"
+        dashboard = copy.copy(fixture.dashboard)
+        dashboard.prioritization_data = fixture.prioritization
+        optimized, expected = fixture.dashboard.analyze_real_data(), dashboard.analyze_real_data()
+    for analysis in (optimized, expected):
+        analysis.get("velocity", {}).pop("generated_at", None)
+    if json.dumps(optimized, sort_keys=True, default=str) != json.dumps(expected, sort_keys=True, default=str):
+        return False, "Dashboard analysis differs on whole stories"
+
+    return True, (f"{len(COLUMN_FIELDS) + len(DERIVED_FIELDS)} columns, counts and projections match; "
+                  "analytics and dashboard agree")
+
+
+def diff_story_model(fixture: Fixture) -> Tuple[bool, str]:
+    """Slotted Stories read, write and serialize exactly like the dicts they were built from."""
+    stories = fixture.stories
+    slotted = stories_from(stories)
+    for story, entry in zip(slotted, stories):
+        if story.to_dict() != entry or list(story) != list(entry):
+            return False, f"{entry.get('id')}: Story does not round-trip"
+        if any(story.get(key) != entry.get(key) for key in list(entry) + ["missing_key"]):
+            return False, f"{entry.get('id')}: Story.get differs from dict.get"
+        if (story.points != parse_points(entry.get("estimate"))
+                or story.created_on != parse_date(entry.get("created"))):
+            return False, f"{entry.get('id')}: parsed estimate or date differs"
+    if json.dumps(slotted, default=json_default) != json.dumps(stories):
+        return False, "Stories serialize differently from the dicts"
+
+    # Edits through the mapping interface keep key order and parsed fields in step
+    rng = random.Random(f"story:{fixture.name}")
+    for entry in rng.sample(stories, min(len(stories), 200)):
+        story, reference = Story(entry), copy.deepcopy(entry)
+        for target in (story, reference):
+            target["estimate"] = "8sp"
+            target.pop("owner", None)
+            target["extra_field"] = {"nested": [1]}
+            target.setdefault("labels", []).append("edited")
+        if story != reference or list(story) != list(reference) or story.points != 8:
+            return False, f"{entry.get('id')}: edits through the mapping interface differ"
+        if copy.deepcopy(story) != reference:
+            return False, f"{entry.get('id')}: deepcopy of a Story differs"
+
+    # The store holds Stories and writes the views byte for byte as loaded
+    store = BacklogStore(str(fixture.base_path))
+    store.dirty = {"complete": True, "prioritization": True}
+    for path, text in store.prepare_commit():
+        view = store.complete if path == store.complete_file else store.prioritization
+        if text != json.dumps({**view, "backlog": [s.to_dict() for s in view["backlog"]]},
+                              indent=2, ensure_ascii=False):
+            return False, f"{path.name}: store serialization differs from the plain dicts"
+
+    return True, f"{len(stories)} stories round-trip; edits, deepcopy and store serialization match dicts"
+
+
+def _reference_points(estimate: Any) -> Optional[float]:
+    """Unmemoized, spelled-out estimate parsing for diff_estimates."""
+    if isinstance(estimate, bool) or not isinstance(estimate, (int, float, str)):
+        return None
+    if not isinstance(estimate, str):
+        return float(estimate)
+    words = estimate.lower().split()
+    text = " ".join(words)
+    if text in TSHIRT_SIZES:
+        return float(TSHIRT_SIZES[text])
+    number = ""
+    while text and (text[0].isdigit() or (text[0] == "." and number and "." not in number)):
+        number, text = number + text[0], text[1:]
+    if not number or number.endswith("."):
+        return None
+    unit = text.strip()
+    factor = POINT_UNITS.get(unit, DURATION_UNITS.get(unit))
+    return None if factor is None else round(float(number) * factor, 2)
+
+
+def diff_estimates(fixture: Fixture) -> Tuple[bool, str]:
+    """The memoized estimate normalizer agrees with a plain parser on known and generated spellings."""
+    known = {"3sp": 3, "3": 3, 3: 3, "5 story points": 5, " 8 SP ": 8, "2 pts": 2, "M": 5,
+             "large": 8, "XL": 13, "2 days": 2, "1 week": 5, "4h": 0.5, "0.5 days": 0.5,
+             "TBD": None, "": None, None: None, True: None, "2-3 days": None, "soon": None}
+    for estimate, expected in known.items():
+        if parse_points(estimate) != expected:
+            return False, f"parse_points({estimate!r}) is {parse_points(estimate)!r}, expected {expected!r}"
+
+    rng = random.Random(f"estimates:{fixture.name}")
+    units = list(POINT_UNITS) + list(DURATION_UNITS)
+    spellings = [story.get("estimate") for story in fixture.stories]
+    for _ in range(500):
+        number = rng.choice([str(rng.randint(0, 40)), f"{rng.randint(0, 9)}.{rng.randint(0, 99)}"])
+        unit = rng.choice(units)
+        spelling = number + rng.choice(["", " ", "  "]) + rng.choice([unit, unit.upper(), unit.title()])
+        spellings.append(spelling if rng.random() < 0.8 else rng.choice(list(TSHIRT_SIZES)).upper())
+
+    for estimate in spellings:
+        # Twice, so the second call is answered from the memo
+        for _ in range(2):
+            points, reference = parse_points(estimate), _reference_points(estimate)
+            if (points is None) != (reference is None) or (points is not None and points != reference):
+                return False, f"parse_points({estimate!r}) is {points!r}, reference {reference!r}"
+        if type(parse_points(estimate)) not in (int, float, type(None)):
+            return False, f"parse_points({estimate!r}) is not a number"
+        bucket = "unknown" if reference is None else (
+            "small" if reference <= 2 else "medium" if reference <= 5 else "large")
+        if size_bucket(estimate) != bucket:
+            return False, f"size_bucket({estimate!r}) is {size_bucket(estimate)}, expected {bucket}"
+        canonical = canonical_estimate(estimate)
+        if canonical is not None and parse_points(canonical) != parse_points(estimate):
+            return False, f"canonical_estimate({estimate!r}) = {canonical!r} changes the points"
+    if any(type(key) is not str for key in _POINTS):
+        return False, "The estimate memo holds non-string keys"
+
+    if find_estimate("Estimate: 3 days of work") != "3 days" or find_estimate("estimate: 3 developers"):
+        return False, "find_estimate misreads a story body"
+
+    return True, f"{len(spellings)} estimate spellings ({len(set(map(str, spellings)))} distinct) match the reference"
+
+
+def diff_story_dates(fixture: Fixture) -> Tuple[bool, str]:
+    """Age histograms and date ranges from the sorted day index match per-story date arithmetic."""
+    stories = [dict(story) for story in fixture.stories]
+    # Mix in the forms stories arrive in: timestamps, frontmatter dates and junk
+    rng = random.Random(f"dates:{fixture.name}")
+    for story in rng.sample(stories, min(len(stories), 300)):
+        value = story.get("created")
+        parsed = date.fromisoformat(value[:10]) if isinstance(value, str) and value[:10].count("-") == 2 else None
+        if parsed is not None:
+            story["created"] = rng.choice([parsed, datetime(parsed.year, parsed.month, parsed.day, 13, 5),
+                                           f"{parsed.isoformat()}T08:30:00Z", "not a date", ""])
+
+    def reference_date(value):
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        try:
+            return datetime.fromisoformat(str(value)[:10]).date()
+        except ValueError:
+            return None
+
+    dated = [(reference_date(story.get("created")), story.get("id") or "") for story in stories]
+    dated = [(day, story_id) for day, story_id in dated if day is not None]
+    index = DayIndex(stories, "created")
+    if len(index) != len(dated) or any(day_date(day) != reference_date(value) for day, value in
+                                       ((day_number(s.get("created")), s.get("created")) for s in stories)
+                                       if day is not None):
+        return False, "day_number disagrees with date parsing"
+
+    known = [day for day, _ in dated] or [date(2025, 1, 1)]
+    for today in rng.sample(known, min(len(known), 20)) + [date.today()]:
+        expected = {name: 0 for name, _ in AGE_BUCKETS}
+        expected["stale"] = 0
+        for day, _ in dated:
+            age = (today - day).days
+            bucket = next((name for name, max_age in AGE_BUCKETS if age <= max_age), "stale")
+            expected[bucket] += 1
+        if index.age_histogram(day_number(today)) != expected:
+            return False, f"Age histogram for {today} differs from per-story ages"
+
+        low, high = sorted(rng.sample(known, 2)) if len(known) > 1 else (known[0], known[0])
+        between = sorted(story_id for day, story_id in dated if low <= day <= high)
+        if sorted(index.between(day_number(low), day_number(high))) != between:
+            return False, f"Stories between {low} and {high} differ from a linear filter"
+        if index.count(low=day_number(low)) != sum(1 for day, _ in dated if day >= low):
+            return False, f"Count since {low} differs from a linear filter"
+
+    if iso_date(date(2025, 8, 28)) != "2025-08-28" or iso_date("2025-08-28T10:00") != "2025-08-28T10:00":
+        return False, "iso_date does not normalize frontmatter dates"
+
+    return True, f"{len(dated)} dated stories; age buckets and ranges match per-story parsing"
+
+
+def _reference_strategic_priority(story: Dict[str, Any], index: int, total: int) -> int:
+    """assign_priorities.calculate_story_priority as it was before the weights moved to YAML."""
+    epic_weight = {"core": 1, "modeling": 2, "data_sources": 3, "infrastructure": 4, "ingestion": 5,
+                   "infra": 6, "ui": 7, "training": 8, "social_media": 9, "llm_backlog": 10,
+                   "adhoc": 11, "unknown": 12}.get(story.get("epic"), 10)
+    status_modifier = {"ready": 0, "backlog": 1, "blocked": 5, "accepted": 10}.get(story.get("status"), 2)
+    position_factor = (index / total) * 2
+    title = str(story.get("title") or "").lower()
+    title_boost = 0
+    if any(keyword in title for keyword in ["critical", "urgent", "blocker", "foundation", "core"]):
+        title_boost = -3
+    elif any(keyword in title for keyword in ["setup", "config", "install"]):
+        title_boost = -1
+    elif any(keyword in title for keyword in ["nice-to-have", "future", "maybe"]):
+        title_boost = 3
+    return max(1, int(epic_weight + status_modifier + position_factor + title_boost))
+
+
+def _reference_ready_score(story: Dict[str, Any]) -> int:
+    """manage_priorities' auto-prioritize calculate_score as it was before the weights moved to YAML."""
+    score = {"core": 10, "modeling": 8, "ingestion": 7, "ui": 6, "quality": 5,
+             "infrastructure": 4, "adhoc": 1}.get(story.get("epic", ""), 3)
+    if not story.get("dependencies", []):
+        score += 2
+    if story.get("owner"):
+        score += 1
+    return score
+
+
+def diff_priority_engine(fixture: Fixture) -> Tuple[bool, str]:
+    """Batch scores from the priority engine equal the per-story scorers they replaced."""
+    stories = fixture.stories
+    weights = PriorityWeights.load()
+    features = StoryFeatures(stories)
+    strategic, ready_queue = weights.model("strategic"), weights.model("ready_queue")
+
+    batch = score_models([strategic, ready_queue], features)
+    expected = [_reference_strategic_priority(story, i, len(stories)) for i, story in enumerate(stories)]
+    if batch[0] != expected:
+        return False, "Strategic priorities differ from assign_priorities' per-story formula"
+    sample = random.Random(f"priority:{fixture.name}").sample(range(len(stories)), min(len(stories), 200))
+    if any(strategic.score_story(stories[i], i, len(stories)) != expected[i] for i in sample):
+        return False, "ScoringModel.score_story differs from the per-story formula"
+    if batch[1] != [_reference_ready_score(story) for story in stories]:
+        return False, "ready_queue scores differ from manage_priorities' calculate_score"
+    reference_order = sorted(range(len(stories)), key=lambda i: _reference_ready_score(stories[i]), reverse=True)
+    if ranking(batch[1], ready_queue.order) != reference_order:
+        return False, "ready_queue ranking differs from sorting by score with reverse=True"
+
+    # Scenarios scored in one batch match scoring each alone, and rank diffs match a direct count
+    scenarios = list(weights.scenarios.values())
+    together = score_models([strategic] + scenarios, features)
+    base_order = ranking(together[0], strategic.order)
+    for model, scores in zip(scenarios, together[1:]):
+        if scores != score_models([model], features)[0]:
+            return False, f"Scenario {model.name} scores differently in a batch"
+        if scores != [model.score_story(story, i, len(stories)) for i, story in enumerate(stories)]:
+            return False, f"Scenario {model.name} batch scores differ from score_story"
+        order = ranking(scores, model.order)
+        before = {i: rank for rank, i in enumerate(base_order)}
+        after = {i: rank for rank, i in enumerate(order)}
+        if rank_changes(features.ids, base_order, order)["moved"] != sum(before[i] != after[i] for i in before):
+            return False, f"Scenario {model.name}: rank_changes miscounts moved stories"
+
+    # score_models takes the NumPy matrix path whenever NumPy is installed
+    numpy = numpy_module()
+    if numpy is not None:
+        models = [strategic, ready_queue] + scenarios
+        for model, scores in zip(models, _score_matrix(models, features, numpy)):
+            if scores != _score_columns(model, features):
+                return False, f"{model.name}: NumPy matrix scores differ from the pure-Python columns"
+        matrix_note = "NumPy matrix matches the pure-Python columns"
+    else:
+        matrix_note = "NumPy not installed, matrix path not checked"
+
+    if (weights.grooming["max_priority"], weights.grooming["count"]) != (20, 20) or \
+            set(weights.grooming["statuses"]) != {"backlog", "draft", "ready", "active", "blocked"}:
+        return False, "Grooming thresholds differ from the groomer's former constants"
+
+    return True, (f"{len(stories)} stories: 2 models and {len(scenarios)} scenarios match per-story scoring; "
+                  f"{matrix_note}")
+
+
+# (name, check) pairs; each compares an optimized path with its reference implementation
+DIFFERENTIAL_CHECKS: List[Tuple[str, Callable[[Fixture], Tuple[bool, str]]]] = [
+    ("Query Plans vs Scan", diff_query_plans),
+    ("Index Select vs Filter", diff_index_select),
+    ("Dashboard Rollups vs Direct Sums", diff_dashboard_rollups),
+    ("Columnar Chunks Round-Trip", diff_columnar_chunks),
+    ("View Snapshots vs JSON", diff_view_snapshots),
+    ("Story Columns vs JSON", diff_story_columns),
+    ("Story Model vs Dicts", diff_story_model),
+    ("Estimate Normalizer vs Reference", diff_estimates),
+    ("Date Index vs Per-Story Dates", diff_story_dates),
+    ("Priority Engine vs Per-Story Scores", diff_priority_engine),
+]
+
+TEST_GROUPS: Dict[str, List[Tuple[str, Callable[[Fixture], Tuple[bool, str]]]]] = {
+    "data": [("Data Files", test_data_files)],
+    "reports": [("Report Generation", test_report_generation), ("Output Validation", test_output_validation)],
+    "dashboard": [("Dashboard Generation", test_dashboard_generation), ("Dashboard Data", test_dashboard_data)],
+    "scripts": [("Script Execution", test_script_execution), ("Git Collector Windows", test_git_collector_windows),
+                ("Backlog Sync No-Op", test_backlog_sync_noop), ("Store Reload Changed", test_store_reload_changed),
+                ("DORA Pruned Store", test_dora_pruned_store)],
+    "differential": DIFFERENTIAL_CHECKS,
+}
+
+
+def run_group(group: str, fixture_name: str) -> List[Dict[str, Any]]:
+    """Run one test group against one shared fixture (in a worker or in-process)."""
+    fixture = _FIXTURES[fixture_name]
+    results = []
+    for test_name, test_func in TEST_GROUPS[group]:
+        started = time.perf_counter()
+        try:
+            passed, message = test_func(fixture)
+            result = {"passed": passed, "message": message}
+        except Exception as e:
+            result = {"passed": False, "message": f"Test execution error: {str(e)}",
+                      "error": traceback.format_exc()}
+        result.update({"name": test_name, "group": group, "fixture": fixture_name,
+                       "seconds": round(time.perf_counter() - started, 4),
+                       "timestamp": datetime.now().isoformat()})
+        results.append(result)
+
+    if fixture.compute_fingerprint() != fixture.fingerprint:
+        results.append({"name": "Fixture Unchanged", "group": group, "fixture": fixture_name, "passed": False,
+                        "message": f"Tests in group '{group}' modified the shared fixture", "seconds": 0.0,
+                        "timestamp": datetime.now().isoformat()})
+    return results
+
+
+def run_comprehensive_test(fixtures: Optional[Dict[str, Fixture]] = None, groups: Optional[List[str]] = None,
+                           jobs: int = 1) -> Dict[str, Any]:
+    """Run all test groups on all fixtures and return results."""
+    if fixtures is not None:
+        _FIXTURES.clear()
+        _FIXTURES.update(fixtures)
+    groups = groups or [group for group in TEST_GROUPS if group != "differential"]
+    tasks = [(group, name) for name in _FIXTURES for group in groups]
+
     results = {
         "timestamp": datetime.now().isoformat(),
+        "fixtures": {name: {"path": str(fixture.base_path), "stories": len(fixture.stories)}
+                     for name, fixture in _FIXTURES.items()},
         "tests": [],
         "summary": {
-            "total": len(tests),
+            "total": 0,
             "passed": 0,
             "failed": 0
         }
     }
-    
+
     print("🧪 Running AI Sports Analytics Reporting System Tests\n")
-    
-    for test_name, test_func in tests:
-        print(f"🔍 Testing: {test_name}...")
-        
-        try:
-            passed, message = test_func()
-            status = "✅ PASS" if passed else "❌ FAIL"
-            
-            test_result = {
-                "name": test_name,
-                "passed": passed,
-                "message": message,
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            results["tests"].append(test_result)
-            
-            if passed:
-                results["summary"]["passed"] += 1
-                print(f"   {status}: {message}")
-            else:
-                results["summary"]["failed"] += 1
-                print(f"   {status}: {message}")
-                
-        except Exception as e:
-            test_result = {
-                "name": test_name,
-                "passed": False,
-                "message": f"Test execution error: {str(e)}",
-                "error": traceback.format_exc(),
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            results["tests"].append(test_result)
-            results["summary"]["failed"] += 1
-            print(f"   ❌ FAIL: {str(e)}")
-        
-        print()
-    
+    started = time.perf_counter()
+
+    # Forked workers inherit the loaded fixtures; elsewhere run in-process
+    use_pool = jobs > 1 and len(tasks) > 1 and "fork" in multiprocessing.get_all_start_methods()
+    if use_pool:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)),
+                                 mp_context=multiprocessing.get_context("fork")) as pool:
+            outcomes = list(pool.map(run_group, *zip(*tasks)))
+    else:
+        outcomes = [run_group(group, name) for group, name in tasks]
+
+    for test_result in (result for outcome in outcomes for result in outcome):
+        results["tests"].append(test_result)
+        status = "✅ PASS" if test_result["passed"] else "❌ FAIL"
+        results["summary"]["passed" if test_result["passed"] else "failed"] += 1
+        print(f"🔍 {test_result['name']} [{test_result['fixture']}] ({test_result['seconds']:.2f}s)")
+        print(f"   {status}: {test_result['message']}")
+    results["summary"]["total"] = len(results["tests"])
+    results["seconds"] = round(time.perf_counter() - started, 3)
+
     # Print summary
     total = results["summary"]["total"]
     passed = results["summary"]["passed"]
     failed = results["summary"]["failed"]
-    
-    print("📊 Test Summary:")
+
+    print("\n📊 Test Summary:")
     print(f"   Total Tests: {total}")
     print(f"   Passed: {passed}")
     print(f"   Failed: {failed}")
-    print(f"   Success Rate: {(passed/total)*100:.1f}%")
-    
+    print(f"   Success Rate: {(passed/total)*100 if total else 0:.1f}%")
+    print(f"   Time: {results['seconds']:.2f}s ({'parallel, ' + str(min(jobs, len(tasks))) + ' workers' if use_pool else 'serial'})")
+
     if failed == 0:
         print("\n🎉 All tests passed! Reporting system is ready for deployment.")
     else:
         print(f"\n⚠️  {failed} test(s) failed. Please review and fix issues before deployment.")
-    
+
     return results
 
+
 def main():
     """Main test execution."""
     import argparse
-    
-    parser = argparse.ArgumentParser(description="Test AI Sports Analytics Reporting System")
+
+    parser = argparse.ArgumentParser(
+        description="Test AI Sports Analytics Reporting System",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Repository backlog plus a 10k-story synthetic backlog, groups in parallel
+  python scripts/test_reporting_system.py
+
+  # Also compare optimized aggregation paths with the reference code, at 100k
+  python scripts/test_reporting_system.py --differential --scale 100k
+
+  # Only the repository backlog, one process
+  python scripts/test_reporting_system.py --no-synthetic --jobs 1
+        """
+    )
     parser.add_argument("--save-results", action="store_true", help="Save test results to file")
     parser.add_argument("--exit-on-failure", action="store_true", help="Exit with error code if tests fail")
-    
+    parser.add_argument("--differential", action="store_true",
+                        help="Also check optimized aggregation paths against reference implementations")
+    parser.add_argument("--groups", type=str,
+                        help=f"Comma-separated test groups (default: all; available: {', '.join(TEST_GROUPS)})")
+    parser.add_argument("--scale", type=parse_scale, default=SCALES["10k"],
+                        help="Stories in the synthetic fixture: 10k, 100k, 1M or a count (default: 10k)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Synthetic fixture seed (default: {DEFAULT_SEED})")
+    parser.add_argument("--no-synthetic", action="store_true", help="Only test the repository backlog")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count; 1 runs in-process)")
+
     args = parser.parse_args()
-    
+
+    groups = [group for group in TEST_GROUPS if group != "differential"]
+    if args.groups:
+        groups = [group.strip() for group in args.groups.split(",") if group.strip()]
+        unknown = [group for group in groups if group not in TEST_GROUPS]
+        if unknown:
+            print(f"❌ Unknown test groups: {', '.join(unknown)}")
+            sys.exit(1)
+    if args.differential and "differential" not in groups:
+        groups.append("differential")
+
+    # Build fixtures once, before any worker starts
+    fixtures: Dict[str, Fixture] = {}
+    if (Path("backlog") / "PRIORITIZATION.json").exists():
+        fixtures["repo"] = Fixture("repo", Path("."))
+    if not args.no_synthetic:
+        started = time.perf_counter()
+        path = synthetic_fixture_path(args.scale, args.seed)
+        fixtures[f"synthetic-{scale_label(args.scale)}"] = Fixture(f"synthetic-{scale_label(args.scale)}", path)
+        print(f"📦 Synthetic fixture: {args.scale:,} stories loaded in {time.perf_counter() - started:.2f}s")
+    if not fixtures:
+        print("❌ No backlog/PRIORITIZATION.json here and --no-synthetic given; nothing to test")
+        sys.exit(1)
+
     # Run tests
-    results = run_comprehensive_test()
-    
+    results = run_comprehensive_test(fixtures, groups, args.jobs)
+
     # Save results if requested
     if args.save_results:
         results_file = Path("reports") / f"test_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         results_file.parent.mkdir(exist_ok=True)
-        
+
         with open(results_file, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
-        
+
         print(f"\n💾 Test results saved to: {results_file}")
-    
+
     # Exit with appropriate code
     if args.exit_on_failure and results["summary"]["failed"] > 0:
         sys.exit(1)
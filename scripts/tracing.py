@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Phase Tracing
+
+Lightweight nested spans for finding where a script spends its time (load,
+parse, aggregate, serialize, write). Entry points add ``--trace FILE`` with
+``add_trace_argument`` and call ``start_from_args`` after parsing; on exit
+the spans are written as Chrome trace JSON (open in ui.perfetto.dev or
+chrome://tracing) and summarized per phase on stderr.
+
+Span names are ``<phase>.<detail>`` (``load.prioritization``,
+``parse.story``, ``serialize.report``); the summary rolls them up by phase.
+
+Spans are cheap no-ops until tracing starts, so instrumented code can stay
+in place: ``span()`` returns a shared null context manager and ``traced``
+functions call straight through.
+
+Usage:
+    from tracing import span, traced
+
+    with span("load", file="PRIORITIZATION.json"):
+        data = json.load(f)
+
+    @traced("report.velocity")
+    def generate_velocity_report(self): ...
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+_tracer: Optional["Tracer"] = None
+
+
+class Span:
+    __slots__ = ("tracer", "name", "args", "start", "children")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.children = 0
+
+    def __enter__(self):
+        self.tracer._stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        stack = self.tracer._stack()
+        stack.pop()
+        duration = end - self.start
+        if stack:
+            stack[-1].children += duration
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self, duration)
+        return False
+
+    def set(self, **args):
+        """Attach values known only inside the span (row counts, sizes)."""
+        self.args.update(args)
+
+
+class Tracer:
+    def __init__(self, process_name: str = "backlog"):
+        self.process_name = process_name
+        self.origin = time.perf_counter_ns()
+        self.started_wall = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self.totals: Dict[str, List[int]] = {}  # name -> [calls, total ns, self ns]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, span: Span, duration: int):
+        event = {"name": span.name, "cat": span.name.split(".", 1)[0], "ph": "X",
+                 "ts": (span.start - self.origin) / 1000, "dur": duration / 1000,
+                 "pid": os.getpid(), "tid": threading.get_ident()}
+        if span.args:
+            event["args"] = {key: value if isinstance(value, (int, float, bool)) else str(value)
+                             for key, value in span.args.items()}
+        with self._lock:
+            self.events.append(event)
+            totals = self.totals.setdefault(span.name, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += duration
+            totals[2] += duration - span.children
+
+    def span(self, name: str, **args) -> Span:
+        return Span(self, name, args)
+
+    def elapsed_ns(self) -> int:
+        return time.perf_counter_ns() - self.origin
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.process_name}}]
+        threads = {event["tid"] for event in self.events}
+        metadata += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                      "args": {"name": "main" if tid == threading.main_thread().ident else f"thread-{tid}"}}
+                     for tid in sorted(threads)]
+        return {"traceEvents": metadata + sorted(self.events, key=lambda e: e["ts"]),
+                "displayTimeUnit": "ms",
+                "otherData": {"script": self.process_name, "started": self.started_wall,
+                              "wall_ms": round(self.elapsed_ns() / 1e6, 3)}}
+
+    def write(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, separators=(",", ":"))
+        return path
+
+    def phase_totals(self) -> Dict[str, List[int]]:
+        """Span totals rolled up by phase, the part of the name before the first dot."""
+        phases: Dict[str, List[int]] = {}
+        for name, (calls, _, own) in self.totals.items():
+            totals = phases.setdefault(name.split(".", 1)[0], [0, 0])
+            totals[0] += calls
+            totals[1] += own
+        return phases
+
+    def summary(self, limit: int = 25) -> str:
+        """Tables of self time per phase and per span, with share of wall time."""
+        wall = max(self.elapsed_ns(), 1)
+        if not self.totals:
+            return "No spans recorded"
+        spans = sorted(self.totals.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        phases = sorted(self.phase_totals().items(), key=lambda item: item[1][1], reverse=True)
+        width = max(len("(untraced)"), max(len(name) for name, _ in spans))
+
+        lines = [f"{'Phase':<{width}}  {'Calls':>7}  {'Self ms':>10}  {'Wall %':>6}",
+                 f"{'-' * width}  {'-' * 7}  {'-' * 10}  {'-' * 6}"]
+        for name, (calls, own) in phases:
+            lines.append(f"{name:<{width}}  {calls:>7,}  {own / 1e6:>10.2f}  {100 * own / wall:>5.1f}%")
+        untraced = wall - sum(own for _, (_, own) in phases)
+        lines.append(f"{'(untraced)':<{width}}  {'':>7}  {untraced / 1e6:>10.2f}  {100 * untraced / wall:>5.1f}%")
+        lines.append(f"{'wall':<{width}}  {'':>7}  {wall / 1e6:>10.2f}")
+
+        lines += ["", f"{'Span':<{width}}  {'Calls':>7}  {'Total ms':>10}  {'Self ms':>10}",
+                  f"{'-' * width}  {'-' * 7}  {'-' * 10}  {'-' * 10}"]
+        for name, (calls, total, own) in spans:
+            lines.append(f"{name:<{width}}  {calls:>7,}  {total / 1e6:>10.2f}  {own / 1e6:>10.2f}")
+        return "\n".join(lines)
+
+
+def span(name: str, **args):
+    """Context manager for a named phase; free when tracing is off."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, **args)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of ``span``; the check happens per call, not at import."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def active() -> bool:
+    return _tracer is not None
+
+
+def start(path: str, process_name: Optional[str] = None) -> Tracer:
+    """Start recording; the trace and summary are written when the process exits."""
+    global _tracer
+    _tracer = Tracer(process_name or Path(sys.argv[0]).stem)
+    atexit.register(finish, path)
+    return _tracer
+
+
+def finish(path: str):
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is None:
+        return
+    tracer.write(Path(path))
+    print(f"\n⏱️  Trace written to {path} ({len(tracer.events):,} spans)", file=sys.stderr)
+    print(tracer.summary(), file=sys.stderr)
+
+
+def add_trace_argument(parser):
+    parser.add_argument("--trace", type=str, metavar="FILE",
+                        help="Write a Chrome/Perfetto trace of the run's phases to FILE")
+
+
+def start_from_args(args, process_name: Optional[str] = None):
+    if getattr(args, "trace", None):
+        start(args.trace, process_name)
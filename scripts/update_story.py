@@ -22,15 +22,18 @@ import argparse
 from datetime import datetime
 from pathlib import Path
 
+from metrics import job
+
 def load_backlog():
     """Load the backlog JSON file."""
     json_file = Path("backlog/PRIORITIZATION.json")
     if not json_file.exists():
         print(f"❌ JSON file not found: {json_file}")
         return None
-        
-    with open(json_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+
+    # backlog_store loads story_model and hashlib; --help does not need them
+    from backlog_store import load_view
+    return load_view(json_file)
 
 def save_backlog(data):
     """Save the backlog JSON file."""
@@ -131,7 +134,8 @@ def list_stories(show_all=False):
     if not show_all and len(data["backlog"]) > 10:
         print(f"... and {len(data['backlog']) - 10} more stories. Use --all to see everything.")
 
-if __name__ == "__main__":
+@job("update_story")
+def main():
     parser = argparse.ArgumentParser(
         description="Update story status and branch info for Neo Starlord of Thunder"
     )
@@ -149,3 +153,6 @@ if __name__ == "__main__":
         list_stories(show_all=args.all)
     else:
         update_story(args.story_id, args.status, args.branch, args.owner)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Columnar Encoding for work_review.json
+
+Encodes the day x repo records of work_review.json as a compact binary file
+that the dashboard decodes straight into typed arrays:
+
+    b"WRC1" | uint32 header length | JSON header | column buffers
+
+The header holds the repo/date/string dictionaries and a column index. Every
+leaf of a repo record becomes one column; hour histograms such as
+``commits.commit_time_distribution`` become fixed-width integer columns (with
+a key mask when buckets are sparse), lists (authors, links, active hours)
+become offset + value columns, and empty dicts are kept as presence-only
+columns. Columns use the smallest little-endian type that fits their values,
+so the payload is far smaller than the nested JSON and needs no deep JSON
+parse to read. A column whose values mix types or shapes stores each value as
+interned JSON text, so any JSON document round-trips.
+
+Present flags are 0 (absent), 1 (value) or 2 (null, for list/hist/records/
+object columns); scalar columns mark nulls with a sentinel instead.
+"""
+
+import json
+import argparse
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from metrics import job
+
+MAGIC = b"WRC1"
+FORMAT_VERSION = 2
+ALIGNMENT = 8
+HISTOGRAM_MAX_WIDTH = 256
+MAX_SAFE_INTEGER = 2 ** 53
+
+# Column type -> (array typecode, item size, null sentinel)
+UINT32_CODE = "I" if array("I").itemsize == 4 else "L"
+COLUMN_TYPES = {
+    "u8": ("B", 1, 0xFF),
+    "u16": ("H", 2, 0xFFFF),
+    "u32": (UINT32_CODE, 4, 0xFFFFFFFF),
+    "i32": ("i", 4, -0x80000000),
+    "f64": ("d", 8, None),  # NaN marks null
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_histogram(value: Dict[str, Any]) -> bool:
+    """Small dicts keyed by canonical bucket numbers ("0", "7", "23") with numeric counts."""
+    return bool(value) and all(
+        isinstance(k, str) and k.isdigit() and str(int(k)) == k and int(k) < HISTOGRAM_MAX_WIDTH
+        and (v is None or _is_number(v))
+        for k, v in value.items()
+    )
+
+
+class _Column:
+    """Collects the values of one leaf path while rows are scanned."""
+
+    def __init__(self, path: Tuple[str, ...]):
+        self.path = path
+        # (row, kind, value) for every row that has this path; kind is None for nulls
+        self.entries: List[Tuple[int, Optional[str], Any]] = []
+
+    def resolve_kind(self) -> str:
+        """Pick the column kind from every value, not just the first one seen."""
+        kinds = {kind for _, kind, _ in self.entries if kind is not None}
+        if kinds == {"list", "records"}:
+            # Empty lists fit a records column; lists of scalars do not
+            if not any(kind == "list" and value for _, kind, value in self.entries):
+                return "records"
+            return "list"
+        if len(kinds) == 1:
+            return kinds.pop()
+        # All null, or a mix of shapes: store each value whole
+        return "scalar"
+
+
+class ColumnarEncoder:
+    """Builds the columnar binary encoding for a list of day records."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        self.columns: Dict[Tuple[str, ...], _Column] = {}
+        self.dates: List[str] = []
+        self.repos: List[str] = []
+        self._repo_index: Dict[str, int] = {}
+        self.row_dates: List[int] = []
+        self.row_repos: List[int] = []
+        self.rows = 0
+
+    def _intern(self, value: str) -> int:
+        index = self._string_index.get(value)
+        if index is None:
+            index = len(self.strings)
+            self._string_index[value] = index
+            self.strings.append(value)
+        return index
+
+    def _flatten(self, record: Dict[str, Any], prefix: Tuple[str, ...] = ()):
+        for key, value in record.items():
+            path = prefix + (key,)
+            if isinstance(value, dict):
+                if not value:
+                    yield path, "object", value
+                elif _is_histogram(value):
+                    yield path, "hist", value
+                else:
+                    yield from self._flatten(value, path)
+            elif isinstance(value, list):
+                kind = "records" if value and all(isinstance(v, dict) for v in value) else "list"
+                yield path, kind, value
+            elif value is None:
+                yield path, None, None
+            else:
+                yield path, "scalar", value
+
+    def add_day(self, date: str):
+        if not self.dates or self.dates[-1] != date:
+            self.dates.append(date)
+        return self
+
+    def add_row(self, date: str, repo: Dict[str, Any]):
+        self.add_day(date)
+        if repo["name"] not in self._repo_index:
+            self._repo_index[repo["name"]] = len(self.repos)
+            self.repos.append(repo["name"])
+        self.row_dates.append(len(self.dates) - 1)
+        self.row_repos.append(self._repo_index[repo["name"]])
+
+        for path, kind, value in self._flatten({k: v for k, v in repo.items() if k != "name"}):
+            column = self.columns.get(path)
+            if column is None:
+                column = self.columns[path] = _Column(path)
+            column.entries.append((self.rows, kind, value))
+
+        self.rows += 1
+        return self
+
+    def _encode_scalars(self, values: List[Any]) -> Tuple[str, Dict[str, Any], array]:
+        """Pick the smallest type for a list of scalars and pack it."""
+        present = [v for v in values if v is not None]
+        extra: Dict[str, Any] = {}
+
+        if present and all(isinstance(v, str) for v in present):
+            extra["encoding"] = "string"
+            values = [None if v is None else self._intern(v) for v in values]
+        elif present and all(isinstance(v, bool) for v in present):
+            extra["encoding"] = "bool"
+            values = [None if v is None else int(v) for v in values]
+        elif not all(_is_number(v) and (isinstance(v, float) or -MAX_SAFE_INTEGER <= v <= MAX_SAFE_INTEGER)
+                     for v in present):
+            # Mixed types, containers or integers a float64 cannot hold: keep the JSON text
+            extra["encoding"] = "json"
+            values = [None if v is None else
+                      self._intern(json.dumps(v, separators=(",", ":"), ensure_ascii=False))
+                      for v in values]
+        present = [v for v in values if v is not None]
+
+        if any(isinstance(v, float) for v in present):
+            typecode = "f64"
+            packed = array("d", [float("nan") if v is None else float(v) for v in values])
+            return typecode, extra, packed
+
+        low = min(present, default=0)
+        high = max(present, default=0)
+        if low < 0:
+            typecode = "i32" if -0x80000000 < low and high <= 0x7FFFFFFF else "f64"
+        elif high < 0xFF:
+            typecode = "u8"
+        elif high < 0xFFFF:
+            typecode = "u16"
+        elif high < 0xFFFFFFFF:
+            typecode = "u32"
+        else:
+            typecode = "f64"
+
+        code, _, sentinel = COLUMN_TYPES[typecode]
+        if typecode == "f64":
+            packed = array("d", [float("nan") if v is None else float(v) for v in values])
+        else:
+            packed = array(code, [sentinel if v is None else v for v in values])
+        return typecode, extra, packed
+
+    def encode(self, metadata: Optional[Dict[str, Any]] = None,
+               aggregates: Optional[Dict[str, Any]] = None) -> bytes:
+        buffers: List[array] = []
+        specs: List[Dict[str, Any]] = []
+
+        def add_buffer(packed: array, typecode: str, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+            buffers.append(packed)
+            spec = {"type": typecode, "length": len(packed), "buffer": len(buffers) - 1}
+            if extra:
+                spec.update(extra)
+            return spec
+
+        specs.append({"path": "@date", "kind": "scalar", **add_buffer(*self._key_column(self.row_dates))})
+        specs.append({"path": "@repo", "kind": "scalar", **add_buffer(*self._key_column(self.row_repos))})
+
+        for column in self.columns.values():
+            kind = column.resolve_kind()
+            spec: Dict[str, Any] = {"path": list(column.path), "kind": kind}
+            present = [0] * self.rows
+            values: List[Any] = [None] * self.rows
+            for row, entry_kind, value in column.entries:
+                # Whole-value columns store nulls inline; the others flag them as 2
+                present[row] = 1 if value is not None or kind == "scalar" else 2
+                values[row] = value
+            if any(state != 1 for state in present):
+                spec["present"] = add_buffer(array("B", present), "u8")
+
+            if kind == "scalar":
+                typecode, extra, packed = self._encode_scalars(values)
+                spec.update(add_buffer(packed, typecode, extra))
+            elif kind == "object":
+                pass  # empty dicts: the present flags are the whole column
+            elif kind == "hist":
+                width = max((int(k) + 1 for value in values for k in (value or {})), default=0)
+                spec["width"] = width
+                flat: List[Any] = []
+                mask: List[int] = []
+                for value in values:
+                    row_values: List[Any] = [0] * width
+                    row_mask = [0] * width
+                    for key, count in (value or {}).items():
+                        row_values[int(key)] = count
+                        row_mask[int(key)] = 1
+                    flat.extend(row_values)
+                    if value is not None:
+                        mask.extend(row_mask)
+                    else:
+                        mask.extend([1] * width)
+                if not all(mask):
+                    # Sparse buckets: flag which keys each row actually had
+                    spec["mask"] = add_buffer(array("B", mask), "u8")
+                typecode, extra, packed = self._encode_scalars(flat)
+                spec.update(add_buffer(packed, typecode, extra))
+            else:
+                offsets = [0]
+                for value in values:
+                    offsets.append(offsets[-1] + len(value or []))
+                spec["offsets"] = add_buffer(*self._key_column(offsets))
+                items = [item for value in values for item in (value or [])]
+                if kind == "list":
+                    typecode, extra, packed = self._encode_scalars(items)
+                    spec.update(add_buffer(packed, typecode, extra))
+                else:
+                    fields: List[str] = []
+                    for item in items:
+                        for key in item:
+                            if key not in fields:
+                                fields.append(key)
+                    spec["fields"] = []
+                    for field in fields:
+                        typecode, extra, packed = self._encode_scalars([item.get(field) for item in items])
+                        field_spec = {"name": field, **add_buffer(packed, typecode, extra)}
+                        if not all(field in item for item in items):
+                            field_spec["present"] = add_buffer(
+                                array("B", [int(field in item) for item in items]), "u8")
+                        spec["fields"].append(field_spec)
+            specs.append(spec)
+
+        # Lay buffers out back to back, each aligned for its element size
+        offsets = []
+        position = 0
+        for packed in buffers:
+            position = (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+            offsets.append(position)
+            position += len(packed) * packed.itemsize
+
+        def resolve(spec: Dict[str, Any]):
+            if "buffer" in spec:
+                spec["offset"] = offsets[spec.pop("buffer")]
+            for key in ("present", "offsets", "mask"):
+                if key in spec:
+                    resolve(spec[key])
+            for field in spec.get("fields", []):
+                resolve(field)
+
+        for spec in specs:
+            resolve(spec)
+
+        header = {
+            "format_version": FORMAT_VERSION,
+            "rows": self.rows,
+            "dates": self.dates,
+            "repos": self.repos,
+            "strings": self.strings,
+            "columns": specs,
+            "metadata": metadata or {},
+            "aggregates": aggregates or {},
+        }
+        header_bytes = json.dumps(header, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        header_bytes += b" " * (-(len(MAGIC) + 4 + len(header_bytes)) % ALIGNMENT)
+
+        body = bytearray(position)
+        for packed, offset in zip(buffers, offsets):
+            if sys.byteorder == "big":
+                packed = array(packed.typecode, packed)
+                packed.byteswap()
+            raw = packed.tobytes()
+            body[offset:offset + len(raw)] = raw
+
+        return MAGIC + len(header_bytes).to_bytes(4, "little") + header_bytes + bytes(body)
+
+    def _key_column(self, values: List[int]) -> Tuple[array, str]:
+        high = max(values, default=0)
+        for typecode in ("u8", "u16", "u32"):
+            code, _, sentinel = COLUMN_TYPES[typecode]
+            if high < sentinel:
+                return array(code, values), typecode
+        raise ValueError("Too many rows for a columnar index")
+
+
+def encode_daily(daily: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None,
+                 aggregates: Optional[Dict[str, Any]] = None) -> bytes:
+    """Encode day records (the ``daily`` list of work_review.json)."""
+    encoder = ColumnarEncoder()
+    for day_data in sorted(daily, key=lambda d: d["date"]):
+        encoder.add_day(day_data["date"])
+        for repo in day_data.get("repos", []):
+            encoder.add_row(day_data["date"], repo)
+    return encoder.encode(metadata, aggregates)
+
+
+# Shapes that must survive the encoding besides the usual collector output
+EDGE_CASE_DAILY: List[Dict[str, Any]] = [
+    {"date": "2025-01-01", "repos": [
+        {"name": "edge", "ai_signals": {}, "work_patterns": {"commit_time_distribution": {"0": 1, "5": 2}},
+         "commits": {"authors": None, "count": 3}, "labels": [], "owner": None,
+         "notes": "x", "links": [{"url": "a"}, {"url": "b", "title": "B"}]},
+    ]},
+    {"date": "2025-01-02", "repos": []},
+    {"date": "2025-01-03", "repos": [
+        {"name": "edge", "ai_signals": {"score": 0.5}, "work_patterns": {"commit_time_distribution": {"23": 4}},
+         "commits": {"authors": ["ann", "bo"], "count": 2 ** 60}, "labels": {}, "owner": "3",
+         "notes": 7, "links": [], "a.b": True},
+        {"name": "other", "commits": {"authors": [], "count": -1}, "owner": 3, "notes": [1, "two"]},
+    ]},
+]
+
+
+def round_trips(daily: List[Dict[str, Any]]) -> bool:
+    """True when ``daily`` decodes back to the same records, types included."""
+    decoded = decode_work_review(encode_daily(daily))["daily"]
+    expected = sorted(daily, key=lambda d: d["date"])
+    return json.dumps(decoded, sort_keys=True) == json.dumps(expected, sort_keys=True)
+
+
+def encode_work_review(data: Dict[str, Any]) -> bytes:
+    """Encode a complete work_review.json document."""
+    return encode_daily(data.get("daily", []), data.get("metadata"), data.get("aggregates"))
+
+
+def _read_column(payload: bytes, base: int, spec: Dict[str, Any]) -> array:
+    code, size, _ = COLUMN_TYPES[spec["type"]]
+    values = array(code)
+    start = base + spec["offset"]
+    values.frombytes(payload[start:start + spec["length"] * size])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def decode_work_review(payload: bytes) -> Dict[str, Any]:
+    """Rebuild the work_review.json tree from the columnar encoding."""
+    if payload[:4] != MAGIC:
+        raise ValueError("Not a columnar work_review file")
+    header_length = int.from_bytes(payload[4:8], "little")
+    header = json.loads(payload[8:8 + header_length])
+    if header.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version: {header.get('format_version')}")
+    base = 8 + header_length
+    strings = header["strings"]
+
+    def scalar(spec: Dict[str, Any], value):
+        _, _, sentinel = COLUMN_TYPES[spec["type"]]
+        if value != value or (sentinel is not None and value == sentinel):  # NaN or sentinel
+            return None
+        if spec.get("encoding") == "string":
+            return strings[int(value)]
+        if spec.get("encoding") == "bool":
+            return bool(value)
+        if spec.get("encoding") == "json":
+            return json.loads(strings[int(value)])
+        return value
+
+    columns = header["columns"]
+    dates = _read_column(payload, base, columns[0])
+    repos = _read_column(payload, base, columns[1])
+    rows = [{"name": header["repos"][repos[i]]} for i in range(header["rows"])]
+
+    def read_optional(spec: Dict[str, Any], key: str) -> Optional[array]:
+        return _read_column(payload, base, spec[key]) if key in spec else None
+
+    for spec in columns[2:]:
+        present = read_optional(spec, "present")
+        parts = spec["path"]
+        kind = spec["kind"]
+        values = _read_column(payload, base, spec) if kind not in ("records", "object") else None
+        offsets = read_optional(spec, "offsets")
+        mask = read_optional(spec, "mask")
+        fields = [(field, _read_column(payload, base, field), read_optional(field, "present"))
+                  for field in spec.get("fields", [])]
+
+        for i, row in enumerate(rows):
+            state = present[i] if present is not None else 1
+            if not state:
+                continue
+            if state == 2:
+                value = None
+            elif kind == "scalar":
+                value = scalar(spec, values[i])
+            elif kind == "object":
+                value = {}
+            elif kind == "hist":
+                width = spec["width"]
+                value = {str(h): scalar(spec, values[i * width + h]) for h in range(width)
+                         if mask is None or mask[i * width + h]}
+            elif kind == "list":
+                value = [scalar(spec, values[j]) for j in range(offsets[i], offsets[i + 1])]
+            else:
+                value = [{field["name"]: scalar(field, data[j])
+                          for field, data, field_present in fields
+                          if field_present is None or field_present[j]}
+                         for j in range(offsets[i], offsets[i + 1])]
+
+            target = row
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+
+    daily: List[Dict[str, Any]] = [{"date": date, "repos": []} for date in header["dates"]]
+    for i, row in enumerate(rows):
+        daily[dates[i]]["repos"].append(row)
+
+    return {"metadata": header["metadata"], "daily": daily, "aggregates": header["aggregates"]}
+
+
+@job("work_review_columnar")
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export work_review.json in the compact columnar encoding",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Write docs/work_review.wrc next to docs/work_review.json
+  python scripts/work_review_columnar.py
+
+  # Export another file and check that it decodes back to the same data
+  python scripts/work_review_columnar.py --source work_review.json --output /tmp/review.wrc --verify
+        """
+    )
+
+    parser.add_argument("--source", type=str, default="docs/work_review.json",
+                       help="work_review.json to encode")
+    parser.add_argument("--output", type=str,
+                       help="Output file (default: source with .wrc suffix)")
+    parser.add_argument("--verify", action="store_true",
+                       help="Decode the output and compare it with the source")
+
+    args = parser.parse_args()
+
+    source = Path(args.source)
+    output = Path(args.output) if args.output else source.with_suffix(".wrc")
+
+    try:
+        raw = source.read_bytes()
+    except FileNotFoundError:
+        print(f"❌ Source file not found: {source}")
+        sys.exit(1)
+
+    data = json.loads(raw)
+    payload = encode_work_review(data)
+    output.write_bytes(payload)
+
+    ratio = len(raw) / len(payload) if payload else 0
+    print(f"✅ Columnar export saved: {output}")
+    print(f"   📉 {len(raw):,} → {len(payload):,} bytes ({ratio:.1f}x smaller)")
+
+    if args.verify:
+        decoded = decode_work_review(payload)
+        if decoded["daily"] != sorted(data.get("daily", []), key=lambda d: d["date"]):
+            print("   ❌ Decoded data differs from source")
+            sys.exit(1)
+        if round_trips(EDGE_CASE_DAILY):
+            print("   ✅ Round trip verified")
+        else:
+            print("   ❌ Edge-case records do not round-trip")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()